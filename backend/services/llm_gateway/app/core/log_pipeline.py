@@ -0,0 +1,156 @@
+# backend/services/llm_gateway/app/core/log_pipeline.py
+"""
+非阻塞日志管道 (与 report_orchestrator 的 core/observability/log_pipeline 一致)
+
+- 请求处理中只做级别判断、采样、记录 trace_id 和入队
+- 格式化与 stdout 写入在后台线程 (QueueListener) 完成
+- trace_id 取自请求头 X-Trace-Id，由 report_orchestrator 的 LLMHelper 透传
+
+Env:
+    LOG_LEVEL: 日志级别 (默认 INFO)
+    LOG_QUEUE_ENABLED: 是否启用队列 (默认 true)
+    LOG_QUEUE_SIZE: 队列容量 (默认 10000)
+    LOG_SAMPLE_RATES: 模块采样率，如 "app.main=10"
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+TRACE_HEADER = "x-trace-id"
+TRACEPARENT_HEADER = "traceparent"
+
+trace_id_var: ContextVar[str] = ContextVar("trace_id", default="")
+
+
+class TraceIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "trace_id", None):
+            record.trace_id = trace_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """对配置的 logger 前缀，低于 WARNING 的记录每 N 条保留 1 条"""
+
+    def __init__(self, rates: Dict[str, int]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        prefixes = [p for p in self.rates if record.name == p or record.name.startswith(p + ".")]
+        if not prefixes:
+            return True
+        prefix = max(prefixes, key=len)
+        with self._lock:
+            count = self._counters.get(prefix, 0)
+            self._counters[prefix] = count + 1
+        if count % self.rates[prefix] == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """record 原样入队 (不在请求协程中格式化)，队列满时丢弃计数"""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, int]:
+    rates: Dict[str, int] = {}
+    for item in (spec or "").split(","):
+        name, _, rate = item.strip().partition("=")
+        if name and rate.strip().isdigit() and int(rate) > 1:
+            rates[name.strip()] = int(rate)
+    return rates
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None):
+    """配置 root logger；重复调用无副作用"""
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None:
+        return
+    root.setLevel(getattr(logging, (level or os.getenv("LOG_LEVEL", "INFO")).upper()))
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(trace_id)s] %(name)s %(message)s"))
+    stream_handler.addFilter(TraceIdFilter())
+
+    if os.getenv("LOG_QUEUE_ENABLED", "true").lower() != "true":
+        root.addHandler(stream_handler)
+        return
+
+    log_queue: "queue.Queue" = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(parse_sample_rates(os.getenv("LOG_SAMPLE_RATES"))))
+    queue_handler.addFilter(TraceIdFilter())
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+class TraceIdMiddleware:
+    """
+    从 X-Trace-Id / traceparent 请求头恢复 trace_id (pure ASGI，不缓冲 streaming 响应)
+
+    响应头附带 Server-Timing: app;dur=<ms>，调用方的 llm.call span 据此区分
+    网关处理耗时与网络/排队耗时 (流式响应为首包耗时)。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers", []))
+        trace_id = headers.get(TRACE_HEADER.encode(), b"").decode("latin-1")
+        if not trace_id:
+            parts = headers.get(TRACEPARENT_HEADER.encode(), b"").decode("latin-1").split("-")
+            trace_id = parts[1] if len(parts) == 4 else ""
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                duration_ms = (time.perf_counter() - started) * 1000
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", f"app;dur={duration_ms:.1f}".encode("latin-1"))
+                ]
+            await send(message)
+
+        token = trace_id_var.set(trace_id)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            trace_id_var.reset(token)
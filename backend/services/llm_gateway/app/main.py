@@ -7,6 +7,7 @@ import os
 import io
 import asyncio
 import json
+import logging
 import time
 from collections import defaultdict, deque
 from threading import Lock
@@ -16,6 +17,10 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Literal, Dict, Any, Union, Tuple
 
 from .core.config import settings
+from .core.log_pipeline import TraceIdMiddleware, configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 # LLM Request timeout configuration
 # Use environment variable or default to 180 seconds (3 minutes)
@@ -129,6 +134,7 @@ def _parse_cors_allow_origins() -> List[str]:
             parsed_origins.append(origin)
     return parsed_origins
 
+app.add_middleware(TraceIdMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_parse_cors_allow_origins(),
@@ -288,12 +294,12 @@ def startup_event():
             from google import genai
             gemini_client = genai.Client(api_key=settings.GOOGLE_API_KEY)
             gemini_model_tier = _normalize_gemini_tier(settings.GEMINI_DEFAULT_TIER)
-            print(
-                "[LLM Gateway] Gemini client initialized "
-                f"(pro={settings.GEMINI_MODEL_NAME}, flash={settings.GEMINI_FLASH_MODEL_NAME}, tier={gemini_model_tier})"
+            logger.info(
+                "[LLM Gateway] Gemini client initialized (pro=%s, flash=%s, tier=%s)",
+                settings.GEMINI_MODEL_NAME, settings.GEMINI_FLASH_MODEL_NAME, gemini_model_tier,
             )
         except Exception as e:
-            print(f"[LLM Gateway] Failed to initialize Gemini client: {e}")
+            logger.error("[LLM Gateway] Failed to initialize Gemini client: %s", e)
 
     # 初始化 Kimi 客户端 (使用 OpenAI 兼容接口)
     if settings.KIMI_API_KEY:
@@ -304,9 +310,9 @@ def startup_event():
                 base_url=settings.KIMI_BASE_URL,
                 timeout=LLM_REQUEST_TIMEOUT  # 应用超时配置
             )
-            print(f"[LLM Gateway] Kimi client initialized (model: {settings.KIMI_MODEL_NAME}, timeout: {LLM_REQUEST_TIMEOUT}s)")
+            logger.info("[LLM Gateway] Kimi client initialized (model: %s, timeout: %ss)", settings.KIMI_MODEL_NAME, LLM_REQUEST_TIMEOUT)
         except Exception as e:
-            print(f"[LLM Gateway] Failed to initialize Kimi client: {e}")
+            logger.error("[LLM Gateway] Failed to initialize Kimi client: %s", e)
 
     # 初始化 DeepSeek 客户端 (使用 OpenAI 兼容接口)
     if settings.DEEPSEEK_API_KEY:
@@ -317,34 +323,34 @@ def startup_event():
                 base_url=settings.DEEPSEEK_BASE_URL,
                 timeout=LLM_REQUEST_TIMEOUT  # 应用超时配置
             )
-            print(f"[LLM Gateway] DeepSeek client initialized (model: {settings.DEEPSEEK_MODEL_NAME}, timeout: {LLM_REQUEST_TIMEOUT}s)")
+            logger.info("[LLM Gateway] DeepSeek client initialized (model: %s, timeout: %ss)", settings.DEEPSEEK_MODEL_NAME, LLM_REQUEST_TIMEOUT)
         except Exception as e:
-            print(f"[LLM Gateway] Failed to initialize DeepSeek client: {e}")
+            logger.error("[LLM Gateway] Failed to initialize DeepSeek client: %s", e)
 
     # 确定默认提供商
     if current_provider == "gemini" and not gemini_client:
         if deepseek_client:
             current_provider = "deepseek"
-            print("[LLM Gateway] Gemini not available, falling back to DeepSeek")
+            logger.warning("[LLM Gateway] Gemini not available, falling back to DeepSeek")
         elif kimi_client:
             current_provider = "kimi"
-            print("[LLM Gateway] Gemini not available, falling back to Kimi")
+            logger.warning("[LLM Gateway] Gemini not available, falling back to Kimi")
     elif current_provider == "kimi" and not kimi_client:
         if deepseek_client:
             current_provider = "deepseek"
-            print("[LLM Gateway] Kimi not available, falling back to DeepSeek")
+            logger.warning("[LLM Gateway] Kimi not available, falling back to DeepSeek")
         elif gemini_client:
             current_provider = "gemini"
-            print("[LLM Gateway] Kimi not available, falling back to Gemini")
+            logger.warning("[LLM Gateway] Kimi not available, falling back to Gemini")
     elif current_provider == "deepseek" and not deepseek_client:
         if gemini_client:
             current_provider = "gemini"
-            print("[LLM Gateway] DeepSeek not available, falling back to Gemini")
+            logger.warning("[LLM Gateway] DeepSeek not available, falling back to Gemini")
         elif kimi_client:
             current_provider = "kimi"
-            print("[LLM Gateway] DeepSeek not available, falling back to Kimi")
+            logger.warning("[LLM Gateway] DeepSeek not available, falling back to Kimi")
 
-    print(f"[LLM Gateway] Current provider: {current_provider}")
+    logger.info("[LLM Gateway] Current provider: %s", current_provider)
 
 def _normalize_gemini_role(role: str) -> str:
     normalized = (role or "user").strip().lower()
@@ -436,7 +442,7 @@ async def call_gemini(request: GenerateRequest) -> str:
                 )
             if request.temperature is not None:
                 config_dict["temperature"] = request.temperature
-                print(f"[Gemini] Using temperature: {request.temperature}")
+                logger.debug("[Gemini] Using temperature: %s", request.temperature)
             if _should_enable_gemini_google_search(request.use_google_search):
                 _attach_google_search_tool(config_dict)
 
@@ -452,22 +458,22 @@ async def call_gemini(request: GenerateRequest) -> str:
 
             # Check if text is None or empty
             if not text:
-                print(f"[Gemini] Response text is empty or None: '{text}'")
+                logger.warning("[Gemini] Response text is empty or None: '%s'", text)
 
                 if finish_reason:
-                    print(f"[Gemini] Finish reason: {finish_reason}")
+                    logger.info("[Gemini] Finish reason: %s", finish_reason)
 
                 if "MALFORMED_FUNCTION_CALL" in finish_reason and not force_plain_text_retry:
-                    print("[Gemini] Retrying with plain-text-only instruction...")
+                    logger.warning("[Gemini] Retrying with plain-text-only instruction...")
                     force_plain_text_retry = True
                     continue
 
                 # Check for safety ratings / block reason
                 if hasattr(response, 'prompt_feedback'):
-                    print(f"[Gemini] Prompt feedback: {response.prompt_feedback}")
+                    logger.info("[Gemini] Prompt feedback: %s", response.prompt_feedback)
 
                 if not text:
-                    print(f"[Gemini] WARNING: Empty response. Candidates: {response.candidates if hasattr(response, 'candidates') else 'N/A'}")
+                    logger.warning("[Gemini] WARNING: Empty response. Candidates: %s", response.candidates if hasattr(response, 'candidates') else 'N/A')
                     text = "模型未返回有效文本，请稍后重试。"
 
             return str(text)
@@ -478,12 +484,12 @@ async def call_gemini(request: GenerateRequest) -> str:
             is_503_error = (isinstance(e, ServerError) and hasattr(e, 'status_code') and e.status_code == 503)
 
             if is_503_error and attempt < max_retries - 1:
-                print(f"[Gemini] Attempt {attempt + 1}/{max_retries} failed with 503. Retrying in {retry_delay}s...")
+                logger.warning("[Gemini] Attempt %s/%s failed with 503. Retrying in %ss...", attempt + 1, max_retries, retry_delay)
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2
                 continue
 
-            print(f"[Gemini] Error: {e}")
+            logger.error("[Gemini] Error: %s", e)
             raise HTTPException(status_code=500, detail=f"Gemini error: {str(e)}")
 
 # --- Kimi 调用 ---
@@ -512,7 +518,7 @@ async def call_kimi(request: GenerateRequest) -> str:
             # Kimi K2 推荐 temperature=0.6
             temperature = request.temperature if request.temperature is not None else 0.6
 
-            print(f"[Kimi] Using temperature: {temperature}")
+            logger.debug("[Kimi] Using temperature: %s", temperature)
 
             # 使用同步调用（在异步上下文中）
             import asyncio
@@ -535,12 +541,12 @@ async def call_kimi(request: GenerateRequest) -> str:
             is_retryable = "503" in error_str or "rate" in error_str.lower() or "timeout" in error_str.lower()
 
             if is_retryable and attempt < max_retries - 1:
-                print(f"[Kimi] Attempt {attempt + 1}/{max_retries} failed. Retrying in {retry_delay}s...")
+                logger.warning("[Kimi] Attempt %s/%s failed. Retrying in %ss...", attempt + 1, max_retries, retry_delay)
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2
                 continue
 
-            print(f"[Kimi] Error: {e}")
+            logger.error("[Kimi] Error: %s", e)
             raise HTTPException(status_code=500, detail=f"Kimi error: {str(e)}")
 
 # --- DeepSeek 调用 ---
@@ -569,7 +575,7 @@ async def call_deepseek(request: GenerateRequest) -> str:
             # DeepSeek 推荐 temperature=1.0 (范围 0-2)
             temperature = request.temperature if request.temperature is not None else 1.0
 
-            print(f"[DeepSeek] Using temperature: {temperature}, model: {settings.DEEPSEEK_MODEL_NAME}")
+            logger.debug("[DeepSeek] Using temperature: %s, model: %s", temperature, settings.DEEPSEEK_MODEL_NAME)
 
             # 使用同步调用（在异步上下文中）
             import asyncio
@@ -592,12 +598,12 @@ async def call_deepseek(request: GenerateRequest) -> str:
             is_retryable = "503" in error_str or "rate" in error_str.lower() or "timeout" in error_str.lower() or "overloaded" in error_str.lower()
 
             if is_retryable and attempt < max_retries - 1:
-                print(f"[DeepSeek] Attempt {attempt + 1}/{max_retries} failed. Retrying in {retry_delay}s...")
+                logger.warning("[DeepSeek] Attempt %s/%s failed. Retrying in %ss...", attempt + 1, max_retries, retry_delay)
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2
                 continue
 
-            print(f"[DeepSeek] Error: {e}")
+            logger.error("[DeepSeek] Error: %s", e)
             raise HTTPException(status_code=500, detail=f"DeepSeek error: {str(e)}")
 
 # --- Tool Calling Helper Functions ---
@@ -646,7 +652,7 @@ def normalize_tools_format(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             })
         else:
             # Unknown format, pass through
-            print(f"[Tool Normalize] WARNING: Unknown tool format: {list(tool.keys())}")
+            logger.warning("[Tool Normalize] WARNING: Unknown tool format: %s", list(tool.keys()))
             normalized.append(tool)
     
     return normalized
@@ -817,10 +823,10 @@ async def call_gemini_with_tools(request: ChatCompletionRequest) -> Dict[str, An
             
             # Check if contents is empty
             if not contents:
-                print(f"[Gemini Tool Calling] WARNING: Empty contents after conversion!")
-                print(f"[Gemini Tool Calling] Original messages count: {len(request.messages)}")
+                logger.warning("[Gemini Tool Calling] WARNING: Empty contents after conversion!")
+                logger.info("[Gemini Tool Calling] Original messages count: %s", len(request.messages))
                 for i, msg in enumerate(request.messages):
-                    print(f"  msg[{i}]: role={msg.role}, content={msg.content[:50] if msg.content else None}...")
+                    logger.info("  msg[%s]: role=%s, content=%s...", i, msg.role, msg.content[:50] if msg.content else None)
 
             # Convert tools if present - normalize first to handle legacy format
             tools_config = None
@@ -831,7 +837,7 @@ async def call_gemini_with_tools(request: ChatCompletionRequest) -> Dict[str, An
                 if function_declarations:
                     tools_config = [types.Tool(function_declarations=function_declarations)]
                     if attempt == 0:
-                        print(f"[Gemini Tool Calling] Configured {len(function_declarations)} tools, contents: {len(contents)}")
+                        logger.debug("[Gemini Tool Calling] Configured %s tools, contents: %s", len(function_declarations), len(contents))
 
             # Build config
             config_dict = {}
@@ -857,8 +863,8 @@ async def call_gemini_with_tools(request: ChatCompletionRequest) -> Dict[str, An
             error_type = type(e).__name__
             
             # Log detailed error
-            print(f"[Gemini Tool Calling] Error Type: {error_type}")
-            print(f"[Gemini Tool Calling] Error Details: {error_str[:500]}")
+            logger.error("[Gemini Tool Calling] Error Type: %s", error_type)
+            logger.error("[Gemini Tool Calling] Error Details: %s", error_str[:500])
             
             # Check if this is a retryable error
             is_503_error = (isinstance(e, ServerError) and hasattr(e, 'status_code') and e.status_code == 503)
@@ -872,12 +878,12 @@ async def call_gemini_with_tools(request: ChatCompletionRequest) -> Dict[str, An
 
             if is_retryable and attempt < max_retries - 1:
                 import asyncio
-                print(f"[Gemini Tool Calling] Attempt {attempt + 1}/{max_retries} failed. Retrying in {retry_delay}s...")
+                logger.warning("[Gemini Tool Calling] Attempt %s/%s failed. Retrying in %ss...", attempt + 1, max_retries, retry_delay)
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2
                 continue
 
-            print(f"[Gemini Tool Calling] Final failure after {attempt + 1} attempts:")
+            logger.error("[Gemini Tool Calling] Final failure after %s attempts:", attempt + 1)
             traceback.print_exc()
             raise HTTPException(status_code=500, detail=f"Gemini error ({error_type}): {error_str[:200]}")
 
@@ -938,7 +944,7 @@ async def call_deepseek_with_tools(request: ChatCompletionRequest) -> Dict[str,
                 if request.tool_choice:
                     kwargs["tool_choice"] = request.tool_choice
                 if attempt == 0:  # Only log on first attempt
-                    print(f"[DeepSeek Tool Calling] Model: {settings.DEEPSEEK_MODEL_NAME}, Reasoner: {is_reasoner}, Tools: {len(request.tools)}, Messages: {len(messages)}")
+                    logger.debug("[DeepSeek Tool Calling] Model: %s, Reasoner: %s, Tools: %s, Messages: %s", settings.DEEPSEEK_MODEL_NAME, is_reasoner, len(request.tools), len(messages))
 
             # Use run_in_executor for sync OpenAI SDK call
             loop = asyncio.get_event_loop()
@@ -954,7 +960,7 @@ async def call_deepseek_with_tools(request: ChatCompletionRequest) -> Dict[str,
             if is_reasoner and attempt == 0:
                 choices = result.get("choices", [])
                 if choices and choices[0].get("message", {}).get("reasoning_content"):
-                    print(f"[DeepSeek Reasoner] Response includes reasoning content")
+                    logger.debug("[DeepSeek Reasoner] Response includes reasoning content")
             
             return result
 
@@ -963,8 +969,8 @@ async def call_deepseek_with_tools(request: ChatCompletionRequest) -> Dict[str,
             error_type = type(e).__name__
             
             # Log detailed error information
-            print(f"[DeepSeek Tool Calling] Error Type: {error_type}")
-            print(f"[DeepSeek Tool Calling] Error Details: {error_str[:500]}")
+            logger.error("[DeepSeek Tool Calling] Error Type: %s", error_type)
+            logger.error("[DeepSeek Tool Calling] Error Details: %s", error_str[:500])
             
             # Check if this is a retryable error
             is_retryable = (
@@ -981,13 +987,13 @@ async def call_deepseek_with_tools(request: ChatCompletionRequest) -> Dict[str,
             )
 
             if is_retryable and attempt < max_retries - 1:
-                print(f"[DeepSeek Tool Calling] Attempt {attempt + 1}/{max_retries} failed. Retrying in {retry_delay}s...")
+                logger.warning("[DeepSeek Tool Calling] Attempt %s/%s failed. Retrying in %ss...", attempt + 1, max_retries, retry_delay)
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
                 continue
 
             # Log full traceback for final failure
-            print(f"[DeepSeek Tool Calling] Final failure after {attempt + 1} attempts:")
+            logger.error("[DeepSeek Tool Calling] Final failure after %s attempts:", attempt + 1)
             traceback.print_exc()
             raise HTTPException(status_code=500, detail=f"DeepSeek error ({error_type}): {error_str[:200]}")
 
@@ -1023,7 +1029,7 @@ async def call_kimi_with_tools(request: ChatCompletionRequest) -> Dict[str, Any]
                 kwargs["tools"] = normalize_tools_format(request.tools)
                 kwargs["tool_choice"] = request.tool_choice
                 if attempt == 0:  # Only log on first attempt
-                    print(f"[Kimi Tool Calling] Configured {len(request.tools)} tools")
+                    logger.debug("[Kimi Tool Calling] Configured %s tools", len(request.tools))
 
             response = await loop.run_in_executor(
                 None,
@@ -1044,12 +1050,12 @@ async def call_kimi_with_tools(request: ChatCompletionRequest) -> Dict[str, Any]
             )
 
             if is_retryable and attempt < max_retries - 1:
-                print(f"[Kimi Tool Calling] Attempt {attempt + 1}/{max_retries} failed: {error_str[:100]}. Retrying in {retry_delay}s...")
+                logger.warning("[Kimi Tool Calling] Attempt %s/%s failed: %s. Retrying in %ss...", attempt + 1, max_retries, error_str[:100], retry_delay)
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
                 continue
 
-            print(f"[Kimi Tool Calling] Error after {attempt + 1} attempts: {e}")
+            logger.error("[Kimi Tool Calling] Error after %s attempts: %s", attempt + 1, e)
             raise HTTPException(status_code=500, detail=f"Kimi error: {str(e)}")
 
 # --- API Endpoints ---
@@ -1097,7 +1103,7 @@ async def set_provider(provider_name: Literal["gemini", "kimi", "deepseek"]):
         raise HTTPException(status_code=400, detail="DeepSeek is not configured. Please set DEEPSEEK_API_KEY in .env")
 
     current_provider = provider_name
-    print(f"[LLM Gateway] Provider switched to: {current_provider}")
+    logger.info("[LLM Gateway] Provider switched to: %s", current_provider)
 
     return {"message": f"Provider switched to {provider_name}", "current_provider": current_provider}
 
@@ -1125,7 +1131,7 @@ async def set_gemini_model_tier(payload: GeminiModelTierUpdateRequest):
     global gemini_model_tier
     gemini_model_tier = "pro" if payload.use_pro else "flash"
     current_model = _resolve_gemini_model_name()
-    print(f"[LLM Gateway] Gemini tier switched to {gemini_model_tier} ({current_model})")
+    logger.info("[LLM Gateway] Gemini tier switched to %s (%s)", gemini_model_tier, current_model)
     return GeminiModelTierResponse(
         tier=gemini_model_tier,
         use_pro=(gemini_model_tier == "pro"),
@@ -1149,7 +1155,7 @@ async def chat_handler(payload: GenerateRequest, request: Request):
     _validate_generate_request(payload)
     provider = payload.provider or current_provider
 
-    print(f"[LLM Gateway] Chat request using provider: {provider}")
+    logger.debug("[LLM Gateway] Chat request using provider: %s", provider)
 
     if provider == "gemini":
         content = await call_gemini(payload)
@@ -1175,9 +1181,9 @@ async def chat_completions(payload: ChatCompletionRequest, request: Request):
     _validate_chat_completion_request(payload)
     provider = payload.provider or current_provider
 
-    print(f"[LLM Gateway] Chat completions request using provider: {provider}")
+    logger.debug("[LLM Gateway] Chat completions request using provider: %s", provider)
     if payload.tools:
-        print(f"[LLM Gateway] Tool calling enabled with {len(payload.tools)} tools")
+        logger.debug("[LLM Gateway] Tool calling enabled with %s tools", len(payload.tools))
 
     if provider == "gemini":
         return await call_gemini_with_tools(payload)
@@ -1229,11 +1235,11 @@ async def generate_from_file(
         )
 
         # 3. 等待文件处理完成
-        print(f"[Gemini] Uploaded file: {upload_response.name}, state: {upload_response.state}")
+        logger.debug("[Gemini] Uploaded file: %s, state: %s", upload_response.name, upload_response.state)
         while upload_response.state == "PROCESSING":
             time.sleep(1)
             upload_response = gemini_client.files.get(name=upload_response.name)
-            print(f"[Gemini] File state: {upload_response.state}")
+            logger.debug("[Gemini] File state: %s", upload_response.state)
 
         if upload_response.state != "ACTIVE":
             raise HTTPException(status_code=500, detail=f"File processing failed with state: {upload_response.state}")
@@ -1253,10 +1259,7 @@ async def generate_from_file(
         return GenerateResponse(content=response.text)
 
     except Exception as e:
-        import traceback
-        print("====== DETAILED ERROR IN llm_gateway ======")
-        traceback.print_exc()
-        print("============================================")
+        logger.exception("[LLM Gateway] Error during generation: %s", e)
         raise HTTPException(status_code=500, detail=f"Error during generation: {str(e)}")
 
 @app.get("/", tags=["Health Check"])
@@ -1265,64 +1268,118 @@ def read_root():
 
 
 # --- Streaming Chat Endpoint (SSE) ---
+_STREAM_END = object()
+
+
+async def _iterate_in_thread(make_iterator):
+    """在线程中驱动同步 SDK 返回的流式迭代器，逐块交还给事件循环（避免阻塞网关）"""
+    iterator = await asyncio.to_thread(lambda: iter(make_iterator()))
+    while True:
+        chunk = await asyncio.to_thread(next, iterator, _STREAM_END)
+        if chunk is _STREAM_END:
+            return
+        yield chunk
+
+
+def _to_openai_messages(request: GenerateRequest) -> List[Dict[str, str]]:
+    """GenerateRequest.history -> OpenAI 兼容 messages（Kimi / DeepSeek）"""
+    return [
+        {
+            "role": "assistant" if msg.role == "model" else msg.role,
+            "content": "\n".join(msg.parts) if msg.parts else "",
+        }
+        for msg in request.history
+    ]
+
+
+async def stream_gemini(request: GenerateRequest):
+    """Gemini 流式生成，内容与配置与 call_gemini 一致"""
+    from google.genai import types
+
+    config_dict = {"response_mime_type": "text/plain"}
+    if request.thinking_level:
+        config_dict["thinking_config"] = types.ThinkingConfig(thinking_level=request.thinking_level)
+    if request.temperature is not None:
+        config_dict["temperature"] = request.temperature
+    if _should_enable_gemini_google_search(request.use_google_search):
+        _attach_google_search_tool(config_dict)
+
+    contents = _build_gemini_contents(request=request, types_module=types)
+    model_name = _resolve_gemini_model_name(request.model)
+    async for chunk in _iterate_in_thread(
+        lambda: gemini_client.models.generate_content_stream(
+            model=model_name,
+            contents=contents,
+            config=types.GenerateContentConfig(**config_dict),
+        )
+    ):
+        text = getattr(chunk, "text", None)
+        if text:
+            yield text
+
+
+async def stream_openai_compatible(client, model_name: str, request: GenerateRequest, default_temperature: float):
+    """Kimi / DeepSeek 流式生成（OpenAI 兼容 stream=True），温度默认值与阻塞调用一致"""
+    messages = _to_openai_messages(request)
+    temperature = request.temperature if request.temperature is not None else default_temperature
+    async for chunk in _iterate_in_thread(
+        lambda: client.chat.completions.create(
+            model=model_name,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+        )
+    ):
+        choices = getattr(chunk, "choices", None) or []
+        text = getattr(choices[0].delta, "content", None) if choices else None
+        if text:
+            yield text
+
+
 @app.post("/chat/stream", tags=["Streaming"])
 async def chat_stream(payload: GenerateRequest, request: Request):
     """
-    流式聊天端点 - 使用 Server-Sent Events (SSE) 逐字返回响应
-    
+    流式聊天端点 - 使用 Server-Sent Events (SSE) 逐块返回响应
+
+    与 /chat 相同的提供商路由（request.provider 或全局 current_provider）与请求体；
     用于圆桌会议等需要实时显示生成内容的场景
     """
     from fastapi.responses import StreamingResponse
-    from google import genai
-    from google.genai import types
-    
-    if not gemini_client:
-        raise HTTPException(status_code=503, detail="Gemini client not available")
 
     _enforce_rate_limit(request, "chat_stream")
     _validate_generate_request(payload)
-    
+    provider = payload.provider or current_provider
+
+    logger.debug("[LLM Gateway] Stream request using provider: %s", provider)
+
+    if provider == "gemini":
+        if not gemini_client:
+            raise HTTPException(status_code=503, detail="Gemini client is not available")
+        chunks = stream_gemini(payload)
+    elif provider == "kimi":
+        if not kimi_client:
+            raise HTTPException(status_code=503, detail="Kimi client is not available")
+        chunks = stream_openai_compatible(kimi_client, settings.KIMI_MODEL_NAME, payload, 0.6)
+    elif provider == "deepseek":
+        if not deepseek_client:
+            raise HTTPException(status_code=503, detail="DeepSeek client is not available")
+        chunks = stream_openai_compatible(deepseek_client, settings.DEEPSEEK_MODEL_NAME, payload, 1.0)
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown provider: {provider}")
+
     async def generate_stream():
         try:
-            # 转换消息格式
-            contents = []
-            for msg in payload.history:
-                contents.append(
-                    types.Content(
-                        role=msg.role,
-                        parts=[types.Part(text=part) for part in msg.parts]
-                    )
-                )
-            
-            # 构建配置
-            config_dict = {}
-            if payload.temperature is not None:
-                config_dict["temperature"] = payload.temperature
-            if _should_enable_gemini_google_search(payload.use_google_search):
-                _attach_google_search_tool(config_dict)
-            
-            config = types.GenerateContentConfig(**config_dict) if config_dict else None
-            
-            # 使用流式响应
-            response = gemini_client.models.generate_content_stream(
-                model=_resolve_gemini_model_name(payload.model),
-                contents=contents,
-                config=config
-            )
-            
-            # 逐块发送
-            for chunk in response:
-                if hasattr(chunk, 'text') and chunk.text:
-                    # SSE 格式: data: {json}\n\n
-                    yield f"data: {json.dumps({'content': chunk.text, 'done': False})}\n\n"
-            
+            async for text in chunks:
+                # SSE 格式: data: {json}\n\n
+                yield f"data: {json.dumps({'content': text, 'done': False})}\n\n"
+
             # 发送完成信号
             yield f"data: {json.dumps({'content': '', 'done': True})}\n\n"
-            
+
         except Exception as e:
-            print(f"[LLM Gateway] Streaming error: {e}")
+            logger.error("[LLM Gateway] Streaming error (%s): %s", provider, e)
             yield f"data: {json.dumps({'error': str(e), 'done': True})}\n\n"
-    
+
     return StreamingResponse(
         generate_stream(),
         media_type="text/event-stream",
@@ -1,9 +1,11 @@
 # backend/services/llm_gateway/tests/test_main.py
-from unittest.mock import AsyncMock, patch
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
+import app.main as gateway
 from app.main import app
 
 client = TestClient(app)
@@ -42,3 +44,26 @@ def test_chat_handler_api_error():
 
     assert response.status_code == 503
     assert response.json()["detail"] == "Gemini unavailable"
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.choices = [type("Choice", (), {"delta": type("Delta", (), {"content": text})()})()]
+
+
+def test_chat_stream_routes_by_provider_like_chat():
+    deepseek = MagicMock()
+    deepseek.chat.completions.create.return_value = iter([_Chunk("Hel"), _Chunk(None), _Chunk("lo")])
+    payload = {"history": [{"role": "user", "parts": ["hi"]}], "provider": "deepseek"}
+
+    with patch.object(gateway, "deepseek_client", deepseek), patch.object(gateway, "gemini_client", None):
+        response = client.post("/chat/stream", json=payload)
+        missing = client.post("/chat/stream", json={**payload, "provider": "gemini"})
+
+    assert response.status_code == 200
+    frames = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert "".join(json.loads(f)["content"] for f in frames) == "Hello"
+    kwargs = deepseek.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True and kwargs["temperature"] == 1.0
+    assert kwargs["messages"] == [{"role": "user", "content": "hi"}]
+    assert missing.status_code == 503
@@ -2,15 +2,25 @@
 Monitoring Router
 Handles error reporting from frontend and exposes monitoring endpoints
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import logging
 import os
 
 from ...core.metrics import record_frontend_error
-from ...middleware.caching import response_cache
+from ...middleware.caching import CACHE_CONFIG, response_cache
 from ...core.auth import get_current_user, get_current_user_id
+from ...core.trading.request_scheduler import get_request_scheduler
+from ...core.trading.price_service import get_price_service
+from ...core.observability.latency_sketch import WINDOWS, get_latency_registry
+from ...core.observability.tracing import (
+    build_span_tree,
+    critical_path,
+    folded_stacks,
+    get_span_buffer,
+    get_tracer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -210,11 +220,8 @@ async def get_cache_stats():
         "cache": response_cache.stats(),
         "config": {
             "endpoints": [
-                {"path": "/api/scenarios", "ttl": 3600},
-                {"path": "/api/workflows", "ttl": 3600},
-                {"path": "/api/health", "ttl": 60},
-                {"path": "/api/reports", "ttl": 30},
-                {"path": "/api/reports/", "ttl": 300, "prefix": True}
+                {"path": path, "ttl": cfg["ttl"], **({"prefix": True} if cfg.get("prefix") else {})}
+                for path, cfg in CACHE_CONFIG.items()
             ]
         }
     }
@@ -245,3 +252,116 @@ async def clear_cache(pattern: Optional[str] = None):
         "message": f"Cache cleared" + (f" for pattern: {pattern}" if pattern else ""),
         "current_stats": response_cache.stats()
     }
+
+
+# =============================================================================
+# Exchange Request Scheduler
+# =============================================================================
+
+@router.get("/exchange/scheduler", response_model=Dict[str, Any])
+async def get_exchange_scheduler_metrics():
+    """
+    Get exchange request scheduler metrics.
+
+    Returns per-endpoint queue depth, coalesced calls, rate-limit pauses and
+    queue-wait / request latency summaries.
+    """
+    return get_request_scheduler().get_metrics()
+
+
+@router.get("/prices/sources", response_model=Dict[str, Any])
+async def get_price_source_stats():
+    """
+    Get price service cache and per-(asset, source) health.
+
+    Source order for hedged price requests follows these latency / failure scores.
+    """
+    service = await get_price_service()
+    return service.get_stats()
+
+
+# =============================================================================
+# Latency SLOs
+# =============================================================================
+
+@router.get("/latency", response_model=Dict[str, Any])
+async def get_latency_percentiles(window: str = "5m", kind: Optional[str] = None):
+    """
+    Rolling p50/p95/p99 per route / agent / tool / provider / phase.
+
+    Served from in-process streaming sketches (window: 1m, 5m, 15m, 1h),
+    not from a Prometheus registry scrape.
+    """
+    if window not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window must be one of {sorted(WINDOWS, key=WINDOWS.get)}")
+    registry = get_latency_registry()
+    return {
+        "window": window,
+        "series": registry.snapshot(window=window, kind=kind),
+        "stats": registry.get_stats(),
+    }
+
+
+@router.get("/slo", response_model=Dict[str, Any])
+async def get_slo_burn_rates():
+    """
+    Latency SLO burn rates over 5m and 1h windows.
+
+    status is "critical" when both windows burn >= 14.4x the error budget,
+    "warning" when both burn >= 6x.
+    """
+    results = get_latency_registry().slo_status()
+    return {
+        "slos": results,
+        "breaching": [r for r in results if r["status"] != "ok"],
+    }
+
+
+# =============================================================================
+# Span Traces
+# =============================================================================
+
+@router.get("/traces", response_model=Dict[str, Any])
+async def list_recent_traces(limit: int = 50):
+    """
+    List the current user's most recent traces in the in-process span buffer (root span summary).
+    """
+    user_id = get_current_user_id()
+    return {
+        "user_id": user_id,
+        "traces": get_span_buffer().recent_roots(limit=limit, owner=user_id),
+        "tracer": get_tracer().get_stats(),
+    }
+
+
+def _trace_view(trace_id: str) -> Dict[str, Any]:
+    spans = get_span_buffer().get_trace(trace_id, owner=get_current_user_id())
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"Trace not found: {trace_id}")
+    return {
+        "trace_id": trace_id,
+        "span_count": len(spans),
+        "tree": build_span_tree(spans),
+        "critical_path": critical_path(spans),
+        "folded": folded_stacks(spans),
+    }
+
+
+@router.get("/traces/meeting/{meeting_id}", response_model=Dict[str, Any])
+async def get_meeting_trace(meeting_id: str):
+    """
+    Get the span tree of a trading meeting (looked up by the root span's meeting_id).
+    """
+    trace_ids = get_span_buffer().find_traces(owner=get_current_user_id(), meeting_id=meeting_id)
+    if not trace_ids:
+        raise HTTPException(status_code=404, detail=f"No trace for meeting: {meeting_id}")
+    return _trace_view(trace_ids[0])
+
+
+@router.get("/traces/{trace_id}", response_model=Dict[str, Any])
+async def get_trace(trace_id: str):
+    """
+    Get one trace as a flame-graph tree, its critical path and folded stacks
+    (feed `folded` to flamegraph.pl / speedscope).
+    """
+    return _trace_view(trace_id)
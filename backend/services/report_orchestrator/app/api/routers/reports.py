@@ -14,15 +14,22 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import StreamingResponse
 
 from ...services.storage import get_report_storage, ReportStorage
-from ...exporters.chart_generator import ChartGenerator
 from ...core.auth import CurrentUser, get_current_user
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Initialize chart generator
-chart_generator_zh = ChartGenerator(language="zh")
-chart_generator_en = ChartGenerator(language="en")
+# 图表生成器按语言懒加载: chart_generator 会导入 matplotlib/seaborn(scipy)，约 1.7s 启动耗时
+_chart_generators: Dict[str, Any] = {}
+
+
+def get_chart_generator(language: str):
+    """获取 (首次调用时创建) 对应语言的图表生成器"""
+    language = "zh" if language == "zh" else "en"
+    if language not in _chart_generators:
+        from ...exporters.chart_generator import ChartGenerator
+        _chart_generators[language] = ChartGenerator(language=language)
+    return _chart_generators[language]
 
 
 def get_storage() -> ReportStorage:
@@ -382,7 +389,7 @@ async def get_report_chart(
         raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
 
     # 选择语言对应的图表生成器
-    generator = chart_generator_zh if language == "zh" else chart_generator_en
+    generator = get_chart_generator(language)
 
     # 根据图表类型提取数据并生成图表
     try:
@@ -3,14 +3,32 @@ Agent Event Bus for V4
 Agent事件总线 - 实时推送Agent工作状态
 
 用于在分析过程中实时向前端推送Agent的思考过程和中间结果
+
+发布端从不等待网络:
+- 每个事件只序列化一次 JSON，放入每个订阅者自己的有界队列，由该订阅者的写任务发送；
+  一个慢浏览器只会拖慢它自己
+- 队列策略: progress/analyzing/searching/thinking 在队列中按 (agent, 类型) 合并为最新一条
+  (同一 agent 的其他事件入队后不再向之前的位置合并，保证该 agent 的事件顺序)；
+  队列满时丢弃 log / message_delta；result/completed/error 等关键事件挤掉最旧的可丢弃事件，
+  仍放不下时断开该订阅者 (客户端重连后通过历史回放恢复)
+- 本地处理器 (持久化/监控) 在后台按顺序执行
+- 事件历史使用 deque(maxlen)
+- 取消订阅时先在超时内发完已入队的事件再关闭
 """
-from typing import Dict, List, Optional, Any
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 from enum import Enum
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
 
+logger = logging.getLogger(__name__)
+
 
 class AgentEventType(str, Enum):
     """Agent事件类型"""
@@ -23,6 +41,22 @@ class AgentEventType(str, Enum):
     RESULT = "result"             # 中间结果
     COMPLETED = "completed"       # 完成
     ERROR = "error"               # 错误
+    MESSAGE_DELTA = "message_delta"  # 流式消息增量
+
+
+# 队列中只保留最新一条的状态类事件 (按 agent + 类型)
+COALESCE_EVENT_TYPES = frozenset({
+    AgentEventType.THINKING,
+    AgentEventType.SEARCHING,
+    AgentEventType.ANALYZING,
+    AgentEventType.PROGRESS,
+})
+# 队列满时可以丢弃的事件
+DROPPABLE_EVENT_TYPES = COALESCE_EVENT_TYPES | {AgentEventType.LOG, AgentEventType.MESSAGE_DELTA}
+
+SUBSCRIBER_QUEUE_SIZE = max(8, int(os.getenv("AGENT_EVENT_SUBSCRIBER_QUEUE_SIZE", "256")))
+# 取消订阅 / 发送结束帧前等待队列写完的最长时间
+FLUSH_TIMEOUT_SECONDS = float(os.getenv("AGENT_EVENT_FLUSH_TIMEOUT_SECONDS", "5"))
 
 
 class AgentEvent(BaseModel):
@@ -40,21 +74,154 @@ class AgentEvent(BaseModel):
         super().__init__(**data)
 
 
+def _serialize(event: AgentEvent) -> str:
+    """WebSocket帧 (每个事件只序列化一次)"""
+    return json.dumps(
+        {"type": "agent_event", "event": event.model_dump()},
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+class _QueuedEvent:
+    __slots__ = ("text", "agent", "coalesce_key", "droppable")
+
+    def __init__(self, text: str, agent: str, coalesce_key: Optional[Tuple[str, str]], droppable: bool):
+        self.text = text
+        self.agent = agent
+        self.coalesce_key = coalesce_key
+        self.droppable = droppable
+
+
+class _Subscriber:
+    """One WebSocket with its own bounded queue and writer task"""
+
+    def __init__(self, websocket: WebSocket, bus: "AgentEventBus", maxsize: int):
+        self.websocket = websocket
+        self.bus = bus
+        self.maxsize = maxsize
+        self.queue: Deque[_QueuedEvent] = deque()
+        self.pending: Dict[Tuple[str, str], _QueuedEvent] = {}
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.sending = False
+        self.stats = {"sent": 0, "coalesced": 0, "dropped": 0}
+        self.writer = asyncio.ensure_future(self._write_loop())
+
+    def offer(self, item: _QueuedEvent):
+        if self.closed:
+            return
+        if item.coalesce_key is not None:
+            queued = self.pending.get(item.coalesce_key)
+            if queued is not None:
+                queued.text = item.text  # 保留队列位置，只更新为最新内容
+                self.stats["coalesced"] += 1
+                return
+        elif self.pending:
+            # 该 agent 之后的状态事件不能再合并到排在本事件之前的位置
+            for key in [key for key in self.pending if key[0] == item.agent]:
+                del self.pending[key]
+
+        if len(self.queue) >= self.maxsize:
+            if item.droppable:
+                self.stats["dropped"] += 1
+                return
+            if not self._evict_droppable():
+                logger.warning("[AgentEventBus] Subscriber queue overflow, disconnecting slow subscriber")
+                self.bus._drop_subscriber(self, close_code=1013)
+                return
+
+        self.queue.append(item)
+        if item.coalesce_key is not None:
+            self.pending[item.coalesce_key] = item
+        self.ready.set()
+
+    def _evict_droppable(self) -> bool:
+        for queued in self.queue:
+            if queued.droppable:
+                self.queue.remove(queued)
+                if queued.coalesce_key is not None and self.pending.get(queued.coalesce_key) is queued:
+                    del self.pending[queued.coalesce_key]
+                self.stats["dropped"] += 1
+                return True
+        return False
+
+    async def _write_loop(self):
+        try:
+            while not self.closed:
+                if not self.queue:
+                    self.ready.clear()
+                    await self.ready.wait()
+                    continue
+                item = self.queue.popleft()
+                if item.coalesce_key is not None and self.pending.get(item.coalesce_key) is item:
+                    del self.pending[item.coalesce_key]
+                if self.websocket.client_state != WebSocketState.CONNECTED:
+                    break
+                self.sending = True
+                try:
+                    await self.websocket.send_text(item.text)
+                finally:
+                    self.sending = False
+                self.stats["sent"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("[AgentEventBus] Error sending to subscriber: %s", e)
+        if not self.closed:
+            self.bus._drop_subscriber(self)
+
+    def close(self):
+        self.closed = True
+        self.queue.clear()
+        self.pending.clear()
+        self.ready.set()
+
+    async def drain(self):
+        """Wait until everything queued so far has been written"""
+        while (self.queue or self.sending) and not self.closed and not self.writer.done():
+            await asyncio.sleep(0.001)
+
+
 class AgentEventBus:
     """
     Agent事件总线
 
     负责：
     1. Agent发布事件
-    2. 通过WebSocket实时推送给前端
+    2. 通过WebSocket实时推送给前端 (每个订阅者独立队列 + 写任务)
     3. 支持多个WebSocket订阅者
     """
 
-    def __init__(self):
-        self.subscribers: List[WebSocket] = []
-        self.event_history: List[AgentEvent] = []  # 事件历史（用于断线重连）
-        self.max_history = 100  # 最多保留100条历史事件
+    def __init__(self, subscriber_queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._subscribers: List[_Subscriber] = []
+        self.subscriber_queue_size = subscriber_queue_size
+        self.event_history: Deque[AgentEvent] = deque(maxlen=100)  # 事件历史（用于断线重连）
         self.local_handlers: List[Any] = []  # 非WebSocket本地处理器（持久化/监控）
+        self._handler_queue: Deque[AgentEvent] = deque()
+        self._handler_ready: Optional[asyncio.Event] = None
+        self._handler_task: Optional[asyncio.Task] = None
+        self._handler_pending = 0
+        self.stats = {"published": 0, "disconnected": 0}
+
+    @property
+    def max_history(self) -> int:
+        """最多保留的历史事件数"""
+        return self.event_history.maxlen
+
+    @max_history.setter
+    def max_history(self, value: int):
+        self.event_history = deque(self.event_history, maxlen=max(1, int(value)))
+
+    @property
+    def subscribers(self) -> List[WebSocket]:
+        return [sub.websocket for sub in self._subscribers]
+
+    @property
+    def has_subscribers(self) -> bool:
+        """当前是否有 WebSocket 订阅者"""
+        return bool(self._subscribers)
 
     def add_local_handler(self, handler: Any):
         if handler not in self.local_handlers:
@@ -64,6 +231,12 @@ class AgentEventBus:
         if handler in self.local_handlers:
             self.local_handlers.remove(handler)
 
+    def _find(self, websocket: WebSocket) -> Optional[_Subscriber]:
+        for sub in self._subscribers:
+            if sub.websocket is websocket:
+                return sub
+        return None
+
     async def subscribe(self, websocket: WebSocket):
         """
         订阅事件（添加WebSocket连接）
@@ -71,62 +244,148 @@ class AgentEventBus:
         Args:
             websocket: WebSocket连接
         """
-        if websocket not in self.subscribers:
-            self.subscribers.append(websocket)
-            print(f"[AgentEventBus] New subscriber added. Total: {len(self.subscribers)}")
+        if self._find(websocket) is None:
+            self._subscribers.append(_Subscriber(websocket, self, self.subscriber_queue_size))
+            logger.info(f"[AgentEventBus] New subscriber added. Total: {len(self._subscribers)}")
 
-    async def unsubscribe(self, websocket: WebSocket):
+    async def unsubscribe(self, websocket: WebSocket, flush_timeout: float = FLUSH_TIMEOUT_SECONDS):
         """
-        取消订阅
+        取消订阅 (先在 flush_timeout 内发完已入队的事件)
 
         Args:
             websocket: WebSocket连接
+            flush_timeout: 等待队列写完的最长秒数
         """
-        if websocket in self.subscribers:
-            self.subscribers.remove(websocket)
-            print(f"[AgentEventBus] Subscriber removed. Total: {len(self.subscribers)}")
+        sub = self._find(websocket)
+        if sub is not None:
+            try:
+                await asyncio.wait_for(sub.drain(), timeout=flush_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("[AgentEventBus] Flush timed out, dropping %s queued events", len(sub.queue))
+            self._remove(sub)
+            logger.info(f"[AgentEventBus] Subscriber removed. Total: {len(self._subscribers)}")
+
+    def _remove(self, sub: _Subscriber):
+        sub.close()
+        if sub in self._subscribers:
+            self._subscribers.remove(sub)
+        if not sub.writer.done() and sub.writer is not asyncio.current_task():
+            sub.writer.cancel()
+
+    def _drop_subscriber(self, sub: _Subscriber, close_code: Optional[int] = None):
+        """Remove a failed or hopelessly slow subscriber"""
+        self.stats["disconnected"] += 1
+        self._remove(sub)
+        if close_code is not None:
+            async def _close():
+                try:
+                    await sub.websocket.close(code=close_code)
+                except Exception:
+                    pass
+            asyncio.ensure_future(_close())
+
+    def _fan_out(self, event: AgentEvent):
+        item_text = _serialize(event)
+        coalesce_key = (event.agent_name, event.event_type.value) if event.event_type in COALESCE_EVENT_TYPES else None
+        droppable = event.event_type in DROPPABLE_EVENT_TYPES
+        for sub in list(self._subscribers):
+            sub.offer(_QueuedEvent(item_text, event.agent_name, coalesce_key, droppable))
 
     async def publish(self, event: AgentEvent):
         """
-        发布事件到所有订阅者
+        发布事件到所有订阅者 (入队即返回，不等待网络)
 
         Args:
             event: Agent事件
         """
         # 记录事件历史
         self.event_history.append(event)
-        if len(self.event_history) > self.max_history:
-            self.event_history.pop(0)
+        self.stats["published"] += 1
+
+        logger.debug(f"[AgentEventBus] Publishing event: {event.agent_name} - {event.event_type} - {event.message[:80]}")
+
+        self._fan_out(event)
+
+        # 通知本地处理器（后台顺序执行，不影响主流程）
+        if self.local_handlers:
+            self._dispatch_to_handlers(event)
+
+    def _dispatch_to_handlers(self, event: AgentEvent):
+        loop = asyncio.get_running_loop()
+        if self._handler_task is None or self._handler_task.done() or self._handler_task.get_loop() is not loop:
+            self._handler_queue = deque()
+            self._handler_pending = 0
+            self._handler_ready = asyncio.Event()
+            self._handler_task = loop.create_task(self._run_handlers())
+        self._handler_queue.append(event)
+        self._handler_pending += 1
+        self._handler_ready.set()
+
+    async def _run_handlers(self):
+        while True:
+            if not self._handler_queue:
+                self._handler_ready.clear()
+                await self._handler_ready.wait()
+                continue
+            event = self._handler_queue.popleft()
+            for handler in list(self.local_handlers):
+                try:
+                    await handler(event)
+                except Exception as e:
+                    logger.error("[AgentEventBus] Local handler error: %s", e)
+            self._handler_pending -= 1
+
+    async def publish_delta(
+        self,
+        agent_name: str,
+        stream_id: str,
+        delta: str,
+        offset: int,
+        done: bool = False,
+    ):
+        """
+        推送流式消息增量
 
-        print(f"[AgentEventBus] Publishing event: {event.agent_name} - {event.event_type} - {event.message}")
+        增量是高频、可丢失的: 不写入事件历史，不通知本地处理器 (持久化)，
+        订阅者队列满时丢弃 (客户端通过 offset 发现缺口，以最终 result 事件为准)。
+        """
+        self._fan_out(AgentEvent(
+            agent_name=agent_name,
+            event_type=AgentEventType.MESSAGE_DELTA,
+            message=delta,
+            data={"stream_id": stream_id, "offset": offset, "done": done},
+        ))
 
-        # 推送给所有订阅者
-        disconnected = []
-        for ws in self.subscribers:
-            try:
-                if ws.client_state == WebSocketState.CONNECTED:
-                    await ws.send_json({
-                        "type": "agent_event",
-                        "event": event.dict()
-                    })
-                else:
-                    print(f"[AgentEventBus] Subscriber not connected (state: {ws.client_state}), skipping", flush=True)
-                    disconnected.append(ws)
-            except Exception as e:
-                print(f"[AgentEventBus] Error sending to subscriber: {e}")
-                disconnected.append(ws)
-
-        # 清理断开的连接
-        for ws in disconnected:
-            if ws in self.subscribers:
-                self.subscribers.remove(ws)
-
-        # 通知本地处理器（不影响主流程）
-        for handler in list(self.local_handlers):
-            try:
-                await handler(event)
-            except Exception as e:
-                print(f"[AgentEventBus] Local handler error: {e}")
+    async def drain(self, timeout: Optional[float] = None):
+        """
+        等待已发布事件写完 (订阅者与本地处理器)，用于关闭前和测试
+
+        Args:
+            timeout: 最长等待秒数 (None 表示一直等待)；超时后剩余事件留在队列中
+        """
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("[AgentEventBus] Drain timed out after %ss", timeout)
+
+    async def _drain(self):
+        for sub in list(self._subscribers):
+            await sub.drain()
+        while self._handler_pending and self._handler_task is not None and not self._handler_task.done():
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        per_subscriber = [sub.stats for sub in self._subscribers]
+        return {
+            **self.stats,
+            "subscribers": len(self._subscribers),
+            "queued": sum(len(sub.queue) for sub in self._subscribers),
+            "sent": sum(s["sent"] for s in per_subscriber),
+            "coalesced": sum(s["coalesced"] for s in per_subscriber),
+            "dropped": sum(s["dropped"] for s in per_subscriber),
+            "history": len(self.event_history),
+        }
 
     async def publish_started(self, agent_name: str, message: str):
         """快捷方法：发布Agent开始事件"""
@@ -229,7 +488,7 @@ class AgentEventBus:
         """
         if agent_name:
             return [e for e in self.event_history if e.agent_name == agent_name]
-        return self.event_history.copy()
+        return list(self.event_history)
 
     def clear_history(self):
         """清空事件历史"""
@@ -0,0 +1,230 @@
+"""
+Redis Streams Event Transport - 跨进程的会话事件扇出
+
+AgentEventBus / SessionEventPublisher 的订阅者只存在于运行会议的进程中，
+WebSocket 必须连到同一个 worker。EventStream 把每个会话的事件写入一个 Redis Stream:
+
+- 会议进程只 XADD 一次 (MAXLEN ~ 自动裁剪，过期时间随写入续期)
+- 任何 worker 都可以 XREAD BLOCK 跟随该 stream，为任意 WebSocket 提供事件
+- 客户端断线重连时带上最后收到的 stream id (last_event_id)，从该位置之后继续
+- 会话元数据 (所有者、状态) 存在一个 hash 中，供其他 worker 做权限校验
+- 圆桌会话的事件只写这一个 stream: 它同时是持久化 (断线回放) 与跨 worker 扇出
+- 跟随方在会话已结束或长时间没有新事件时退出，写入方进程退出也不会永远阻塞
+
+Usage:
+    stream = get_event_stream()
+    if stream:
+        await stream.publish(session_id, {"type": "agent_event", "event": {...}})
+        async for entry_id, frame in stream.follow(session_id, after_id=last_event_id):
+            await websocket.send_json({**frame, "stream_id": entry_id})
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # pragma: no cover - redis is a hard dependency of the service
+    redis = None
+
+# 结束跟随的帧类型
+TERMINAL_FRAME_TYPES = frozenset({"discussion_complete", "session_closed"})
+# 元数据中表示会话已结束的状态
+ENDED_SESSION_STATUSES = frozenset({"completed", "error"})
+# 跟随方最长空闲时间 (秒)：超过后认为写入方已退出
+FOLLOW_IDLE_TIMEOUT_SECONDS = float(os.getenv("EVENT_STREAM_FOLLOW_IDLE_SECONDS", "900"))
+
+
+class EventStream:
+    """
+    Redis Streams 事件传输
+
+    Args:
+        client: redis.asyncio 客户端 (decode_responses=True)
+        maxlen: 每个会话保留的事件数 (近似裁剪)
+        ttl_seconds: 最后一次写入后的保留时间 (默认 30 天，与会话事件回放的保留期一致)
+        prefix: key 前缀
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        maxlen: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        prefix: str = "event_stream",
+    ):
+        self.client = client
+        self.maxlen = maxlen or int(os.getenv("EVENT_STREAM_MAXLEN", "5000"))
+        self.ttl_seconds = ttl_seconds or int(os.getenv("EVENT_STREAM_TTL_SECONDS", str(30 * 24 * 3600)))
+        self.prefix = prefix
+        # Redis 不可用时暂停写入，避免每个事件都等待连接超时
+        self._retry_at = 0.0
+        self.stats = {"published": 0, "publish_errors": 0, "read": 0}
+
+    def key(self, channel: str) -> str:
+        return f"{self.prefix}:{channel}"
+
+    def meta_key(self, channel: str) -> str:
+        return f"{self.prefix}_meta:{channel}"
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    async def publish(self, channel: str, frame: Dict[str, Any]) -> Optional[str]:
+        """
+        追加一帧到会话 stream
+
+        Returns:
+            stream entry id，失败时为 None
+        """
+        if not channel or not self.available:
+            return None
+        key = self.key(channel)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.xadd(
+                key,
+                {"data": json.dumps(frame, ensure_ascii=False, default=str)},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+            pipe.expire(key, self.ttl_seconds)
+            entry_id, _ = await pipe.execute()
+            self.stats["published"] += 1
+            return entry_id
+        except Exception as e:
+            self.stats["publish_errors"] += 1
+            self._retry_at = time.monotonic() + 5.0
+            logger.warning(f"[EventStream] Publish to {key} failed, pausing for 5s: {e}")
+            return None
+
+    @staticmethod
+    def _decode(entries: List[Tuple[str, Dict[str, str]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        frames = []
+        for entry_id, fields in entries or []:
+            try:
+                frame = json.loads(fields.get("data") or "{}")
+            except (TypeError, ValueError):
+                continue
+            if isinstance(frame, dict):
+                frames.append((entry_id, frame))
+        return frames
+
+    async def read_after(self, channel: str, after_id: str = "0", count: int = 500) -> List[Tuple[str, Dict[str, Any]]]:
+        """读取 after_id 之后的事件 (不阻塞)"""
+        response = await self.client.xread({self.key(channel): after_id or "0"}, count=count)
+        entries = response[0][1] if response else []
+        self.stats["read"] += len(entries)
+        return self._decode(entries)
+
+    async def follow(
+        self,
+        channel: str,
+        after_id: str = "0",
+        block_ms: int = 5000,
+        count: int = 200,
+        stop_on_terminal: bool = True,
+        idle_timeout: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        从 after_id 之后开始持续跟随 stream (先回放已有事件，再阻塞等待新事件)
+
+        遇到 TERMINAL_FRAME_TYPES 中的帧后结束 (stop_on_terminal=True)。
+        一次阻塞读取没有新事件时，若会话元数据显示已结束 (completed/error) 则结束；
+        连续 idle_timeout 秒没有新事件也结束 (写入方进程退出、没写结束帧)。
+        """
+        key = self.key(channel)
+        last_id = after_id or "0"
+        idle_timeout = FOLLOW_IDLE_TIMEOUT_SECONDS if idle_timeout is None else idle_timeout
+        last_event_at = time.monotonic()
+        while True:
+            response = await self.client.xread({key: last_id}, count=count, block=block_ms)
+            entries = response[0][1] if response else []
+            if not entries:
+                if time.monotonic() - last_event_at >= idle_timeout:
+                    logger.warning(f"[EventStream] No events on {key} for {idle_timeout:.0f}s, stop following")
+                    return
+                if (await self.get_meta(channel)).get("status") in ENDED_SESSION_STATUSES:
+                    return
+                continue
+            last_event_at = time.monotonic()
+            self.stats["read"] += len(entries)
+            last_id = entries[-1][0]
+            for entry_id, frame in self._decode(entries):
+                yield entry_id, frame
+                if stop_on_terminal and frame.get("type") in TERMINAL_FRAME_TYPES:
+                    return
+
+    async def set_meta(self, channel: str, **fields: Any):
+        """写入会话元数据 (owner user_id、status 等)"""
+        if not channel or not self.available:
+            return
+        key = self.meta_key(channel)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(key, mapping={k: str(v) for k, v in fields.items() if v is not None})
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            self._retry_at = time.monotonic() + 5.0
+            logger.warning(f"[EventStream] Failed to write meta for {channel}: {e}")
+
+    async def get_meta(self, channel: str) -> Dict[str, str]:
+        try:
+            return dict(await self.client.hgetall(self.meta_key(channel)) or {})
+        except Exception as e:
+            logger.warning(f"[EventStream] Failed to read meta for {channel}: {e}")
+            return {}
+
+    async def delete(self, channel: str):
+        await self.client.delete(self.key(channel), self.meta_key(channel))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "available": self.available, "maxlen": self.maxlen}
+
+
+# 全局实例
+_event_stream: Optional[EventStream] = None
+
+
+def get_event_stream() -> Optional[EventStream]:
+    """
+    获取全局 EventStream 实例
+
+    EVENT_STREAM_ENABLED=false 或未安装 redis 时返回 None (仅进程内扇出)。
+    """
+    global _event_stream
+    if os.getenv("EVENT_STREAM_ENABLED", "true").lower() != "true" or redis is None:
+        return None
+    if _event_stream is None:
+        client = redis.from_url(
+            os.getenv("REDIS_URL", "redis://redis:6379"),
+            decode_responses=True,
+            socket_connect_timeout=5,
+        )
+        _event_stream = EventStream(client)
+    return _event_stream
+
+
+def set_event_stream(stream: Optional[EventStream]):
+    """替换全局实例 (测试或自定义连接)"""
+    global _event_stream
+    _event_stream = stream
+
+
+def stream_publisher(stream: EventStream, channel: str):
+    """
+    AgentEventBus 本地处理器: 把每个事件以 /ws/roundtable 帧格式写入 stream
+
+    在 AgentEventBus 的后台处理任务中执行，不阻塞发布者。
+    """
+    async def _publish(event) -> None:
+        await stream.publish(channel, {"type": "agent_event", "event": event.model_dump()})
+
+    return _publish
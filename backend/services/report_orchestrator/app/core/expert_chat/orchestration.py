@@ -239,7 +239,7 @@ def format_shared_evidence_context(
     evidence_packets: List[Dict[str, Any]],
     language: str,
     max_items: int = 6,
-    max_chars: int = 1800,
+    max_chars: Optional[int] = 1800,
 ) -> str:
     if not evidence_packets:
         return ""
@@ -270,7 +270,7 @@ def format_shared_evidence_context(
         lines.append(row[:420])
 
     text = "\n".join(lines).strip()
-    if len(text) <= max_chars:
+    if max_chars is None or len(text) <= max_chars:
         return text
     return text[: max_chars - 16] + "\n...[trimmed]"
 
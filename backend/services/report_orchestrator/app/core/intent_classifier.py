@@ -0,0 +1,298 @@
+"""
+Local Intent Classifier
+本地意图分类器
+
+- HashedNgramClassifier: 字符 n-gram 哈希特征 + 多分类逻辑回归 (纯 Python，无额外依赖)
+- IntentLog: 记录 LLM 兜底分类结果，作为分类器的训练数据 (需设置 INTENT_LOG_PATH 开启)
+- IntentRouteCache: 按归一化输入缓存路由结果
+
+分类器模型由 scripts/train_intent_classifier.py 从 IntentLog 训练生成；
+模型文件不存在时本地分类器不参与路由。
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_utterance(text: str) -> str:
+    """归一化用户输入: 去首尾空白、转小写、合并连续空白"""
+    return _WHITESPACE.sub(" ", (text or "").strip().lower())
+
+
+class HashedNgramClassifier:
+    """
+    哈希字符 n-gram 多分类逻辑回归
+
+    中文没有空格分词，字符 1~3 gram 即可覆盖"尽调"、"商业计划书"这类短语；
+    特征经 crc32 哈希到固定维度，权重按稀疏 dict 存储。
+
+    Args:
+        dim: 哈希空间大小
+        ngram_range: n-gram 长度范围 (含两端)
+    """
+
+    def __init__(self, dim: int = 1 << 18, ngram_range: Tuple[int, int] = (1, 3)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.labels: List[str] = []
+        self.weights: List[Dict[int, float]] = []
+        self.bias: List[float] = []
+
+    def features(self, text: str) -> Dict[int, float]:
+        text = normalize_utterance(text)
+        counts: Dict[int, float] = {}
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(text) - n + 1):
+                index = zlib.crc32(text[i:i + n].encode("utf-8")) % self.dim
+                counts[index] = counts.get(index, 0.0) + 1.0
+        if counts:
+            norm = math.sqrt(sum(v * v for v in counts.values()))
+            counts = {k: v / norm for k, v in counts.items()}
+        return counts
+
+    def _scores(self, features: Dict[int, float]) -> List[float]:
+        return [
+            self.bias[c] + sum(weights.get(k, 0.0) * v for k, v in features.items())
+            for c, weights in enumerate(self.weights)
+        ]
+
+    @staticmethod
+    def _softmax(scores: Sequence[float]) -> List[float]:
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def fit(
+        self,
+        examples: Iterable[Tuple[str, str]],
+        epochs: int = 15,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> "HashedNgramClassifier":
+        """
+        SGD 训练
+
+        Args:
+            examples: (文本, 标签) 序列
+        """
+        data = [(self.features(text), label) for text, label in examples if text and label]
+        if not data:
+            raise ValueError("no training examples")
+        self.labels = sorted({label for _, label in data})
+        label_index = {label: i for i, label in enumerate(self.labels)}
+        self.weights = [{} for _ in self.labels]
+        self.bias = [0.0 for _ in self.labels]
+
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            lr = learning_rate / (1 + epoch * 0.1)
+            for features, label in data:
+                probs = self._softmax(self._scores(features))
+                target = label_index[label]
+                for c, prob in enumerate(probs):
+                    grad = prob - (1.0 if c == target else 0.0)
+                    if abs(grad) < 1e-6:
+                        continue
+                    weights = self.weights[c]
+                    for k, v in features.items():
+                        w = weights.get(k, 0.0)
+                        weights[k] = w - lr * (grad * v + l2 * w)
+                    self.bias[c] -= lr * grad
+        return self
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        if not self.labels:
+            return {}
+        probs = self._softmax(self._scores(self.features(text)))
+        return dict(zip(self.labels, probs))
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        probs = self.predict_proba(text)
+        if not probs:
+            return None, 0.0
+        label = max(probs, key=probs.get)
+        return label, probs[label]
+
+    def save(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "dim": self.dim,
+            "ngram_range": list(self.ngram_range),
+            "labels": self.labels,
+            "bias": self.bias,
+            # 去掉接近 0 的权重以缩小模型文件
+            "weights": [
+                {str(k): round(w, 6) for k, w in weights.items() if abs(w) > 1e-6}
+                for weights in self.weights
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        model = cls(dim=payload["dim"], ngram_range=tuple(payload["ngram_range"]))
+        model.labels = payload["labels"]
+        model.bias = payload["bias"]
+        model.weights = [{int(k): w for k, w in weights.items()} for weights in payload["weights"]]
+        return model
+
+
+class IntentLog:
+    """
+    意图分类日志 (JSONL)
+
+    每行: {"text": ..., "intent": ..., "confidence": ..., "source": "llm", "ts": ...}
+
+    记录包含用户原文，默认不落盘: 未传 path 且未设置 INTENT_LOG_PATH 时 append 为空操作。
+    文件超过 max_bytes (INTENT_LOG_MAX_BYTES，默认 10MB) 时轮转为 <path>.1 (只保留一份)。
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.getenv("INTENT_LOG_PATH") or None
+        self.max_bytes = max_bytes or int(os.getenv("INTENT_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def rotated_path(self) -> str:
+        return f"{self.path}.1"
+
+    def append(self, text: str, intent: str, confidence: float, source: str = "llm"):
+        """同步写入 (脚本/线程中使用)；事件循环内请用 append_async"""
+        if not self.enabled:
+            return
+        record = {"text": text, "intent": intent, "confidence": confidence, "source": source, "ts": time.time()}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        try:
+            with self._lock:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(line.encode("utf-8")) > self.max_bytes:
+                    os.replace(self.path, self.rotated_path)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError as e:
+            logger.warning(f"[IntentLog] Failed to append intent record: {e}")
+
+    async def append_async(self, text: str, intent: str, confidence: float, source: str = "llm"):
+        """在线程池中写文件，不阻塞事件循环"""
+        if self.enabled:
+            await asyncio.to_thread(self.append, text, intent, confidence, source)
+
+    def read(self, min_confidence: float = 0.0) -> List[Dict[str, Any]]:
+        """读取日志 (含轮转出的旧文件)，同一归一化输入只保留最后一条"""
+        if not self.enabled:
+            return []
+        records: Dict[str, Dict[str, Any]] = {}
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("text") and record.get("intent") and record.get("confidence", 0) >= min_confidence:
+                        records[normalize_utterance(record["text"])] = record
+        return list(records.values())
+
+
+class IntentRouteCache:
+    """按归一化输入缓存的意图路由结果 (LRU)"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.getenv("INTENT_ROUTE_CACHE_SIZE", "2048"))
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, text: str) -> Optional[Tuple[str, float]]:
+        key = normalize_utterance(text)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry
+
+    def set(self, text: str, intent: str, confidence: float):
+        key = normalize_utterance(text)
+        self._entries[key] = (intent, confidence)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_intent_classifier: Optional[HashedNgramClassifier] = None
+_intent_classifier_loaded = False
+_intent_log: Optional[IntentLog] = None
+_intent_route_cache: Optional[IntentRouteCache] = None
+
+
+def intent_classifier_threshold() -> float:
+    return float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", "0.75"))
+
+
+def get_intent_classifier() -> Optional[HashedNgramClassifier]:
+    """加载本地分类器；模型文件不存在时返回 None"""
+    global _intent_classifier, _intent_classifier_loaded
+    if not _intent_classifier_loaded:
+        _intent_classifier_loaded = True
+        path = os.getenv("INTENT_CLASSIFIER_MODEL_PATH", "/tmp/magellan_intent/intent_classifier.json")
+        if os.path.exists(path):
+            try:
+                _intent_classifier = HashedNgramClassifier.load(path)
+                logger.info(f"[IntentClassifier] Loaded model from {path} ({len(_intent_classifier.labels)} labels)")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"[IntentClassifier] Failed to load model {path}: {e}")
+    return _intent_classifier
+
+
+def set_intent_classifier(classifier: Optional[HashedNgramClassifier]):
+    global _intent_classifier, _intent_classifier_loaded
+    _intent_classifier = classifier
+    _intent_classifier_loaded = True
+
+
+def get_intent_log() -> IntentLog:
+    global _intent_log
+    if _intent_log is None:
+        _intent_log = IntentLog()
+    return _intent_log
+
+
+def get_intent_route_cache() -> IntentRouteCache:
+    global _intent_route_cache
+    if _intent_route_cache is None:
+        _intent_route_cache = IntentRouteCache()
+    return _intent_route_cache
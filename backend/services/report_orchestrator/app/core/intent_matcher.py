@@ -0,0 +1,122 @@
+"""
+Compiled Intent Matcher
+预编译的意图匹配器
+
+- 所有意图的关键词合并为一个 Aho-Corasick 自动机，一次扫描得到全部命中
+- 每个意图的正则合并为一个预编译的交替表达式
+"""
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick 多模式匹配自动机 (纯 Python)
+
+    构建 O(总关键词长度)，匹配 O(文本长度 + 命中数)。
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """产出 (结束位置, 模式下标)"""
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern_id in out[node]:
+                yield i, pattern_id
+
+    def matched(self, text: str) -> Set[int]:
+        """命中的模式下标集合"""
+        return {pattern_id for _, pattern_id in self.iter_matches(text)}
+
+
+class CompiledIntentMatcher:
+    """
+    从 IntentRecognizer.INTENT_PATTERNS 构建的匹配器
+
+    打分规则与原逐个扫描实现一致:
+    - 关键词: 置信度 = min(命中关键词数 / 关键词总数 * 1.5, 1.0)
+    - 正则: 按意图定义顺序，第一个命中的意图得 0.8
+    """
+
+    def __init__(self, intent_patterns: Dict[Any, Dict[str, List[str]]]):
+        keywords: List[str] = []
+        self._keyword_owners: List[List[Any]] = []
+        self._keyword_totals: Dict[Any, int] = {}
+        index: Dict[str, int] = {}
+        for intent_type, config in intent_patterns.items():
+            intent_keywords = {kw.lower() for kw in config.get("keywords", []) if kw}
+            self._keyword_totals[intent_type] = len(config.get("keywords", []))
+            for kw in intent_keywords:
+                if kw not in index:
+                    index[kw] = len(keywords)
+                    keywords.append(kw)
+                    self._keyword_owners.append([])
+                self._keyword_owners[index[kw]].append(intent_type)
+        self._automaton = AhoCorasick(keywords)
+
+        self._regexes = [
+            (intent_type, re.compile("|".join(f"(?:{p})" for p in config["patterns"]), re.IGNORECASE))
+            for intent_type, config in intent_patterns.items()
+            if config.get("patterns")
+        ]
+
+    def keyword_scores(self, text: str) -> Dict[Any, float]:
+        counts: Dict[Any, int] = {}
+        for keyword_id in self._automaton.matched(text.lower()):
+            for intent_type in self._keyword_owners[keyword_id]:
+                counts[intent_type] = counts.get(intent_type, 0) + 1
+        # 按意图定义顺序返回，平分时与原实现一样取先定义的意图
+        return {
+            intent_type: min(counts[intent_type] / total * 1.5, 1.0)
+            for intent_type, total in self._keyword_totals.items()
+            if intent_type in counts
+        }
+
+    def match_pattern(self, text: str) -> Any:
+        """返回第一个正则命中的意图，无命中返回 None"""
+        for intent_type, regex in self._regexes:
+            if regex.search(text):
+                return intent_type
+        return None
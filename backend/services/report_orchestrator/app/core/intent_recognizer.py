@@ -5,7 +5,11 @@ Intent Recognition System for V4
 Hybrid approach:
 1. Keyword matching (<10ms)
 2. Regex pattern matching (<20ms)
-3. LLM classification (~300ms) as fallback
+3. Local hashed n-gram classifier (<1ms, trained on logged LLM decisions)
+4. LLM classification (~300ms) as fallback
+
+Keywords are matched with one Aho-Corasick pass and regexes are precompiled
+(see intent_matcher); routing decisions are cached per normalized utterance.
 
 Target accuracy: 85%+
 """
@@ -14,6 +18,16 @@ from typing import Dict, List, Tuple
 from enum import Enum
 from pydantic import BaseModel
 from .llm_helper import LLMHelper
+from .intent_matcher import CompiledIntentMatcher
+from .intent_classifier import (
+    get_intent_classifier,
+    get_intent_log,
+    get_intent_route_cache,
+    intent_classifier_threshold,
+)
+
+# LLM 调用失败时的兜底置信度；不高于该值的结果不缓存、不写入训练日志
+LLM_FALLBACK_CONFIDENCE = 0.5
 
 
 class IntentType(str, Enum):
@@ -111,10 +125,19 @@ class IntentRecognizer:
         }
     }
 
+    _matcher = None
+
     def __init__(self, llm_gateway_url: str = "http://llm_gateway:8003"):
         self.llm_gateway_url = llm_gateway_url
         self.llm = LLMHelper(llm_gateway_url=self.llm_gateway_url, timeout=10)
 
+    @classmethod
+    def _get_matcher(cls) -> CompiledIntentMatcher:
+        # 每个 WebSocket 连接都会新建 IntentRecognizer，匹配器按类只编译一次
+        if cls._matcher is None:
+            cls._matcher = CompiledIntentMatcher(cls.INTENT_PATTERNS)
+        return cls._matcher
+
     async def recognize(self, user_input: str) -> Intent:
         """
         Recognize user intent using hybrid approach
@@ -128,6 +151,30 @@ class IntentRecognizer:
         """
         user_input = user_input.strip()
 
+        route_cache = get_intent_route_cache()
+        cached = route_cache.get(user_input)
+        if cached is not None:
+            return self._build_intent(
+                intent_type=IntentType(cached[0]),
+                confidence=cached[1],
+                raw_input=user_input
+            )
+
+        intent_type, confidence = await self._route(user_input)
+        if confidence > LLM_FALLBACK_CONFIDENCE:
+            # 兜底/低置信度结果不缓存，避免一次 Gateway 故障把该输入固定为 FREE_CHAT
+            route_cache.set(user_input, intent_type.value, confidence)
+        return self._build_intent(
+            intent_type=intent_type,
+            confidence=confidence,
+            raw_input=user_input
+        )
+
+    async def _route(self, user_input: str) -> Tuple[IntentType, float]:
+        """
+        Run the matching stages in order and return (intent, confidence)
+        按顺序执行各匹配阶段
+        """
         # Special rule: If input is short and looks like a company name,
         # treat as DD_ANALYSIS (most common user intent)
         if len(user_input) <= 15 and len(user_input) >= 2:
@@ -138,57 +185,37 @@ class IntentRecognizer:
             )
             if not has_action_keyword:
                 # Likely a company name - default to DD_ANALYSIS
-                return self._build_intent(
-                    intent_type=IntentType.DD_ANALYSIS,
-                    confidence=0.75,
-                    raw_input=user_input
-                )
+                return IntentType.DD_ANALYSIS, 0.75
 
         # Stage 1: Fast keyword matching
         keyword_result = self._match_keywords(user_input)
         if keyword_result[1] >= 0.8:  # High confidence from keywords
-            return self._build_intent(
-                intent_type=keyword_result[0],
-                confidence=keyword_result[1],
-                raw_input=user_input
-            )
+            return keyword_result
 
         # Stage 2: Regex pattern matching
         regex_result = self._match_patterns(user_input)
         if regex_result[1] >= 0.7:  # Medium-high confidence from patterns
-            return self._build_intent(
-                intent_type=regex_result[0],
-                confidence=regex_result[1],
-                raw_input=user_input
-            )
+            return regex_result
 
-        # Stage 3: LLM classification (fallback)
+        # Stage 3: Local classifier trained on logged LLM decisions
+        local_result = self._local_classify(user_input)
+        if local_result[1] >= intent_classifier_threshold():
+            return local_result
+
+        # Stage 4: LLM classification (fallback)
         llm_result = await self._llm_classify(user_input)
-        return self._build_intent(
-            intent_type=llm_result[0],
-            confidence=llm_result[1],
-            raw_input=user_input
-        )
+        if llm_result[1] > LLM_FALLBACK_CONFIDENCE:
+            # 兜底值不作为训练样本
+            await get_intent_log().append_async(user_input, llm_result[0].value, llm_result[1])
+        return llm_result
 
     def _match_keywords(self, text: str) -> Tuple[IntentType, float]:
         """
         Fast keyword matching
         快速关键词匹配
         """
-        text_lower = text.lower()
-        scores = {}
-
-        for intent_type, config in self.INTENT_PATTERNS.items():
-            keywords = config.get("keywords", [])
-            if not keywords:
-                continue
-
-            # Count keyword matches
-            matches = sum(1 for kw in keywords if kw.lower() in text_lower)
-            if matches > 0:
-                # Confidence based on match count
-                confidence = min(matches / len(keywords) * 1.5, 1.0)
-                scores[intent_type] = confidence
+        # Confidence based on match count
+        scores = self._get_matcher().keyword_scores(text)
 
         if scores:
             best_intent = max(scores.items(), key=lambda x: x[1])
@@ -201,16 +228,28 @@ class IntentRecognizer:
         Regex pattern matching
         正则模式匹配
         """
-        for intent_type, config in self.INTENT_PATTERNS.items():
-            patterns = config.get("patterns", [])
-
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    # Pattern match gives 0.7-0.9 confidence
-                    return intent_type, 0.8
+        intent_type = self._get_matcher().match_pattern(text)
+        if intent_type is not None:
+            # Pattern match gives 0.7-0.9 confidence
+            return intent_type, 0.8
 
         return IntentType.UNKNOWN, 0.0
 
+    def _local_classify(self, text: str) -> Tuple[IntentType, float]:
+        """
+        Local hashed n-gram classification
+        本地分类器（未训练模型时不生效）
+        """
+        classifier = get_intent_classifier()
+        if classifier is None:
+            return IntentType.UNKNOWN, 0.0
+
+        label, probability = classifier.predict(text)
+        try:
+            return IntentType(label), probability
+        except ValueError:
+            return IntentType.UNKNOWN, 0.0
+
     async def _llm_classify(self, text: str) -> Tuple[IntentType, float]:
         """
         LLM-based intent classification (fallback)
@@ -242,7 +281,7 @@ class IntentRecognizer:
             print(f"[IntentRecognizer] LLM classification failed: {e}")
 
         # Default to free_chat if uncertain
-        return IntentType.FREE_CHAT, 0.5
+        return IntentType.FREE_CHAT, LLM_FALLBACK_CONFIDENCE
 
     def _build_intent(
         self,
@@ -4,10 +4,22 @@ LLM Helper - 通用的LLM调用封装
 """
 import httpx
 import json
+import logging
 import re
 from typing import Dict, Any, Optional
 from datetime import datetime
-from .metrics import record_llm_context_usage
+from .metrics import record_llm_context_usage, track_llm_call
+from .observability.logging import get_trace_id
+from .observability.tracing import annotate_http_response, inject_headers, start_span
+from .parallel.adaptive_scheduler import report_dependency_throttled
+
+logger = logging.getLogger(__name__)
+
+
+def trace_headers() -> Dict[str, str]:
+    """把当前 trace_id 与 span 上下文 (traceparent) 透传给 LLM Gateway"""
+    trace_id = get_trace_id()
+    return inject_headers({"X-Trace-Id": trace_id} if trace_id else {})
 
 
 class LLMHelper:
@@ -62,13 +74,19 @@ class LLMHelper:
         # 调用LLM
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.llm_gateway_url}/chat",
-                    json={"history": history}
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"LLM Gateway returned {response.status_code}: {response.text}")
+                with track_llm_call("llm", "default"):
+                    async with start_span("llm.call", kind="client", source="llm_helper") as span:
+                        response = await client.post(
+                            f"{self.llm_gateway_url}/chat",
+                            json={"history": history},
+                            headers=trace_headers(),
+                        )
+                        annotate_http_response(span, response)
+
+                    if response.status_code == 429:
+                        report_dependency_throttled("llm")
+                    if response.status_code != 200:
+                        raise Exception(f"LLM Gateway returned {response.status_code}: {response.text}")
 
                 result = response.json()
                 content = result.get("content", "")
@@ -87,11 +105,11 @@ class LLMHelper:
                     return {"content": content}
 
         except httpx.TimeoutException:
-            print(f"[LLMHelper] Request timeout after {self.timeout}s")
+            logger.warning("[LLMHelper] Request timeout after %ss", self.timeout)
             return self._create_timeout_response()
 
         except Exception as e:
-            print(f"[LLMHelper] Error calling LLM: {e}")
+            logger.error("[LLMHelper] Error calling LLM: %s", e)
             return self._create_error_response(str(e))
 
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
@@ -132,7 +150,7 @@ class LLMHelper:
                 pass
 
         # 4. 解析失败,返回原文本
-        print(f"[LLMHelper] Failed to parse JSON, returning raw content")
+        logger.warning("[LLMHelper] Failed to parse JSON, returning raw content")
         return {
             "error": "JSON parsing failed",
             "raw_content": content
@@ -187,7 +205,7 @@ class LLMHelper:
 
             except Exception as e:
                 last_error = str(e)
-                print(f"[LLMHelper] Attempt {attempt + 1} failed: {e}")
+                logger.warning("[LLMHelper] Attempt %s failed: %s", attempt + 1, e)
 
             # 如果不是最后一次尝试,等待后重试
             if attempt < max_retries:
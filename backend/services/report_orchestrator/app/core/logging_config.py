@@ -8,6 +8,9 @@ Provides JSON-formatted structured logging for better log aggregation and analys
 
 import logging
 import sys
+from typing import Optional
+
+from .observability.log_pipeline import install_log_pipeline, log_queue_enabled
 try:
     # python-json-logger >= 3.x
     from pythonjsonlogger.json import JsonFormatter
@@ -21,13 +24,15 @@ except Exception:  # Optional in some local/dev test setups
     structlog = None
 
 
-def configure_logging(log_level: str = "INFO", json_logs: bool = True):
+def configure_logging(log_level: str = "INFO", json_logs: bool = True, queue: Optional[bool] = None):
     """
     Configure structured logging for the application
 
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_logs: Whether to output logs in JSON format
+        queue: Write through a background thread (see observability.log_pipeline);
+            defaults to LOG_QUEUE_ENABLED
     """
 
     # Set logging level
@@ -51,6 +56,10 @@ def configure_logging(log_level: str = "INFO", json_logs: bool = True):
         root_logger.handlers = []
         root_logger.addHandler(logHandler)
 
+    # 事件循环中只入队，格式化和 stdout 写入在后台线程完成
+    if queue if queue is not None else log_queue_enabled():
+        install_log_pipeline()
+
     if structlog is None:
         logging.getLogger(__name__).warning(
             "structlog not installed; falling back to stdlib logging only"
@@ -10,27 +10,28 @@ import math
 import os
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-
-from google import genai
-from google.genai import types
-from qdrant_client import QdrantClient
-from qdrant_client.models import (
-    Distance,
-    FieldCondition,
-    Filter,
-    MatchValue,
-    PointStruct,
-    Range,
-    VectorParams,
-)
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .interface import MemoryHit, MemoryStore
 from .redis_store import RedisMemoryStore
 
+if TYPE_CHECKING:
+    from qdrant_client.models import Filter
+
 logger = logging.getLogger(__name__)
 
 
+def _qdrant_models():
+    # qdrant-client / google-genai 推迟到首次使用 (未配置 GOOGLE_API_KEY 时 auto 模式不再付出 ~1.3s 导入)
+    from qdrant_client import models
+    return models
+
+
+def _genai_types():
+    from google.genai import types
+    return types
+
+
 class GeminiVectorMemoryStore(MemoryStore):
     """Semantic memory powered by Gemini embeddings and Qdrant."""
 
@@ -56,6 +57,9 @@ class GeminiVectorMemoryStore(MemoryStore):
         if not api_key:
             raise RuntimeError("GOOGLE_API_KEY is required for gemini_vector memory provider")
 
+        from google import genai
+        from qdrant_client import QdrantClient
+
         self.client = QdrantClient(url=self.qdrant_url)
         self.genai_client = genai.Client(api_key=api_key)
         self._fallback = fallback_store or RedisMemoryStore()
@@ -70,6 +74,7 @@ class GeminiVectorMemoryStore(MemoryStore):
         metadata: Dict[str, Any] | None = None,
         collection: str = "episodic",
     ) -> str:
+        models = _qdrant_models()
         text = (content or "").strip()
         record_id = uuid.uuid4().hex
         if not text:
@@ -87,7 +92,7 @@ class GeminiVectorMemoryStore(MemoryStore):
         try:
             await self._ensure_collection()
             vector = await self._embed_text(text, task_type=self.document_task_type)
-            point = PointStruct(id=record_id, vector=vector, payload=payload)
+            point = models.PointStruct(id=record_id, vector=vector, payload=payload)
             await asyncio.to_thread(
                 self.client.upsert,
                 collection_name=self.collection_name,
@@ -108,6 +113,7 @@ class GeminiVectorMemoryStore(MemoryStore):
         top_k: int = 3,
         collection: str = "episodic",
     ) -> List[MemoryHit]:
+        models = _qdrant_models()
         q = (query or "").strip()
         if not q:
             return []
@@ -115,14 +121,14 @@ class GeminiVectorMemoryStore(MemoryStore):
             await self._ensure_collection()
             vector = await self._embed_text(q, task_type=self.query_task_type)
             must_conditions = [
-                FieldCondition(key="user_id", match=MatchValue(value=str(user_id))),
-                FieldCondition(key="agent_id", match=MatchValue(value=str(agent_id))),
-                FieldCondition(key="collection", match=MatchValue(value=str(collection))),
+                models.FieldCondition(key="user_id", match=models.MatchValue(value=str(user_id))),
+                models.FieldCondition(key="agent_id", match=models.MatchValue(value=str(agent_id))),
+                models.FieldCondition(key="collection", match=models.MatchValue(value=str(collection))),
             ]
             if self.ttl_seconds > 0:
                 cutoff = int(datetime.now(timezone.utc).timestamp()) - self.ttl_seconds
-                must_conditions.append(FieldCondition(key="ts_epoch", range=Range(gte=cutoff)))
-            q_filter = Filter(must=must_conditions)
+                must_conditions.append(models.FieldCondition(key="ts_epoch", range=models.Range(gte=cutoff)))
+            q_filter = models.Filter(must=must_conditions)
             results = await asyncio.to_thread(
                 self._query_points_sync,
                 vector,
@@ -157,6 +163,7 @@ class GeminiVectorMemoryStore(MemoryStore):
         content: str,
         metadata: Dict[str, Any] | None = None,
     ) -> str:
+        models = _qdrant_models()
         text = (content or "").strip()
         record_id = uuid.uuid4().hex
         if not text:
@@ -174,7 +181,7 @@ class GeminiVectorMemoryStore(MemoryStore):
         try:
             await self._ensure_collection()
             vector = await self._embed_text(text, task_type=self.document_task_type)
-            point = PointStruct(id=record_id, vector=vector, payload=payload)
+            point = models.PointStruct(id=record_id, vector=vector, payload=payload)
             await asyncio.to_thread(
                 self.client.upsert,
                 collection_name=self.collection_name,
@@ -193,6 +200,7 @@ class GeminiVectorMemoryStore(MemoryStore):
         query: str,
         top_k: int = 3,
     ) -> List[MemoryHit]:
+        models = _qdrant_models()
         q = (query or "").strip()
         if not q:
             return []
@@ -200,13 +208,13 @@ class GeminiVectorMemoryStore(MemoryStore):
             await self._ensure_collection()
             vector = await self._embed_text(q, task_type=self.query_task_type)
             must_conditions = [
-                FieldCondition(key="user_id", match=MatchValue(value=str(user_id))),
-                FieldCondition(key="collection", match=MatchValue(value="shared:evidence")),
+                models.FieldCondition(key="user_id", match=models.MatchValue(value=str(user_id))),
+                models.FieldCondition(key="collection", match=models.MatchValue(value="shared:evidence")),
             ]
             if self.ttl_seconds > 0:
                 cutoff = int(datetime.now(timezone.utc).timestamp()) - self.ttl_seconds
-                must_conditions.append(FieldCondition(key="ts_epoch", range=Range(gte=cutoff)))
-            q_filter = Filter(must=must_conditions)
+                must_conditions.append(models.FieldCondition(key="ts_epoch", range=models.Range(gte=cutoff)))
+            q_filter = models.Filter(must=must_conditions)
             results = await asyncio.to_thread(
                 self._query_points_sync,
                 vector,
@@ -251,12 +259,13 @@ class GeminiVectorMemoryStore(MemoryStore):
         self._collection_ready = True
 
     def _ensure_collection_sync(self) -> None:
+        models = _qdrant_models()
         collections = self.client.get_collections().collections
         names = [c.name for c in collections]
         if self.collection_name not in names:
             self.client.create_collection(
                 collection_name=self.collection_name,
-                vectors_config=VectorParams(size=self.vector_size, distance=Distance.COSINE),
+                vectors_config=models.VectorParams(size=self.vector_size, distance=models.Distance.COSINE),
             )
             return
 
@@ -279,7 +288,7 @@ class GeminiVectorMemoryStore(MemoryStore):
         self.client.delete_collection(collection_name=self.collection_name)
         self.client.create_collection(
             collection_name=self.collection_name,
-            vectors_config=VectorParams(size=self.vector_size, distance=Distance.COSINE),
+            vectors_config=models.VectorParams(size=self.vector_size, distance=models.Distance.COSINE),
         )
 
     @staticmethod
@@ -302,7 +311,7 @@ class GeminiVectorMemoryStore(MemoryStore):
     def _embed_text_sync(self, text: str, task_type: str) -> List[float]:
         cleaned = text if text and text.strip() else " "
         try:
-            config = types.EmbedContentConfig(
+            config = _genai_types().EmbedContentConfig(
                 task_type=task_type,
                 output_dimensionality=self.vector_size,
             )
@@ -312,7 +321,7 @@ class GeminiVectorMemoryStore(MemoryStore):
                 config=config,
             )
         except TypeError:
-            config = types.EmbedContentConfig(task_type=task_type)
+            config = _genai_types().EmbedContentConfig(task_type=task_type)
             response = self.genai_client.models.embed_content(
                 model=self.embedding_model,
                 contents=[cleaned],
@@ -7,6 +7,8 @@ import time
 from functools import wraps
 from typing import Callable, Any, Dict, Optional, Iterable
 
+from .observability.latency_sketch import get_latency_registry
+
 # =============================================================================
 # Analysis Metrics
 # =============================================================================
@@ -129,6 +131,18 @@ context_chars_total = Counter(
     ['source', 'model', 'type']  # type: prompt / completion
 )
 
+context_section_tokens_total = Counter(
+    'magellan_context_section_tokens_total',
+    'Estimated tokens per assembled prompt context section (after budget trimming)',
+    ['source', 'section']  # section: history / memory / evidence / skills ...
+)
+
+context_section_truncations_total = Counter(
+    'magellan_context_section_truncations_total',
+    'Prompt context sections trimmed to fit the token budget',
+    ['source', 'section']
+)
+
 context_tool_calls_total = Counter(
     'magellan_context_tool_calls_total',
     'Tool call count in context-intensive flows',
@@ -245,6 +259,7 @@ def track_llm_call(provider: str, model: str):
                 provider=self.provider,
                 model=self.model
             ).observe(duration)
+            record_latency('provider', f'{self.provider}:{self.model}', duration, ok=self.status == 'success')
 
             return False  # Don't suppress exceptions
 
@@ -290,6 +305,7 @@ def track_agent_execution(agent_type: str):
                 agent_execution_duration_seconds.labels(
                     agent_type=agent_type
                 ).observe(duration)
+                record_latency('agent', agent_type, duration, ok=status == 'success')
 
         return wrapper
     return decorator
@@ -355,13 +371,24 @@ def record_llm_context_usage(
     usage: Optional[Dict[str, Any]] = None,
     prompt_texts: Optional[Iterable[str]] = None,
     completion_text: Optional[str] = None,
+    section_tokens: Optional[Dict[str, int]] = None,
+    truncated_sections: Optional[Iterable[str]] = None,
 ):
     """
     Record context usage using provider usage first, then char-estimate fallback.
+
+    section_tokens / truncated_sections: per-section sizes from prompt assembly
+    (recorded separately so they don't double count the prompt totals).
     """
     safe_source = str(source or "unknown")
     safe_model = str(model or "default")
 
+    for section, tokens in (section_tokens or {}).items():
+        if tokens > 0:
+            context_section_tokens_total.labels(source=safe_source, section=str(section)).inc(tokens)
+    for section in truncated_sections or ():
+        context_section_truncations_total.labels(source=safe_source, section=str(section)).inc()
+
     prompt_text = _join_texts(prompt_texts)
     completion = str(completion_text or "")
 
@@ -424,6 +451,7 @@ def record_tool_call(
             agent=safe_agent,
             tool=safe_tool,
         ).observe(duration_seconds)
+        record_latency("tool", safe_tool, duration_seconds, ok=safe_status == "success")
 
 
 def record_cache_event(layer: str, event: str):
@@ -431,3 +459,13 @@ def record_cache_event(layer: str, event: str):
         layer=str(layer or "unknown"),
         event=str(event or "unknown"),
     ).inc()
+
+
+def record_latency(kind: str, name: str, duration_seconds: float, ok: bool = True):
+    """
+    Record one latency observation into the streaming sketches behind the
+    SLO dashboard (kind: route / agent / tool / provider / phase).
+    """
+    if duration_seconds is None or duration_seconds < 0:
+        return
+    get_latency_registry().observe(str(kind or "unknown"), str(name or "unknown"), duration_seconds, ok=ok)
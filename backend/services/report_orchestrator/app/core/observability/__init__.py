@@ -8,6 +8,11 @@ from .logging import (
     set_trace_id,
     get_trace_id,
 )
+from .log_pipeline import (
+    install_log_pipeline,
+    get_log_pipeline,
+    shutdown_log_pipeline,
+)
 from .metrics import (
     signals_generated,
     execution_failures,
@@ -16,7 +21,15 @@ from .metrics import (
     position_pnl,
     setup_metrics,
 )
-from .tracing import TraceContext
+from .tracing import (
+    TraceContext,
+    Tracer,
+    get_tracer,
+    start_span,
+    traced,
+    inject_headers,
+    parse_traceparent,
+)
 
 __all__ = [
     # Logging
@@ -25,6 +38,9 @@ __all__ = [
     "trace_id_var",
     "set_trace_id",
     "get_trace_id",
+    "install_log_pipeline",
+    "get_log_pipeline",
+    "shutdown_log_pipeline",
     # Metrics
     "signals_generated",
     "execution_failures",
@@ -34,4 +50,10 @@ __all__ = [
     "setup_metrics",
     # Tracing
     "TraceContext",
+    "Tracer",
+    "get_tracer",
+    "start_span",
+    "traced",
+    "inject_headers",
+    "parse_traceparent",
 ]
@@ -0,0 +1,335 @@
+"""
+Streaming Latency Sketches
+流式延迟分位数与 SLO 燃烧率
+
+- LatencySketch: 对数分桶的分位数草图 (DDSketch 思路)，相对误差 <= alpha，可合并，桶数有上限
+- RollingLatency: 按时间片 (默认 60s x 60) 保存草图，查询时合并最近的时间片得到 1m/5m/15m/1h 窗口
+- LatencyRegistry: 按 (kind, name) 维护序列，kind 为 route / agent / tool / provider / phase
+
+查询只合并相关序列的几十个小草图，不需要 prometheus 的 generate_latest() 渲染整个 registry。
+
+Env:
+    LATENCY_SLOT_SECONDS: 时间片长度 (默认 60)
+    LATENCY_SLOTS: 时间片数量 (默认 60，即最长 1h 窗口)
+    LATENCY_MAX_SERIES: 序列上限 (默认 500，超出的归入 <kind>/_other)
+    LATENCY_SLOS: SLO 配置，如 "route:*=1000@0.99,provider:*=30000@0.95"
+"""
+
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SLOS = "route:*=1000@0.99,agent:*=120000@0.95,tool:*=10000@0.95,provider:*=30000@0.95"
+WINDOWS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600}
+OTHER_SERIES = "_other"
+
+
+class LatencySketch:
+    """
+    对数分桶分位数草图
+
+    值 v (ms) 落入桶 ceil(log_gamma(v))，gamma = (1 + alpha) / (1 - alpha)；
+    桶代表值与真实值的相对误差不超过 alpha。桶数超过 max_buckets 时合并最低的桶
+    (只损失低分位的精度，p95/p99 不受影响)。
+
+    Args:
+        alpha: 相对误差
+        max_buckets: 桶数上限
+        min_value: 小于该值 (ms) 的观测计入零桶
+    """
+
+    __slots__ = ("alpha", "gamma", "_log_gamma", "max_buckets", "min_value",
+                 "buckets", "zero_count", "count", "sum", "max")
+
+    def __init__(self, alpha: float = 0.01, max_buckets: int = 512, min_value: float = 0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value: float, count: int = 1):
+        self.count += count
+        self.sum += value * count
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        merged = sum(self.buckets.pop(k) for k in keys[:excess + 1])
+        self.buckets[keys[excess]] = merged
+
+    def merge(self, other: "LatencySketch"):
+        """合并另一个草图 (alpha 需相同)"""
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different alpha")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def count_above(self, threshold: float) -> int:
+        """大于 threshold (ms) 的观测数 (按桶近似)"""
+        if threshold < self.min_value:
+            return self.count - self.zero_count
+        cutoff = math.ceil(math.log(threshold) / self._log_gamma)
+        return sum(count for index, count in self.buckets.items() if index > cutoff)
+
+    def copy(self) -> "LatencySketch":
+        sketch = LatencySketch(self.alpha, self.max_buckets, self.min_value)
+        sketch.merge(self)
+        return sketch
+
+
+class _Slot:
+    __slots__ = ("epoch", "sketch", "errors")
+
+    def __init__(self, epoch: int, sketch: LatencySketch):
+        self.epoch = epoch
+        self.sketch = sketch
+        self.errors = 0
+
+
+class RollingLatency:
+    """
+    一个序列的滚动窗口: slots 个时间片，每片一个草图 + 错误计数
+
+    内存上限 = slots x max_buckets 个桶，与请求量无关。
+    """
+
+    def __init__(self, slot_seconds: int = 60, slots: int = 60, alpha: float = 0.01, max_buckets: int = 512):
+        self.slot_seconds = slot_seconds
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self._slots: List[Optional[_Slot]] = [None] * slots
+
+    def _slot(self, now: float) -> _Slot:
+        epoch = int(now // self.slot_seconds)
+        position = epoch % len(self._slots)
+        slot = self._slots[position]
+        if slot is None or slot.epoch != epoch:
+            slot = self._slots[position] = _Slot(epoch, LatencySketch(self.alpha, self.max_buckets))
+        return slot
+
+    def observe(self, value_ms: float, ok: bool = True, now: Optional[float] = None):
+        slot = self._slot(time.time() if now is None else now)
+        slot.sketch.add(value_ms)
+        if not ok:
+            slot.errors += 1
+
+    def window(self, seconds: int, now: Optional[float] = None) -> Tuple[LatencySketch, int]:
+        """合并最近 seconds 秒 (含当前时间片) 的草图，返回 (草图, 错误数)"""
+        current = int((time.time() if now is None else now) // self.slot_seconds)
+        oldest = current - max(1, math.ceil(seconds / self.slot_seconds)) + 1
+        merged = LatencySketch(self.alpha, self.max_buckets)
+        errors = 0
+        for slot in self._slots:
+            if slot is not None and oldest <= slot.epoch <= current:
+                merged.merge(slot.sketch)
+                errors += slot.errors
+        return merged, errors
+
+
+@dataclass
+class LatencySLO:
+    """延迟 SLO: objective 比例的请求在 threshold_ms 内成功完成"""
+    kind: str
+    name: str
+    threshold_ms: float
+    objective: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.name}"
+
+    def matches(self, kind: str, name: str) -> bool:
+        return kind == self.kind and (self.name == "*" or self.name == name)
+
+
+def parse_slos(spec: Optional[str]) -> List[LatencySLO]:
+    """解析 "kind:name=threshold_ms@objective,..." 格式的 SLO 配置"""
+    slos = []
+    for item in (spec or "").split(","):
+        target, _, rule = item.strip().partition("=")
+        kind, _, name = target.partition(":")
+        threshold, _, objective = rule.partition("@")
+        try:
+            slo = LatencySLO(kind.strip(), name.strip() or "*", float(threshold), float(objective))
+        except ValueError:
+            continue
+        if kind.strip() and 0 < slo.objective < 1:
+            slos.append(slo)
+    return slos
+
+
+def burn_rate(bad: int, total: int, objective: float) -> float:
+    """错误预算燃烧速度: 1.0 表示恰好在 SLO 周期末耗尽预算"""
+    if total == 0:
+        return 0.0
+    return (bad / total) / (1 - objective)
+
+
+class LatencyRegistry:
+    """
+    按 (kind, name) 组织的滚动延迟序列
+
+    Args:
+        max_series: 序列数上限，超出后新名称归入 (kind, "_other")
+    """
+
+    # 多窗口燃烧率告警 (Google SRE Workbook): 5m 与 1h 同时超过阈值才告警，兼顾灵敏与抗抖动
+    CRITICAL_BURN = 14.4
+    WARNING_BURN = 6.0
+
+    def __init__(
+        self,
+        slot_seconds: Optional[int] = None,
+        slots: Optional[int] = None,
+        max_series: Optional[int] = None,
+        slos: Optional[Iterable[LatencySLO]] = None,
+        alpha: float = 0.01,
+    ):
+        self.slot_seconds = slot_seconds or int(os.getenv("LATENCY_SLOT_SECONDS", "60"))
+        self.slots = slots or int(os.getenv("LATENCY_SLOTS", "60"))
+        self.max_series = max_series or int(os.getenv("LATENCY_MAX_SERIES", "500"))
+        self.slos = list(slos) if slos is not None else parse_slos(os.getenv("LATENCY_SLOS", DEFAULT_SLOS))
+        self.alpha = alpha
+        self._series: Dict[Tuple[str, str], RollingLatency] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind: str, name: str, seconds: float, ok: bool = True, now: Optional[float] = None):
+        key = (kind, name or "unknown")
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= self.max_series:
+                    key = (kind, OTHER_SERIES)
+                    series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = RollingLatency(self.slot_seconds, self.slots, self.alpha)
+            series.observe(seconds * 1000, ok=ok, now=now)
+
+    def _windows(self, seconds: int, kind: Optional[str], now: Optional[float]):
+        with self._lock:
+            items = [(k, s.window(seconds, now)) for k, s in self._series.items() if kind is None or k[0] == kind]
+        return items
+
+    def snapshot(self, window: str = "5m", kind: Optional[str] = None, now: Optional[float] = None) -> List[Dict]:
+        """每个序列在窗口内的 p50/p95/p99 (ms)，按 p99 降序"""
+        seconds = WINDOWS.get(window, 300)
+        rows = []
+        for (series_kind, name), (sketch, errors) in self._windows(seconds, kind, now):
+            if sketch.count == 0:
+                continue
+            rows.append({
+                "kind": series_kind,
+                "name": name,
+                "count": sketch.count,
+                "error_rate": round(errors / sketch.count, 4),
+                "avg_ms": round(sketch.sum / sketch.count, 2),
+                "p50_ms": round(sketch.quantile(0.50), 2),
+                "p95_ms": round(sketch.quantile(0.95), 2),
+                "p99_ms": round(sketch.quantile(0.99), 2),
+                "max_ms": round(sketch.max, 2),
+            })
+        rows.sort(key=lambda r: r["p99_ms"], reverse=True)
+        return rows
+
+    def slo_status(self, now: Optional[float] = None) -> List[Dict]:
+        """每个 SLO 在 5m / 1h 窗口的燃烧率；name 为 * 的 SLO 对该 kind 的每个序列分别计算"""
+        short, long = self._windows(WINDOWS["5m"], None, now), self._windows(WINDOWS["1h"], None, now)
+        long_by_key = dict(long)
+        results = []
+        for slo in self.slos:
+            for key, (sketch_5m, errors_5m) in short:
+                if not slo.matches(*key):
+                    continue
+                sketch_1h, errors_1h = long_by_key[key]
+                if sketch_1h.count == 0:
+                    continue
+                # 慢请求与失败请求都消耗错误预算 (失败请求可能同时是慢请求，取较大者避免重复计数)
+                bad_5m = max(sketch_5m.count_above(slo.threshold_ms), errors_5m)
+                bad_1h = max(sketch_1h.count_above(slo.threshold_ms), errors_1h)
+                burn_5m = burn_rate(bad_5m, sketch_5m.count, slo.objective)
+                burn_1h = burn_rate(bad_1h, sketch_1h.count, slo.objective)
+                if burn_5m >= self.CRITICAL_BURN and burn_1h >= self.CRITICAL_BURN:
+                    status = "critical"
+                elif burn_5m >= self.WARNING_BURN and burn_1h >= self.WARNING_BURN:
+                    status = "warning"
+                else:
+                    status = "ok"
+                results.append({
+                    "slo": slo.key,
+                    "kind": key[0],
+                    "name": key[1],
+                    "threshold_ms": slo.threshold_ms,
+                    "objective": slo.objective,
+                    "burn_rate_5m": round(burn_5m, 3),
+                    "burn_rate_1h": round(burn_1h, 3),
+                    "good_ratio_1h": round(1 - bad_1h / sketch_1h.count, 5),
+                    "requests_1h": sketch_1h.count,
+                    "status": status,
+                })
+        results.sort(key=lambda r: r["burn_rate_5m"], reverse=True)
+        return results
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            series = list(self._series.values())
+        return {
+            "series": len(series),
+            "max_series": self.max_series,
+            "slot_seconds": self.slot_seconds,
+            "slots": self.slots,
+            "buckets": sum(len(s.sketch.buckets) for r in series for s in r._slots if s is not None),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+_latency_registry: Optional[LatencyRegistry] = None
+
+
+def get_latency_registry() -> LatencyRegistry:
+    global _latency_registry
+    if _latency_registry is None:
+        _latency_registry = LatencyRegistry()
+    return _latency_registry
@@ -0,0 +1,208 @@
+"""
+Non-blocking Log Pipeline
+非阻塞日志管道
+
+configure_logging() 配置好的 root handlers 被挪到后台线程 (QueueListener) 中执行，
+事件循环里的 logger 调用只做:
+1. 级别判断 (未开启的级别直接返回，不格式化)
+2. 采样 (可选: 配置了 LOG_SAMPLE_RATES 的模块 DEBUG/INFO 每 N 条保留 1 条，WARNING 及以上全部保留)
+3. 记录 trace_id (contextvar 只在调用方线程可见，必须在入队前取出)
+4. put_nowait 入队 (队列满时丢弃并计数，不阻塞事件循环)
+
+消息的 % 格式化和 handler 的 I/O 都在后台线程完成。
+
+Env:
+    LOG_QUEUE_ENABLED: 是否启用 (默认 true)
+    LOG_QUEUE_SIZE: 队列容量 (默认 10000)
+    LOG_SAMPLE_RATES: 模块采样率 (默认为空，不采样)。日志量过大时按模块开启，如
+        LOG_SAMPLE_RATES="app.core.session_store=10,app.core.roundtable.message_bus=20"
+        表示这两个模块的 DEBUG/INFO 分别每 10 / 20 条保留 1 条；被采样丢弃的条数见 get_stats()["sampled_out"]
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+from .logging import trace_id_var
+
+# 默认不采样: 丢弃日志必须显式开启
+DEFAULT_SAMPLE_RATES = ""
+
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, int]:
+    """解析 "module=N,module2=M" 格式的采样配置"""
+    rates: Dict[str, int] = {}
+    for item in (spec or "").split(","):
+        name, _, rate = item.strip().partition("=")
+        if name and rate.strip().isdigit() and int(rate) > 1:
+            rates[name.strip()] = int(rate)
+    return rates
+
+
+class TraceIdFilter(logging.Filter):
+    """把当前上下文的 trace_id 写入 record (调用方线程执行)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "trace_id", None):
+            record.trace_id = trace_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    按模块采样: 对配置的 logger 前缀，低于 WARNING 的记录每 N 条保留 1 条
+
+    Args:
+        rates: {logger 名前缀: N}
+    """
+
+    def __init__(self, rates: Dict[str, int]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._counters: Dict[str, int] = {}
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+
+    def _prefix(self, name: str) -> Optional[str]:
+        if name not in self._resolved:
+            matches = [p for p in self.rates if name == p or name.startswith(p + ".")]
+            self._resolved[name] = max(matches, key=len) if matches else None
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        prefix = self._prefix(record.name)
+        if prefix is None:
+            return True
+        with self._lock:
+            count = self._counters.get(prefix, 0)
+            self._counters[prefix] = count + 1
+        if count % self.rates[prefix] == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    不在调用方线程格式化消息的 QueueHandler
+
+    标准库 QueueHandler.prepare() 会先 format 一遍以便跨进程 pickle；
+    这里的队列只在进程内使用，record 原样入队，由后台线程的 handler 格式化。
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """root logger 的队列化包装"""
+
+    def __init__(self, handlers, max_size: int = 10000, sample_rates: Optional[Dict[str, int]] = None):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self.handler = LazyQueueHandler(self.queue)
+        self.trace_filter = TraceIdFilter()
+        self.sampling_filter = SamplingFilter(sample_rates or {})
+        self.handler.addFilter(self.sampling_filter)
+        self.handler.addFilter(self.trace_filter)
+        self.handlers = list(handlers)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+
+    def start(self):
+        self.listener.start()
+
+    def stop(self):
+        """停止后台线程并写完队列中剩余的记录"""
+        listener = self.listener
+        if listener._thread is not None:
+            # QueueListener.stop() 用 put_nowait 放哨兵，队列满时会抛 Full；这里阻塞等待空位
+            self.queue.put(listener._sentinel)
+            listener._thread.join()
+            listener._thread = None
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampling_filter.sampled_out,
+        }
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def log_queue_enabled() -> bool:
+    return os.getenv("LOG_QUEUE_ENABLED", "true").lower() == "true"
+
+
+def install_log_pipeline(
+    max_size: Optional[int] = None,
+    sample_rates: Optional[Dict[str, int]] = None,
+) -> LogPipeline:
+    """
+    把 root logger 当前的 handlers 挪到后台线程
+
+    重复调用时先停掉旧的管道，使用新的 root handlers 重新安装。
+    """
+    global _pipeline
+    root = logging.getLogger()
+    previous = _pipeline
+    if previous is not None:
+        previous.stop()
+        if previous.handler in root.handlers:
+            root.removeHandler(previous.handler)
+
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+    if not handlers and previous is not None:
+        # basicConfig() 在 root 已有 handler 时不做任何事，沿用上一次的 handlers
+        handlers = previous.handlers
+
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", DEFAULT_SAMPLE_RATES))
+    pipeline = LogPipeline(
+        handlers,
+        max_size=max_size or int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+        sample_rates=sample_rates,
+    )
+    root.addHandler(pipeline.handler)
+    pipeline.start()
+    _pipeline = pipeline
+    return pipeline
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    return _pipeline
+
+
+def shutdown_log_pipeline():
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline = None
+
+
+atexit.register(shutdown_log_pipeline)
@@ -106,6 +106,10 @@ def configure_logging(
         json_output: If True, output logs as JSON. If False, use console format.
         add_timestamp: If True, add ISO format timestamps to logs.
     """
+    from .log_pipeline import install_log_pipeline, log_queue_enabled
+
+    use_queue = log_queue_enabled()
+
     if structlog is None:
         # Fall back to stdlib logging only (no structured processors).
         logging.basicConfig(
@@ -113,6 +117,8 @@ def configure_logging(
             stream=sys.stdout,
             level=getattr(logging, level.upper()),
         )
+        if use_queue:
+            install_log_pipeline()
         logging.getLogger(__name__).warning(
             "structlog not installed; falling back to stdlib logging only"
         )
@@ -143,7 +149,8 @@ def configure_logging(
             getattr(logging, level.upper())
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        # 启用日志队列时经 stdlib logger 入队，由后台线程写 stdout
+        logger_factory=structlog.stdlib.LoggerFactory() if use_queue else structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
     )
     
@@ -153,6 +160,8 @@ def configure_logging(
         stream=sys.stdout,
         level=getattr(logging, level.upper()),
     )
+    if use_queue:
+        install_log_pipeline()
 
 
 def get_logger(name: Optional[str] = None) -> Any:
@@ -2,7 +2,9 @@
 Trace Context for Distributed Tracing
 
 This module provides a context manager for managing trace context
-across async operations in the trading system.
+across async operations in the trading system, plus a low-overhead span
+tracer (Tracer / start_span / traced) with ring-buffer and OTLP file
+exporters and flame/critical-path views (see "Span Tracing" below).
 
 Usage:
     from core.observability import TraceContext
@@ -13,11 +15,19 @@ Usage:
             await process_data()
 """
 
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
-from contextvars import ContextVar
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
+from contextvars import ContextVar, Token
 
 from .logging import trace_id_var, get_logger
 
@@ -128,3 +138,605 @@ def create_trace(operation_name: str, **attributes) -> TraceContext:
 def get_current_trace_id() -> str:
     """Get the current trace ID from context."""
     return trace_id_var.get() or "no-trace"
+
+
+# ==================== Span Tracing ====================
+#
+# 轻量 span 追踪 (不依赖 opentelemetry SDK):
+# - 父子关系通过 contextvar 传递，asyncio.gather/create_task 的子任务自动继承
+# - 采样在根 span 决定，未采样的整棵树都走 NOOP 路径 (无分配、无导出)
+# - 导出: 进程内环形缓冲 (供 monitoring 路由生成火焰图/关键路径) + OTLP/JSON 文件
+# - 跨进程: HTTP 用 W3C traceparent 头，Kafka 用同名消息头
+# - 归属: 本进程内的根 span 记录当前用户 (user_id)，monitoring 路由只返回调用者自己的 trace
+
+_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+
+
+class SpanContext:
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+
+class Span:
+    """一个已开始的 span；end() 后交给导出器"""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "kind",
+        "start_ns", "end_ns", "attributes", "status", "error", "_tracer", "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, span_id: str,
+                 parent_id: Optional[str], kind: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self._token: Optional[Token] = None
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id, True)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if not self.end_ns:
+            self.end_ns = time.time_ns()
+            self._tracer._export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": dict(self.attributes),
+            "status": self.status,
+            "error": self.error,
+        }
+
+    # 同时支持 with / async with
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self.context)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_val is not None and not isinstance(exc_val, GeneratorExit):
+            self.record_error(exc_val)
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end()
+        return False
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+
+class _NoopSpan:
+    """未采样时的 span: 只负责把"不采样"传给子 span"""
+
+    __slots__ = ("context", "_token")
+
+    trace_id = ""
+    span_id = ""
+    attributes: Dict[str, Any] = {}
+
+    def __init__(self, context: SpanContext):
+        self.context = context
+        self._token: Optional[Token] = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        self._token = _current_span.set(self.context)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+
+_current_span: ContextVar[Optional[SpanContext]] = ContextVar("current_span", default=None)
+_UNSAMPLED = SpanContext("", "", sampled=False)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class RingBufferExporter:
+    """
+    进程内环形缓冲: 最近 max_spans 个 span，按 trace 分组
+
+    trace 按首次出现顺序淘汰；单个 trace 的 span 数不超过 max_spans_per_trace。
+    """
+
+    def __init__(self, max_spans: int = 20000, max_spans_per_trace: int = 5000):
+        self.max_spans = max_spans
+        self.max_spans_per_trace = max_spans_per_trace
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def export(self, span: Span):
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+            if len(spans) >= self.max_spans_per_trace:
+                self.dropped += 1
+                return
+            spans.append(span)
+            self._size += 1
+            while self._size > self.max_spans and len(self._traces) > 1:
+                _, evicted = self._traces.popitem(last=False)
+                self._size -= len(evicted)
+
+    @staticmethod
+    def _root(spans: List[Span]) -> Span:
+        return next((s for s in spans if s.parent_id is None), None) or min(spans, key=lambda s: s.start_ns)
+
+    @classmethod
+    def _owned_by(cls, spans: List[Span], owner: Optional[str]) -> bool:
+        return owner is None or cls._root(spans).attributes.get("user_id") == owner
+
+    def get_trace(self, trace_id: str, owner: Optional[str] = None) -> List[Span]:
+        """owner 不为 None 时只返回根 span 的 user_id 等于 owner 的 trace"""
+        with self._lock:
+            spans = list(self._traces.get(trace_id, []))
+        return spans if spans and self._owned_by(spans, owner) else []
+
+    def find_traces(self, owner: Optional[str] = None, **attributes: Any) -> List[str]:
+        """按根 span 属性查找 trace (如 meeting_id=...)，最新的在前"""
+        with self._lock:
+            items = list(self._traces.items())
+        matched = []
+        for trace_id, spans in reversed(items):
+            if not self._owned_by(spans, owner):
+                continue
+            for span in spans:
+                if all(span.attributes.get(k) == v for k, v in attributes.items()):
+                    matched.append(trace_id)
+                    break
+        return matched
+
+    def recent_roots(self, limit: int = 50, owner: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._traces.items())
+        roots = []
+        for trace_id, spans in reversed(items):
+            if len(roots) >= limit:
+                break
+            if not self._owned_by(spans, owner):
+                continue
+            root = self._root(spans)
+            roots.append({
+                "trace_id": trace_id,
+                "name": root.name,
+                "start_ns": root.start_ns,
+                "duration_ms": round(root.duration_ms, 3),
+                "spans": len(spans),
+                "attributes": dict(root.attributes),
+            })
+        return roots
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+            self._size = 0
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def span_to_otlp(span: Span) -> Dict[str, Any]:
+    """OTLP/JSON 的 Span 结构 (trace/span id 为 hex)"""
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+class OTLPFileExporter:
+    """
+    OTLP/JSON 文件导出 (每行一个 ExportTraceServiceRequest，可被 otelcol filelog/otlpjsonfile 接收)
+
+    span 先进入内存队列，由后台线程按批写文件，事件循环中不做文件 I/O。
+    """
+
+    def __init__(self, path: str, service_name: str = "report_orchestrator",
+                 batch_size: int = 256, flush_interval: float = 2.0, max_queue: int = 50000):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="otlp-file-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while not self._stopped.is_set() or not self._queue.empty():
+            batch: List[Span] = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                self._write(batch)
+
+    def _write(self, spans: List[Span]):
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "magellan.tracing"}, "spans": [span_to_otlp(s) for s in spans]}],
+            }]
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            self.written += len(spans)
+        except OSError as e:
+            logger.warning("otlp_file_export_failed", path=self.path, error=str(e))
+
+    def shutdown(self):
+        self._stopped.set()
+        self._thread.join(timeout=5)
+
+
+class Tracer:
+    """
+    Span 工厂
+
+    Args:
+        sample_rate: 根 span 采样率 (0~1)，子 span 跟随根 span
+        exporters: 导出器列表 (需实现 export(span))
+        root_attributes: 返回本进程内根 span 额外属性的函数 (如当前 user_id)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        exporters: Optional[Iterable[Any]] = None,
+        root_attributes: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.exporters = list(exporters or [])
+        self.root_attributes = root_attributes
+        self.stats = {"started": 0, "unsampled": 0, "exported": 0}
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        parent: Optional[SpanContext] = None,
+        **attributes: Any,
+    ):
+        """
+        开始一个 span (用作 with/async with，或手动 end())
+
+        Args:
+            parent: 显式父 span (跨进程时来自 traceparent)，默认取当前上下文
+        """
+        remote_parent = parent is not None
+        parent = parent if remote_parent else _current_span.get()
+        if parent is None:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                self.stats["unsampled"] += 1
+                return _NoopSpan(_UNSAMPLED)
+            trace_id, parent_id = _new_id(128), None
+        elif not parent.sampled:
+            return _NoopSpan(parent)
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        if (parent_id is None or remote_parent) and self.root_attributes is not None:
+            attributes = {**self.root_attributes(), **attributes}
+        self.stats["started"] += 1
+        return Span(self, name, trace_id, _new_id(64), parent_id, kind, attributes)
+
+    def _export(self, span: Span):
+        self.stats["exported"] += 1
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:  # 导出失败不影响业务
+                logger.warning("span_export_failed", exporter=type(exporter).__name__, error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats, sample_rate=self.sample_rate)
+        for exporter in self.exporters:
+            if hasattr(exporter, "dropped"):
+                stats[f"{type(exporter).__name__}.dropped"] = exporter.dropped
+        return stats
+
+
+def current_span_context() -> Optional[SpanContext]:
+    return _current_span.get()
+
+
+def format_traceparent(context: Optional[SpanContext] = None) -> Optional[str]:
+    context = context or _current_span.get()
+    if context is None or not context.trace_id:
+        return None
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """解析 W3C traceparent: 00-<32 hex>-<16 hex>-<flags>"""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return SpanContext(parts[1], parts[2], sampled)
+
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """HTTP 请求头中写入 traceparent"""
+    headers = dict(headers or {})
+    traceparent = format_traceparent()
+    if traceparent:
+        headers["traceparent"] = traceparent
+    return headers
+
+
+def annotate_http_response(span: Any, response: Any):
+    """记录状态码与下游 Server-Timing (如 LLM Gateway 的处理耗时)"""
+    span.set_attribute("http.status_code", getattr(response, "status_code", 0))
+    timing = getattr(response, "headers", {}).get("server-timing") or ""
+    for metric in timing.split(","):
+        name, _, params = metric.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                try:
+                    span.set_attribute(f"downstream.{name}_ms", float(value))
+                except ValueError:
+                    pass
+
+
+def inject_kafka_headers() -> List[Tuple[str, bytes]]:
+    traceparent = format_traceparent()
+    return [("traceparent", traceparent.encode("ascii"))] if traceparent else []
+
+
+def extract_kafka_headers(headers: Optional[Iterable[Tuple[str, bytes]]]) -> Optional[SpanContext]:
+    for key, value in headers or ():
+        if key == "traceparent" and value:
+            return parse_traceparent(value.decode("ascii", "ignore"))
+    return None
+
+
+# ==================== Flame / Critical Path ====================
+
+def build_span_tree(spans: List[Span]) -> List[Dict[str, Any]]:
+    """
+    构建火焰图树: 每个节点含相对根的 offset_ms、duration_ms、self_ms (未被子 span 覆盖的时间)
+    """
+    if not spans:
+        return []
+    origin = min(s.start_ns for s in spans)
+    ids = {s.span_id for s in spans}
+    children: Dict[Optional[str], List[Span]] = {}
+    for span in spans:
+        parent = span.parent_id if span.parent_id in ids else None
+        children.setdefault(parent, []).append(span)
+
+    def covered_ns(items: List[Span]) -> int:
+        # 子 span 可能并行 (gather)，按区间并集计算覆盖时间
+        total, cursor = 0, 0
+        for start, end in sorted((c.start_ns, c.end_ns) for c in items):
+            if end <= cursor:
+                continue
+            total += end - max(start, cursor)
+            cursor = end
+        return total
+
+    def node(span: Span) -> Dict[str, Any]:
+        kids = sorted(children.get(span.span_id, []), key=lambda s: s.start_ns)
+        duration_ns = span.end_ns - span.start_ns
+        return {
+            "name": span.name,
+            "span_id": span.span_id,
+            "offset_ms": round((span.start_ns - origin) / 1e6, 3),
+            "duration_ms": round(duration_ns / 1e6, 3),
+            "self_ms": round(max(duration_ns - covered_ns(kids), 0) / 1e6, 3),
+            "status": span.status,
+            "attributes": dict(span.attributes),
+            "children": [node(k) for k in kids],
+        }
+
+    return [node(root) for root in sorted(children.get(None, []), key=lambda s: s.start_ns)]
+
+
+def critical_path(spans: List[Span]) -> List[Dict[str, Any]]:
+    """
+    关键路径: 从根开始，每层取结束最晚的子 span (它决定了父 span 何时能结束)
+
+    返回路径上每个 span 的耗时与"独占"时间，耗时集中在哪个阶段/Agent/工具一目了然。
+    """
+    tree = build_span_tree(spans)
+    if not tree:
+        return []
+    path = []
+    current = max(tree, key=lambda n: n["offset_ms"] + n["duration_ms"])
+    while current is not None:
+        path.append({
+            "name": current["name"],
+            "span_id": current["span_id"],
+            "duration_ms": current["duration_ms"],
+            "self_ms": current["self_ms"],
+            "attributes": current["attributes"],
+        })
+        kids = current["children"]
+        current = max(kids, key=lambda n: n["offset_ms"] + n["duration_ms"]) if kids else None
+    return path
+
+
+def folded_stacks(spans: List[Span]) -> List[str]:
+    """Brendan Gregg folded 格式 ("a;b;c <self_us>")，可直接喂给 flamegraph.pl / speedscope"""
+    lines: List[str] = []
+
+    def walk(node: Dict[str, Any], prefix: str):
+        label = node["name"]
+        for key in ("phase", "agent", "tool", "provider"):
+            if key in node["attributes"]:
+                label = f"{label}[{node['attributes'][key]}]"
+                break
+        stack = f"{prefix};{label}" if prefix else label
+        self_us = int(node["self_ms"] * 1000)
+        if self_us:
+            lines.append(f"{stack} {self_us}")
+        for child in node["children"]:
+            walk(child, stack)
+
+    for root in build_span_tree(spans):
+        walk(root, "")
+    return lines
+
+
+_tracer: Optional[Tracer] = None
+_ring_buffer: Optional[RingBufferExporter] = None
+
+
+def _current_user_attributes() -> Dict[str, Any]:
+    from ..auth import get_current_user_id
+
+    return {"user_id": get_current_user_id()}
+
+
+def get_span_buffer() -> RingBufferExporter:
+    global _ring_buffer
+    if _ring_buffer is None:
+        _ring_buffer = RingBufferExporter(max_spans=int(os.getenv("TRACE_BUFFER_SPANS", "20000")))
+    return _ring_buffer
+
+
+def get_tracer() -> Tracer:
+    """
+    全局 Tracer
+
+    Env:
+        TRACE_SAMPLE_RATE: 根 span 采样率 (默认 1.0)
+        TRACE_OTLP_FILE: OTLP/JSON 输出文件 (未设置时不写文件)
+    """
+    global _tracer
+    if _tracer is None:
+        exporters: List[Any] = [get_span_buffer()]
+        otlp_path = os.getenv("TRACE_OTLP_FILE")
+        if otlp_path:
+            exporters.append(OTLPFileExporter(otlp_path))
+        _tracer = Tracer(
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+            exporters=exporters,
+            root_attributes=_current_user_attributes,
+        )
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    global _tracer
+    _tracer = tracer
+
+
+def start_span(name: str, kind: str = "internal", parent: Optional[SpanContext] = None, **attributes: Any):
+    """get_tracer().start_span 的简写"""
+    return get_tracer().start_span(name, kind=kind, parent=parent, **attributes)
+
+
+def traced(name: str, kind: str = "internal", attributes: Optional[Callable[..., Dict[str, Any]]] = None):
+    """
+    async 函数装饰器: 每次调用包一个 span
+
+    Args:
+        attributes: 从调用参数计算 span 属性，如 lambda self, query, **_: {"query": query[:80]}
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            attrs = {}
+            if attributes is not None:
+                try:
+                    attrs = attributes(*args, **kwargs)
+                except Exception:
+                    attrs = {}
+            async with get_tracer().start_span(name, kind=kind, **attrs):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
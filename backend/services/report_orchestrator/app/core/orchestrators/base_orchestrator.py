@@ -24,6 +24,13 @@ from app.core.agent_registry import registry
 from app.core.session_store import SessionStore
 from app.core.memory import format_memory_hits, get_memory_store
 from app.core.memory.governance import compact_text, make_provenance_metadata, should_persist_memory
+from app.core.orchestrators.step_memo import (
+    StepMemo,
+    select_inputs,
+    step_fingerprint,
+    step_memo_enabled,
+    uses_live_data,
+)
 # Phase 7: Import Agent Message Service for Kafka integration
 from app.messaging import get_agent_service
 
@@ -62,6 +69,8 @@ class BaseOrchestrator(ABC):
         self.session_store = SessionStore()
         self.memory_store = get_memory_store()
         self.memory_top_k = max(1, int(os.getenv("ATOMIC_MEMORY_TOP_K", "3")))
+        # 步骤级结果复用: 输入未变的步骤直接使用上次的结果
+        self.step_memo = StepMemo(self.session_store, scope=request.user_id) if step_memo_enabled() else None
 
         # Phase 2: 从AgentRegistry加载workflow配置
         # Convert YAML-based workflow steps to old WorkflowStepTemplate format for backward compatibility
@@ -126,9 +135,10 @@ class BaseOrchestrator(ABC):
                 quick_mode=step.get('agent_params', {}).get('quick_mode', False),
                 expected_duration=step.get('estimated_duration', 60),
                 inputs=inputs,
-                data_sources=step.get('data_sources', []),
+                data_sources=step.get('data_sources'),
                 expected_output=step.get('expected_output', []),
-                condition=step.get('condition')
+                condition=step.get('condition'),
+                input_keys=step.get('input_keys'),
             )
             templates.append(template)
 
@@ -477,7 +487,7 @@ class BaseOrchestrator(ABC):
         ordered_ids = [s.id for s in self.workflow]
 
         deps_map: Dict[str, set[str]] = {}
-        for step_id in ordered_ids:
+        for index, step_id in enumerate(ordered_ids):
             template = templates.get(step_id)
             deps = set()
             if template:
@@ -486,6 +496,9 @@ class BaseOrchestrator(ABC):
                     for dep in (template.inputs or [])
                     if str(dep) in step_by_id and str(dep) != "all_previous"
                 }
+                # all_previous: 汇总类步骤等待之前的所有步骤完成
+                if "all_previous" in (template.inputs or []):
+                    deps.update(ordered_ids[:index])
             deps_map[step_id] = deps
 
         pending = set(ordered_ids)
@@ -522,7 +535,7 @@ class BaseOrchestrator(ABC):
 
             batch_steps = [step_by_id[sid] for sid in ready_ids]
             results = await asyncio.gather(
-                *(self._execute_step(step) for step in batch_steps),
+                *(self._execute_step_memoized(step, deps_map.get(step.id, set())) for step in batch_steps),
                 return_exceptions=True,
             )
 
@@ -547,6 +560,66 @@ class BaseOrchestrator(ABC):
                 details = "; ".join([f"{sid}: {err}" for sid, err in failed.items()])
                 raise RuntimeError(f"Workflow execution failed: {details}")
 
+    def _step_fingerprint(
+        self,
+        step: WorkflowStep,
+        template: WorkflowStepTemplate,
+        deps: set,
+    ) -> str:
+        """按步骤实际接收的输入计算指纹 (与 _execute_agent_step 传给 Agent 的内容一致)"""
+        return step_fingerprint(
+            step_id=step.id,
+            agent_id=step.agent,
+            agent_config=self.registry.get_agent_config(step.agent),
+            step_config={
+                "name": template.name,
+                "quick_mode": template.quick_mode,
+                "data_sources": template.data_sources or [],
+                "expected_output": template.expected_output,
+                "scenario": self.scenario.value,
+                "depth": self.request.config.depth.value,
+                "language": getattr(self.request.config, 'language', 'zh'),
+            },
+            inputs=select_inputs(self.request.target, template.input_keys),
+            upstream_results={dep: self.results.get(dep) for dep in deps},
+            as_of=self.step_memo.as_of,
+        )
+
+    async def _execute_step_memoized(self, step: WorkflowStep, deps: set):
+        """
+        执行步骤，输入指纹命中时直接复用已持久化的结果
+
+        Orchestrator 自身的步骤依赖全部中间结果，使用实时数据源的步骤结果会过期，
+        未声明 data_sources 的步骤无法判断是否读取实时数据，都不做复用。
+        """
+        memo = getattr(self, "step_memo", None)
+        template = self._get_step_template(step.id) if memo is not None else None
+        if (
+            memo is None
+            or template is None
+            or step.agent == "orchestrator"
+            or template.data_sources is None
+            or uses_live_data(template.data_sources)
+        ):
+            return await self._execute_step(step)
+
+        fingerprint = self._step_fingerprint(step, template, deps)
+        cached = memo.get(step.id, fingerprint)
+        if cached is not None:
+            now = datetime.now().isoformat()
+            step.result = cached
+            step.status = "success"
+            step.started_at = step.started_at or now
+            step.completed_at = now
+            step.progress = 100
+            self.results[step.id] = cached
+            await self._send_step_complete(step, memoized=True)
+            return
+
+        await self._execute_step(step)
+        if step.status == "success" and isinstance(step.result, dict):
+            memo.put(step.id, fingerprint, step.result)
+
     def _get_step_template(self, step_id: str) -> Optional[WorkflowStepTemplate]:
         """获取步骤模板"""
         for template in self.workflow_templates:
@@ -610,7 +683,8 @@ class BaseOrchestrator(ABC):
             # 调用Agent服务
             response = await agent_service.request_analysis(
                 agent_id=step.agent,
-                inputs=self.request.target,
+                # 声明了 input_keys 的步骤只拿到这些字段，与步骤指纹覆盖的输入一致
+                inputs=select_inputs(self.request.target, template.input_keys),
                 session_id=self.session_id,
                 config=config,
                 trace_id=getattr(self, 'trace_id', None),
@@ -755,7 +829,7 @@ class BaseOrchestrator(ABC):
             "inputs": inputs,
             "target": self.request.target,
             "config": self.request.config.model_dump(),
-            "data_sources": template.data_sources,
+            "data_sources": template.data_sources or [],
             "quick_mode": template.quick_mode,
             "context": {
                 "scenario": self.scenario.value,
@@ -838,17 +912,20 @@ class BaseOrchestrator(ABC):
             }
         })
 
-    async def _send_step_complete(self, step: WorkflowStep):
+    async def _send_step_complete(self, step: WorkflowStep, memoized: bool = False):
+        data = {
+            "step_id": step.id,
+            "status": "success",
+            "result": step.result if step.result else {},
+            "duration": self._calculate_step_duration(step)
+        }
+        if memoized:
+            data["memoized"] = True
         await self._emit_event({
             "type": "step_complete",
             "session_id": self.session_id,
             "timestamp": datetime.now().isoformat(),
-            "data": {
-                "step_id": step.id,
-                "status": "success",
-                "result": step.result if step.result else {},
-                "duration": self._calculate_step_duration(step)
-            }
+            "data": data
         })
 
     async def _send_step_error(self, step: WorkflowStep, error: str):
@@ -974,6 +1051,8 @@ class BaseOrchestrator(ABC):
             }
             if error:
                 context["error"] = error
+            if getattr(self, "step_memo", None) is not None:
+                context["step_memo"] = self.step_memo.get_stats()
 
             if quick_judgment:
                 # Handle Pydantic models in quick_judgment
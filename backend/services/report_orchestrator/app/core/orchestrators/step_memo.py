@@ -0,0 +1,131 @@
+"""
+StepMemo - 工作流步骤级结果复用
+
+每个步骤的结果按其输入指纹持久化:
+- 指纹 = 步骤/Agent 配置 + 该步骤读取的 target 字段 + 分析配置 + 上游步骤结果摘要
+- 上游用"结果摘要"而不是上游指纹: 上游重跑但产出不变时，下游直接复用 (early cutoff)
+- 用户修改某个输入 (如重新上传 BP) 时，只有受影响的步骤及其下游重跑
+- 结果在步骤成功后立即写入，崩溃后重跑会从最后完成的步骤继续
+- 默认关闭 (WORKFLOW_STEP_MEMO_ENABLED=true 开启)；结果保留 1 小时 (与 cache_analysis_result 一致)，
+  指纹包含按 TTL 划分的时间桶 (as_of)；声明了实时数据源 (搜索/行情/新闻等) 或未声明 data_sources
+  的步骤不做复用 (步骤的 data_sources / input_keys 在 config/workflows.yaml 中声明)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 指纹格式变化时递增，旧结果自然失效
+STEP_MEMO_VERSION = 2
+
+# 这些数据源的结果随时间变化，对应步骤每次都重新执行
+LIVE_DATA_SOURCES = frozenset({
+    "web_search", "yahoo_finance", "coingecko", "etherscan", "dune_analytics",
+    "twitter", "discord", "telegram", "github", "competitor_data", "news",
+})
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+
+
+def result_digest(result: Any) -> str:
+    """步骤结果的内容摘要"""
+    return hashlib.sha256(_canonical(result).encode("utf-8")).hexdigest()
+
+
+def step_fingerprint(
+    step_id: str,
+    agent_id: str,
+    agent_config: Optional[Dict[str, Any]],
+    step_config: Dict[str, Any],
+    inputs: Dict[str, Any],
+    upstream_results: Dict[str, Any],
+    as_of: str = "",
+) -> str:
+    """
+    计算步骤输入指纹
+
+    Args:
+        step_id: 步骤 ID
+        agent_id: Agent ID
+        agent_config: agents.yaml 中的 Agent 配置 (模型、提示词版本等)
+        step_config: 步骤模板与运行参数 (quick_mode、depth、language ...)
+        inputs: 步骤读取的请求输入
+        upstream_results: 依赖步骤的结果 {step_id: result}
+        as_of: 数据时间桶，不同时间桶的结果互不复用
+    """
+    payload = {
+        "v": STEP_MEMO_VERSION,
+        "step": step_id,
+        "agent": agent_id,
+        "agent_config": agent_config or {},
+        "step_config": step_config,
+        "inputs": inputs,
+        "upstream": {dep: result_digest(result) for dep, result in sorted(upstream_results.items())},
+        "as_of": as_of,
+    }
+    return hashlib.sha256(_canonical(payload).encode("utf-8")).hexdigest()
+
+
+def select_inputs(target: Dict[str, Any], input_keys: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """只取步骤声明读取的 target 字段；未声明时使用整个 target"""
+    if input_keys is None:
+        return target
+    return {key: target.get(key) for key in input_keys}
+
+
+def uses_live_data(data_sources: Optional[Iterable[str]]) -> bool:
+    return any(str(source).lower() in LIVE_DATA_SOURCES for source in data_sources or ())
+
+
+class StepMemo:
+    """
+    步骤结果存储 (Redis，通过 SessionStore)
+
+    Args:
+        store: SessionStore
+        scope: 隔离范围 (用户 ID)，不同用户之间不共享步骤结果
+        ttl_hours: 结果保留小时数，同时也是指纹时间桶的长度
+        as_of: 指纹时间桶，默认取当前时间所在的 TTL 区间 (整个工作流共用一个)
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        scope: str,
+        ttl_hours: Optional[int] = None,
+        as_of: Optional[str] = None,
+    ):
+        self.store = store
+        self.scope = str(scope or "anonymous")
+        self.ttl_hours = max(1, ttl_hours or int(os.getenv("WORKFLOW_STEP_MEMO_TTL_HOURS", "1")))
+        self.as_of = as_of if as_of is not None else str(int(time.time() // (self.ttl_hours * 3600)))
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+        self.reused_steps: list = []
+
+    def get(self, step_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        result = self.store.get_step_result(self.scope, fingerprint)
+        if result is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.reused_steps.append(step_id)
+        logger.info(f"[StepMemo] Reusing result for step {step_id} ({fingerprint[:12]})")
+        return result
+
+    def put(self, step_id: str, fingerprint: str, result: Dict[str, Any]):
+        if self.store.save_step_result(self.scope, fingerprint, result, ttl_hours=self.ttl_hours):
+            self.stats["stored"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "reused_steps": list(self.reused_steps)}
+
+
+def step_memo_enabled() -> bool:
+    return os.getenv("WORKFLOW_STEP_MEMO_ENABLED", "false").lower() == "true"
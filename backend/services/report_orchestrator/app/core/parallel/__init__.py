@@ -4,6 +4,7 @@ Parallel Agent Execution - Package Init
 This package provides rate-limited parallel execution for trading agents.
 
 Phase 1: Parallel Agent Execution with API Rate Limiting
+Phase 2: Adaptive per-dependency (AIMD) agent scheduling
 """
 
 from .rate_limiter import (
@@ -13,15 +14,29 @@ from .rate_limiter import (
 )
 from .batch_config import (
     AGENT_BATCHES,
+    AGENT_DEPENDENCIES,
     get_agent_batch,
+    get_agent_dependencies,
     get_batch_for_agent,
 )
+from .adaptive_scheduler import (
+    AdaptiveAgentScheduler,
+    DependencyLimit,
+    get_agent_scheduler,
+    report_dependency_throttled,
+)
 
 __all__ = [
     "RateLimitConfig",
     "RateLimitedExecutor",
     "get_rate_limiter",
     "AGENT_BATCHES",
+    "AGENT_DEPENDENCIES",
     "get_agent_batch",
+    "get_agent_dependencies",
     "get_batch_for_agent",
+    "AdaptiveAgentScheduler",
+    "DependencyLimit",
+    "get_agent_scheduler",
+    "report_dependency_throttled",
 ]
@@ -0,0 +1,313 @@
+"""
+Adaptive Agent Scheduler
+
+Feedback-driven replacement for the static AGENT_BATCHES pipeline:
+
+- Each external dependency (LLM, Tavily, OKX, on-chain) has an AIMD
+  concurrency window: +1/window per success, x0.5 on a rate-limit signal
+  (at most once per decrease interval, like TCP once-per-RTT)
+- An agent holds one slot in every dependency it uses and starts as soon as
+  all of them have room, so there are no batch barriers or inter-batch delays
+- Rate-limit signals come from agent failures that look like throttling
+  (429 / "rate limit" / timeouts) and from the clients that see them first,
+  via report_dependency_throttled(): LLM Gateway 429s (roundtable Agent,
+  ReWOOAgent, LLMHelper) -> "llm", OKX rate-limit codes (RequestScheduler
+  penalty) -> "okx", search provider rate limits (SearchRouter) -> the
+  provider that returned them ("tavily" / "serper" / "duckduckgo")
+
+Usage:
+    scheduler = get_agent_scheduler()
+    results = await scheduler.run_round(agent_ids, get_agent, prompt, run_agent, parse_vote)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.observability.logging import get_logger
+from .batch_config import get_agent_dependencies
+from .rate_limiter import AgentResult, run_agent_with_timeout
+
+logger = get_logger(__name__)
+
+RATE_LIMIT_MARKERS = ("429", "rate limit", "rate-limit", "ratelimit", "too many requests", "quota")
+
+
+def is_rate_limit_error(error: Any) -> bool:
+    """Whether an exception / error message indicates provider throttling."""
+    text = str(error).lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+@dataclass
+class DependencyLimit:
+    """AIMD parameters for one external dependency."""
+    initial_window: float
+    max_window: float
+    min_window: float = 1.0
+    additive_increase: float = 1.0
+    multiplicative_decrease: float = 0.5
+    decrease_interval_seconds: float = 1.0
+
+
+DEFAULT_DEPENDENCY_LIMITS: Dict[str, DependencyLimit] = {
+    "llm": DependencyLimit(initial_window=4, max_window=8),
+    "tavily": DependencyLimit(initial_window=2, max_window=6),
+    "serper": DependencyLimit(initial_window=2, max_window=6),
+    "duckduckgo": DependencyLimit(initial_window=2, max_window=6),
+    "okx": DependencyLimit(initial_window=4, max_window=10),
+    "onchain": DependencyLimit(initial_window=1, max_window=4),
+}
+
+FALLBACK_DEPENDENCY_LIMIT = DependencyLimit(initial_window=2, max_window=6)
+
+
+class AIMDWindow:
+    """Additive-increase / multiplicative-decrease concurrency window."""
+
+    def __init__(self, name: str, limit: DependencyLimit):
+        self.name = name
+        self.limit = limit
+        self.window = float(limit.initial_window)
+        self.in_flight = 0
+        self.successes = 0
+        self.throttles = 0
+        self.decreases = 0
+        self.peak_in_flight = 0
+        self._last_decrease = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return max(1, int(self.window))
+
+    @property
+    def has_room(self) -> bool:
+        return self.in_flight < self.capacity
+
+    def on_success(self):
+        self.successes += 1
+        self.window = min(self.limit.max_window, self.window + self.limit.additive_increase / self.window)
+
+    def on_throttle(self, now: Optional[float] = None) -> bool:
+        """Shrink the window; repeated signals within the decrease interval count once."""
+        self.throttles += 1
+        now = time.monotonic() if now is None else now
+        if now - self._last_decrease < self.limit.decrease_interval_seconds:
+            return False
+        self._last_decrease = now
+        self.decreases += 1
+        self.window = max(self.limit.min_window, self.window * self.limit.multiplicative_decrease)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window": round(self.window, 2),
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "successes": self.successes,
+            "throttles": self.throttles,
+            "decreases": self.decreases,
+        }
+
+
+class AdaptiveAgentScheduler:
+    """
+    Starts agents as soon as their dependency budgets allow.
+
+    Args:
+        limits: Per-dependency AIMD parameters (unknown dependencies use a fallback)
+        dependency_map: agent_id -> dependencies (default: batch_config.AGENT_DEPENDENCIES)
+        agent_timeout_seconds: Per-agent timeout
+        throttle_on_timeout: Treat agent timeouts as congestion signals
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, DependencyLimit]] = None,
+        dependency_map: Optional[Callable[[str], Tuple[str, ...]]] = None,
+        agent_timeout_seconds: float = 120.0,
+        throttle_on_timeout: bool = True,
+    ):
+        self._limits = dict(DEFAULT_DEPENDENCY_LIMITS if limits is None else limits)
+        self._dependencies_of = dependency_map or get_agent_dependencies
+        self.agent_timeout_seconds = agent_timeout_seconds
+        self.throttle_on_timeout = throttle_on_timeout
+        self._windows: Dict[str, AIMDWindow] = {}
+        self._cond: Optional[asyncio.Condition] = None
+        self._rounds = 0
+        self._last_round_ms = 0.0
+
+    def _window(self, name: str) -> AIMDWindow:
+        window = self._windows.get(name)
+        if window is None:
+            window = self._windows[name] = AIMDWindow(name, self._limits.get(name, FALLBACK_DEPENDENCY_LIMIT))
+        return window
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def dependencies_for(self, agent_id: str) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(self._dependencies_of(agent_id)))
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    async def acquire(self, dependencies: Iterable[str]) -> Tuple[str, ...]:
+        """Take one slot in every dependency at once (all-or-nothing, no hold-and-wait)."""
+        windows = [self._window(d) for d in dependencies]
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: all(w.has_room for w in windows))
+            for w in windows:
+                w.in_flight += 1
+                w.peak_in_flight = max(w.peak_in_flight, w.in_flight)
+        return tuple(w.name for w in windows)
+
+    async def release(self, dependencies: Iterable[str], outcome: str = "success"):
+        """
+        Return slots and feed the outcome back into the windows.
+
+        Args:
+            outcome: "success" (additive increase), "throttled" (multiplicative
+                decrease) or "failed" (unrelated failure, window unchanged)
+        """
+        cond = self._condition()
+        async with cond:
+            for name in dependencies:
+                window = self._window(name)
+                window.in_flight = max(0, window.in_flight - 1)
+                if outcome == "throttled":
+                    window.on_throttle()
+                elif outcome == "success":
+                    window.on_success()
+            cond.notify_all()
+
+    def report_throttled(self, dependency: str):
+        """Rate-limit signal from inside an agent run (e.g. a tool saw HTTP 429)."""
+        if self._window(dependency).on_throttle():
+            logger.warning("dependency_throttled",
+                dependency=dependency,
+                window=round(self._window(dependency).window, 2)
+            )
+
+    # ------------------------------------------------------------------
+    # Vote round
+    # ------------------------------------------------------------------
+
+    def _outcome(self, result: Optional[AgentResult]) -> str:
+        if result is None:
+            return "failed"
+        if result.success:
+            return "success"
+        if result.error and is_rate_limit_error(result.error):
+            return "throttled"
+        if self.throttle_on_timeout and (result.error or "").startswith("Timeout"):
+            return "throttled"
+        return "failed"
+
+    async def run_agent(
+        self,
+        agent: Any,
+        prompt: str,
+        run_agent_func: Callable[..., Awaitable[str]],
+        parse_vote_func: Callable[..., Any],
+        timeout_seconds: Optional[float] = None,
+    ) -> AgentResult:
+        agent_id = agent.id if hasattr(agent, 'id') else str(agent)
+        held = await self.acquire(self.dependencies_for(agent_id))
+        result: Optional[AgentResult] = None
+        try:
+            result = await run_agent_with_timeout(
+                agent, prompt, run_agent_func, parse_vote_func,
+                timeout_seconds=timeout_seconds or self.agent_timeout_seconds
+            )
+            return result
+        finally:
+            await self.release(held, self._outcome(result))
+
+    async def run_round(
+        self,
+        agent_ids: List[str],
+        get_agents_func: Callable[[str], Optional[Any]],
+        prompt: str,
+        run_agent_func: Callable[..., Awaitable[str]],
+        parse_vote_func: Callable[..., Any],
+        timeout_seconds: Optional[float] = None,
+    ) -> List[AgentResult]:
+        """
+        Run every agent in ``agent_ids`` under the dependency windows.
+
+        Returns:
+            AgentResults in ``agent_ids`` order (missing agents are skipped)
+        """
+        started = time.time()
+        agents = []
+        for agent_id in agent_ids:
+            agent = get_agents_func(agent_id)
+            if agent:
+                agents.append(agent)
+            else:
+                logger.warning("agent_not_found", agent_id=agent_id)
+
+        outcomes = await asyncio.gather(
+            *(
+                self.run_agent(agent, prompt, run_agent_func, parse_vote_func, timeout_seconds)
+                for agent in agents
+            ),
+            return_exceptions=True
+        )
+
+        results: List[AgentResult] = []
+        for agent, outcome in zip(agents, outcomes):
+            if isinstance(outcome, Exception):
+                agent_id = agent.id if hasattr(agent, 'id') else str(agent)
+                results.append(AgentResult(
+                    agent_id=agent_id,
+                    agent_name=getattr(agent, 'name', agent_id),
+                    success=False,
+                    error=str(outcome),
+                    is_fallback=True
+                ))
+            else:
+                results.append(outcome)
+
+        self._rounds += 1
+        self._last_round_ms = (time.time() - started) * 1000
+        successful = sum(1 for r in results if r.success)
+        logger.info("adaptive_round_completed",
+            total_agents=len(results),
+            successful=successful,
+            failed=len(results) - successful,
+            total_duration_ms=self._last_round_ms,
+            windows={name: round(w.window, 2) for name, w in self._windows.items()}
+        )
+        return results
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "rounds": self._rounds,
+            "last_round_ms": round(self._last_round_ms, 1),
+            "dependencies": {name: w.to_dict() for name, w in self._windows.items()},
+        }
+
+
+# Singleton instance
+_agent_scheduler: Optional[AdaptiveAgentScheduler] = None
+
+
+def get_agent_scheduler() -> AdaptiveAgentScheduler:
+    """Get or create the singleton adaptive agent scheduler."""
+    global _agent_scheduler
+    if _agent_scheduler is None:
+        _agent_scheduler = AdaptiveAgentScheduler()
+    return _agent_scheduler
+
+
+def report_dependency_throttled(dependency: str):
+    """Hook for tools: record a rate-limit response from ``dependency``."""
+    get_agent_scheduler().report_throttled(dependency)
@@ -8,9 +8,13 @@ Batch Strategy:
 - Batch 1: Fast agents (no external search, only cached market data)
 - Batch 2: Tavily-dependent agents (news search, macro data)
 - Batch 3: Mixed API agents (on-chain, quantitative)
+
+AGENT_DEPENDENCIES maps each agent to the external services it calls. The
+adaptive scheduler (adaptive_scheduler.py) uses it instead of the static
+batches: every agent starts as soon as all of its dependencies have room.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 # Agent Batches - organized by API dependency
 # Agents in the same batch run in parallel
@@ -29,6 +33,18 @@ AGENT_BATCHES: List[List[str]] = [
     ["OnchainAnalyst", "QuantStrategist", "ContrarianAnalyst"],
 ]
 
+# Agent -> external dependencies (every agent calls the LLM)
+AGENT_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "TechnicalAnalyst": ("okx", "llm"),
+    "MacroEconomist": ("tavily", "llm"),
+    "SentimentAnalyst": ("tavily", "llm"),
+    "OnchainAnalyst": ("onchain", "llm"),
+    "QuantStrategist": ("okx", "llm"),
+    "ContrarianAnalyst": ("tavily", "okx", "llm"),
+}
+
+DEFAULT_AGENT_DEPENDENCIES: Tuple[str, ...] = ("llm",)
+
 # Agent to batch mapping for quick lookup
 _AGENT_TO_BATCH: Dict[str, int] = {}
 for batch_idx, batch in enumerate(AGENT_BATCHES):
@@ -64,6 +80,11 @@ def get_batch_for_agent(agent_id: str) -> int:
     return _AGENT_TO_BATCH.get(agent_id, -1)
 
 
+def get_agent_dependencies(agent_id: str) -> Tuple[str, ...]:
+    """External dependencies of an agent (defaults to LLM only)."""
+    return AGENT_DEPENDENCIES.get(agent_id, DEFAULT_AGENT_DEPENDENCIES)
+
+
 def get_all_voting_agents() -> List[str]:
     """Get flat list of all voting agents in batch order."""
     agents = []
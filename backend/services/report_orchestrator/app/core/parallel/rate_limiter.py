@@ -2,8 +2,8 @@
 Rate-Limited Parallel Executor
 
 Provides controlled parallel execution of trading agents with:
-- Semaphore-based concurrency control
-- Configurable batch delays
+- Adaptive per-dependency scheduling (see adaptive_scheduler.py), or
+- Semaphore-based concurrency control with configurable batch delays
 - Per-agent timeout protection
 - Fallback vote generation on failure
 
@@ -20,7 +20,7 @@ from datetime import datetime
 
 from app.core.observability.logging import get_logger
 from app.core.observability.metrics import agent_latency
-from .batch_config import AGENT_BATCHES, get_batch_for_agent
+from .batch_config import AGENT_BATCHES, get_all_voting_agents, get_batch_for_agent
 
 logger = get_logger(__name__)
 
@@ -44,6 +44,9 @@ class RateLimitConfig:
     max_retries: int = 1
     retry_delay_seconds: float = 1.0
 
+    # Feedback-driven scheduling (adaptive_scheduler.py) instead of static batches
+    adaptive_scheduling: bool = True
+
 
 # Default configuration
 DEFAULT_CONFIG = RateLimitConfig()
@@ -61,6 +64,101 @@ class AgentResult:
     is_fallback: bool = False
 
 
+async def run_agent_with_timeout(
+    agent: Any,
+    prompt: str,
+    run_agent_func: Callable[..., Awaitable[str]],
+    parse_vote_func: Callable[..., Any],
+    timeout_seconds: float,
+) -> AgentResult:
+    """Run one agent with timeout protection and parse its vote (no concurrency control)."""
+    agent_id = agent.id if hasattr(agent, 'id') else str(agent)
+    agent_name = agent.name if hasattr(agent, 'name') else agent_id
+
+    start_time = time.time()
+
+    logger.info("agent_execution_started",
+        agent_id=agent_id,
+        agent_name=agent_name
+    )
+    
+    try:
+        # Execute with timeout
+        response = await asyncio.wait_for(
+            run_agent_func(agent, prompt),
+            timeout=timeout_seconds
+        )
+        
+        # Parse the vote
+        vote = parse_vote_func(agent_id, agent_name, response)
+        
+        duration_ms = (time.time() - start_time) * 1000
+        
+        # Record metrics
+        agent_latency.labels(agent_name=agent_name).observe(duration_ms / 1000)
+        
+        if vote:
+            logger.info("agent_execution_completed",
+                agent_id=agent_id,
+                agent_name=agent_name,
+                duration_ms=duration_ms,
+                direction=vote.direction if hasattr(vote, 'direction') else 'unknown'
+            )
+            return AgentResult(
+                agent_id=agent_id,
+                agent_name=agent_name,
+                success=True,
+                vote=vote,
+                duration_ms=duration_ms
+            )
+        else:
+            logger.warning("agent_vote_parse_failed",
+                agent_id=agent_id,
+                agent_name=agent_name,
+                response_length=len(response) if response else 0
+            )
+            return AgentResult(
+                agent_id=agent_id,
+                agent_name=agent_name,
+                success=False,
+                error="Failed to parse vote",
+                duration_ms=duration_ms,
+                is_fallback=True
+            )
+            
+    except asyncio.TimeoutError:
+        duration_ms = (time.time() - start_time) * 1000
+        logger.warning("agent_execution_timeout",
+            agent_id=agent_id,
+            agent_name=agent_name,
+            timeout_seconds=timeout_seconds
+        )
+        return AgentResult(
+            agent_id=agent_id,
+            agent_name=agent_name,
+            success=False,
+            error=f"Timeout after {timeout_seconds}s",
+            duration_ms=duration_ms,
+            is_fallback=True
+        )
+        
+    except Exception as e:
+        duration_ms = (time.time() - start_time) * 1000
+        logger.error("agent_execution_failed",
+            agent_id=agent_id,
+            agent_name=agent_name,
+            error=str(e)
+        )
+        return AgentResult(
+            agent_id=agent_id,
+            agent_name=agent_name,
+            success=False,
+            error=str(e),
+            duration_ms=duration_ms,
+            is_fallback=True
+        )
+
+
 class RateLimitedExecutor:
     """
     Executes agents in parallel with rate limiting.
@@ -143,92 +241,11 @@ class RateLimitedExecutor:
         parse_vote_func: Callable[..., Any],
     ) -> AgentResult:
         """Execute a single agent with semaphore and timeout protection."""
-        agent_id = agent.id if hasattr(agent, 'id') else str(agent)
-        agent_name = agent.name if hasattr(agent, 'name') else agent_id
-        
-        start_time = time.time()
-        
         async with self._semaphore:
-            logger.info("agent_execution_started",
-                agent_id=agent_id,
-                agent_name=agent_name
+            return await run_agent_with_timeout(
+                agent, prompt, run_agent_func, parse_vote_func,
+                timeout_seconds=self.config.agent_timeout_seconds
             )
-            
-            try:
-                # Execute with timeout
-                response = await asyncio.wait_for(
-                    run_agent_func(agent, prompt),
-                    timeout=self.config.agent_timeout_seconds
-                )
-                
-                # Parse the vote
-                vote = parse_vote_func(agent_id, agent_name, response)
-                
-                duration_ms = (time.time() - start_time) * 1000
-                
-                # Record metrics
-                agent_latency.labels(agent_name=agent_name).observe(duration_ms / 1000)
-                
-                if vote:
-                    logger.info("agent_execution_completed",
-                        agent_id=agent_id,
-                        agent_name=agent_name,
-                        duration_ms=duration_ms,
-                        direction=vote.direction if hasattr(vote, 'direction') else 'unknown'
-                    )
-                    return AgentResult(
-                        agent_id=agent_id,
-                        agent_name=agent_name,
-                        success=True,
-                        vote=vote,
-                        duration_ms=duration_ms
-                    )
-                else:
-                    logger.warning("agent_vote_parse_failed",
-                        agent_id=agent_id,
-                        agent_name=agent_name,
-                        response_length=len(response) if response else 0
-                    )
-                    return AgentResult(
-                        agent_id=agent_id,
-                        agent_name=agent_name,
-                        success=False,
-                        error="Failed to parse vote",
-                        duration_ms=duration_ms,
-                        is_fallback=True
-                    )
-                    
-            except asyncio.TimeoutError:
-                duration_ms = (time.time() - start_time) * 1000
-                logger.warning("agent_execution_timeout",
-                    agent_id=agent_id,
-                    agent_name=agent_name,
-                    timeout_seconds=self.config.agent_timeout_seconds
-                )
-                return AgentResult(
-                    agent_id=agent_id,
-                    agent_name=agent_name,
-                    success=False,
-                    error=f"Timeout after {self.config.agent_timeout_seconds}s",
-                    duration_ms=duration_ms,
-                    is_fallback=True
-                )
-                
-            except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
-                logger.error("agent_execution_failed",
-                    agent_id=agent_id,
-                    agent_name=agent_name,
-                    error=str(e)
-                )
-                return AgentResult(
-                    agent_id=agent_id,
-                    agent_name=agent_name,
-                    success=False,
-                    error=str(e),
-                    duration_ms=duration_ms,
-                    is_fallback=True
-                )
     
     async def execute_all_batches(
         self,
@@ -238,7 +255,11 @@ class RateLimitedExecutor:
         parse_vote_func: Callable[..., Any],
     ) -> List[AgentResult]:
         """
-        Execute all agent batches sequentially, agents within batch in parallel.
+        Execute all voting agents.
+
+        With ``adaptive_scheduling`` (default) agents start as soon as their
+        dependency windows allow; otherwise batches run sequentially with
+        agents within a batch in parallel.
         
         Args:
             get_agents_func: Function to get agent by ID
@@ -249,6 +270,13 @@ class RateLimitedExecutor:
         Returns:
             List of all AgentResults
         """
+        if self.config.adaptive_scheduling:
+            from .adaptive_scheduler import get_agent_scheduler
+            return await get_agent_scheduler().run_round(
+                get_all_voting_agents(), get_agents_func, prompt, run_agent_func, parse_vote_func,
+                timeout_seconds=self.config.agent_timeout_seconds
+            )
+
         all_results = []
         total_start = time.time()
         
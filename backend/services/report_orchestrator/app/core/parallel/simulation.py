@@ -0,0 +1,203 @@
+"""
+Simulated-Latency Harness for Vote Rounds
+
+Runs a full signal-generation vote round against simulated providers so the
+static-batch executor and the adaptive scheduler can be compared without
+network access or LLM cost.
+
+Each simulated dependency has a per-call latency and a true concurrency
+capacity; calls above capacity come back as HTTP 429 after a short delay, are
+reported to the scheduler and retried with backoff.
+
+Usage:
+    python -m app.core.parallel.simulation
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .adaptive_scheduler import AdaptiveAgentScheduler
+from .rate_limiter import RateLimitConfig, RateLimitedExecutor
+
+
+@dataclass
+class SimulatedDependency:
+    """A provider with fixed latency and a hard concurrency limit."""
+    name: str
+    latency_seconds: float
+    capacity: int
+    throttle_latency_seconds: float = 0.2
+
+
+@dataclass
+class AgentProfile:
+    """Sequence of dependency calls one agent makes during its vote."""
+    agent_id: str
+    calls: List[str]
+
+
+# Latencies are in "real" seconds and are scaled down by time_scale when simulated
+DEFAULT_DEPENDENCIES: Dict[str, SimulatedDependency] = {
+    "llm": SimulatedDependency("llm", latency_seconds=6.0, capacity=6),
+    "tavily": SimulatedDependency("tavily", latency_seconds=2.0, capacity=2),
+    "okx": SimulatedDependency("okx", latency_seconds=0.3, capacity=10),
+    "onchain": SimulatedDependency("onchain", latency_seconds=1.5, capacity=1),
+}
+
+DEFAULT_PROFILES: List[AgentProfile] = [
+    AgentProfile("TechnicalAnalyst", ["okx", "okx", "okx", "llm"]),
+    AgentProfile("MacroEconomist", ["tavily", "tavily", "llm"]),
+    AgentProfile("SentimentAnalyst", ["tavily", "okx", "llm"]),
+    AgentProfile("OnchainAnalyst", ["onchain", "onchain", "llm"]),
+    AgentProfile("QuantStrategist", ["okx", "okx", "llm"]),
+    AgentProfile("ContrarianAnalyst", ["tavily", "okx", "llm"]),
+]
+
+
+class SimulatedRateLimit(Exception):
+    """HTTP 429 from a simulated provider."""
+
+
+@dataclass
+class SimulationReport:
+    mode: str
+    wall_clock_seconds: float
+    agents: int
+    successful: int
+    throttled_calls: int
+    agent_seconds: Dict[str, float] = field(default_factory=dict)
+    scheduler_metrics: Optional[Dict[str, Any]] = None
+
+    def summary(self) -> str:
+        return (
+            f"{self.mode:>8}: {self.wall_clock_seconds:6.2f}s wall-clock, "
+            f"{self.successful}/{self.agents} votes, {self.throttled_calls} throttled calls"
+        )
+
+
+class _Agent:
+    def __init__(self, agent_id: str):
+        self.id = agent_id
+        self.name = agent_id
+
+
+@dataclass
+class _Vote:
+    agent_id: str
+    direction: str = "hold"
+
+
+class SimulatedProviders:
+    """In-process stand-ins for the external services agents call."""
+
+    def __init__(self, dependencies: Dict[str, SimulatedDependency], time_scale: float, seed: int = 7):
+        self.dependencies = dependencies
+        self.time_scale = time_scale
+        self.in_flight: Dict[str, int] = {name: 0 for name in dependencies}
+        self.throttled_calls = 0
+        self._rng = random.Random(seed)
+
+    async def call(self, name: str):
+        dep = self.dependencies[name]
+        if self.in_flight[name] >= dep.capacity:
+            self.throttled_calls += 1
+            await asyncio.sleep(dep.throttle_latency_seconds * self.time_scale)
+            raise SimulatedRateLimit(f"{name}: 429 Too Many Requests")
+        self.in_flight[name] += 1
+        try:
+            jitter = self._rng.uniform(0.8, 1.2)
+            await asyncio.sleep(dep.latency_seconds * jitter * self.time_scale)
+        finally:
+            self.in_flight[name] -= 1
+
+
+async def simulate_vote_round(
+    mode: str = "adaptive",
+    profiles: Optional[List[AgentProfile]] = None,
+    dependencies: Optional[Dict[str, SimulatedDependency]] = None,
+    time_scale: float = 0.01,
+    max_retries: int = 5,
+    batch_config: Optional[RateLimitConfig] = None,
+) -> SimulationReport:
+    """
+    Run one vote round against simulated providers.
+
+    Args:
+        mode: "adaptive" (AdaptiveAgentScheduler) or "batched" (static AGENT_BATCHES)
+        time_scale: Multiplier applied to every simulated delay; reported times are unscaled
+        max_retries: Retries per throttled call before the agent gives up
+
+    Returns:
+        SimulationReport with wall-clock time in unscaled seconds
+    """
+    profiles = profiles or DEFAULT_PROFILES
+    dependencies = dependencies or DEFAULT_DEPENDENCIES
+    providers = SimulatedProviders(dependencies, time_scale)
+    calls_by_agent = {p.agent_id: p.calls for p in profiles}
+    agents = {p.agent_id: _Agent(p.agent_id) for p in profiles}
+    agent_seconds: Dict[str, float] = {}
+
+    scheduler: Optional[AdaptiveAgentScheduler] = None
+    if mode == "adaptive":
+        scheduler = AdaptiveAgentScheduler(
+            dependency_map=lambda agent_id: tuple(dict.fromkeys(calls_by_agent.get(agent_id, ["llm"])))
+        )
+
+    async def run_agent(agent: _Agent, prompt: str) -> str:
+        started = time.monotonic()
+        for dep in calls_by_agent[agent.id]:
+            for attempt in range(max_retries + 1):
+                try:
+                    await providers.call(dep)
+                    break
+                except SimulatedRateLimit:
+                    if scheduler is not None:
+                        scheduler.report_throttled(dep)
+                    if attempt == max_retries:
+                        raise
+                    await asyncio.sleep(0.5 * (2 ** attempt) * time_scale)
+        agent_seconds[agent.id] = (time.monotonic() - started) / time_scale
+        return '{"direction": "hold"}'
+
+    def parse_vote(agent_id: str, agent_name: str, response: str) -> _Vote:
+        return _Vote(agent_id=agent_id)
+
+    started = time.monotonic()
+    if scheduler is not None:
+        results = await scheduler.run_round(
+            [p.agent_id for p in profiles], agents.get, "vote", run_agent, parse_vote
+        )
+    elif mode == "batched":
+        config = batch_config or RateLimitConfig(adaptive_scheduling=False)
+        config.batch_delay_seconds *= time_scale
+        executor = RateLimitedExecutor(config)
+        results = await executor.execute_all_batches(agents.get, "vote", run_agent, parse_vote)
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+    wall_clock = (time.monotonic() - started) / time_scale
+
+    return SimulationReport(
+        mode=mode,
+        wall_clock_seconds=wall_clock,
+        agents=len(results),
+        successful=sum(1 for r in results if r.success),
+        throttled_calls=providers.throttled_calls,
+        agent_seconds=agent_seconds,
+        scheduler_metrics=scheduler.get_metrics() if scheduler else None,
+    )
+
+
+async def compare(time_scale: float = 0.01) -> List[SimulationReport]:
+    """Run the same round in both modes."""
+    return [
+        await simulate_vote_round("batched", time_scale=time_scale),
+        await simulate_vote_round("adaptive", time_scale=time_scale),
+    ]
+
+
+if __name__ == "__main__":
+    for report in asyncio.run(compare()):
+        print(report.summary())
@@ -0,0 +1,174 @@
+"""
+Prompt assembly: precompiled templates + one token budget shared by context sections.
+提示词组装：静态模板预编译，记忆/证据/技能/历史等上下文按优先级共享同一个 token 预算。
+
+- compile_template(): 模板按 str.format 语法只解析一次，渲染时只拼接槽位
+- fit_sections(): 先满足各段的保底额度，再按优先级分配剩余预算；超出部分按整行/整条裁剪
+  (历史保留尾部最新的消息，其余保留头部排名最高的条目)
+- 输出顺序与优先级无关: stable 段在前，使同一 Agent 连续调用的提示词前缀保持一致，
+  便于 provider 侧 prompt caching 命中
+"""
+
+from __future__ import annotations
+
+import json
+import string
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .metrics import record_llm_context_usage
+
+TRIM_MARKER = "...[trimmed]"
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token: ASCII 约 4 字符/token，中文等非 ASCII 字符约 1 字符/token"""
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return max(1, non_ascii + (len(text) - non_ascii + 3) // 4)
+
+
+_MARKER_TOKENS = estimate_tokens(TRIM_MARKER) + 1
+
+
+class PromptTemplate:
+    """str.format 语法的模板，字面量片段在编译时拆好，渲染时不再解析格式串"""
+
+    def __init__(self, template: str):
+        self.template = template
+        self._parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field_name)
+            for literal, field_name, _spec, _conv in string.Formatter().parse(template)
+        ]
+        self.fields = tuple(dict.fromkeys(name for _, name in self._parts if name))
+
+    def render(self, **values: Any) -> str:
+        out: List[str] = []
+        for literal, name in self._parts:
+            out.append(literal)
+            if name is not None:
+                out.append(str(values[name]))
+        return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> PromptTemplate:
+    return PromptTemplate(template)
+
+
+@dataclass
+class ContextSection:
+    """一段可裁剪的上下文
+
+    priority 越小越优先获得预算；keep="tail" 时从头部丢弃 (对话历史保留最新)，
+    否则从尾部丢弃 (记忆/证据按相关度排序，保留排名靠前的)。
+    """
+
+    name: str
+    text: str = ""
+    items: Optional[Sequence[str]] = None
+    priority: int = 5
+    keep: str = "head"
+    min_tokens: int = 0
+    stable: bool = False
+
+    def entries(self) -> List[str]:
+        if self.items is not None:
+            return [str(item) for item in self.items if str(item or "").strip()]
+        return self.text.splitlines() if self.text else []
+
+
+@dataclass
+class AssembledContext:
+    budget_tokens: int
+    texts: Dict[str, str] = field(default_factory=dict)
+    order: List[str] = field(default_factory=list)
+    stats: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(s["tokens"] for s in self.stats.values())
+
+    @property
+    def truncated(self) -> List[str]:
+        return [name for name in self.order if self.stats[name]["dropped_tokens"] > 0]
+
+    def render(self, render_section: Callable[[str, str], str], separator: str = "\n") -> str:
+        return separator.join(render_section(name, self.texts[name]) for name in self.order if self.texts[name])
+
+    def record(self, source: str, model: str) -> None:
+        record_llm_context_usage(
+            source=source,
+            model=model,
+            section_tokens={name: self.stats[name]["tokens"] for name in self.order},
+            truncated_sections=self.truncated,
+        )
+
+
+def _trim_entries(entries: List[str], max_tokens: int, keep: str) -> List[str]:
+    ordered = entries if keep != "tail" else list(reversed(entries))
+    kept: List[str] = []
+    used = 0
+    for entry in ordered:
+        cost = estimate_tokens(entry) + 1
+        if used + cost > max_tokens:
+            if not kept and max_tokens > 0:
+                # 单条就超预算时按比例截断字符，至少保留部分内容
+                ratio = max_tokens / max(1, cost)
+                cut = int(len(entry) * ratio)
+                if cut:
+                    kept.append(entry[-cut:] if keep == "tail" else entry[:cut])
+            break
+        kept.append(entry)
+        used += cost
+    return kept if keep != "tail" else list(reversed(kept))
+
+
+def fit_sections(sections: Iterable[ContextSection], budget_tokens: int) -> AssembledContext:
+    """在 budget_tokens 内为各段分配额度并裁剪，返回裁剪后的文本与每段统计"""
+    sections = [s for s in sections if s.entries()]
+    result = AssembledContext(budget_tokens=budget_tokens)
+    needs = {s.name: sum(estimate_tokens(e) + 1 for e in s.entries()) for s in sections}
+
+    grants: Dict[str, int] = {}
+    remaining = max(0, budget_tokens)
+    # 保底额度之和超过预算时按比例缩减，避免低优先级的保底挤占全部预算
+    floors = {s.name: min(needs[s.name], s.min_tokens) for s in sections}
+    scale = min(1.0, remaining / max(1, sum(floors.values())))
+    for section in sorted(sections, key=lambda s: s.priority):
+        grants[section.name] = min(int(floors[section.name] * scale), remaining)
+        remaining -= grants[section.name]
+    for section in sorted(sections, key=lambda s: s.priority):
+        extra = min(needs[section.name] - grants[section.name], remaining)
+        grants[section.name] += extra
+        remaining -= extra
+
+    # stable 段在前 (保持声明顺序)，其余按声明顺序在后
+    for section in [s for s in sections if s.stable] + [s for s in sections if not s.stable]:
+        entries = section.entries()
+        trimmed = grants[section.name] < needs[section.name]
+        if trimmed:
+            kept = _trim_entries(entries, max(0, grants[section.name] - _MARKER_TOKENS), section.keep)
+            text = "\n".join(kept)
+            if kept:
+                text = f"{TRIM_MARKER}\n{text}" if section.keep == "tail" else f"{text}\n{TRIM_MARKER}"
+        else:
+            kept = entries
+            text = "\n".join(kept)
+        result.texts[section.name] = text
+        result.order.append(section.name)
+        result.stats[section.name] = {
+            "tokens": estimate_tokens(text),
+            "chars": len(text),
+            "items": len(kept),
+            "dropped_items": len(entries) - len(kept),
+            "dropped_tokens": needs[section.name] - grants[section.name],
+        }
+    return result
+
+
+def json_lines(values: Iterable[Any]) -> List[str]:
+    """每个对象一行紧凑 JSON (相比 indent=2 省去大量缩进 token，且可按条裁剪)"""
+    return [json.dumps(value, ensure_ascii=False, default=str) for value in values]
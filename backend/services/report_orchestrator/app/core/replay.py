@@ -0,0 +1,471 @@
+"""
+LLM / Tool Record-Replay Harness
+LLM 与工具调用的录制/回放
+
+拦截以下边界:
+1. LLM Gateway HTTP 请求 (/chat、/chat/stream、/v1/chat/completions、/generate_from_file)。
+   各 Agent 的 _call_llm、main._llm_chat_completion、LLMMessageService 的 HTTP 路径都经过这里，
+   在 httpx 传输层拦截即可全部覆盖，无需逐个替换函数。
+2. Tool.execute (所有 Tool 子类)。memoizable=False 的工具 (下单、结束会议等有副作用的 FunctionTool)
+   始终真实执行，只计数。
+3. 其余 httpx 请求 (行情、搜索等外部 API)，按 method + host + path 录制/回放。
+
+模式:
+- record: 真实调用并写入 cassette (JSONL)
+- replay: 从 cassette 回放；未命中时交给 responder 合成，没有 responder 则抛 ReplayMissError
+- synthetic: 不读 cassette，全部由 responder 合成
+
+匹配: 请求体中的数字被掩码后计算 key (价格、时间戳每次运行都不同)，同 key 按录制顺序依次回放；
+key 未命中时按同一 endpoint / 工具的录制顺序取下一条。
+
+回放延迟由 LatencyModel 决定 (录制值、固定值、均匀分布、对数正态分布)，随机数可设种子，
+同一 cassette + 种子的多次运行结果一致。
+
+Usage:
+    async with ReplayHarness(mode="replay", cassette=Cassette.load(path), llm_latency="recorded") as harness:
+        await meeting.run(...)
+    harness.get_stats()
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from .roundtable.tool import Tool
+
+logger = logging.getLogger(__name__)
+
+LLM_ENDPOINTS = ("/chat/stream", "/v1/chat/completions", "/generate_from_file", "/chat")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+# responder(kind, name, payload) -> llm: 回复文本；tool: 工具结果
+Responder = Callable[[str, str, Any], Any]
+
+
+class ReplayMissError(RuntimeError):
+    """回放模式下 cassette 中没有匹配的记录，且未配置 responder"""
+
+
+def mask_numbers(text: str) -> str:
+    return _NUMBER.sub("#", text)
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _json_safe(value: Any) -> Any:
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def request_key(name: str, payload: Any) -> str:
+    """endpoint/工具名 + 掩码数字后的规范化参数"""
+    digest = hashlib.sha1(f"{name}\n{mask_numbers(_canonical(payload))}".encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+class LatencyModel:
+    """
+    回放延迟分布
+
+    spec:
+        none                    不等待
+        recorded[:scale]        录制时的真实耗时 (乘以 scale)
+        fixed:<ms>
+        uniform:<lo_ms>,<hi_ms>
+        lognormal:<median_ms>,<sigma>
+    """
+
+    def __init__(self, spec: str = "recorded", seed: Optional[int] = None):
+        self.spec = spec or "none"
+        kind, _, args = self.spec.partition(":")
+        self.kind = kind.strip().lower()
+        self.args = [float(a) for a in args.split(",") if a.strip()]
+        if self.kind not in {"none", "recorded", "fixed", "uniform", "lognormal"}:
+            raise ValueError(f"unknown latency model: {spec}")
+        self._rng = random.Random(seed)
+
+    def sample_ms(self, recorded_ms: float = 0.0) -> float:
+        if self.kind == "recorded":
+            return recorded_ms * (self.args[0] if self.args else 1.0)
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return self._rng.uniform(self.args[0], self.args[1])
+        if self.kind == "lognormal":
+            return self._rng.lognormvariate(math.log(self.args[0]), self.args[1])
+        return 0.0
+
+
+class Cassette:
+    """
+    录制的交互列表 (JSONL，每行一条)
+
+    llm:  {"kind": "llm", "name": endpoint, "key", "status", "headers", "body", "latency_ms"}
+    tool: {"kind": "tool", "name": tool, "key", "params", "result", "error", "latency_ms"}
+    """
+
+    def __init__(self, entries: Optional[Iterable[Dict[str, Any]]] = None):
+        self.entries: List[Dict[str, Any]] = []
+        self._by_key: Dict[Tuple[str, str], Deque[int]] = {}
+        self._by_name: Dict[Tuple[str, str], Deque[int]] = {}
+        self._used: Set[int] = set()
+        for entry in entries or []:
+            self.add(entry)
+
+    def add(self, entry: Dict[str, Any]):
+        index = len(self.entries)
+        self.entries.append(entry)
+        self._by_key.setdefault((entry["kind"], entry["key"]), deque()).append(index)
+        self._by_name.setdefault((entry["kind"], entry["name"]), deque()).append(index)
+
+    def take(self, kind: str, name: str, key: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """取下一条匹配记录，返回 (记录, 是否精确命中 key)"""
+        for queue, exact in ((self._by_key.get((kind, key)), True), (self._by_name.get((kind, name)), False)):
+            while queue:
+                index = queue.popleft()
+                if index not in self._used:
+                    self._used.add(index)
+                    return self.entries[index], exact
+        return None, False
+
+    def rewind(self):
+        """重新从头回放"""
+        entries, self.entries = self.entries, []
+        self._by_key, self._by_name, self._used = {}, {}, set()
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+        return cls(entries)
+
+    def save(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def _llm_endpoint(request: httpx.Request) -> Optional[str]:
+    path = request.url.path.rstrip("/")
+    for endpoint in LLM_ENDPOINTS:
+        if path.endswith(endpoint):
+            return endpoint
+    return None
+
+
+def _request_payload(request: httpx.Request) -> Any:
+    content_type = request.headers.get("content-type", "")
+    if "json" in content_type:
+        try:
+            return json.loads(request.content or b"null")
+        except ValueError:
+            pass
+    # multipart 的 boundary 每次随机，不参与匹配
+    return None
+
+
+def _prompt_text(payload: Any) -> str:
+    """从 Gateway 请求体中取出提示文本，供 responder 判断要合成什么"""
+    if not isinstance(payload, dict):
+        return ""
+    parts: List[str] = []
+    for message in payload.get("messages") or []:
+        if isinstance(message, dict):
+            parts.append(str(message.get("content", "")))
+    for message in payload.get("history") or []:
+        if isinstance(message, dict):
+            parts.extend(str(p) for p in message.get("parts") or [])
+    return "\n".join(parts)
+
+
+def _llm_body(endpoint: str, content: str) -> Tuple[Dict[str, str], bytes]:
+    """按 endpoint 的响应格式包装合成的回复"""
+    usage = {"prompt_tokens": 0, "completion_tokens": max(1, len(content) // 4)}
+    if endpoint == "/chat/stream":
+        step = 64
+        lines = [f"data: {json.dumps({'content': content[i:i + step]}, ensure_ascii=False)}\n\n"
+                 for i in range(0, len(content), step)]
+        lines.append('data: {"done": true}\n\n')
+        return {"content-type": "text/event-stream"}, "".join(lines).encode("utf-8")
+    if endpoint == "/v1/chat/completions":
+        body = {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}], "usage": usage}
+    else:
+        body = {"content": content, "usage": usage}
+    return {"content-type": "application/json"}, json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def default_responder(kind: str, name: str, payload: Any) -> Any:
+    if kind == "http":
+        return None
+    if kind == "tool":
+        return {"success": True, "summary": f"[synthetic] {name} result", "data": {}}
+    return "[synthetic] 分析完成。"
+
+
+class ReplayHarness:
+    """
+    录制/回放上下文 (同一时刻只能有一个生效)
+
+    Args:
+        mode: record / replay / synthetic
+        cassette: 回放来源或录制目标
+        llm_latency / tool_latency: LatencyModel spec
+        responder: 合成回复，未命中且为 None 时抛 ReplayMissError (synthetic 模式默认 default_responder)
+        passthrough_hosts: replay/synthetic 模式下允许真实访问的主机 (不录制)
+        seed: 延迟分布的随机种子
+    """
+
+    _active: Optional["ReplayHarness"] = None
+
+    def __init__(
+        self,
+        mode: str = "replay",
+        cassette: Optional[Cassette] = None,
+        llm_latency: str = "recorded",
+        tool_latency: str = "recorded",
+        responder: Optional[Responder] = None,
+        passthrough_hosts: Iterable[str] = (),
+        seed: Optional[int] = 0,
+    ):
+        if mode not in {"record", "replay", "synthetic"}:
+            raise ValueError(f"unknown replay mode: {mode}")
+        self.mode = mode
+        self.cassette = cassette if cassette is not None else Cassette()
+        self.llm_latency = LatencyModel(llm_latency, seed=seed)
+        self.tool_latency = LatencyModel(tool_latency, seed=None if seed is None else seed + 1)
+        self.responder = responder if responder is not None or mode != "synthetic" else default_responder
+        self.passthrough_hosts = set(passthrough_hosts)
+        self.stats: Dict[str, Any] = {
+            "llm_calls": 0, "tool_calls": 0, "http_calls": 0, "exact_hits": 0, "ordered_hits": 0,
+            "synthesized": 0, "misses": 0, "recorded": 0, "live_tools": 0,
+            "blocked_requests": 0, "simulated_wait_s": 0.0,
+        }
+        self._original_transport: Optional[Callable] = None
+        self._original_executes: Dict[type, Callable] = {}
+
+    # ---------- install ----------
+
+    def install(self):
+        if ReplayHarness._active is not None:
+            raise RuntimeError("another ReplayHarness is already active")
+        ReplayHarness._active = self
+        self._original_transport = httpx.AsyncHTTPTransport.handle_async_request
+        harness = self
+
+        async def handle_async_request(transport, request):
+            return await harness._handle_http(transport, request)
+
+        httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+        for cls in self._tool_classes():
+            self._patch_tool_class(cls)
+
+        # 会议运行中才定义的 Tool 子类 (如函数内的嵌套类) 同样拦截
+        def init_subclass(cls, **kwargs):
+            super(Tool, cls).__init_subclass__(**kwargs)
+            if ReplayHarness._active is harness and "execute" in cls.__dict__:
+                harness._patch_tool_class(cls)
+
+        Tool.__init_subclass__ = classmethod(init_subclass)
+
+    def uninstall(self):
+        if ReplayHarness._active is not self:
+            return
+        httpx.AsyncHTTPTransport.handle_async_request = self._original_transport
+        if "__init_subclass__" in Tool.__dict__:
+            del Tool.__init_subclass__
+        for cls, original in self._original_executes.items():
+            cls.execute = original
+        self._original_executes.clear()
+        ReplayHarness._active = None
+
+    async def __aenter__(self) -> "ReplayHarness":
+        self.install()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.uninstall()
+        return False
+
+    @staticmethod
+    def _tool_classes() -> List[type]:
+        classes, pending = [], [Tool]
+        while pending:
+            cls = pending.pop()
+            pending.extend(cls.__subclasses__())
+            if "execute" in cls.__dict__ and not getattr(cls.__dict__["execute"], "__isabstractmethod__", False):
+                classes.append(cls)
+        return classes
+
+    def _patch_tool_class(self, cls: type):
+        original = cls.__dict__["execute"]
+        self._original_executes[cls] = original
+        cls.execute = self._wrap_execute(original)
+
+    async def _wait(self, model: LatencyModel, recorded_ms: float):
+        delay = model.sample_ms(recorded_ms) / 1000
+        if delay > 0:
+            self.stats["simulated_wait_s"] += delay
+            await asyncio.sleep(delay)
+
+    def _lookup(self, kind: str, name: str, key: str) -> Optional[Dict[str, Any]]:
+        if self.mode != "replay":
+            return None
+        entry, exact = self.cassette.take(kind, name, key)
+        if entry is not None:
+            self.stats["exact_hits" if exact else "ordered_hits"] += 1
+        return entry
+
+    def _synthesize(self, kind: str, name: str, payload: Any) -> Any:
+        if self.responder is None:
+            self.stats["misses"] += 1
+            raise ReplayMissError(f"no recorded {kind} call for {name}")
+        self.stats["synthesized"] += 1
+        return self.responder(kind, name, payload)
+
+    # ---------- HTTP boundary (LLM Gateway + 外部数据源) ----------
+
+    async def _record_http(self, transport, request: httpx.Request, entry: Dict[str, Any]) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._original_transport(transport, request)
+        body = await response.aread()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS}
+        entry.update({
+            "status": response.status_code, "headers": headers,
+            "body": body.decode("utf-8", "replace"),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        })
+        self.cassette.add(entry)
+        self.stats["recorded"] += 1
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    @staticmethod
+    def _replayed(entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            entry["status"], headers=entry.get("headers") or {},
+            content=entry["body"].encode("utf-8"), request=request,
+        )
+
+    async def _handle_http(self, transport, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        payload = _request_payload(request)
+        endpoint = _llm_endpoint(request)
+        if endpoint is None:
+            return await self._handle_external(transport, request, payload)
+
+        self.stats["llm_calls"] += 1
+        key = request_key(endpoint, payload)
+        if self.mode == "record":
+            entry = {"kind": "llm", "name": endpoint, "key": key, "prompt_preview": _prompt_text(payload)[:200]}
+            return await self._record_http(transport, request, entry)
+
+        entry = self._lookup("llm", endpoint, key)
+        if entry is not None:
+            await self._wait(self.llm_latency, entry.get("latency_ms", 0.0))
+            return self._replayed(entry, request)
+
+        content = self._synthesize("llm", endpoint, {"endpoint": endpoint, "prompt": _prompt_text(payload), "body": payload})
+        await self._wait(self.llm_latency, 0.0)
+        headers, body = _llm_body(endpoint, str(content))
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+    async def _handle_external(self, transport, request: httpx.Request, payload: Any) -> httpx.Response:
+        """
+        非 LLM 请求 (行情、搜索 API 等): 同样录制/回放；
+        回放未命中时 responder 返回 None 或未配置 responder 则返回 503，保证离线运行
+        """
+        if request.url.host in self.passthrough_hosts:
+            return await self._original_transport(transport, request)
+        self.stats["http_calls"] += 1
+        name = f"{request.method} {request.url.host}{request.url.path}"
+        key = request_key(name, {"params": sorted(request.url.params.multi_items()), "body": payload})
+        if self.mode == "record":
+            return await self._record_http(transport, request, {"kind": "http", "name": name, "key": key})
+
+        entry = self._lookup("http", name, key)
+        if entry is not None:
+            await self._wait(self.tool_latency, entry.get("latency_ms", 0.0))
+            return self._replayed(entry, request)
+
+        result = None
+        if self.responder is not None:
+            result = self.responder("http", name, {"url": str(request.url), "params": dict(request.url.params), "body": payload})
+        if result is None:
+            self.stats["blocked_requests"] += 1
+            return httpx.Response(503, json={"error": "blocked by replay harness"}, request=request)
+        self.stats["synthesized"] += 1
+        await self._wait(self.tool_latency, 0.0)
+        return httpx.Response(200, json=result, request=request)
+
+    # ---------- tool boundary ----------
+
+    def _wrap_execute(self, original: Callable) -> Callable:
+        harness = self
+
+        async def execute(tool, **kwargs):
+            if ReplayHarness._active is not harness:
+                return await original(tool, **kwargs)
+            return await harness._handle_tool(tool, original, kwargs)
+
+        execute.__wrapped__ = original
+        return execute
+
+    async def _handle_tool(self, tool: Tool, original: Callable, params: Dict[str, Any]) -> Any:
+        self.stats["tool_calls"] += 1
+        name = getattr(tool, "name", type(tool).__name__)
+        if not getattr(tool, "memoizable", True):
+            self.stats["live_tools"] += 1
+            return await original(tool, **params)
+
+        key = request_key(name, params)
+        if self.mode == "record":
+            started = time.perf_counter()
+            error, result = None, None
+            try:
+                result = await original(tool, **params)
+                return result
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.cassette.add({
+                    "kind": "tool", "name": name, "key": key, "params": _json_safe(params),
+                    "result": _json_safe(result), "error": error,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                })
+                self.stats["recorded"] += 1
+
+        entry = self._lookup("tool", name, key)
+        if entry is not None:
+            await self._wait(self.tool_latency, entry.get("latency_ms", 0.0))
+            if entry.get("error"):
+                raise RuntimeError(entry["error"])
+            return entry["result"]
+
+        result = self._synthesize("tool", name, params)
+        await self._wait(self.tool_latency, 0.0)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["simulated_wait_s"] = round(stats["simulated_wait_s"], 3)
+        return stats
@@ -5,7 +5,7 @@ MAIA: Multi-Agent Interaction Architecture for Magellan
 Inspired by the roundtable discussion design in Crypilot.
 """
 
-from .message import Message, MessageType
+from .message import Message, MessageDelta, MessageType
 from .tool import Tool
 from .agent import Agent
 from .message_bus import MessageBus
@@ -13,6 +13,7 @@ from .meeting import Meeting
 
 __all__ = [
     'Message',
+    'MessageDelta',
     'MessageType',
     'Tool',
     'Agent',
@@ -10,8 +10,10 @@ from .message_bus import MessageBus
 import httpx
 import json
 from ..config_timeouts import HTTP_CLIENT_TIMEOUT
-from ..metrics import record_llm_context_usage, record_tool_call
+from ..metrics import record_llm_context_usage, record_tool_call, track_llm_call
+from ..observability.tracing import annotate_http_response, inject_headers, start_span
 from ..model_policy import resolve_model_for_role
+from ..parallel.adaptive_scheduler import report_dependency_throttled
 
 AGENT_MAX_SYSTEM_PROMPT_CHARS = max(1024, int(os.getenv("AGENT_MAX_SYSTEM_PROMPT_CHARS", "6000")))
 AGENT_MAX_HISTORY_MESSAGE_CHARS = max(512, int(os.getenv("AGENT_MAX_HISTORY_MESSAGE_CHARS", "2000")))
@@ -88,6 +90,9 @@ class Agent:
         # AgentEventBus reference (set by Meeting for real-time progress)
         self.event_bus = None
 
+        # 会议级工具结果复用 (set by Meeting)
+        self.tool_memo = None
+
         # Agent current state
         self.status = "idle"  # idle, thinking, tool_using, speaking
         # Raw execution evidence chain for current turn.
@@ -505,8 +510,14 @@ After tool execution, you will receive results to continue the discussion.
         for attempt in range(max_retries):
             try:
                 async with httpx.AsyncClient(timeout=HTTP_CLIENT_TIMEOUT) as client:
-                    response = await client.post(url, json=request_data)
-                    response.raise_for_status()
+                    with track_llm_call("llm", resolved_model):
+                        async with start_span(
+                            "llm.call", kind="client", source="roundtable_agent",
+                            agent=self.name, model=resolved_model, attempt=attempt + 1,
+                        ) as span:
+                            response = await client.post(url, json=request_data, headers=inject_headers())
+                            annotate_http_response(span, response)
+                        response.raise_for_status()
                     result = response.json()
                     print(f"[Agent:{self.name}] LLM response type: {type(result)}")
                     completion_text = ""
@@ -551,6 +562,8 @@ After tool execution, you will receive results to continue the discussion.
                     f"[Agent:{self.name}] LLM HTTP error on attempt {attempt + 1}/{max_retries}: "
                     f"status={e.response.status_code} detail={response_preview}"
                 )
+                if e.response.status_code == 429:
+                    report_dependency_throttled("llm")
                 # 4xx is usually not retryable for the same payload.
                 if 400 <= e.response.status_code < 500:
                     break
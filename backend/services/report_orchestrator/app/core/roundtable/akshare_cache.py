@@ -0,0 +1,281 @@
+"""
+AkShare Table Cache - AkShare 专用线程池 + DataFrame 结果缓存
+
+AkShare 接口是同步的网页抓取，且很多接口每次返回全市场的大表 (实时行情约 5000 行、
+行业板块、北向资金、龙虎榜)。多个中国市场 agent 在同一会议里会反复请求同一张表:
+
+- 专用有界线程池 (AKSHARE_MAX_WORKERS)，不再占用事件循环的默认 executor
+- 按接口的 TTL 缓存整张表，同一张表的并发请求合并为一次抓取
+- 表以 Arrow 列式格式存放在内存中 (安装了 pyarrow 时)，按代码切片在本地完成，
+  只把需要的行转换回 pandas；未安装 pyarrow 时退化为 category 压缩的 DataFrame
+- prefetch() / schedule_china_market_prefetch() 供中国市场 agent 创建时预热
+
+Usage:
+    cache = get_akshare_cache()
+    df = await cache.get_table("stock_board_industry_name_em", ak.stock_board_industry_name_em)
+    row = await cache.lookup("stock_zh_a_spot_em", ak.stock_zh_a_spot_em, column="代码", value="600519")
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except Exception:  # Optional dependency
+    pa = None
+    pc = None
+
+logger = logging.getLogger(__name__)
+
+# 各接口的缓存时间 (秒)
+TABLE_TTLS: Dict[str, float] = {
+    "stock_zh_a_spot_em": 15,
+    "stock_zh_a_hist": 300,
+    "stock_board_industry_name_em": 60,
+    "stock_em_hsgt_north_net_flow_in": 300,
+    "stock_lhb_detail_em": 600,
+    "stock_financial_analysis_indicator": 3600,
+    "stock_individual_info_em": 3600,
+}
+DEFAULT_TTL_SECONDS = 120.0
+
+# 中国市场 agent 预热的全市场表
+DEFAULT_PREFETCH_TABLES: Tuple[str, ...] = (
+    "stock_zh_a_spot_em",
+    "stock_board_industry_name_em",
+    "stock_em_hsgt_north_net_flow_in",
+)
+
+
+def _compact_frame(df):
+    """No-arrow fallback: store low-cardinality string columns as categories"""
+    from pandas.api.types import is_object_dtype, is_string_dtype
+
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if not (is_object_dtype(series) or is_string_dtype(series)):
+            continue
+        if len(df) and series.nunique(dropna=False) <= len(df) // 2:
+            df[column] = df[column].astype("category")
+    return df
+
+
+@dataclass
+class _StoredTable:
+    """One cached AkShare table (Arrow table or compacted DataFrame)"""
+    data: Any
+    fetched_at: float
+    ttl: float
+    rows: int
+    nbytes: int
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl
+
+    @classmethod
+    def from_frame(cls, df, ttl: float) -> "_StoredTable":
+        if pa is not None:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                return cls(table, time.time(), ttl, table.num_rows, table.nbytes)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                pass  # mixed-type columns: keep as pandas
+        compact = _compact_frame(df)
+        return cls(compact, time.time(), ttl, len(compact), int(compact.memory_usage(deep=True).sum()))
+
+    @property
+    def is_arrow(self) -> bool:
+        return pa is not None and isinstance(self.data, pa.Table)
+
+    def to_frame(self):
+        if self.is_arrow:
+            return self.data.to_pandas()
+        return self.data.copy()
+
+    def select(self, column: str, value: Any):
+        """Rows where ``column == value``, sliced before conversion to pandas"""
+        if self.is_arrow:
+            if column not in self.data.column_names:
+                return self.data.slice(0, 0).to_pandas()
+            mask = pc.equal(pc.cast(self.data.column(column), pa.string()), str(value))
+            return self.data.filter(mask).to_pandas()
+        df = self.data
+        if column not in df.columns:
+            return df.iloc[0:0].copy()
+        return df[df[column].astype(str) == str(value)].copy()
+
+
+class AkShareTableCache:
+    """
+    AkShare 表缓存
+
+    Args:
+        max_workers: AkShare 线程池大小 (default: AKSHARE_MAX_WORKERS 或 2)
+        ttls: 接口名 -> TTL 秒
+        max_entries: 最多缓存的表数量 (按参数区分，如不同股票的历史K线)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 256,
+    ):
+        self.max_workers = max_workers or max(1, int(os.getenv("AKSHARE_MAX_WORKERS", "2")))
+        self.ttls = dict(TABLE_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tables: Dict[str, _StoredTable] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "fetches": 0, "errors": 0}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="akshare")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """在 AkShare 线程池中执行同步调用 (不缓存)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    @staticmethod
+    def make_key(name: str, params: Dict[str, Any]) -> str:
+        if not params:
+            return name
+        return name + "|" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+    async def _load(self, name: str, fetch: Callable[[], Any], ttl: Optional[float], params: Dict[str, Any]) -> _StoredTable:
+        key = self.make_key(name, params)
+        stored = self._tables.get(key)
+        if stored is not None and stored.fresh:
+            self.stats["hits"] += 1
+            return stored
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(self._fetch(key, name, fetch, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: str, name: str, fetch: Callable[[], Any], ttl: Optional[float]) -> _StoredTable:
+        started = time.monotonic()
+        try:
+            df = await self.run(fetch)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        self.stats["fetches"] += 1
+        stored = _StoredTable.from_frame(df, ttl if ttl is not None else self.ttls.get(name, DEFAULT_TTL_SECONDS))
+        self._tables[key] = stored
+        self._evict()
+        logger.debug(
+            f"[AkShareCache] Fetched {key}: {stored.rows} rows, {stored.nbytes / 1024:.0f}KB "
+            f"in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+        return stored
+
+    def _evict(self):
+        if len(self._tables) <= self.max_entries:
+            return
+        for key in sorted(self._tables, key=lambda k: self._tables[k].fetched_at)[: len(self._tables) - self.max_entries]:
+            self._tables.pop(key, None)
+
+    async def get_table(self, name: str, fetch: Callable[[], Any], ttl: Optional[float] = None, **params):
+        """
+        获取整张表 (DataFrame)
+
+        Args:
+            name: AkShare 接口名 (决定 TTL)
+            fetch: 在线程池中执行的无参抓取函数
+            **params: 区分缓存条目的参数 (如 symbol / start_date)
+        """
+        stored = await self._load(name, fetch, ttl, params)
+        return stored.to_frame()
+
+    async def lookup(self, name: str, fetch: Callable[[], Any], column: str, value: Any,
+                     ttl: Optional[float] = None, **params):
+        """全市场表中 ``column == value`` 的行 (本地切片)"""
+        stored = await self._load(name, fetch, ttl, params)
+        return stored.select(column, value)
+
+    async def prefetch(self, fetchers: Dict[str, Callable[[], Any]]) -> Dict[str, bool]:
+        """并发预热若干全市场表。返回 name -> 是否成功"""
+        names = list(fetchers)
+        outcomes = await asyncio.gather(
+            *(self._load(name, fetchers[name], None, {}) for name in names), return_exceptions=True
+        )
+        result = {}
+        for name, outcome in zip(names, outcomes):
+            result[name] = not isinstance(outcome, BaseException)
+            if not result[name]:
+                logger.warning(f"[AkShareCache] Prefetch {name} failed: {outcome}")
+        return result
+
+    def clear(self):
+        self._tables.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "storage": "arrow" if pa is not None else "pandas",
+            "tables": len(self._tables),
+            "bytes": sum(t.nbytes for t in self._tables.values()),
+            "max_workers": self.max_workers,
+        }
+
+
+# 全局实例
+_akshare_cache: Optional[AkShareTableCache] = None
+_prefetch_task: Optional[asyncio.Task] = None
+
+
+def get_akshare_cache() -> AkShareTableCache:
+    """获取全局 AkShareTableCache 实例"""
+    global _akshare_cache
+    if _akshare_cache is None:
+        _akshare_cache = AkShareTableCache()
+    return _akshare_cache
+
+
+async def prefetch_china_market(tables: Iterable[str] = DEFAULT_PREFETCH_TABLES) -> Dict[str, bool]:
+    """预热中国市场 agent 常用的全市场表"""
+    try:
+        import akshare as ak
+    except ImportError:
+        return {}
+    fetchers = {name: getattr(ak, name) for name in tables if hasattr(ak, name)}
+    return await get_akshare_cache().prefetch(fetchers)
+
+
+def schedule_china_market_prefetch() -> bool:
+    """
+    Agent 创建时调用的预热钩子: 在后台启动 prefetch_china_market()
+
+    没有运行中的事件循环、已有预热在进行或 AKSHARE_PREFETCH_ENABLED=false 时不做任何事。
+    """
+    global _prefetch_task
+    if os.getenv("AKSHARE_PREFETCH_ENABLED", "true").lower() != "true":
+        return False
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    if _prefetch_task is not None and not _prefetch_task.done():
+        return False
+    _prefetch_task = loop.create_task(prefetch_china_market())
+    return True
@@ -4,11 +4,14 @@ Free access to China A-share market data
 
 AkShare is an open-source Python financial data interface library
 Official docs: https://akshare.akfamily.xyz/
+
+Calls run on a dedicated bounded executor and market-wide tables are cached
+per function TTL (see akshare_cache.py).
 """
-import asyncio
 from typing import Any, Dict
 from datetime import datetime, timedelta
 from .tool import Tool
+from .akshare_cache import get_akshare_cache
 
 
 class AkShareTool(Tool):
@@ -30,6 +33,7 @@ class AkShareTool(Tool):
             description="Get China A-share market data including real-time quotes, historical K-lines, financial statements, northbound capital flow, etc. Supports all stocks in Shanghai and Shenzhen markets."
         )
         self._ak = None
+        self.cache = get_akshare_cache()
 
     def _get_akshare(self):
         """Lazy import akshare"""
@@ -105,13 +109,11 @@ class AkShareTool(Tool):
         """获取实时行情"""
         ak = self._get_akshare()
 
-        def _fetch():
-            # 获取实时行情
-            df = ak.stock_zh_a_spot_em()
-            # 根据代码筛选
-            code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
-            row = df[df["代码"] == code]
+        # 全市场实时行情表按 TTL 缓存，按代码在本地切片
+        code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
+        row = await self.cache.lookup("stock_zh_a_spot_em", ak.stock_zh_a_spot_em, column="代码", value=code)
 
+        def _parse(row):
             if row.empty:
                 return None
 
@@ -135,8 +137,7 @@ class AkShareTool(Tool):
                 "circulating_cap": float(row["流通市值"]) if row["流通市值"] else 0,
             }
 
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, _fetch)
+        result = _parse(row)
 
         if result is None:
             return {
@@ -183,31 +184,18 @@ class AkShareTool(Tool):
         start_date = start_date.replace("-", "")
         end_date = end_date.replace("-", "")
 
-        def _fetch():
-            code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
-
-            # 根据周期选择接口
-            if period == "daily":
-                df = ak.stock_zh_a_hist(symbol=code, period="daily",
-                                        start_date=start_date, end_date=end_date,
-                                        adjust="qfq")  # 前复权
-            elif period == "weekly":
-                df = ak.stock_zh_a_hist(symbol=code, period="weekly",
-                                        start_date=start_date, end_date=end_date,
-                                        adjust="qfq")
-            elif period == "monthly":
-                df = ak.stock_zh_a_hist(symbol=code, period="monthly",
-                                        start_date=start_date, end_date=end_date,
-                                        adjust="qfq")
-            else:
-                df = ak.stock_zh_a_hist(symbol=code, period="daily",
-                                        start_date=start_date, end_date=end_date,
-                                        adjust="qfq")
-
-            return df.to_dict("records") if not df.empty else []
+        code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
+        # 根据周期选择接口
+        ak_period = period if period in ("daily", "weekly", "monthly") else "daily"
 
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, _fetch)
+        df = await self.cache.get_table(
+            "stock_zh_a_hist",
+            lambda: ak.stock_zh_a_hist(symbol=code, period=ak_period,
+                                       start_date=start_date, end_date=end_date,
+                                       adjust="qfq"),  # 前复权
+            symbol=code, period=ak_period, start_date=start_date, end_date=end_date,
+        )
+        data = df.to_dict("records") if not df.empty else []
 
         if not data:
             return {
@@ -254,21 +242,16 @@ class AkShareTool(Tool):
         """获取财务数据"""
         ak = self._get_akshare()
 
-        def _fetch():
-            code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
-
-            # 获取主要财务指标
-            df = ak.stock_financial_analysis_indicator(symbol=code)
-
-            if df.empty:
-                return None
-
-            # 取最近4个季度
-            recent = df.head(4).to_dict("records")
-            return recent
+        code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
 
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, _fetch)
+        # 获取主要财务指标
+        df = await self.cache.get_table(
+            "stock_financial_analysis_indicator",
+            lambda: ak.stock_financial_analysis_indicator(symbol=code),
+            symbol=code,
+        )
+        # 取最近4个季度
+        data = df.head(4).to_dict("records") if not df.empty else None
 
         if not data:
             return {
@@ -300,19 +283,10 @@ class AkShareTool(Tool):
         """获取北向资金数据"""
         ak = self._get_akshare()
 
-        def _fetch():
-            # 获取北向资金历史数据
-            df = ak.stock_em_hsgt_north_net_flow_in()
-
-            if df.empty:
-                return None
-
-            # 取最近10天
-            recent = df.head(10).to_dict("records")
-            return recent
-
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, _fetch)
+        # 获取北向资金历史数据
+        df = await self.cache.get_table("stock_em_hsgt_north_net_flow_in", ak.stock_em_hsgt_north_net_flow_in)
+        # 取最近10天
+        data = df.head(10).to_dict("records") if not df.empty else None
 
         if not data:
             return {
@@ -344,17 +318,9 @@ class AkShareTool(Tool):
         """获取行业板块数据"""
         ak = self._get_akshare()
 
-        def _fetch():
-            # 获取行业板块行情
-            df = ak.stock_board_industry_name_em()
-
-            if df.empty:
-                return None
-
-            return df.head(20).to_dict("records")
-
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, _fetch)
+        # 获取行业板块行情
+        df = await self.cache.get_table("stock_board_industry_name_em", ak.stock_board_industry_name_em)
+        data = df.head(20).to_dict("records") if not df.empty else None
 
         if not data:
             return {
@@ -391,17 +357,12 @@ class AkShareTool(Tool):
         if not date:
             date = datetime.now().strftime("%Y%m%d")
 
-        def _fetch():
-            # 获取龙虎榜数据
-            df = ak.stock_lhb_detail_em(date=date.replace("-", ""))
-
-            if df.empty:
-                return None
-
-            return df.head(20).to_dict("records")
-
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, _fetch)
+        # 获取龙虎榜数据
+        lhb_date = date.replace("-", "")
+        df = await self.cache.get_table(
+            "stock_lhb_detail_em", lambda: ak.stock_lhb_detail_em(date=lhb_date), date=lhb_date
+        )
+        data = df.head(20).to_dict("records") if not df.empty else None
 
         if not data:
             return {
@@ -426,24 +387,14 @@ class AkShareTool(Tool):
         """获取股票基本信息"""
         ak = self._get_akshare()
 
-        def _fetch():
-            code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
+        code = symbol.replace("SH", "").replace("SZ", "").replace(".", "")
 
-            # 获取个股信息
-            df = ak.stock_individual_info_em(symbol=code)
-
-            if df.empty:
-                return None
-
-            # 转换为字典
-            info = {}
-            for _, row in df.iterrows():
-                info[row["item"]] = row["value"]
-
-            return info
-
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, _fetch)
+        # 获取个股信息
+        df = await self.cache.get_table(
+            "stock_individual_info_em", lambda: ak.stock_individual_info_em(symbol=code), symbol=code
+        )
+        # 转换为字典
+        data = {row["item"]: row["value"] for _, row in df.iterrows()} if not df.empty else None
 
         if not data:
             return {
@@ -469,6 +420,11 @@ class AkShareTool(Tool):
             "data": data
         }
 
+    async def warm_up(self) -> Dict[str, bool]:
+        """Prefetch market-wide tables (spot quotes, industries, northbound flow)"""
+        from .akshare_cache import prefetch_china_market
+        return await prefetch_china_market()
+
     def _format_large_number(self, num: float) -> str:
         """格式化大数字"""
         if num >= 1e12:
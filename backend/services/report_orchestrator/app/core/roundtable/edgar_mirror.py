@@ -0,0 +1,386 @@
+"""
+EDGAR Mirror - SEC EDGAR 数据的本地 SQLite 镜像
+
+SECEdgarTool 之前每次都下载完整的 company_tickers.json (线性扫描找 CIK) 和数 MB 的
+XBRL companyfacts JSON。这里把它们落盘到 SQLite:
+
+- tickers: ticker → CIK 索引，每天刷新一次
+- facts:   companyfacts 拆成行，按 (cik, concept, period_end) 建索引，
+           单个概念的查询是毫秒级的本地读取
+- 刷新使用条件 GET (If-None-Match / If-Modified-Since)，未变化时 SEC 返回 304，不重新下载
+- 所有请求复用同一个 httpx.AsyncClient；SQLite 读写在线程中执行
+
+Usage:
+    mirror = get_edgar_mirror()
+    cik = await mirror.lookup_cik("AAPL")
+    rows = await mirror.get_concept(cik, "Revenues", form="10-K")
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "/tmp/magellan_edgar/edgar.sqlite3"
+DEFAULT_USER_AGENT = "Magellan AI Investment Platform contact@example.com"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tickers (
+    ticker TEXT PRIMARY KEY,
+    cik TEXT NOT NULL,
+    title TEXT
+);
+CREATE TABLE IF NOT EXISTS companies (
+    cik TEXT PRIMARY KEY,
+    entity_name TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS facts (
+    cik TEXT NOT NULL,
+    taxonomy TEXT NOT NULL,
+    concept TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    period_start TEXT,
+    period_end TEXT NOT NULL,
+    val REAL,
+    form TEXT,
+    fy INTEGER,
+    fp TEXT,
+    filed TEXT,
+    accn TEXT,
+    frame TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_facts_lookup ON facts (cik, concept, period_end);
+"""
+
+_FACT_COLUMNS = (
+    "cik", "taxonomy", "concept", "unit", "period_start", "period_end",
+    "val", "form", "fy", "fp", "filed", "accn", "frame",
+)
+
+
+def normalize_cik(cik: Any) -> str:
+    """'0000320193' / 320193 -> '320193'"""
+    return str(cik).strip().lstrip("0") or "0"
+
+
+def flatten_company_facts(cik: str, payload: Dict[str, Any]) -> List[tuple]:
+    """companyfacts JSON -> facts 表的行"""
+    rows: List[tuple] = []
+    for taxonomy, concepts in (payload.get("facts") or {}).items():
+        for concept, body in (concepts or {}).items():
+            for unit, entries in ((body or {}).get("units") or {}).items():
+                for entry in entries or []:
+                    end = entry.get("end")
+                    # 没有数值的条目对分析无用 (格式化时也会出错)
+                    if not end or entry.get("val") is None:
+                        continue
+                    rows.append((
+                        cik, taxonomy, concept, unit, entry.get("start"), end,
+                        entry.get("val"), entry.get("form"), entry.get("fy"), entry.get("fp"),
+                        entry.get("filed"), entry.get("accn"), entry.get("frame"),
+                    ))
+    return rows
+
+
+class EdgarMirror:
+    """
+    SEC EDGAR 本地镜像
+
+    Args:
+        db_path: SQLite 文件路径 (":memory:" 不支持，需要跨线程访问)
+        base_url: data.sec.gov 根地址 (submissions / companyfacts)
+        tickers_url: company_tickers.json 地址
+        tickers_max_age_seconds: ticker 索引刷新间隔
+        facts_max_age_seconds: companyfacts 在此时间内直接使用本地数据，不发请求
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        base_url: str = "https://data.sec.gov",
+        tickers_url: str = "https://www.sec.gov/files/company_tickers.json",
+        user_agent: str = DEFAULT_USER_AGENT,
+        tickers_max_age_seconds: float = 86400.0,
+        facts_max_age_seconds: float = 86400.0,
+        timeout_seconds: float = 30.0,
+    ):
+        self.db_path = db_path or os.getenv("SEC_EDGAR_CACHE_PATH", DEFAULT_DB_PATH)
+        self.base_url = base_url.rstrip("/")
+        self.tickers_url = tickers_url
+        self.headers = {"User-Agent": user_agent, "Accept-Encoding": "gzip, deflate"}
+        self.tickers_max_age_seconds = tickers_max_age_seconds
+        self.facts_max_age_seconds = facts_max_age_seconds
+        self.timeout_seconds = timeout_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._initialized = False
+        self.stats = {"downloads": 0, "not_modified": 0, "local_hits": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Infrastructure
+    # ------------------------------------------------------------------
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds, headers=self.headers)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_sync(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+
+    async def _ensure_db(self):
+        if not self._initialized:
+            await asyncio.to_thread(self._init_sync)
+            self._initialized = True
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def _conditional_get(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> httpx.Response:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = await self.client.get(url, headers=headers)
+        if response.status_code == 304:
+            self.stats["not_modified"] += 1
+        else:
+            response.raise_for_status()
+            self.stats["downloads"] += 1
+        return response
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    def _meta(self) -> Dict[str, str]:
+        return {row["key"]: row["value"] for row in self._query("SELECT key, value FROM meta")}
+
+    # ------------------------------------------------------------------
+    # Ticker -> CIK
+    # ------------------------------------------------------------------
+
+    async def refresh_tickers(self, force: bool = False) -> bool:
+        """刷新 ticker 索引 (超过 tickers_max_age 才请求)。返回索引是否可用"""
+        await self._ensure_db()
+        async with self._lock("tickers"):
+            meta = await asyncio.to_thread(self._meta)
+            refreshed_at = float(meta.get("tickers_refreshed_at") or 0)
+            if not force and time.time() - refreshed_at < self.tickers_max_age_seconds:
+                return True
+            try:
+                response = await self._conditional_get(
+                    self.tickers_url, meta.get("tickers_etag"), meta.get("tickers_last_modified")
+                )
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"[EdgarMirror] Ticker index refresh failed: {e}")
+                return refreshed_at > 0
+            await asyncio.to_thread(self._store_tickers, response)
+            return True
+
+    def _store_tickers(self, response: httpx.Response):
+        now = str(time.time())
+        with closing(self._connect()) as conn:
+            if response.status_code != 304:
+                entries = response.json().values()
+                rows = [
+                    (str(e.get("ticker", "")).upper(), normalize_cik(e.get("cik_str")), e.get("title"))
+                    for e in entries if e.get("ticker") and e.get("cik_str") is not None
+                ]
+                conn.execute("DELETE FROM tickers")
+                conn.executemany("INSERT OR REPLACE INTO tickers (ticker, cik, title) VALUES (?, ?, ?)", rows)
+                for key, header in (("tickers_etag", "ETag"), ("tickers_last_modified", "Last-Modified")):
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, response.headers.get(header))
+                    )
+                logger.info(f"[EdgarMirror] Ticker index refreshed: {len(rows)} tickers")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('tickers_refreshed_at', ?)", (now,))
+            conn.commit()
+
+    async def lookup_cik(self, ticker: str) -> Optional[str]:
+        """ticker → CIK (本地索引，必要时先刷新)"""
+        if not await self.refresh_tickers():
+            return None
+        rows = await asyncio.to_thread(
+            self._query, "SELECT cik FROM tickers WHERE ticker = ?", (ticker.strip().upper(),)
+        )
+        return rows[0]["cik"] if rows else None
+
+    # ------------------------------------------------------------------
+    # Company facts
+    # ------------------------------------------------------------------
+
+    async def ensure_company_facts(self, cik: Any, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        确保 CIK 的 companyfacts 在本地且足够新
+
+        Returns:
+            {"cik", "entity_name", "fetched_at"}；从未成功获取过时返回 None
+        """
+        await self._ensure_db()
+        cik = normalize_cik(cik)
+        async with self._lock(f"facts:{cik}"):
+            rows = await asyncio.to_thread(self._query, "SELECT * FROM companies WHERE cik = ?", (cik,))
+            company = rows[0] if rows else None
+            if company and not force and time.time() - company["fetched_at"] < self.facts_max_age_seconds:
+                self.stats["local_hits"] += 1
+                return company
+
+            url = f"{self.base_url}/api/xbrl/companyfacts/CIK{cik.zfill(10)}.json"
+            try:
+                response = await self._conditional_get(
+                    url,
+                    company["etag"] if company else None,
+                    company["last_modified"] if company else None,
+                )
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"[EdgarMirror] companyfacts refresh failed for CIK {cik}: {e}")
+                return company
+            return await asyncio.to_thread(self._store_company_facts, cik, response)
+
+    def _store_company_facts(self, cik: str, response: httpx.Response) -> Dict[str, Any]:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            if response.status_code == 304:
+                conn.execute("UPDATE companies SET fetched_at = ? WHERE cik = ?", (now, cik))
+            else:
+                payload = response.json()
+                rows = flatten_company_facts(cik, payload)
+                conn.execute("DELETE FROM facts WHERE cik = ?", (cik,))
+                conn.executemany(
+                    f"INSERT INTO facts ({', '.join(_FACT_COLUMNS)}) VALUES ({', '.join('?' * len(_FACT_COLUMNS))})",
+                    rows,
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO companies (cik, entity_name, etag, last_modified, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (cik, payload.get("entityName"), response.headers.get("ETag"),
+                     response.headers.get("Last-Modified"), now),
+                )
+                logger.info(f"[EdgarMirror] Stored {len(rows)} facts for CIK {cik}")
+            conn.commit()
+            row = conn.execute("SELECT * FROM companies WHERE cik = ?", (cik,)).fetchone()
+        return dict(row)
+
+    async def get_concept(
+        self,
+        cik: Any,
+        concept: str,
+        unit: Optional[str] = "USD",
+        form: Optional[str] = None,
+        limit: int = 20,
+        refresh: bool = True,
+        taxonomy: Optional[str] = "us-gaap",
+    ) -> List[Dict[str, Any]]:
+        """
+        单个 XBRL 概念的数据点，按 period_end 倒序 (同一期取最新提交)
+
+        Args:
+            concept: 如 "Revenues", "NetIncomeLoss"
+            unit: 单位过滤 (None 表示不过滤)
+            form: 表格过滤 (如 "10-K")
+            refresh: 是否先确保本地数据足够新
+            taxonomy: 分类标准 (us-gaap / dei / ifrs-full ...)，同名概念在不同分类下含义不同；None 表示不过滤
+        """
+        cik = normalize_cik(cik)
+        if refresh:
+            await self.ensure_company_facts(cik)
+        else:
+            await self._ensure_db()
+        sql = "SELECT * FROM facts WHERE cik = ? AND concept = ? AND val IS NOT NULL"
+        params: List[Any] = [cik, concept]
+        if taxonomy:
+            sql += " AND taxonomy = ?"
+            params.append(taxonomy)
+        if unit:
+            sql += " AND unit = ?"
+            params.append(unit)
+        if form:
+            sql += " AND form = ?"
+            params.append(form)
+        sql += " ORDER BY period_end DESC, filed DESC"
+        rows = await asyncio.to_thread(self._query, sql, tuple(params))
+
+        latest: List[Dict[str, Any]] = []
+        seen = set()
+        for row in rows:
+            key = (row["period_start"], row["period_end"])
+            if key in seen:
+                continue
+            seen.add(key)
+            latest.append(row)
+            if len(latest) >= limit:
+                break
+        return latest
+
+    async def latest_values(
+        self,
+        cik: Any,
+        concepts: Dict[str, str],
+        form: str = "10-K",
+        unit: str = "USD",
+        taxonomy: str = "us-gaap",
+    ) -> Dict[str, Dict[str, Any]]:
+        """{metric_name: concept} -> 每个概念最新一期的值"""
+        cik = normalize_cik(cik)
+        await self.ensure_company_facts(cik)
+        latest: Dict[str, Dict[str, Any]] = {}
+        for name, concept in concepts.items():
+            rows = await self.get_concept(
+                cik, concept, unit=unit, form=form, limit=1, refresh=False, taxonomy=taxonomy
+            )
+            if rows:
+                latest[name] = rows[0]
+        return latest
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"db_path": self.db_path, **self.stats}
+
+
+# 全局实例
+_edgar_mirror: Optional[EdgarMirror] = None
+
+
+def get_edgar_mirror() -> EdgarMirror:
+    """获取全局 EdgarMirror 实例"""
+    global _edgar_mirror
+    if _edgar_mirror is None:
+        _edgar_mirror = EdgarMirror()
+    return _edgar_mirror
@@ -0,0 +1,127 @@
+"""
+LLM Streaming - 从 LLM Gateway /chat/stream 逐 token 读取并向前端推送增量
+
+- iter_sse_content(): 解析 Gateway 的 SSE 流 (data: {"content": ..., "done": ...})
+- DeltaCoalescer: 在 LLM 读取与推送之间解耦。读取端只追加缓冲区，从不等待推送；
+  推送端按 ROUNDTABLE_STREAM_FLUSH_MS 的节奏把缓冲区整体发出。下游 (WebSocket) 变慢时，
+  增量自动合并成更大的块 —— 背压不会拖慢 LLM 读取，也不会无限堆积小消息。
+
+每个增量带 offset (之前已发送的字符数)，客户端可以据此检测丢失并以最终消息为准。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+STREAM_FLUSH_INTERVAL_MS = float(os.getenv("ROUNDTABLE_STREAM_FLUSH_MS", "50"))
+
+DeltaSink = Callable[[str, int, bool], Awaitable[None]]
+
+
+def new_stream_id(agent_name: str) -> str:
+    return f"{agent_name}-{uuid.uuid4().hex[:12]}"
+
+
+def parse_sse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one ``data: {...}`` line; None for comments, blanks and malformed lines"""
+    if not line.startswith("data:"):
+        return None
+    body = line[5:].strip()
+    if not body or body == "[DONE]":
+        return {"done": True} if body == "[DONE]" else None
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        logger.debug(f"[LLMStream] Skipping malformed SSE line: {body[:80]}")
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+async def iter_sse_content(response: httpx.Response) -> AsyncIterator[str]:
+    """Yield content chunks from a Gateway SSE response until ``done``"""
+    async for line in response.aiter_lines():
+        payload = parse_sse_line(line)
+        if payload is None:
+            continue
+        if payload.get("error"):
+            raise RuntimeError(str(payload["error"]))
+        content = payload.get("content")
+        if content:
+            yield content
+        if payload.get("done"):
+            return
+
+
+class DeltaCoalescer:
+    """
+    合并 LLM 增量并按固定节奏推送
+
+    Args:
+        sink: async (delta, offset, done) -> None
+        flush_interval_ms: 两次推送的最小间隔
+    """
+
+    def __init__(self, sink: DeltaSink, flush_interval_ms: float = STREAM_FLUSH_INTERVAL_MS):
+        self._sink = sink
+        self._interval = max(0.0, flush_interval_ms / 1000)
+        self._buffer: list = []
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._pump_task: Optional[asyncio.Task] = None
+        self.sent_chars = 0
+        self.flushes = 0
+        self.chunks_in = 0
+
+    def start(self):
+        if self._pump_task is None:
+            self._pump_task = asyncio.ensure_future(self._pump())
+        return self
+
+    def feed(self, text: str):
+        """Called by the reader for every chunk; never blocks"""
+        if not text or self._closed:
+            return
+        self._buffer.append(text)
+        self.chunks_in += 1
+        self._wakeup.set()
+
+    async def _flush(self, done: bool):
+        delta = "".join(self._buffer)
+        self._buffer.clear()
+        if not delta and not done:
+            return
+        offset = self.sent_chars
+        self.sent_chars += len(delta)
+        self.flushes += 1
+        try:
+            await self._sink(delta, offset, done)
+        except Exception as e:
+            # 推送失败不影响 LLM 读取，最终消息仍会完整发送
+            logger.debug(f"[LLMStream] Delta sink failed: {e}")
+
+    async def _pump(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closed:
+                break
+            await self._flush(done=False)
+            if self._interval:
+                await asyncio.sleep(self._interval)
+        await self._flush(done=True)
+
+    async def close(self):
+        """Flush whatever is buffered and send the final ``done`` delta"""
+        self._closed = True
+        self._wakeup.set()
+        if self._pump_task is None:
+            await self._flush(done=True)
+        else:
+            await self._pump_task
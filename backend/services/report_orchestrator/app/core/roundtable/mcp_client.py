@@ -6,12 +6,20 @@ import os
 import yaml
 import asyncio
 import httpx
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 import logging
 
+from .mcp_transport import (
+    BatchUnsupported,
+    CallHistory,
+    LatencyHistogram,
+    MCPBatcher,
+    create_pooled_client,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +43,8 @@ class MCPServerConfig:
     timeout: int = 30
     retry_count: int = 3
     enabled: bool = True
+    batching: bool = True          # 并发调用合并为 /mcp/batch
+    max_connections: int = 20      # 连接池大小
 
 
 @dataclass
@@ -77,19 +87,32 @@ class MCPServerConnection(ABC):
 
 
 class HTTPMCPConnection(MCPServerConnection):
-    """HTTP MCP服务器连接"""
+    """
+    HTTP MCP服务器连接
+
+    整个连接生命周期复用一个长连接池 (keep-alive / HTTP/2)；
+    config.batching 开启时并发调用经 MCPBatcher 合并为 /mcp/batch 请求。
+    """
 
     def __init__(self, config: MCPServerConfig):
         super().__init__(config)
         self.client: Optional[httpx.AsyncClient] = None
+        self.batcher = MCPBatcher(
+            self._send_batch,
+            self._call_single,
+            window_ms=float(os.getenv("MCP_BATCH_WINDOW_MS", "2")),
+            max_batch=int(os.getenv("MCP_BATCH_MAX_SIZE", "16")),
+        )
+        self._connect_lock = asyncio.Lock()
 
     async def connect(self) -> bool:
         """建立HTTP连接"""
         try:
-            self.client = httpx.AsyncClient(
+            self.client = create_pooled_client(
                 base_url=self.config.url,
                 timeout=self.config.timeout,
-                headers=self._get_auth_headers()
+                headers=self._get_auth_headers(),
+                max_connections=self.config.max_connections,
             )
             # 尝试健康检查
             try:
@@ -103,6 +126,13 @@ class HTTPMCPConnection(MCPServerConnection):
             logger.error(f"Failed to connect to MCP server {self.config.name}: {e}")
             return False
 
+    async def _ensure_client(self):
+        if self.client:
+            return
+        async with self._connect_lock:
+            if not self.client:
+                await self.connect()
+
     async def disconnect(self):
         """断开HTTP连接"""
         if self.client:
@@ -121,8 +151,38 @@ class HTTPMCPConnection(MCPServerConnection):
 
     async def call_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """调用HTTP工具"""
-        if not self.client:
-            await self.connect()
+        await self._ensure_client()
+        if self.config.batching:
+            return await self.batcher.submit(tool_name, params)
+        return await self._call_single(tool_name, params)
+
+    async def _send_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """一次往返发送多个工具调用 (POST /mcp/batch)"""
+        await self._ensure_client()
+        response = await self.client.post(
+            "/mcp/batch",
+            json={"calls": [{"id": str(i), "tool": tool, "params": params} for i, (tool, params) in enumerate(calls)]}
+        )
+        if response.status_code in (404, 405):
+            raise BatchUnsupported(self.config.name)
+        response.raise_for_status()
+        by_id = {str(item.get("id")): item for item in response.json().get("results", [])}
+        results = []
+        for i, (tool, _) in enumerate(calls):
+            item = by_id.get(str(i))
+            if item is None:
+                results.append({
+                    "success": False,
+                    "error": "missing result in batch response",
+                    "summary": f"MCP批量调用缺少 {tool} 的结果"
+                })
+            else:
+                results.append({k: v for k, v in item.items() if k != "id"})
+        return results
+
+    async def _call_single(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """单个工具调用 (依次尝试标准与备用端点)"""
+        await self._ensure_client()
 
         try:
             # 标准MCP调用格式
@@ -165,8 +225,7 @@ class HTTPMCPConnection(MCPServerConnection):
 
     async def list_tools(self) -> List[Dict[str, Any]]:
         """列出HTTP服务器可用工具"""
-        if not self.client:
-            await self.connect()
+        await self._ensure_client()
 
         try:
             response = await self.client.get("/tools")
@@ -238,7 +297,9 @@ class MCPClient:
         """
         self.servers: Dict[str, MCPServerConnection] = {}
         self.config: Dict[str, MCPServerConfig] = {}
-        self.call_history: List[MCPToolCall] = []
+        self.call_history = CallHistory(maxlen=int(os.getenv("MCP_CALL_HISTORY_SIZE", "500")))
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self._connect_locks: Dict[str, asyncio.Lock] = {}
 
         if config_path and os.path.exists(config_path):
             self._load_config(config_path)
@@ -260,7 +321,9 @@ class MCPClient:
                     auth=self._resolve_auth(server_config.get("auth", {})),
                     timeout=server_config.get("timeout", 30),
                     retry_count=server_config.get("retry_count", 3),
-                    enabled=server_config.get("enabled", True)
+                    enabled=server_config.get("enabled", True),
+                    batching=server_config.get("batching", True),
+                    max_connections=server_config.get("max_connections", 20)
                 )
         except Exception as e:
             logger.error(f"Failed to load MCP config: {e}")
@@ -294,6 +357,14 @@ class MCPClient:
         if server_name not in self.config:
             raise ValueError(f"Unknown MCP server: {server_name}")
 
+        # 并发的首次调用只建立一个连接
+        lock = self._connect_locks.setdefault(server_name, asyncio.Lock())
+        async with lock:
+            if server_name in self.servers and self.servers[server_name].connected:
+                return self.servers[server_name]
+            return await self._open_connection(server_name)
+
+    async def _open_connection(self, server_name: str) -> MCPServerConnection:
         config = self.config[server_name]
 
         if not config.enabled:
@@ -364,9 +435,27 @@ class MCPClient:
 
         call_record.duration_ms = (time.time() - start_time) * 1000
         self.call_history.append(call_record)
+        key = f"{server_name}/{tool_name}"
+        if key not in self.latency:
+            self.latency[key] = LatencyHistogram()
+        self.latency[key].observe(call_record.duration_ms)
 
         return result
 
+    async def call_tools(self, calls: List[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        并发调用多个MCP工具 (同一服务器的调用会合并为批量请求)
+
+        Args:
+            calls: [(server_name, tool_name, params), ...]
+
+        Returns:
+            与 calls 顺序一致的结果列表
+        """
+        return list(await asyncio.gather(
+            *(self.call_tool(server, tool, **params) for server, tool, params in calls)
+        ))
+
     async def list_tools(self, server_name: str = None) -> Dict[str, List[Dict]]:
         """
         列出可用工具
@@ -395,35 +484,31 @@ class MCPClient:
         return result
 
     def get_call_history(self, limit: int = 100) -> List[MCPToolCall]:
-        """获取调用历史"""
-        return self.call_history[-limit:]
+        """获取调用历史 (最近 MCP_CALL_HISTORY_SIZE 条以内)"""
+        return self.call_history.recent(limit)
 
     def get_statistics(self) -> Dict[str, Any]:
-        """获取调用统计"""
-        if not self.call_history:
+        """获取调用统计 (累计全部调用，不受历史缓冲大小限制)"""
+        history = self.call_history
+        if not history.total:
             return {"total_calls": 0}
 
-        total = len(self.call_history)
-        success = sum(1 for c in self.call_history if c.result and c.result.get("success"))
-        failed = total - success
-        avg_duration = sum(c.duration_ms for c in self.call_history) / total
-
-        # 按服务器统计
-        by_server = {}
-        for call in self.call_history:
-            if call.server not in by_server:
-                by_server[call.server] = {"calls": 0, "success": 0}
-            by_server[call.server]["calls"] += 1
-            if call.result and call.result.get("success"):
-                by_server[call.server]["success"] += 1
+        total = history.total
+        success = history.success
 
         return {
             "total_calls": total,
             "success_count": success,
-            "failed_count": failed,
-            "success_rate": success / total if total > 0 else 0,
-            "avg_duration_ms": avg_duration,
-            "by_server": by_server
+            "failed_count": total - success,
+            "success_rate": success / total,
+            "avg_duration_ms": history.total_duration_ms / total,
+            "by_server": {name: dict(counts) for name, counts in history.by_server.items()},
+            "latency": {key: hist.to_dict() for key, hist in self.latency.items()},
+            "transport": {
+                name: conn.batcher.get_stats()
+                for name, conn in self.servers.items()
+                if isinstance(conn, HTTPMCPConnection)
+            }
         }
 
 
@@ -622,4 +622,9 @@ def create_mcp_tools_for_agent(agent_role: str) -> List[Tool]:
     # 知识库工具 - 所有专家都可以使用
     tools.append(KnowledgeBaseTool())
 
+    # 中国市场 agent: 后台预热 AkShare 全市场表 (行情/行业/北向资金)
+    if any(isinstance(tool, AkShareTool) for tool in tools):
+        from .akshare_cache import schedule_china_market_prefetch
+        schedule_china_market_prefetch()
+
     return tools
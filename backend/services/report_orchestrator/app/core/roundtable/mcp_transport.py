@@ -0,0 +1,228 @@
+"""
+MCP Transport - MCP 工具调用的传输层
+
+- 每个 HTTP MCP 服务器一个长连接池 (keep-alive，安装了 h2 时启用 HTTP/2 多路复用)
+- MCPBatcher: 短时间窗口内的并发工具调用合并为一次 POST /mcp/batch；
+  服务器不支持批量端点 (404/405) 时自动退回逐个调用
+- CallHistory: 定长环形缓冲的调用历史，统计量按全部调用累计
+- LatencyHistogram: 每个工具的延迟直方图 (p50/p90/p99)
+
+ReWOO 执行阶段并行发出的 6-10 个 MCP 调用会落入同一个批次窗口，只需一次网络往返。
+"""
+
+import asyncio
+import bisect
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 延迟直方图桶上界 (ms)
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class BatchUnsupported(Exception):
+    """The MCP server has no /mcp/batch endpoint."""
+
+
+def create_pooled_client(
+    base_url: str,
+    timeout: float,
+    headers: Optional[Dict[str, str]] = None,
+    max_connections: int = 20,
+    keepalive_expiry: float = 60.0,
+) -> httpx.AsyncClient:
+    """Keep-alive client shared by all calls to one MCP server"""
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        headers=headers or {},
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)  # 最后一个桶为 +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(self.buckets_ms, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Bucket upper bound containing the q-quantile (max for the +Inf bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p90_ms": self.percentile(0.90),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": {
+                **{f"le_{int(b)}": c for b, c in zip(self.buckets_ms, self.counts)},
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+class CallHistory:
+    """
+    Ring buffer of recent calls plus running totals over all calls
+
+    Args:
+        maxlen: Calls kept for get_call_history()
+    """
+
+    def __init__(self, maxlen: int = 500):
+        self._items: Deque[Any] = deque(maxlen=maxlen)
+        self.total = 0
+        self.success = 0
+        self.total_duration_ms = 0.0
+        self.by_server: Dict[str, Dict[str, int]] = {}
+
+    def append(self, call: Any):
+        self._items.append(call)
+        ok = bool(call.result and call.result.get("success"))
+        self.total += 1
+        self.success += ok
+        self.total_duration_ms += call.duration_ms
+        server = self.by_server.setdefault(call.server, {"calls": 0, "success": 0})
+        server["calls"] += 1
+        server["success"] += ok
+
+    def recent(self, limit: int = 100) -> List[Any]:
+        if limit <= 0:
+            return []
+        return list(self._items)[-limit:]
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+
+SendBatch = Callable[[List[Tuple[str, Dict[str, Any]]]], Awaitable[List[Dict[str, Any]]]]
+SendSingle = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class MCPBatcher:
+    """
+    Coalesces concurrent tool calls into batch requests.
+
+    Args:
+        send_batch: Sends [(tool, params), ...] in one round trip, results in order
+        send_single: Fallback for single calls / servers without batch support
+        window_ms: How long the first call of a batch waits for company
+        max_batch: Flush immediately at this size
+    """
+
+    def __init__(self, send_batch: SendBatch, send_single: SendSingle, window_ms: float = 2.0, max_batch: int = 16):
+        self._send_batch = send_batch
+        self._send_single = send_single
+        self.window_seconds = window_ms / 1000
+        self.max_batch = max_batch
+        self.supported = True
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.batched_calls = 0
+        self.single_calls = 0
+
+    async def submit(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.supported:
+            self.single_calls += 1
+            return await self._send_single(tool_name, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((tool_name, params, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]):
+        live = [item for item in batch if not item[2].done()]
+        if not live:
+            return
+        if len(live) > 1 and self.supported:
+            try:
+                results = await self._send_batch([(tool, params) for tool, params, _ in live])
+                self.batches += 1
+                self.batched_calls += len(live)
+                for (_, _, future), result in zip(live, results):
+                    if not future.done():
+                        future.set_result(result)
+                return
+            except BatchUnsupported:
+                logger.info("[MCPTransport] Server has no batch endpoint, using individual calls")
+                self.supported = False
+            except Exception as e:
+                logger.warning(f"[MCPTransport] Batch of {len(live)} calls failed ({e}), retrying individually")
+
+        async def _single(tool: str, params: Dict[str, Any], future: asyncio.Future):
+            try:
+                result = await self._send_single(tool, params)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                return
+            if not future.done():
+                future.set_result(result)
+
+        self.single_calls += len(live)
+        await asyncio.gather(*(_single(tool, params, future) for tool, params, future in live))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "batch_supported": self.supported,
+            "batches": self.batches,
+            "batched_calls": self.batched_calls,
+            "single_calls": self.single_calls,
+        }
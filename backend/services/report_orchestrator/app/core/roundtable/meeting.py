@@ -4,9 +4,10 @@ Meeting: 管理多智能体讨论的编排器
 """
 from typing import List, Optional, Dict, Any, Callable
 from .agent import Agent
-from .message import Message, MessageType
+from .message import Message, MessageDelta, MessageType
 from .message_bus import MessageBus
 from ..agent_event_bus import AgentEventBus
+from .tool_memo import ToolResultMemo
 import asyncio
 import time
 
@@ -54,10 +55,14 @@ class Meeting:
         # Message list for TradingMeeting compatibility
         self.messages: List[Dict[str, Any]] = []
 
-        # 将MessageBus和EventBus注入到每个Agent
+        # 会议内共享的工具结果 (相同 tool+params 只执行一次)
+        self.tool_memo = ToolResultMemo()
+
+        # 将MessageBus、EventBus和工具结果缓存注入到每个Agent
         for agent in agents:
             agent.message_bus = self.message_bus
             agent.event_bus = self.agent_event_bus  # Inject event_bus for real-time progress
+            agent.tool_memo = self.tool_memo
             self.message_bus.register_agent(agent.name)
 
         # 讨论状态
@@ -75,6 +80,11 @@ class Meeting:
 
         # 设置消息监听器（用于实时推送）
         self.message_bus.add_listener(self._on_message)
+        if self.agent_event_bus:
+            self.message_bus.add_delta_listener(
+                self._on_message_delta,
+                has_demand=lambda: self.agent_event_bus.has_subscribers,
+            )
 
     def conclude_meeting(self, reason: str = "Leader决定结束会议") -> str:
         """
@@ -387,6 +397,17 @@ class Meeting:
                 )
             )
 
+    async def _on_message_delta(self, delta: MessageDelta):
+        """流式增量回调：转发到前端（不进入事件历史）"""
+        if self.agent_event_bus:
+            await self.agent_event_bus.publish_delta(
+                agent_name=delta.sender,
+                stream_id=delta.stream_id,
+                delta=delta.delta,
+                offset=delta.offset,
+                done=delta.done,
+            )
+
     async def _generate_leader_summary(self) -> str:
         """
         让Leader生成最终总结
@@ -510,6 +531,7 @@ class Meeting:
             "message_type_stats": message_type_stats,
             "conversation_history": [msg.to_dict() for msg in message_history],
             "participating_agents": list(self.agents.keys()),
+            "tool_reuse_stats": self.tool_memo.get_stats(),
         }
 
     def pause(self):
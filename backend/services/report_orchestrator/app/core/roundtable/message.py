@@ -20,6 +20,20 @@ class MessageType(str, Enum):
     THINKING = "thinking"   # 思考过程分享
 
 
+class MessageDelta(BaseModel):
+    """
+    流式消息增量
+
+    Agent 生成回复时逐段推送；offset 为此前已推送的字符数，
+    done=True 表示流结束 (完整内容随后以 Message 发送，metadata.stream_id 与之对应)。
+    """
+    sender: str
+    stream_id: str
+    delta: str = ""
+    offset: int = 0
+    done: bool = False
+
+
 class Message(BaseModel):
     """
     消息对象
@@ -2,8 +2,11 @@
 MessageBus: The communication backbone of the multi-agent system
 消息总线: 多智能体系统的通信骨干
 """
+import logging
 from typing import Dict, List, Callable, Awaitable, Optional
-from .message import Message
+from .message import Message, MessageDelta
+
+logger = logging.getLogger(__name__)
 
 
 class MessageBus:
@@ -29,6 +32,11 @@ class MessageBus:
         # 消息监听器（用于实时推送到前端）
         self.listeners: List[Callable[[Message], Awaitable[None]]] = []
 
+        # 流式增量监听器（增量不进入队列和历史）
+        self.delta_listeners: List[Callable[[MessageDelta], Awaitable[None]]] = []
+        # 监听器当前是否有真实消费者（如 WebSocket 订阅者）；无判定函数视为始终有
+        self._delta_demand: Dict[Callable[[MessageDelta], Awaitable[None]], Callable[[], bool]] = {}
+
     def register_agent(self, agent_name: str):
         """
         注册Agent到消息总线
@@ -39,7 +47,7 @@ class MessageBus:
         if agent_name not in self.registered_agents:
             self.registered_agents.append(agent_name)
             self.agent_queues[agent_name] = []
-            print(f"[MessageBus] Agent registered: {agent_name}")
+            logger.info("[MessageBus] Agent registered: %s", agent_name)
 
     def unregister_agent(self, agent_name: str):
         """
@@ -52,7 +60,7 @@ class MessageBus:
             self.registered_agents.remove(agent_name)
             if agent_name in self.agent_queues:
                 del self.agent_queues[agent_name]
-            print(f"[MessageBus] Agent unregistered: {agent_name}")
+            logger.info("[MessageBus] Agent unregistered: %s", agent_name)
 
     async def send(self, message: Message):
         """
@@ -75,14 +83,14 @@ class MessageBus:
             for agent_name in self.registered_agents:
                 if agent_name != message.sender:
                     self.agent_queues[agent_name].append(message)
-            print(f"[MessageBus] Broadcast from {message.sender}: {message.content[:50]}...")
+            logger.debug("[MessageBus] Broadcast from %s: %s...", message.sender, message.content[:50])
         else:
             # 点对点消息
             if message.recipient in self.agent_queues:
                 self.agent_queues[message.recipient].append(message)
-                print(f"[MessageBus] Message from {message.sender} to {message.recipient}: {message.content[:50]}...")
+                logger.debug("[MessageBus] Message from %s to %s: %s...", message.sender, message.recipient, message.content[:50])
             else:
-                print(f"[MessageBus] Warning: Recipient {message.recipient} not found")
+                logger.warning("[MessageBus] Warning: Recipient %s not found", message.recipient)
 
     def get_messages(self, agent_name: str) -> List[Message]:
         """
@@ -131,6 +139,51 @@ class MessageBus:
         if listener in self.listeners:
             self.listeners.remove(listener)
 
+    def add_delta_listener(
+        self,
+        listener: Callable[[MessageDelta], Awaitable[None]],
+        has_demand: Optional[Callable[[], bool]] = None,
+    ):
+        """
+        添加流式增量监听器
+
+        Args:
+            listener: 异步回调函数
+            has_demand: 可选，返回该监听器此刻是否有人消费增量（无人消费时 Agent 不走流式调用）
+        """
+        if listener not in self.delta_listeners:
+            self.delta_listeners.append(listener)
+        if has_demand is not None:
+            self._delta_demand[listener] = has_demand
+
+    def remove_delta_listener(self, listener: Callable[[MessageDelta], Awaitable[None]]):
+        """移除流式增量监听器"""
+        if listener in self.delta_listeners:
+            self.delta_listeners.remove(listener)
+        self._delta_demand.pop(listener, None)
+
+    @property
+    def has_delta_listeners(self) -> bool:
+        """是否有监听器当前真正消费增量"""
+        for listener in self.delta_listeners:
+            has_demand = self._delta_demand.get(listener)
+            if has_demand is None or has_demand():
+                return True
+        return False
+
+    async def publish_delta(self, delta: MessageDelta):
+        """
+        推送流式增量
+
+        增量只转发给监听器，不路由到Agent队列，也不记录历史；
+        完整消息仍通过 send() 发送。
+        """
+        for listener in list(self.delta_listeners):
+            try:
+                await listener(delta)
+            except Exception as e:
+                logger.error("[MessageBus] Error in delta listener: %s", e)
+
     async def _notify_listeners(self, message: Message):
         """
         通知所有监听器有新消息
@@ -142,7 +195,7 @@ class MessageBus:
             try:
                 await listener(message)
             except Exception as e:
-                print(f"[MessageBus] Error in listener: {e}")
+                logger.error("[MessageBus] Error in listener: %s", e)
 
     def get_conversation_history(
         self,
@@ -172,7 +225,7 @@ class MessageBus:
     def clear_history(self):
         """清空消息历史"""
         self.message_history.clear()
-        print("[MessageBus] Message history cleared")
+        logger.info("[MessageBus] Message history cleared")
 
     def get_stats(self) -> Dict[str, any]:
         """
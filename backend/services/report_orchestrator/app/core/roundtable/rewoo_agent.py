@@ -18,13 +18,18 @@ import re
 import logging
 import os
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Tuple
 from .agent import Agent
 import httpx
 from ..memory import format_memory_hits, get_memory_store
 from ..memory.governance import compact_text, make_provenance_metadata, should_persist_memory
-from ..metrics import record_llm_context_usage, record_tool_call
+from ..metrics import record_latency, record_llm_context_usage, record_tool_call, track_llm_call
+from ..observability.tracing import annotate_http_response, inject_headers, start_span, traced
+from ..parallel.adaptive_scheduler import report_dependency_throttled
+from ..prompt_assembly import AssembledContext, ContextSection, compile_template, fit_sections, json_lines
 from ..skills import build_skill_instruction_context
+from .llm_streaming import DeltaCoalescer, iter_sse_content, new_stream_id
+from .message import MessageDelta
 
 # Import timeout configurations
 from ..config_timeouts import (
@@ -45,6 +50,78 @@ MAX_REWOO_CONTEXT_MESSAGES = int(os.getenv("REWOO_MAX_CONTEXT_MESSAGES", "8"))
 MAX_REWOO_CONTEXT_MESSAGE_CHARS = int(os.getenv("REWOO_MAX_CONTEXT_MESSAGE_CHARS", "2000"))
 MAX_LLM_PAYLOAD_PREVIEW_CHARS = int(os.getenv("REWOO_MAX_LLM_PAYLOAD_PREVIEW_CHARS", "2000"))
 MAX_REWOO_EVIDENCE_ITEMS = max(1, int(os.getenv("REWOO_EVIDENCE_MAX_ITEMS", "24")))
+REWOO_STREAMING_ENABLED = os.getenv("REWOO_STREAMING_ENABLED", "true").lower() == "true"
+# 记忆/技能/历史等上下文共享的 token 预算 (估算值，中文约 1 字/token)
+REWOO_CONTEXT_TOKEN_BUDGET = max(500, int(os.getenv("REWOO_CONTEXT_TOKEN_BUDGET", "8000")))
+
+
+_PLANNING_PROMPT = compile_template("""You are {name}, planning tool calls for an analysis task.
+
+{role_prompt}
+
+## Available Tools:
+{tools_desc}
+
+## Planning Task:
+For the given analysis task, you need to:
+1. Understand the goal
+2. Determine what information is needed
+3. Select appropriate tools to gather this information
+4. Arrange tool calls in logical order
+
+## OUTPUT FORMAT (CRITICAL - MUST FOLLOW EXACTLY):
+
+You MUST output ONLY a JSON array in this exact format. NO other text, NO explanation, NO markdown formatting.
+
+Valid output examples:
+
+Example 1 (with tools):
+[
+  {{"step": 1, "tool": "yahoo_finance", "params": {{"symbol": "TSLA", "action": "price"}}, "purpose": "Get current stock price"}},
+  {{"step": 2, "tool": "sec_edgar", "params": {{"ticker": "TSLA", "form_type": "10-K"}}, "purpose": "Get annual report"}},
+  {{"step": 3, "tool": "tavily_search", "params": {{"query": "Tesla market share 2024"}}, "purpose": "Get market position"}}
+]
+
+Example 2 (no tools needed):
+[]
+
+## CRITICAL RULES:
+1. Output ONLY the JSON array - nothing before, nothing after
+2. Tool names MUST exactly match available tools
+3. Params MUST match tool requirements
+4. Typically plan 3-6 steps
+5. Steps can execute in parallel
+
+DO NOT add explanations. DO NOT use markdown code blocks. JUST the raw JSON array.
+""")
+
+_SOLVING_PROMPT = compile_template("""You are {name}, generating the final analysis based on tool execution results.
+
+{role_prompt}
+
+## Synthesis Task:
+You have executed a series of tool calls and obtained observation results. Now you need to:
+1. Integrate all observation results
+2. Conduct in-depth analysis
+3. Draw conclusions and recommendations
+4. Generate a structured analysis report
+
+## Output Requirements:
+- **Structured**: Use Markdown format with headings, lists, and data tables
+- **Data-Driven**: Reference specific data sources and values
+- **In-Depth**: Not just data listing, include insights and judgments
+- **Objective**: Clearly distinguish between facts and inferences
+- **Audience-Friendly**: Write for non-technical readers. Avoid jargon unless necessary.
+- **No Raw Dumps**: Never output raw JSON, tool payloads, parameter blocks, or stack traces. Translate them into readable facts.
+- {language_instruction}
+- **Direct Output**: Do not add "TO: ALL", "CC:" or other email format prefixes
+
+## Analysis Framework:
+Apply the appropriate analysis framework based on your role (e.g., DuPont analysis for finance, SWOT for market analysis)
+
+## Final Instruction:
+{synthesis_hint}
+""")
 
 
 class ReWOOAgent(Agent):
@@ -72,6 +149,7 @@ class ReWOOAgent(Agent):
         self.language = str(language or self._infer_language_from_prompt(role_prompt))
         self._last_evidence_chain: List[Dict[str, Any]] = []
         self._last_task_brief: str = ""
+        self._last_stream_id: str = ""
 
     @staticmethod
     def _infer_language_from_prompt(prompt: str) -> str:
@@ -126,6 +204,7 @@ class ReWOOAgent(Agent):
         # 3. Extract query and context from messages
         # Combine all message content as the query
         self._last_evidence_chain = []
+        self._last_stream_id = ""
         self._last_task_brief = self._build_task_brief(new_messages)
         query_parts = []
         for msg in new_messages:
@@ -148,8 +227,8 @@ class ReWOOAgent(Agent):
             user_message=query,
             language=str(getattr(self, "language", "en") or "en"),
         )
-        history_window = MAX_REWOO_CONTEXT_MESSAGES if not skill_context else max(4, MAX_REWOO_CONTEXT_MESSAGES - 2)
-        recent_history = self.message_history[-history_window:]
+        # 历史条数不再因技能卡片而缩减，统一由 _format_context 的 token 预算裁剪
+        recent_history = self.message_history[-MAX_REWOO_CONTEXT_MESSAGES:]
         compacted_history = [self._compact_message_dict(msg.to_dict()) for msg in recent_history]
         memory_context = await self._load_memory_context(query)
         context = {
@@ -189,6 +268,9 @@ class ReWOOAgent(Agent):
                         },
                     },
                 )
+                if self._last_stream_id:
+                    # 前端用 stream_id 把流式草稿替换为完整消息
+                    msg.metadata["stream_id"] = self._last_stream_id
 
                 self.message_history.append(msg)
                 return [msg]
@@ -233,8 +315,9 @@ class ReWOOAgent(Agent):
                 query=query,
                 top_k=2,
             )
-            agent_text = format_memory_hits(hits, max_items=3, max_chars=1400)
-            shared_text = format_memory_hits(shared, max_items=2, max_chars=900)
+            # 条数上限在这里，长度由 _format_context 的统一预算裁剪
+            agent_text = format_memory_hits(hits, max_items=3)
+            shared_text = format_memory_hits(shared, max_items=2)
             if not agent_text and not shared_text:
                 return ""
             sections: List[str] = []
@@ -294,6 +377,7 @@ class ReWOOAgent(Agent):
         except Exception as e:
             logger.warning("[%s] memory persist failed: %s", self.name, e)
 
+    @traced("rewoo.analyze", attributes=lambda self, *_, **__: {"agent": self.name})
     async def analyze_with_rewoo(
         self,
         query: str,
@@ -386,6 +470,7 @@ class ReWOOAgent(Agent):
             chain = chain[-MAX_REWOO_EVIDENCE_ITEMS:]
         return chain
 
+    @traced("rewoo.plan", attributes=lambda self, *_, **__: {"agent": self.name})
     async def _plan_phase(
         self,
         query: str,
@@ -471,6 +556,7 @@ class ReWOOAgent(Agent):
                 )
             return []
 
+    @traced("rewoo.execute", attributes=lambda self, plan, **__: {"agent": self.name, "tools": len(plan)})
     async def _execute_phase(
         self,
         plan: List[Dict[str, Any]]
@@ -528,7 +614,7 @@ class ReWOOAgent(Agent):
                     )
 
                 # Use configured tool execution timeout + metrics.
-                task = self._execute_tool_with_metrics(
+                task = self._execute_tool_shared(
                     tool_name=tool_name,
                     tool=tool,
                     tool_params=tool_params,
@@ -631,6 +717,30 @@ class ReWOOAgent(Agent):
         """创建一个已完成的future"""
         return result
 
+    def _execute_tool_shared(
+        self,
+        tool_name: str,
+        tool: Any,
+        tool_params: Dict[str, Any],
+        timeout: float,
+    ):
+        """
+        Execute through the meeting's tool memo when available, so experts that
+        plan the same call (same tool + params) share one execution.
+        """
+        def execute():
+            return self._execute_tool_with_metrics(
+                tool_name=tool_name,
+                tool=tool,
+                tool_params=tool_params,
+                timeout=timeout,
+            )
+
+        if self.tool_memo is None or not getattr(tool, "memoizable", False):
+            return execute()
+        return self.tool_memo.get_or_execute(tool_name, tool_params, execute, agent=self.name)
+
+    @traced("tool.call", attributes=lambda self, tool_name, *_, **__: {"agent": self.name, "tool": tool_name})
     async def _execute_tool_with_metrics(
         self,
         tool_name: str,
@@ -684,6 +794,7 @@ class ReWOOAgent(Agent):
                 "duration_ms": duration_ms,
             }
 
+    @traced("rewoo.solve", attributes=lambda self, *_, **__: {"agent": self.name})
     async def _solve_phase(
         self,
         query: str,
@@ -716,12 +827,18 @@ class ReWOOAgent(Agent):
             )}
         ]
 
-        # 调用LLM生成最终分析
+        # 调用LLM生成最终分析 (有前端监听时流式推送)
         try:
-            result = await self._call_llm(
-                messages,
-                temperature=self.solving_temperature
-            )
+            if self._should_stream():
+                result = await self._call_llm_streaming(
+                    messages,
+                    temperature=self.solving_temperature
+                )
+            else:
+                result = await self._call_llm(
+                    messages,
+                    temperature=self.solving_temperature
+                )
 
             print(f"[{self.name}] Analysis complete ({len(result)} chars)")
             return result
@@ -737,89 +854,43 @@ class ReWOOAgent(Agent):
                 )
             raise RuntimeError(f"ReWOO solving failed: {error_text}") from e
 
+    def _cached_system_prompt(self, phase: str, build) -> str:
+        """系统提示词只依赖角色/工具/语言，缓存后每次调用字节级一致 (provider 侧前缀缓存可命中)"""
+        cache = self.__dict__.setdefault("_system_prompt_cache", {})
+        key = (phase, self.name, self.role_prompt, self._is_zh_language(),
+               tuple((name, id(tool)) for name, tool in self.tools.items()))
+        prompt = cache.get(key)
+        if prompt is None:
+            if len(cache) >= 16:
+                cache.clear()
+            prompt = cache[key] = build()
+        return prompt
+
     def _create_planning_prompt(self) -> str:
         """创建规划阶段的Prompt (强化JSON输出)"""
-        tools_desc = self._format_tools_description()
-
-        return f"""You are {self.name}, planning tool calls for an analysis task.
-
-{self.role_prompt}
-
-## Available Tools:
-{tools_desc}
-
-## Planning Task:
-For the given analysis task, you need to:
-1. Understand the goal
-2. Determine what information is needed
-3. Select appropriate tools to gather this information
-4. Arrange tool calls in logical order
-
-## OUTPUT FORMAT (CRITICAL - MUST FOLLOW EXACTLY):
-
-You MUST output ONLY a JSON array in this exact format. NO other text, NO explanation, NO markdown formatting.
-
-Valid output examples:
-
-Example 1 (with tools):
-[
-  {{"step": 1, "tool": "yahoo_finance", "params": {{"symbol": "TSLA", "action": "price"}}, "purpose": "Get current stock price"}},
-  {{"step": 2, "tool": "sec_edgar", "params": {{"ticker": "TSLA", "form_type": "10-K"}}, "purpose": "Get annual report"}},
-  {{"step": 3, "tool": "tavily_search", "params": {{"query": "Tesla market share 2024"}}, "purpose": "Get market position"}}
-]
-
-Example 2 (no tools needed):
-[]
-
-## CRITICAL RULES:
-1. Output ONLY the JSON array - nothing before, nothing after
-2. Tool names MUST exactly match available tools
-3. Params MUST match tool requirements
-4. Typically plan 3-6 steps
-5. Steps can execute in parallel
-
-DO NOT add explanations. DO NOT use markdown code blocks. JUST the raw JSON array.
-"""
+        return self._cached_system_prompt("plan", lambda: _PLANNING_PROMPT.render(
+            name=self.name,
+            role_prompt=self.role_prompt,
+            tools_desc=self._format_tools_description(),
+        ))
 
     def _create_solving_prompt(self) -> str:
         """Create the solving phase prompt"""
-        language_instruction = (
-            "- **中文输出**: 最终回答必须使用简体中文，风格专业、简洁、可执行"
-            if self._is_zh_language()
-            else "- **English Output**: Use concise, professional English"
-        )
-        synthesis_hint = (
-            "请综合以上信息并输出结构化分析报告。"
-            if self._is_zh_language()
-            else "Please synthesize all the above information and generate a structured analysis report."
-        )
-        return f"""You are {self.name}, generating the final analysis based on tool execution results.
-
-{self.role_prompt}
-
-## Synthesis Task:
-You have executed a series of tool calls and obtained observation results. Now you need to:
-1. Integrate all observation results
-2. Conduct in-depth analysis
-3. Draw conclusions and recommendations
-4. Generate a structured analysis report
-
-## Output Requirements:
-- **Structured**: Use Markdown format with headings, lists, and data tables
-- **Data-Driven**: Reference specific data sources and values
-- **In-Depth**: Not just data listing, include insights and judgments
-- **Objective**: Clearly distinguish between facts and inferences
-- **Audience-Friendly**: Write for non-technical readers. Avoid jargon unless necessary.
-- **No Raw Dumps**: Never output raw JSON, tool payloads, parameter blocks, or stack traces. Translate them into readable facts.
-- {language_instruction}
-- **Direct Output**: Do not add "TO: ALL", "CC:" or other email format prefixes
-
-## Analysis Framework:
-Apply the appropriate analysis framework based on your role (e.g., DuPont analysis for finance, SWOT for market analysis)
-
-## Final Instruction:
-{synthesis_hint}
-"""
+        zh = self._is_zh_language()
+        return self._cached_system_prompt("solve", lambda: _SOLVING_PROMPT.render(
+            name=self.name,
+            role_prompt=self.role_prompt,
+            language_instruction=(
+                "- **中文输出**: 最终回答必须使用简体中文，风格专业、简洁、可执行"
+                if zh
+                else "- **English Output**: Use concise, professional English"
+            ),
+            synthesis_hint=(
+                "请综合以上信息并输出结构化分析报告。"
+                if zh
+                else "Please synthesize all the above information and generate a structured analysis report."
+            ),
+        ))
 
     def _format_tools_description(self) -> str:
         """Format tool descriptions"""
@@ -864,17 +935,15 @@ Please create a tool call plan for this task (JSON format).
         plan: List[Dict[str, Any]],
         observations: List[Dict[str, Any]]
     ) -> str:
-        """格式化综合查询"""
-        context_str = self._format_context(context)
-
-        # Format execution results
-        results_text = ""
+        """格式化综合查询 (上下文与各步骤结果共享 REWOO_CONTEXT_TOKEN_BUDGET)"""
+        # Format execution results, one entry per step so trimming drops whole steps
+        step_texts = []
         for i, (step, obs) in enumerate(zip(plan, observations), 1):
             tool_name = step.get("tool", "unknown")
             params = step.get("params", {})
             purpose = step.get("purpose", "")
 
-            results_text += f"\n## Step {i}: {tool_name}\n"
+            results_text = f"\n## Step {i}: {tool_name}\n"
             results_text += f"**Purpose**: {purpose}\n"
             results_text += f"**Params**: {json.dumps(params, ensure_ascii=False)}\n"
 
@@ -906,6 +975,12 @@ Please create a tool call plan for this task (JSON format).
                 results_text += f"**Result**: {obs[:2000]}\n"
             else:
                 results_text += f"**Result**: {str(obs)[:2000]}\n"
+            step_texts.append(results_text)
+
+        observations_section = ContextSection("observations", items=step_texts, **self._OBSERVATION_SECTION)
+        assembled = self._fit_context(context, extra_sections=[observations_section])
+        context_str = self._render_context(assembled, exclude=("observations",))
+        results_text = assembled.texts.get("observations", "")
 
         final_instruction = (
             "请综合以上信息并输出结构化分析报告。注意：不要输出原始JSON、工具入参、调试日志，只保留外行可读的结论和证据。"
@@ -925,22 +1000,54 @@ Please create a tool call plan for this task (JSON format).
 {final_instruction}
 """
 
+    # 已知上下文段的预算策略: (priority, keep, min_tokens, stable)
+    # 未知键 (调用方传入的 symbol 等) 视为稳定且优先级最高
+    _CONTEXT_SECTIONS = {
+        "available_agents": (0, "head", 0, True),
+        "skills_context": (1, "head", 300, True),
+        "memory_context": (2, "head", 0, False),
+        "conversation_history": (3, "tail", 800, False),
+    }
+    # 综合阶段的工具结果: 仅次于技能卡片，超预算时保留靠前的步骤
+    _OBSERVATION_SECTION = {"priority": 1, "keep": "head", "min_tokens": 1500}
+
     def _format_context(self, context: Dict[str, Any]) -> str:
-        """Format context information"""
+        """Format context information within REWOO_CONTEXT_TOKEN_BUDGET"""
         if not context:
             return "None"
+        return self._render_context(self._fit_context(context))
 
-        parts = []
-        for key, value in context.items():
-            # 处理不同类型的值
-            if isinstance(value, (dict, list)):
-                value_str = json.dumps(value, ensure_ascii=False, indent=2)
-            else:
-                value_str = str(value)
+    @staticmethod
+    def _render_context(assembled: AssembledContext, exclude: Tuple[str, ...] = ()) -> str:
+        lines = [
+            f"- **{name}**: {assembled.texts[name]}"
+            for name in assembled.order
+            if name not in exclude and assembled.texts[name]
+        ]
+        return "\n".join(lines) or "None"
 
-            parts.append(f"- **{key}**: {value_str}")
+    def _fit_context(
+        self,
+        context: Dict[str, Any],
+        extra_sections: Sequence[ContextSection] = (),
+    ) -> AssembledContext:
+        """Fit context (plus e.g. tool observations) into one REWOO_CONTEXT_TOKEN_BUDGET"""
+        sections = []
+        for key, value in (context or {}).items():
+            priority, keep, min_tokens, stable = self._CONTEXT_SECTIONS.get(key, (0, "head", 0, True))
+            if key == "conversation_history" and isinstance(value, list):
+                # 每条消息一行，超预算时整条丢弃最早的消息
+                section = ContextSection(key, items=json_lines(value))
+            elif isinstance(value, (dict, list)):
+                section = ContextSection(key, text=json.dumps(value, ensure_ascii=False, indent=2))
+            else:
+                section = ContextSection(key, text=str(value))
+            section.priority, section.keep, section.min_tokens, section.stable = priority, keep, min_tokens, stable
+            sections.append(section)
 
-        return "\n".join(parts)
+        assembled = fit_sections([*sections, *extra_sections], REWOO_CONTEXT_TOKEN_BUDGET)
+        assembled.record(source="rewoo_agent", model=str(self.model or "default"))
+        return assembled
 
     def _parse_plan(self, llm_response: str) -> List[Dict[str, Any]]:
         """解析LLM生成的计划（增强版，支持多种格式）"""
@@ -980,6 +1087,111 @@ Please create a tool call plan for this task (JSON format).
         logger.warning(f"[{self.name}] Plan parsing failed (strict failure mode)")
         return []
 
+    def _should_stream(self) -> bool:
+        return bool(
+            REWOO_STREAMING_ENABLED
+            and self.message_bus is not None
+            and getattr(self.message_bus, "has_delta_listeners", False)
+        )
+
+    @staticmethod
+    def _to_gateway_history(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """转换消息格式为LLM Gateway期待的格式"""
+        # Gemini只支持 "user" 和 "model" role,不支持 "system"
+        history = []
+        for msg in messages:
+            role = msg.get("role", "user")
+            # 将 "system" 转换为 "user" (Gemini不支持system role)
+            if role == "system":
+                role = "user"
+            elif role == "assistant":
+                role = "model"  # Gemini使用 "model" 而非 "assistant"
+
+            history.append({
+                "role": role,
+                "parts": [msg.get("content", "")]
+            })
+        return history
+
+    async def _call_llm_streaming(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = None,
+    ) -> str:
+        """
+        通过 /chat/stream 调用LLM，边生成边经 MessageBus 推送增量
+
+        首个 token 到达前失败时退回阻塞的 _call_llm (带重试)；
+        流中途失败同样退回，已推送的草稿由最终消息替换。
+        """
+        if temperature is None:
+            temperature = self.temperature
+
+        stream_id = new_stream_id(self.name)
+        self._last_stream_id = stream_id
+
+        async def sink(delta: str, offset: int, done: bool):
+            await self.message_bus.publish_delta(MessageDelta(
+                sender=self.name,
+                stream_id=stream_id,
+                delta=delta,
+                offset=offset,
+                done=done,
+            ))
+
+        coalescer = DeltaCoalescer(sink).start()
+        request_model = self._resolve_request_model()
+        # 与阻塞 /chat 调用相同的请求体 (网关按 provider 路由，温度用服务端默认)
+        payload = {"history": self._to_gateway_history(messages)}
+        if request_model:
+            payload["model"] = request_model
+
+        parts: List[str] = []
+        started_at = time.perf_counter()
+        try:
+            async with start_span(
+                "llm.call", kind="client", source="rewoo_agent", agent=self.name,
+                model=str(request_model or self.model or "default"), stream=True,
+            ) as span, httpx.AsyncClient(timeout=HTTP_CLIENT_TIMEOUT) as client:
+                async with client.stream(
+                    "POST", f"{self.llm_gateway_url}/chat/stream", json=payload, headers=inject_headers()
+                ) as response:
+                    annotate_http_response(span, response)
+                    response.raise_for_status()
+                    async for chunk in iter_sse_content(response):
+                        if not parts:
+                            first_token_ms = (time.perf_counter() - started_at) * 1000
+                            span.set_attribute("first_token_ms", round(first_token_ms, 1))
+                            logger.info("[%s] First token after %.0fms", self.name, first_token_ms)
+                        parts.append(chunk)
+                        coalescer.feed(chunk)
+        except Exception as e:
+            record_latency("provider", f"llm:{request_model or self.model or 'default'}",
+                           time.perf_counter() - started_at, ok=False)
+            logger.warning(
+                "[%s] Streaming LLM call failed after %s chars (%s), falling back to /chat",
+                self.name,
+                sum(len(p) for p in parts),
+                self._format_exception(e),
+            )
+            await coalescer.close()
+            return await self._call_llm(messages, temperature=temperature)
+
+        await coalescer.close()
+        record_latency("provider", f"llm:{request_model or self.model or 'default'}", time.perf_counter() - started_at)
+        content = "".join(parts)
+        if not content:
+            return await self._call_llm(messages, temperature=temperature)
+
+        record_llm_context_usage(
+            source="rewoo_agent",
+            model=str(request_model or self.model or "default"),
+            usage=None,
+            prompt_texts=[str(msg.get("content", "")) for msg in messages if isinstance(msg, dict)],
+            completion_text=content,
+        )
+        return content
+
     async def _call_llm(
         self,
         messages: List[Dict[str, str]],
@@ -998,21 +1210,7 @@ Please create a tool call plan for this task (JSON format).
         for attempt in range(max_retries):
             try:
                 async with httpx.AsyncClient(timeout=HTTP_CLIENT_TIMEOUT) as client:
-                    # 转换消息格式为LLM Gateway期待的格式
-                    # Gemini只支持 "user" 和 "model" role,不支持 "system"
-                    history = []
-                    for msg in messages:
-                        role = msg.get("role", "user")
-                        # 将 "system" 转换为 "user" (Gemini不支持system role)
-                        if role == "system":
-                            role = "user"
-                        elif role == "assistant":
-                            role = "model"  # Gemini使用 "model" 而非 "assistant"
-
-                        history.append({
-                            "role": role,
-                            "parts": [msg.get("content", "")]
-                        })
+                    history = self._to_gateway_history(messages)
 
                     payload = {"history": history}
                     if request_model:
@@ -1027,11 +1225,18 @@ Please create a tool call plan for this task (JSON format).
                     )
                     logger.debug("[ReWOO:%s] Payload preview: %s", self.name, payload_preview)
 
-                    response = await client.post(
-                        f"{self.llm_gateway_url}/chat",
-                        json=payload
-                    )
-                    response.raise_for_status()
+                    with track_llm_call("llm", resolved_model):
+                        async with start_span(
+                            "llm.call", kind="client", source="rewoo_agent", agent=self.name,
+                            model=resolved_model, attempt=attempt + 1,
+                        ) as span:
+                            response = await client.post(
+                                f"{self.llm_gateway_url}/chat",
+                                json=payload,
+                                headers=inject_headers(),
+                            )
+                            annotate_http_response(span, response)
+                        response.raise_for_status()
                     result = response.json()
 
                     # 提取LLM回复 (LLM Gateway返回 {"content": "..."})
@@ -1071,6 +1276,7 @@ Please create a tool call plan for this task (JSON format).
                 except Exception:
                     pass
                 if e.response.status_code == 429:  # Rate limit
+                    report_dependency_throttled("llm")
                     logger.warning(f"[{self.name}] Rate limited, retrying... (attempt {attempt + 1}/{max_retries})")
                     if attempt < max_retries - 1:
                         await asyncio.sleep(5)  # 等待5s后重试
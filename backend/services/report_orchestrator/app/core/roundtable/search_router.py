@@ -5,7 +5,11 @@ Search Router - 统一搜索路由器 (Plan C 重构版)
 - normal:   DuckDuckGo (免费) → Serper → Tavily
 - critical: Serper (高性价比) → Tavily
 - realtime: Tavily (最佳质量，不缓存)
+
+链内执行由 SearchRoutingEngine 负责: 链首超过其 p90 延迟时对冲到下一个提供商，
+失败立即回退；并发的相同查询合并为一次请求。
 """
+import asyncio
 import logging
 import os
 from typing import Any, Dict, Optional, List
@@ -13,8 +17,11 @@ from enum import Enum
 
 from ..auth import get_current_user_id
 from ..metrics import record_cache_event
+from ..observability.tracing import traced
+from ..parallel.adaptive_scheduler import is_rate_limit_error, report_dependency_throttled
 from ..memory import get_memory_store
 from ..memory.governance import compact_text, make_provenance_metadata, should_persist_memory
+from .search_routing import SearchRoutingEngine
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +33,14 @@ class SearchPriority(Enum):
     NORMAL = "normal"       # 一般信息：公司背景 → DuckDuckGo
 
 
+# 各优先级的提供商链 (按成本从低到高，由 SearchRoutingEngine 执行对冲/回退)
+PROVIDER_CHAINS: Dict[SearchPriority, List[str]] = {
+    SearchPriority.REALTIME: ["tavily"],
+    SearchPriority.CRITICAL: ["serper", "tavily"],
+    SearchPriority.NORMAL: ["duckduckgo", "serper", "tavily"],
+}
+
+
 class SearchRouter:
     """
     搜索路由器 (Plan C 架构)
@@ -44,6 +59,8 @@ class SearchRouter:
         self._dedup = None
         self._memory_store = get_memory_store()
         self._memory_top_k = max(1, int(os.getenv("ATOMIC_MEMORY_TOP_K", "3")))
+        self.routing = SearchRoutingEngine()
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     @property
     def tavily_tool(self):
@@ -166,6 +183,10 @@ class SearchRouter:
             "user_scope": str(user_scope or ""),
         }
     
+    @traced("search", attributes=lambda self, query, priority="normal", *_, **__: {
+        "query": query[:80],
+        "priority": priority,
+    })
     async def search(
         self,
         query: str,
@@ -219,58 +240,84 @@ class SearchRouter:
                 return self._normalize_result_contract(query, cached)
             record_cache_event("search_cache", "miss")
         
-        # 2. 根据优先级路由
-        result = None
-        source = None
+        # 2. 合并并发的相同查询 (同一会议中多个 agent 常同时搜索同一问题)
+        # 请求在独立 task 中执行并被 shield，单个调用方取消不会中断其他等待者
+        inflight_key = self._inflight_key(query, prio, search_context)
+        task = self._inflight.get(inflight_key)
+        if task is not None:
+            logger.info(f"[SearchRouter] Joining in-flight search for '{query[:30]}...'")
+            record_cache_event("search_inflight", "hit")
+        else:
+            task = asyncio.ensure_future(
+                self._route_and_store(query, prio, priority, search_context, user_scope, **kwargs)
+            )
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _t, key=inflight_key: self._inflight.pop(key, None))
+        result = dict(await asyncio.shield(task))
+
+        # 4. 添加到会话去重缓存
+        if session_id and self.dedup and result.get("success"):
+            self.dedup.add(query, session_id, result, context=search_context)
         
-        if prio == SearchPriority.REALTIME:
-            # realtime → Tavily only (最高质量)
-            result = await self._search_with_tavily(query, **kwargs)
-            source = "tavily"
-            
-        elif prio == SearchPriority.CRITICAL:
-            # critical → Serper → Tavily
-            result = await self._search_with_serper(query, **kwargs)
-            source = "serper"
-            
-            if not result.get("success") or result.get("fallback_needed"):
-                logger.warning(f"[SearchRouter] Serper failed, falling back to Tavily")
-                result = await self._search_with_tavily(query, **kwargs)
-                source = "tavily_fallback"
-                
-        else:  # NORMAL
-            # normal → DDG → Serper → Tavily
-            result = await self._search_with_ddg(query, **kwargs)
-            source = "duckduckgo"
-            
-            if not result.get("success") or result.get("fallback_needed"):
-                logger.warning(f"[SearchRouter] DuckDuckGo failed, trying Serper...")
-                result = await self._search_with_serper(query, **kwargs)
-                source = "serper_fallback"
-                
-                if not result.get("success") or result.get("fallback_needed"):
-                    logger.warning(f"[SearchRouter] Serper failed, falling back to Tavily")
-                    result = await self._search_with_tavily(query, **kwargs)
-                    source = "tavily_fallback"
-
-        result = self._normalize_result_contract(query, result)
+        return result
+
+    def _inflight_key(self, query: str, prio: SearchPriority, search_context: Dict[str, Any]) -> str:
+        context = ",".join(f"{k}={search_context[k]}" for k in sorted(search_context))
+        return f"{prio.value}|{' '.join(query.lower().split())}|{context}"
+
+    def _provider_calls(self, query: str, **kwargs) -> Dict[str, Any]:
+        return {
+            "duckduckgo": lambda: self._report_throttle("duckduckgo", self._search_with_ddg(query, **kwargs)),
+            "serper": lambda: self._report_throttle("serper", self._search_with_serper(query, **kwargs)),
+            "tavily": lambda: self._report_throttle("tavily", self._search_with_tavily(query, **kwargs)),
+        }
+
+    @staticmethod
+    async def _report_throttle(provider: str, call) -> Dict[str, Any]:
+        """提供商返回 429 / rate limit 时，以该提供商的名义反馈给 Agent 调度器"""
+        result = await call
+        if isinstance(result, dict) and not result.get("success", True) and is_rate_limit_error(result.get("error", "")):
+            report_dependency_throttled(provider)
+        return result
+
+    async def _route_and_store(
+        self,
+        query: str,
+        prio: SearchPriority,
+        priority: str,
+        search_context: Dict[str, Any],
+        user_scope: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """按优先级链路由 (带对冲)，并写入共享记忆和缓存"""
+        chain = PROVIDER_CHAINS[prio]
+        outcome = await self.routing.route(chain, self._provider_calls(query, **kwargs))
+
+        # 保持原有的来源标签: 链首提供商直接命名，其余为 "<provider>_fallback"
+        provider = outcome.provider or chain[-1]
+        source = provider if provider == chain[0] else f"{provider}_fallback"
+
+        result = self._normalize_result_contract(query, outcome.result)
         result["routed_source"] = source
         result["priority"] = prio.value
+        if outcome.hedged:
+            result["hedged"] = True
         if result.get("success"):
             await self._persist_shared_evidence(user_id=user_scope, query=query, result=result, source=source)
-        
+
         # 3. 写入缓存（realtime不缓存）
         if prio != SearchPriority.REALTIME and self.cache and result.get("success"):
             await self.cache.set(query, priority, result, search_params=search_context)
             logger.info(f"[SearchRouter] Cached result for '{query[:30]}...'")
             record_cache_event("search_cache", "store")
-        
-        # 4. 添加到会话去重缓存
-        if session_id and self.dedup and result.get("success"):
-            self.dedup.add(query, session_id, result, context=search_context)
-        
         return result
 
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """Provider latency percentiles, success rates, quotas and hedge counts"""
+        stats = self.routing.get_stats()
+        stats["inflight"] = len(self._inflight)
+        return stats
+
     async def _search_from_shared_memory(
         self,
         user_id: str,
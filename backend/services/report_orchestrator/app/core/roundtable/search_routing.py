@@ -0,0 +1,288 @@
+"""
+Search Routing Engine - 搜索提供商的延迟感知路由
+
+SearchRouter 按优先级给出提供商链 (normal: DDG → Serper → Tavily)，本模块决定如何执行:
+
+- 每个提供商维护滚动窗口内的成功率、延迟分位数 (p50/p90/p99) 和每日配额
+- 首选提供商超过自身 p90 仍未返回时，发起对冲请求 (hedge) 到链中的下一个提供商，
+  先返回的有效结果胜出，其余请求取消
+- 失败的提供商立即切换到下一个，而不是等待超时
+- 对冲请求受预算约束 (占总请求的比例 + 配额)，避免放大付费提供商的调用量
+- 持续失败或配额耗尽的提供商被移到链尾
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from ..metrics import record_latency
+
+logger = logging.getLogger(__name__)
+
+SearchCall = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float(os.getenv(key, default))
+    except ValueError:
+        return default
+
+
+def is_good_result(result: Any) -> bool:
+    """A provider answer the router can return (not a failure / fallback request)."""
+    return isinstance(result, dict) and bool(result.get("success")) and not result.get("fallback_needed")
+
+
+class ProviderStats:
+    """Rolling latency / success statistics and daily quota for one provider."""
+
+    def __init__(self, name: str, window: int = 200, daily_quota: int = 0):
+        self.name = name
+        self.daily_quota = daily_quota  # 0 = unlimited
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._quota_day = date.today()
+        self.used_today = 0
+        self.requests = 0
+        self.wins = 0
+        self.hedges = 0
+        self.cancelled = 0
+
+    # ----- quota -----
+
+    def _roll_day(self):
+        today = date.today()
+        if today != self._quota_day:
+            self._quota_day = today
+            self.used_today = 0
+
+    @property
+    def remaining_quota(self) -> Optional[int]:
+        self._roll_day()
+        if not self.daily_quota:
+            return None
+        return max(0, self.daily_quota - self.used_today)
+
+    @property
+    def has_quota(self) -> bool:
+        remaining = self.remaining_quota
+        return remaining is None or remaining > 0
+
+    def consume(self):
+        self._roll_day()
+        self.used_today += 1
+        self.requests += 1
+
+    # ----- outcomes -----
+
+    def record(self, latency_ms: float, ok: Optional[bool]):
+        """ok=None marks a cancelled request: its latency is a lower bound, outcome unknown."""
+        self._latencies.append(latency_ms)
+        if ok is None:
+            self.cancelled += 1
+        else:
+            self._outcomes.append(ok)
+
+    @property
+    def samples(self) -> int:
+        return len(self._outcomes)
+
+    @property
+    def success_rate(self) -> float:
+        if not self._outcomes:
+            return 1.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1) + 0.5))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        def _r(v):
+            return round(v, 1) if v is not None else None
+        return {
+            "requests": self.requests,
+            "wins": self.wins,
+            "hedges": self.hedges,
+            "cancelled": self.cancelled,
+            "success_rate": round(self.success_rate, 3),
+            "p50_ms": _r(self.percentile(0.50)),
+            "p90_ms": _r(self.percentile(0.90)),
+            "p99_ms": _r(self.percentile(0.99)),
+            "daily_quota": self.daily_quota or None,
+            "remaining_quota": self.remaining_quota,
+        }
+
+
+@dataclass
+class RouteOutcome:
+    """Result of one routed search"""
+    result: Dict[str, Any]
+    provider: Optional[str]
+    attempts: List[str]
+    hedged: bool
+
+
+class SearchRoutingEngine:
+    """
+    Executes a provider chain with hedging.
+
+    Args:
+        min_samples: Latency samples needed before a provider's own p90 is trusted
+        default_hedge_ms: Hedge delay used until then
+        min_hedge_ms / max_hedge_ms: Clamp for the hedge delay
+        hedge_budget_ratio: Max hedged requests as a fraction of routed searches
+        unhealthy_success_rate: Providers below this (with enough samples) go to the end of the chain
+    """
+
+    def __init__(
+        self,
+        min_samples: int = 10,
+        default_hedge_ms: float = None,
+        min_hedge_ms: float = 300.0,
+        max_hedge_ms: float = 8000.0,
+        hedge_budget_ratio: float = None,
+        unhealthy_success_rate: float = 0.3,
+        daily_quotas: Optional[Dict[str, int]] = None,
+    ):
+        self.min_samples = min_samples
+        self.default_hedge_ms = default_hedge_ms if default_hedge_ms is not None else _env_float("SEARCH_HEDGE_DEFAULT_MS", 3000.0)
+        self.min_hedge_ms = min_hedge_ms
+        self.max_hedge_ms = max_hedge_ms
+        self.hedge_budget_ratio = (
+            hedge_budget_ratio if hedge_budget_ratio is not None else _env_float("SEARCH_HEDGE_BUDGET_RATIO", 0.2)
+        )
+        self.unhealthy_success_rate = unhealthy_success_rate
+        if daily_quotas is None:
+            daily_quotas = {
+                name: int(_env_float(f"SEARCH_DAILY_QUOTA_{name.upper()}", 0))
+                for name in ("duckduckgo", "serper", "tavily")
+            }
+        self._daily_quotas = daily_quotas
+        self._stats: Dict[str, ProviderStats] = {}
+        self._routed = 0
+        self._hedged = 0
+
+    def stats(self, provider: str) -> ProviderStats:
+        stats = self._stats.get(provider)
+        if stats is None:
+            stats = self._stats[provider] = ProviderStats(provider, daily_quota=self._daily_quotas.get(provider, 0))
+        return stats
+
+    # ------------------------------------------------------------------
+    # Policy
+    # ------------------------------------------------------------------
+
+    def order(self, chain: List[str]) -> List[str]:
+        """Keep the cost order, but move exhausted / unhealthy providers to the end."""
+        def demoted(name: str) -> bool:
+            s = self.stats(name)
+            if not s.has_quota:
+                return True
+            return s.samples >= self.min_samples and s.success_rate < self.unhealthy_success_rate
+        healthy = [p for p in chain if not demoted(p)]
+        return healthy + [p for p in chain if demoted(p) and self.stats(p).has_quota]
+
+    def hedge_delay(self, provider: str) -> float:
+        """Seconds to wait on ``provider`` before hedging: its p90 once known"""
+        s = self.stats(provider)
+        p90 = s.percentile(0.90) if s.samples >= self.min_samples else None
+        delay_ms = p90 if p90 is not None else self.default_hedge_ms
+        return min(max(delay_ms, self.min_hedge_ms), self.max_hedge_ms) / 1000
+
+    def _can_hedge(self, provider: str) -> bool:
+        if not self.stats(provider).has_quota:
+            return False
+        # +1 so the first routed searches may hedge too
+        return self._hedged < self.hedge_budget_ratio * (self._routed + 1)
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _attempt(self, provider: str, call: SearchCall) -> Dict[str, Any]:
+        stats = self.stats(provider)
+        stats.consume()
+        started = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            stats.record((time.monotonic() - started) * 1000, None)
+            raise
+        except Exception as e:
+            result = {"success": False, "error": str(e), "fallback_needed": True}
+        good = is_good_result(result)
+        stats.record((time.monotonic() - started) * 1000, good)
+        record_latency("provider", f"search:{provider}", time.monotonic() - started, ok=good)
+        return result
+
+    async def route(self, chain: List[str], calls: Dict[str, SearchCall]) -> RouteOutcome:
+        """
+        Run ``chain`` (provider names, cheapest first) and return the first good result.
+
+        If every provider fails, the last failure is returned.
+        """
+        self._routed += 1
+        remaining = [p for p in self.order(chain) if p in calls]
+        pending: Dict[asyncio.Task, str] = {}
+        attempts: List[str] = []
+        hedged = False
+        last_result: Dict[str, Any] = {"success": False, "error": "no_provider_available", "fallback_needed": True}
+
+        def _launch(provider: str):
+            attempts.append(provider)
+            pending[asyncio.ensure_future(self._attempt(provider, calls[provider]))] = provider
+
+        try:
+            if remaining:
+                _launch(remaining.pop(0))
+            while pending:
+                leader = next(iter(pending.values()))
+                timeout = None
+                if remaining and len(pending) == 1 and self._can_hedge(remaining[0]):
+                    timeout = self.hedge_delay(leader)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Leader is slower than its p90: hedge to the next provider
+                    provider = remaining.pop(0)
+                    self._hedged += 1
+                    self.stats(provider).hedges += 1
+                    hedged = True
+                    logger.info(f"[SearchRouting] {leader} exceeded {timeout * 1000:.0f}ms, hedging to {provider}")
+                    _launch(provider)
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    result = task.result()
+                    if is_good_result(result):
+                        self.stats(provider).wins += 1
+                        return RouteOutcome(result, provider, attempts, hedged)
+                    last_result = result
+                    logger.warning(f"[SearchRouting] {provider} failed: {result.get('error') or result.get('summary')}")
+
+                if not pending and remaining:
+                    _launch(remaining.pop(0))
+
+            return RouteOutcome(last_result, attempts[-1] if attempts else None, attempts, hedged)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "routed": self._routed,
+            "hedged": self._hedged,
+            "hedge_budget_ratio": self.hedge_budget_ratio,
+            "providers": {name: s.to_dict() for name, s in self._stats.items()},
+        }
@@ -1,10 +1,14 @@
 """
 SEC EDGAR MCP Tool
 Retrieve official financial disclosure documents for US public companies
+
+Ticker lookups and XBRL company facts are served from a local SQLite mirror
+(see edgar_mirror.py) refreshed with conditional GETs.
 """
 import httpx
 from typing import Any, Dict, Optional
 from .tool import Tool
+from .edgar_mirror import EdgarMirror, get_edgar_mirror
 
 
 # Comprehensive Ticker to CIK mapping table (1000+ common US stocks)
@@ -273,10 +277,24 @@ class SECEdgarTool(Tool):
     Supported file types: 10-K, 10-Q, 8-K, DEF 14A
     """
 
+    # Key metrics extracted by get_company_facts: name -> us-gaap concept
+    KEY_METRICS = {
+        "Revenue": "Revenues",
+        "NetIncome": "NetIncomeLoss",
+        "Assets": "Assets",
+        "Liabilities": "Liabilities",
+        "StockholdersEquity": "StockholdersEquity",
+        "OperatingCashFlow": "NetCashProvidedByUsedInOperatingActivities",
+        "GrossProfit": "GrossProfit",
+        "OperatingIncome": "OperatingIncomeLoss",
+        "CashAndEquivalents": "CashAndCashEquivalentsAtCarryingValue"
+    }
+
     def __init__(
         self,
         base_url: str = "https://data.sec.gov",
-        user_agent: str = "Magellan AI Investment Platform contact@example.com"
+        user_agent: str = "Magellan AI Investment Platform contact@example.com",
+        mirror: Optional[EdgarMirror] = None
     ):
         super().__init__(
             name="sec_edgar",
@@ -287,6 +305,7 @@ class SECEdgarTool(Tool):
             "User-Agent": user_agent,  # SEC requires User-Agent
             "Accept-Encoding": "gzip, deflate"
         }
+        self.mirror = mirror or get_edgar_mirror()
 
     async def execute(
         self,
@@ -300,7 +319,7 @@ class SECEdgarTool(Tool):
         Execute SEC EDGAR query
 
         Args:
-            action: Action type (search_filings, get_company_facts)
+            action: Action type (search_filings, get_company_facts, get_concept)
             ticker: Stock ticker (e.g., AAPL)
             cik: CIK number (Central Index Key)
             form_type: File type (10-K, 10-Q, 8-K, DEF 14A)
@@ -314,6 +333,8 @@ class SECEdgarTool(Tool):
                 return await self._search_filings(ticker, cik, form_type, **kwargs)
             elif action == "get_company_facts":
                 return await self._get_company_facts(ticker, cik)
+            elif action == "get_concept":
+                return await self._get_concept(ticker, cik, **kwargs)
             elif action == "get_filing_content":
                 filing_url = kwargs.get("filing_url")
                 return await self._get_filing_content(filing_url)
@@ -356,10 +377,9 @@ class SECEdgarTool(Tool):
         url = f"{self.base_url}/submissions/CIK{cik_padded}.json"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.mirror.client.get(url, headers=self.headers)
+            response.raise_for_status()
+            data = response.json()
         except httpx.HTTPError as e:
             return {
                 "success": False,
@@ -427,57 +447,27 @@ class SECEdgarTool(Tool):
                     "summary": f"Cannot find CIK number for ticker {ticker}."
                 }
 
-        cik_padded = str(cik).zfill(10)
-        url = f"{self.base_url}/api/xbrl/companyfacts/CIK{cik_padded}.json"
-
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-                data = response.json()
-        except httpx.HTTPError as e:
+        company = await self.mirror.ensure_company_facts(cik)
+        if company is None:
             return {
                 "success": False,
-                "error": str(e),
-                "summary": f"Cannot retrieve financial data for CIK {cik}: {str(e)}"
+                "error": "companyfacts_unavailable",
+                "summary": f"Cannot retrieve financial data for CIK {cik}"
             }
-
-        # Extract key financial metrics
-        facts = data.get("facts", {})
-        us_gaap = facts.get("us-gaap", {})
-
-        # Common metrics
-        key_metrics = {
-            "Revenue": "Revenues",
-            "NetIncome": "NetIncomeLoss",
-            "Assets": "Assets",
-            "Liabilities": "Liabilities",
-            "StockholdersEquity": "StockholdersEquity",
-            "OperatingCashFlow": "NetCashProvidedByUsedInOperatingActivities",
-            "GrossProfit": "GrossProfit",
-            "OperatingIncome": "OperatingIncomeLoss",
-            "CashAndEquivalents": "CashAndCashEquivalentsAtCarryingValue"
+        data = {"entityName": company.get("entity_name")}
+
+        # Latest annual (10-K) value of each key metric, read from the local mirror
+        latest = await self.mirror.latest_values(cik, self.KEY_METRICS, form="10-K")
+        extracted_data = {
+            metric_name: {
+                "value": row["val"],
+                "date": row["period_end"],
+                "form": row["form"],
+                "fy": row["fy"]  # Fiscal year
+            }
+            for metric_name, row in latest.items()
         }
 
-        extracted_data = {}
-        for metric_name, xbrl_tag in key_metrics.items():
-            if xbrl_tag in us_gaap:
-                metric_data = us_gaap[xbrl_tag]
-                # Get latest annual data
-                units = metric_data.get("units", {})
-                usd_data = units.get("USD", [])
-                if usd_data:
-                    # Sort by date, get latest annual data (10-K)
-                    annual_data = [d for d in usd_data if d.get("form") == "10-K"]
-                    if annual_data:
-                        latest = sorted(annual_data, key=lambda x: x.get("end", ""), reverse=True)[0]
-                        extracted_data[metric_name] = {
-                            "value": latest.get("val"),
-                            "date": latest.get("end"),
-                            "form": latest.get("form"),
-                            "fy": latest.get("fy")  # Fiscal year
-                        }
-
         if not extracted_data:
             return {
                 "success": True,
@@ -492,7 +482,9 @@ class SECEdgarTool(Tool):
         for metric, info in extracted_data.items():
             value = info['value']
             # Format large numbers
-            if value > 1_000_000_000:
+            if value is None:
+                formatted_value = "N/A"
+            elif value > 1_000_000_000:
                 formatted_value = f"${value/1_000_000_000:.2f}B"
             elif value > 1_000_000:
                 formatted_value = f"${value/1_000_000:.2f}M"
@@ -541,21 +533,74 @@ class SECEdgarTool(Tool):
         return None
 
     async def _fetch_cik_from_sec(self, ticker: str) -> Optional[str]:
-        """Fetch CIK from SEC API dynamically"""
+        """Look up CIK in the local company_tickers.json index (refreshed daily)"""
         try:
-            # Use SEC's company_tickers.json
-            url = "https://www.sec.gov/files/company_tickers.json"
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    for entry in data.values():
-                        if entry.get("ticker", "").upper() == ticker:
-                            return str(entry.get("cik_str"))
+            return await self.mirror.lookup_cik(ticker)
         except Exception as e:
-            print(f"[SECEdgarTool] SEC API lookup failed: {e}")
+            print(f"[SECEdgarTool] SEC ticker index lookup failed: {e}")
         return None
 
+    async def _get_concept(
+        self,
+        ticker: str,
+        cik: str,
+        concept: Optional[str] = None,
+        form: Optional[str] = None,
+        unit: str = "USD",
+        limit: int = 8,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Get the history of one XBRL concept (e.g. Revenues) from the local mirror"""
+        if not concept:
+            return {
+                "success": False,
+                "error": "missing_concept",
+                "summary": "get_concept requires a concept, e.g. Revenues or NetIncomeLoss"
+            }
+        if ticker and not cik:
+            cik = await self._ticker_to_cik(ticker)
+            if not cik:
+                return {
+                    "success": False,
+                    "summary": f"Cannot find CIK number for ticker {ticker}."
+                }
+
+        rows = await self.mirror.get_concept(cik, concept, unit=unit, form=form, limit=int(limit))
+        label = ticker or cik
+        if not rows:
+            return {
+                "success": True,
+                "summary": f"No {concept} ({unit}) data found for {label}.",
+                "cik": cik,
+                "concept": concept,
+                "values": []
+            }
+
+        values = [
+            {
+                "value": row["val"],
+                "start": row["period_start"],
+                "end": row["period_end"],
+                "form": row["form"],
+                "fy": row["fy"],
+                "fp": row["fp"],
+                "filed": row["filed"]
+            }
+            for row in rows
+        ]
+        summary = f"{concept} ({unit}) for {label}:\n"
+        for v in values:
+            formatted_value = f"{v['value']:,.0f}" if v['value'] is not None else "N/A"
+            summary += f"\n- {v['end']} ({v['form']} FY{v['fy']} {v['fp']}): {formatted_value}"
+        return {
+            "success": True,
+            "summary": summary,
+            "cik": cik,
+            "concept": concept,
+            "unit": unit,
+            "values": values
+        }
+
     def to_schema(self) -> Dict[str, Any]:
         """Return tool schema"""
         return {
@@ -566,8 +611,8 @@ class SECEdgarTool(Tool):
                 "properties": {
                     "action": {
                         "type": "string",
-                        "enum": ["search_filings", "get_company_facts"],
-                        "description": "Action type: search_filings (search disclosure documents) or get_company_facts (get financial data)"
+                        "enum": ["search_filings", "get_company_facts", "get_concept"],
+                        "description": "Action type: search_filings (search disclosure documents), get_company_facts (get key financial data) or get_concept (history of one XBRL concept)"
                     },
                     "ticker": {
                         "type": "string",
@@ -583,9 +628,13 @@ class SECEdgarTool(Tool):
                         "description": "File type: 10-K (annual report), 10-Q (quarterly report), 8-K (material events), DEF 14A (proxy statement)",
                         "default": "10-K"
                     },
+                    "concept": {
+                        "type": "string",
+                        "description": "us-gaap XBRL concept for get_concept, e.g. Revenues, NetIncomeLoss, Assets"
+                    },
                     "limit": {
                         "type": "integer",
-                        "description": "Number of files to return",
+                        "description": "Number of files (or concept data points) to return",
                         "default": 5
                     }
                 },
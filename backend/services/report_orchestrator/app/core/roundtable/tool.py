@@ -14,6 +14,9 @@ class Tool(ABC):
     设计遵循MCP(Model Context Protocol)理念
     """
 
+    # 同一会议内相同参数的调用可以复用结果 (见 ToolResultMemo)
+    memoizable: bool = True
+
     def __init__(self, name: str, description: str):
         """
         初始化工具
@@ -57,8 +60,12 @@ class FunctionTool(Tool):
     基于函数的工具实现
 
     允许快速将Python函数包装为Tool
+
+    包装的函数可能有副作用 (下单、结束会议) 或读取实时账户状态，默认不参与结果复用。
     """
 
+    memoizable: bool = False
+
     def __init__(
         self,
         name: str,
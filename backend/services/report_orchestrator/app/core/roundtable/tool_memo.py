@@ -0,0 +1,125 @@
+"""
+Tool Result Memo - 会议级工具结果复用
+
+同一场会议里，市场分析师、财务专家、风险评估师经常对同一家公司发出相同的工具调用
+(同一个 Yahoo Finance action、同一个搜索 query)。ToolResultMemo 以规范化的
+(tool, params) 哈希为键:
+
+- 已完成的成功结果直接复用
+- 进行中的调用被共享: 第二个 agent 等待第一个调用，而不是重复执行
+- 失败结果不缓存，后来的 agent 会重新执行
+- 按会议统计 executed / reused / shared_inflight
+
+Meeting 创建一个实例并注入到每个 agent (agent.tool_memo)，生命周期与会议相同。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_call_key(tool_name: str, params: Optional[Dict[str, Any]]) -> str:
+    """Stable hash of a tool call: parameter order and None-valued params do not matter"""
+    cleaned = {k: v for k, v in (params or {}).items() if v is not None}
+    payload = json.dumps([tool_name, cleaned], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_success(result: Any) -> bool:
+    if not isinstance(result, dict):
+        return result is not None
+    if "success" in result:
+        return result["success"] is True
+    return "error" not in result
+
+
+def _copy_result(result: Any) -> Any:
+    # 浅拷贝: 调用方可能在顶层追加字段 (duration_ms 等)
+    return dict(result) if isinstance(result, dict) else result
+
+
+class ToolResultMemo:
+    """
+    会议级工具结果缓存
+
+    Args:
+        max_entries: 最多保存的结果数 (超出后淘汰最早的)
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._results: Dict[str, Any] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"executed": 0, "reused": 0, "shared_inflight": 0, "failed": 0}
+        self.by_agent: Dict[str, Dict[str, int]] = {}
+        self.by_tool: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, agent: str, tool_name: str):
+        self.stats[kind] += 1
+        for table, name in ((self.by_agent, agent), (self.by_tool, tool_name)):
+            counts = table.setdefault(name, {"executed": 0, "reused": 0})
+            counts["executed" if kind == "executed" else "reused"] += 1
+
+    async def get_or_execute(
+        self,
+        tool_name: str,
+        params: Optional[Dict[str, Any]],
+        execute: Callable[[], Awaitable[Any]],
+        agent: str = "",
+    ) -> Any:
+        """
+        返回已有结果、等待进行中的相同调用，或执行 execute()
+
+        Args:
+            tool_name: 工具名
+            params: 工具参数 (用于生成键)
+            execute: 无参协程工厂，实际执行工具调用
+            agent: 调用方 agent 名 (仅用于统计)
+        """
+        key = canonical_call_key(tool_name, params)
+
+        if key in self._results:
+            self._count("reused", agent, tool_name)
+            logger.debug(f"[ToolMemo] {agent} reused {tool_name}")
+            return _copy_result(self._results[key])
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count("shared_inflight", agent, tool_name)
+            logger.debug(f"[ToolMemo] {agent} joined in-flight {tool_name}")
+        else:
+            self._count("executed", agent, tool_name)
+            task = asyncio.ensure_future(self._run(key, execute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        # shield: 一个 agent 被取消不会中断其他 agent 正在等待的调用
+        return _copy_result(await asyncio.shield(task))
+
+    async def _run(self, key: str, execute: Callable[[], Awaitable[Any]]) -> Any:
+        result = await execute()
+        if _is_success(result):
+            self._results[key] = result
+            if len(self._results) > self.max_entries:
+                self._results.pop(next(iter(self._results)))
+        else:
+            self.stats["failed"] += 1
+        return result
+
+    def clear(self):
+        self._results.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        reused = self.stats["reused"] + self.stats["shared_inflight"]
+        total = reused + self.stats["executed"]
+        return {
+            **self.stats,
+            "total_calls": total,
+            "reuse_rate": round(reused / total, 3) if total else 0.0,
+            "cached_results": len(self._results),
+            "by_agent": {name: dict(counts) for name, counts in self.by_agent.items()},
+            "by_tool": {name: dict(counts) for name, counts in self.by_tool.items()},
+        }
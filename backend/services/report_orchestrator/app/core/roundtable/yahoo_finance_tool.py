@@ -1,19 +1,120 @@
 """
 Yahoo Finance MCP Tool for Financial Data Retrieval
+
+yfinance 是同步库 (每次属性访问都可能发起 HTTP 请求)，这里所有 yfinance 调用都在
+有界线程池中执行，不阻塞事件循环:
+
+- 每个 symbol 一个 _SymbolSnapshot，共享 Ticker 对象以及 info / history / 报表等原始数据，
+  price / valuation / dividends / holders 等 action 不再各自重复拉取 ticker.info
+- 同一字段的并发加载合并为一次请求
+- execute_batch() 用一次 yf.download 获取多个 ticker 的报价或历史，用于可比公司分析
 """
-try:
-    import yfinance as yf
-except Exception:  # Optional dependency in some dev/test setups
-    yf = None
+import asyncio
+import functools
 import os
+import threading
 import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from .tool import Tool
 from ..metrics import record_cache_event
 
+# yfinance (连带 pandas/curl_cffi) 导入约 0.25s，推迟到首次使用；测试可直接替换模块级 yf
+yf = None
+_yf_import_attempted = False
+
+
+def _yfinance():
+    global yf, _yf_import_attempted
+    if yf is None and not _yf_import_attempted:
+        _yf_import_attempted = True
+        try:
+            import yfinance
+            yf = yfinance
+        except Exception:  # Optional dependency in some dev/test setups
+            yf = None
+    return yf
+
+
+# yfinance 工作线程池 (有界，避免大批量请求时打爆 Yahoo 或占满默认 executor)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = max(1, int(os.getenv("YAHOO_FINANCE_MAX_WORKERS", "4")))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yfinance")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """在 yfinance 线程池中执行同步调用"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def parse_symbols(value: Any) -> List[str]:
+    """'AAPL, msft' / ['AAPL', 'MSFT'] -> ['AAPL', 'MSFT'] (order kept, deduped)"""
+    parts = value.split(",") if isinstance(value, str) else list(value or [])
+    symbols: List[str] = []
+    for part in parts:
+        symbol = str(part).strip().upper()
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+
+class _SymbolSnapshot:
+    """
+    单个 symbol 的 yfinance 原始数据快照，在各 action 之间共享
+
+    每个字段独立记录获取时间，调用方按自身 action 的 TTL 决定是否可复用。
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._ticker = None
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.fetch_count = 0
+
+    def _get_ticker(self):
+        # 仅在工作线程中调用
+        if self._ticker is None:
+            self._ticker = _yfinance().Ticker(self.symbol)
+        return self._ticker
+
+    async def load(self, field: str, fetch: Callable[[Any], Any], max_age: float) -> Any:
+        entry = self._values.get(field)
+        if entry is not None and time.time() - entry[0] <= max_age:
+            return entry[1]
+        task = self._inflight.get(field)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(field, fetch))
+            self._inflight[field] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(field, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, field: str, fetch: Callable[[Any], Any]) -> Any:
+        value = await run_blocking(lambda: fetch(self._get_ticker()))
+        self.fetch_count += 1
+        self._values[field] = (time.time(), value)
+        return value
+
+    async def attr(self, name: str, max_age: float) -> Any:
+        """Ticker 属性 (info, news, dividends, income_stmt, ...)"""
+        return await self.load(name, lambda t: getattr(t, name), max_age)
+
+    async def history(self, period: str, max_age: float) -> Any:
+        return await self.load(f"history:{period}", lambda t: t.history(period=period), max_age)
+
 
 class YahooFinanceTool(Tool):
     """
@@ -24,6 +125,7 @@ class YahooFinanceTool(Tool):
 
     _cache_lock = None
     _cache_store: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _snapshots: "OrderedDict[str, _SymbolSnapshot]" = OrderedDict()
 
     def __init__(self):
         """Initialize Yahoo Finance Tool"""
@@ -35,7 +137,6 @@ class YahooFinanceTool(Tool):
         self.cache_max_entries = max(32, int(os.getenv("YAHOO_FINANCE_CACHE_MAX_ENTRIES", "256")))
         self.cache_default_ttl_seconds = max(10, int(os.getenv("YAHOO_FINANCE_CACHE_TTL_SECONDS", "120")))
         if YahooFinanceTool._cache_lock is None:
-            import asyncio
             YahooFinanceTool._cache_lock = asyncio.Lock()
 
     async def execute(self, action: str, symbol: str, **kwargs) -> Dict[str, Any]:
@@ -44,26 +145,31 @@ class YahooFinanceTool(Tool):
 
         Args:
             action: 操作类型 (price, history, financials, info, news, valuation, dividends, holders)
-            symbol: 股票代码 (如 AAPL, TSLA, 0700.HK)
-            **kwargs: 其他参数
+            symbol: 股票代码 (如 AAPL, TSLA, 0700.HK)；price/history 支持逗号分隔的多个代码 (批量)
+            **kwargs: 其他参数 (symbols: 代码列表，等价于批量调用)
 
         Returns:
             查询结果
         """
+        symbols = parse_symbols(kwargs.pop("symbols", None) or symbol)
+        if len(symbols) > 1:
+            return await self.execute_batch(action, symbols, **kwargs)
+        symbol = symbols[0] if symbols else symbol
+
         try:
             cache_key = self._make_cache_key(action=action, symbol=symbol, kwargs=kwargs)
             cached = await self._get_cached(cache_key)
             if cached is not None:
                 return cached
 
-            if yf is None:
+            if _yfinance() is None:
                 return {
                     "success": False,
                     "error": "Missing optional dependency: yfinance",
                     "summary": "yfinance 未安装，无法使用 Yahoo Finance 数据工具。请安装依赖后重试。",
                 }
 
-            ticker = yf.Ticker(symbol)
+            ticker = self._get_snapshot(symbol)
 
             if action == "price":
                 result = await self._get_current_price(ticker, symbol)
@@ -102,6 +208,122 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 的 {action} 数据时出错: {str(e)}"
             }
 
+    def _get_snapshot(self, symbol: str) -> _SymbolSnapshot:
+        key = str(symbol or "").strip().upper()
+        snapshots = YahooFinanceTool._snapshots
+        snapshot = snapshots.get(key)
+        if snapshot is None:
+            snapshot = snapshots[key] = _SymbolSnapshot(symbol)
+            while len(snapshots) > self.cache_max_entries:
+                snapshots.popitem(last=False)
+        snapshots.move_to_end(key)
+        return snapshot
+
+    async def execute_batch(self, action: str, symbols: List[str], **kwargs) -> Dict[str, Any]:
+        """
+        批量获取多个 ticker 的数据 (可比公司分析)
+
+        - price / history: 缓存未命中的 ticker 合并为一次 yf.download 请求
+        - 其他 action: 逐个 ticker 在线程池中并发执行
+
+        Returns:
+            {"success", "summary", "results": {symbol: 单个 ticker 的结果}}
+        """
+        symbols = parse_symbols(symbols)
+        if not symbols:
+            return {"success": False, "error": "no_symbols", "summary": "未提供股票代码"}
+
+        if action in ("price", "history") and _yfinance() is not None:
+            period = kwargs.get("period", "1mo") if action == "history" else "5d"
+            # 批量报价来自日线而非 ticker.info，字段更少，不能与单个 price 共用缓存
+            cache_action = action if action == "history" else "batch_price"
+            results: Dict[str, Dict[str, Any]] = {}
+            missing: List[str] = []
+            for symbol in symbols:
+                cached = await self._get_cached(self._make_cache_key(cache_action, symbol, kwargs))
+                if cached is not None:
+                    results[symbol] = cached
+                else:
+                    missing.append(symbol)
+
+            if missing:
+                try:
+                    frame = await run_blocking(
+                        _yfinance().download, missing, period=period, interval="1d",
+                        group_by="ticker", auto_adjust=False, progress=False,
+                    )
+                except Exception as e:
+                    print(f"[YahooFinanceTool] Batch download failed for {missing}: {e}")
+                    frame = None
+                for symbol in missing:
+                    hist = self._frame_for_symbol(frame, symbol, single=len(missing) == 1)
+                    if action == "history":
+                        result = self._summarize_history(hist, symbol, period)
+                    else:
+                        result = self._summarize_quote(hist, symbol)
+                    await self._store_cache(self._make_cache_key(cache_action, symbol, kwargs), cache_action, result)
+                    results[symbol] = result
+            results = {symbol: results[symbol] for symbol in symbols}
+        else:
+            outcomes = await asyncio.gather(*(self.execute(action, symbol, **kwargs) for symbol in symbols))
+            results = dict(zip(symbols, outcomes))
+
+        ok = [s for s, r in results.items() if r.get("success")]
+        failed = [s for s in symbols if s not in ok]
+        summary_parts = [f"批量 {action}: {len(ok)}/{len(symbols)} 成功"]
+        for symbol in ok:
+            summary_parts.append(f"\n\n{results[symbol].get('summary', '')}")
+        if failed:
+            summary_parts.append(f"\n\n失败: {', '.join(failed)}")
+        return {
+            "success": bool(ok),
+            "summary": "".join(summary_parts),
+            "results": results,
+            "failed": failed,
+        }
+
+    @staticmethod
+    def _frame_for_symbol(frame, symbol: str, single: bool = False):
+        """从 yf.download 的结果中取出单个 ticker 的 OHLCV"""
+        if frame is None or getattr(frame, "empty", True):
+            return None
+        columns = frame.columns
+        if getattr(columns, "nlevels", 1) > 1:
+            if symbol in columns.get_level_values(0):
+                sub = frame[symbol]
+            elif symbol in columns.get_level_values(-1):
+                sub = frame.xs(symbol, axis=1, level=-1)
+            else:
+                return None
+        elif single:
+            sub = frame
+        else:
+            return None
+        return sub.dropna(how="all")
+
+    @staticmethod
+    def _summarize_quote(hist, symbol: str) -> Dict[str, Any]:
+        """由最近几根日线得到报价 (批量接口用，来源为 yf.download 而非 ticker.info)"""
+        if hist is None or hist.empty:
+            return {"success": False, "summary": f"无法获取 {symbol} 的当前价格，可能是股票代码错误或市场未开盘"}
+        current_price = float(hist['Close'].iloc[-1])
+        previous_close = float(hist['Close'].iloc[-2]) if len(hist) > 1 else None
+        change = current_price - previous_close if previous_close else 0.0
+        change_percent = (change / previous_close * 100) if previous_close else 0.0
+        return {
+            "success": True,
+            "summary": f"{symbol}: ${current_price:.2f} ({change_percent:+.2f}%)",
+            "data": {
+                "symbol": symbol,
+                "current_price": current_price,
+                "previous_close": previous_close,
+                "change": change,
+                "change_percent": change_percent,
+                "as_of": hist.index[-1].strftime('%Y-%m-%d'),
+                "source": "download",
+            }
+        }
+
     def _make_cache_key(self, action: str, symbol: str, kwargs: Dict[str, Any]) -> str:
         key_parts = [
             str(action or "").strip().lower(),
@@ -114,6 +336,7 @@ class YahooFinanceTool(Tool):
     def _resolve_ttl(self, action: str) -> int:
         action_ttl = {
             "price": 15,
+            "batch_price": 15,
             "history": 300,
             "news": 120,
             "info": 900,
@@ -161,10 +384,10 @@ class YahooFinanceTool(Tool):
                 record_cache_event(layer="yahoo_finance", event="evict")
         record_cache_event(layer="yahoo_finance", event="store")
 
-    async def _get_current_price(self, ticker, symbol: str) -> Dict[str, Any]:
+    async def _get_current_price(self, ticker: "_SymbolSnapshot", symbol: str) -> Dict[str, Any]:
         """获取当前股价"""
         try:
-            info = ticker.info
+            info = await ticker.attr("info", self._resolve_ttl("price"))
             current_price = info.get('currentPrice') or info.get('regularMarketPrice')
             previous_close = info.get('previousClose')
 
@@ -208,12 +431,23 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 价格失败: {str(e)}"
             }
 
-    async def _get_price_history(self, ticker, symbol: str, period: str) -> Dict[str, Any]:
+    async def _get_price_history(self, ticker: "_SymbolSnapshot", symbol: str, period: str) -> Dict[str, Any]:
         """获取历史价格"""
         try:
-            hist = ticker.history(period=period)
+            hist = await ticker.history(period, self._resolve_ttl("history"))
+            return self._summarize_history(hist, symbol, period)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "summary": f"获取 {symbol} 历史数据失败: {str(e)}"
+            }
 
-            if hist.empty:
+    @staticmethod
+    def _summarize_history(hist, symbol: str, period: str) -> Dict[str, Any]:
+        """把 OHLCV DataFrame 整理为 history 结果 (单品种和批量接口共用)"""
+        try:
+            if hist is None or hist.empty:
                 return {
                     "success": False,
                     "summary": f"没有找到 {symbol} 在 {period} 期间的历史数据"
@@ -260,17 +494,17 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 历史数据失败: {str(e)}"
             }
 
-    async def _get_financials(self, ticker, symbol: str, statement: str) -> Dict[str, Any]:
+    async def _get_financials(self, ticker: "_SymbolSnapshot", symbol: str, statement: str) -> Dict[str, Any]:
         """获取财务报表"""
         try:
             if statement == "income":
-                df = ticker.income_stmt
+                df = await ticker.attr("income_stmt", self._resolve_ttl("financials"))
                 stmt_name = "利润表"
             elif statement == "balance":
-                df = ticker.balance_sheet
+                df = await ticker.attr("balance_sheet", self._resolve_ttl("financials"))
                 stmt_name = "资产负债表"
             elif statement == "cash":
-                df = ticker.cashflow
+                df = await ticker.attr("cashflow", self._resolve_ttl("financials"))
                 stmt_name = "现金流量表"
             else:
                 return {
@@ -344,10 +578,10 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 财务数据失败: {str(e)}"
             }
 
-    async def _get_company_info(self, ticker, symbol: str) -> Dict[str, Any]:
+    async def _get_company_info(self, ticker: "_SymbolSnapshot", symbol: str) -> Dict[str, Any]:
         """获取公司基本信息"""
         try:
-            info = ticker.info
+            info = await ticker.attr("info", self._resolve_ttl("info"))
 
             summary = (
                 f"{symbol} 公司信息:\n"
@@ -381,10 +615,10 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 公司信息失败: {str(e)}"
             }
 
-    async def _get_news(self, ticker, symbol: str) -> Dict[str, Any]:
+    async def _get_news(self, ticker: "_SymbolSnapshot", symbol: str) -> Dict[str, Any]:
         """获取公司新闻"""
         try:
-            news = ticker.news
+            news = await ticker.attr("news", self._resolve_ttl("news"))
 
             if not news:
                 return {
@@ -418,10 +652,10 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 新闻失败: {str(e)}"
             }
 
-    async def _get_valuation_metrics(self, ticker, symbol: str) -> Dict[str, Any]:
+    async def _get_valuation_metrics(self, ticker: "_SymbolSnapshot", symbol: str) -> Dict[str, Any]:
         """获取全面的估值指标"""
         try:
-            info = ticker.info
+            info = await ticker.attr("info", self._resolve_ttl("valuation"))
 
             # 基础估值指标
             pe_trailing = info.get('trailingPE')
@@ -603,11 +837,13 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 估值数据失败: {str(e)}"
             }
 
-    async def _get_dividend_info(self, ticker, symbol: str) -> Dict[str, Any]:
+    async def _get_dividend_info(self, ticker: "_SymbolSnapshot", symbol: str) -> Dict[str, Any]:
         """获取股息信息"""
         try:
-            info = ticker.info
-            dividends = ticker.dividends
+            info, dividends = await asyncio.gather(
+                ticker.attr("info", self._resolve_ttl("dividends")),
+                ticker.attr("dividends", self._resolve_ttl("dividends")),
+            )
 
             dividend_yield = info.get('dividendYield')
             dividend_rate = info.get('dividendRate')
@@ -679,15 +915,17 @@ class YahooFinanceTool(Tool):
                 "summary": f"获取 {symbol} 股息数据失败: {str(e)}"
             }
 
-    async def _get_holders_info(self, ticker, symbol: str) -> Dict[str, Any]:
+    async def _get_holders_info(self, ticker: "_SymbolSnapshot", symbol: str) -> Dict[str, Any]:
         """获取持股人信息"""
         try:
             # 机构持股
-            institutional = ticker.institutional_holders
-            # 内部人持股
-            insiders = ticker.insider_transactions
-
-            info = ticker.info
+            ttl = self._resolve_ttl("holders")
+            institutional, insiders, info = await asyncio.gather(
+                ticker.attr("institutional_holders", ttl),
+                # 内部人持股
+                ticker.attr("insider_transactions", ttl),
+                ticker.attr("info", ttl),
+            )
             insider_pct = info.get('heldPercentInsiders')
             institution_pct = info.get('heldPercentInstitutions')
 
@@ -763,7 +1001,7 @@ class YahooFinanceTool(Tool):
                     },
                     "symbol": {
                         "type": "string",
-                        "description": "Stock symbol (e.g., AAPL, TSLA, 0700.HK, BTC-USD)"
+                        "description": "Stock symbol (e.g., AAPL, TSLA, 0700.HK, BTC-USD). For price/history, a comma-separated list (e.g., AAPL,MSFT,GOOGL) fetches all tickers in one batch"
                     },
                     "period": {
                         "type": "string",
@@ -3,6 +3,7 @@ Session Store for Redis-based persistence
 会话存储服务 - 基于Redis实现持久化
 """
 import json
+import logging
 import redis
 from typing import Optional, Dict, Any
 from datetime import timedelta
@@ -10,6 +11,8 @@ import os
 from typing import List
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class SessionStore:
     """
@@ -42,9 +45,9 @@ class SessionStore:
         # Test connection
         try:
             self.redis_client.ping()
-            print(f"[SessionStore] ✅ Connected to Redis: {redis_url}")
+            logger.info("[SessionStore] ✅ Connected to Redis: %s", redis_url)
         except redis.ConnectionError as e:
-            print(f"[SessionStore] ❌ Failed to connect to Redis: {e}")
+            logger.error("[SessionStore] ❌ Failed to connect to Redis: %s", e)
             raise
 
     # ==================== Session Management ====================
@@ -77,11 +80,11 @@ class SessionStore:
                 value
             )
 
-            print(f"[SessionStore] ✅ Saved session: {session_id}")
+            logger.debug("[SessionStore] ✅ Saved session: %s", session_id)
             return True
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to save session {session_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to save session %s: %s", session_id, e)
             return False
 
     def _session_owned_by_user(self, session_data: Dict[str, Any], user_id: Optional[str]) -> bool:
@@ -108,17 +111,17 @@ class SessionStore:
             value = self.redis_client.get(key)
 
             if value is None:
-                print(f"[SessionStore] ⚠️  Session not found: {session_id}")
+                logger.warning("[SessionStore] ⚠️  Session not found: %s", session_id)
                 return None
 
             context = json.loads(value)
             if not self._session_owned_by_user(context, user_id):
                 return None
-            print(f"[SessionStore] ✅ Retrieved session: {session_id}")
+            logger.debug("[SessionStore] ✅ Retrieved session: %s", session_id)
             return context
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get session {session_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to get session %s: %s", session_id, e)
             return None
 
     def delete_session(self, session_id: str) -> bool:
@@ -136,14 +139,14 @@ class SessionStore:
             result = self.redis_client.delete(key)
 
             if result > 0:
-                print(f"[SessionStore] ✅ Deleted session: {session_id}")
+                logger.debug("[SessionStore] ✅ Deleted session: %s", session_id)
                 return True
             else:
-                print(f"[SessionStore] ⚠️  Session not found: {session_id}")
+                logger.warning("[SessionStore] ⚠️  Session not found: %s", session_id)
                 return False
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to delete session {session_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to delete session %s: %s", session_id, e)
             return False
 
     def session_exists(self, session_id: str) -> bool:
@@ -160,7 +163,7 @@ class SessionStore:
             key = f"dd_session:{session_id}"
             return self.redis_client.exists(key) > 0
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to check session {session_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to check session %s: %s", session_id, e)
             return False
 
     def extend_session_ttl(self, session_id: str, ttl_days: int = 30) -> bool:
@@ -177,10 +180,10 @@ class SessionStore:
         try:
             key = f"dd_session:{session_id}"
             self.redis_client.expire(key, timedelta(days=ttl_days))
-            print(f"[SessionStore] ✅ Extended TTL for session: {session_id}")
+            logger.debug("[SessionStore] ✅ Extended TTL for session: %s", session_id)
             return True
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to extend TTL for {session_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to extend TTL for %s: %s", session_id, e)
             return False
 
     # ==================== Report Management ====================
@@ -222,7 +225,7 @@ class SessionStore:
                     dt = datetime.fromisoformat(timestamp_str)
                     score = dt.timestamp()
                 except ValueError:
-                    print(f"[SessionStore] ⚠️  Invalid timestamp format: {timestamp_str}, using 0")
+                    logger.warning("[SessionStore] ⚠️  Invalid timestamp format: %s, using 0", timestamp_str)
                     score = 0.0
 
             self.redis_client.zadd(
@@ -230,11 +233,11 @@ class SessionStore:
                 {report_id: score}
             )
 
-            print(f"[SessionStore] ✅ Saved report: {report_id}")
+            logger.debug("[SessionStore] ✅ Saved report: %s", report_id)
             return True
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to save report {report_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to save report %s: %s", report_id, e)
             return False
 
     def get_report(self, report_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -252,17 +255,17 @@ class SessionStore:
             value = self.redis_client.get(key)
 
             if value is None:
-                print(f"[SessionStore] ⚠️  Report not found: {report_id}")
+                logger.warning("[SessionStore] ⚠️  Report not found: %s", report_id)
                 return None
 
             report_data = json.loads(value)
             if not self._report_owned_by_user(report_data, user_id):
                 return None
-            print(f"[SessionStore] ✅ Retrieved report: {report_id}")
+            logger.debug("[SessionStore] ✅ Retrieved report: %s", report_id)
             return report_data
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get report {report_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to get report %s: %s", report_id, e)
             return None
 
     def _report_owned_by_user(self, report_data: Dict[str, Any], user_id: Optional[str]) -> bool:
@@ -293,11 +296,11 @@ class SessionStore:
                     if len(reports) >= limit:
                         break
 
-            print(f"[SessionStore] ✅ Retrieved {len(reports)} reports")
+            logger.debug("[SessionStore] ✅ Retrieved %s reports", len(reports))
             return reports
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get all reports: {e}")
+            logger.error("[SessionStore] ❌ Failed to get all reports: %s", e)
             return []
 
     def delete_report(self, report_id: str, user_id: Optional[str] = None) -> bool:
@@ -312,7 +315,7 @@ class SessionStore:
         """
         try:
             if self.get_report(report_id, user_id=user_id) is None:
-                print(f"[SessionStore] ⚠️  Report not found: {report_id}")
+                logger.warning("[SessionStore] ⚠️  Report not found: %s", report_id)
                 return False
 
             key = f"report:{report_id}"
@@ -324,14 +327,14 @@ class SessionStore:
             result = self.redis_client.delete(key)
 
             if result > 0:
-                print(f"[SessionStore] ✅ Deleted report: {report_id}")
+                logger.debug("[SessionStore] ✅ Deleted report: %s", report_id)
                 return True
             else:
-                print(f"[SessionStore] ⚠️  Report not found: {report_id}")
+                logger.warning("[SessionStore] ⚠️  Report not found: %s", report_id)
                 return False
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to delete report {report_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to delete report %s: %s", report_id, e)
             return False
 
     # ==================== Roundtable History Management ====================
@@ -375,11 +378,11 @@ class SessionStore:
                     if len(roundtable_reports) >= limit:
                         break
 
-            print(f"[SessionStore] ✅ Retrieved {len(roundtable_reports)} roundtable reports")
+            logger.debug("[SessionStore] ✅ Retrieved %s roundtable reports", len(roundtable_reports))
             return roundtable_reports
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get roundtable reports: {e}")
+            logger.error("[SessionStore] ❌ Failed to get roundtable reports: %s", e)
             return []
 
     def get_roundtable_report_full(self, report_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -399,7 +402,7 @@ class SessionStore:
                 return None
 
             if report_data.get('type') != 'roundtable':
-                print(f"[SessionStore] ⚠️  Report {report_id} is not a roundtable report")
+                logger.warning("[SessionStore] ⚠️  Report %s is not a roundtable report", report_id)
                 return None
             if not self._report_owned_by_user(report_data, user_id):
                 return None
@@ -407,7 +410,7 @@ class SessionStore:
             return report_data
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get roundtable report {report_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to get roundtable report %s: %s", report_id, e)
             return None
 
     def search_similar_roundtables(self, topic: str, limit: int = 5, user_id: Optional[str] = None) -> list:
@@ -452,7 +455,7 @@ class SessionStore:
             return [r[1] for r in scored_results[:limit]]
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to search similar roundtables: {e}")
+            logger.error("[SessionStore] ❌ Failed to search similar roundtables: %s", e)
             return []
 
     # ==================== Analysis Result Caching ====================
@@ -510,11 +513,11 @@ class SessionStore:
                 value
             )
 
-            print(f"[SessionStore] ✅ Cached analysis result: {cache_key}")
+            logger.debug("[SessionStore] ✅ Cached analysis result: %s", cache_key)
             return True
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to cache analysis: {e}")
+            logger.error("[SessionStore] ❌ Failed to cache analysis: %s", e)
             return False
 
     def get_cached_analysis(
@@ -538,15 +541,15 @@ class SessionStore:
             value = self.redis_client.get(cache_key)
 
             if value is None:
-                print(f"[SessionStore] Cache miss: {cache_key}")
+                logger.debug("[SessionStore] Cache miss: %s", cache_key)
                 return None
 
             result = json.loads(value)
-            print(f"[SessionStore] ✅ Cache hit: {cache_key}")
+            logger.debug("[SessionStore] ✅ Cache hit: %s", cache_key)
             return result
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get cached analysis: {e}")
+            logger.error("[SessionStore] ❌ Failed to get cached analysis: %s", e)
             return None
 
     def invalidate_analysis_cache(
@@ -584,19 +587,60 @@ class SessionStore:
             keys = self.redis_client.keys(pattern)
             if keys:
                 deleted = self.redis_client.delete(*keys)
-                print(f"[SessionStore] ✅ Invalidated {deleted} cache entries")
+                logger.debug("[SessionStore] ✅ Invalidated %s cache entries", deleted)
                 return deleted
             return 0
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to invalidate cache: {e}")
+            logger.error("[SessionStore] ❌ Failed to invalidate cache: %s", e)
             return 0
 
+    # ==================== Workflow Step Results ====================
+
+    def _step_result_key(self, scope: str, fingerprint: str) -> str:
+        return f"step_result:{scope or 'anonymous'}:{fingerprint}"
+
+    def save_step_result(
+        self,
+        scope: str,
+        fingerprint: str,
+        result: Dict[str, Any],
+        ttl_hours: int = 1,
+    ) -> bool:
+        """
+        Persist one workflow step result under the fingerprint of its inputs.
+        """
+        try:
+            value = json.dumps(result, ensure_ascii=False, default=str)
+            self.redis_client.setex(self._step_result_key(scope, fingerprint), timedelta(hours=ttl_hours), value)
+            return True
+        except Exception as e:
+            logger.error("[SessionStore] ❌ Failed to save step result (%s): %s", fingerprint[:12], e)
+            return False
+
+    def get_step_result(self, scope: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.redis_client.get(self._step_result_key(scope, fingerprint))
+            if value is None:
+                return None
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, dict) else None
+        except Exception as e:
+            logger.error("[SessionStore] ❌ Failed to get step result (%s): %s", fingerprint[:12], e)
+            return None
+
     # ==================== Session Event Stream ====================
+    #
+    # 事件存放在 Redis Stream 中，entry id 固定为 "<seq>-0":
+    # 追加是 O(1) 的 XADD (MAXLEN ~ 近似裁剪)，按 seq 游标读取是 XRANGE。
+    # 旧版本使用 sorted set (session_events:*)，仅作为只读回退保留到过期。
 
     def _session_events_key(self, session_id: str) -> str:
         return f"session_events:{session_id}"
 
+    def _session_event_stream_key(self, session_id: str) -> str:
+        return f"session_event_stream:{session_id}"
+
     def _session_events_seq_key(self, session_id: str) -> str:
         return f"session_events_seq:{session_id}"
 
@@ -618,7 +662,7 @@ class SessionStore:
 
         try:
             seq_key = self._session_events_seq_key(session_id)
-            events_key = self._session_events_key(session_id)
+            stream_key = self._session_event_stream_key(session_id)
             seq = int(self.redis_client.incr(seq_key))
 
             payload = {
@@ -628,20 +672,14 @@ class SessionStore:
             }
             value = json.dumps(payload, ensure_ascii=False, default=str)
 
-            # Use sorted set score=seq for efficient cursor-based reads.
-            self.redis_client.zadd(events_key, {value: float(seq)})
-
-            # Keep only recent max_events.
-            total = self.redis_client.zcard(events_key)
-            overflow = int(total) - int(max_events)
-            if overflow > 0:
-                self.redis_client.zremrangebyrank(events_key, 0, overflow - 1)
-
-            self.redis_client.expire(events_key, timedelta(days=ttl_days))
-            self.redis_client.expire(seq_key, timedelta(days=ttl_days))
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.xadd(stream_key, {"data": value}, id=f"{seq}-0", maxlen=int(max_events), approximate=True)
+            pipe.expire(stream_key, timedelta(days=ttl_days))
+            pipe.expire(seq_key, timedelta(days=ttl_days))
+            pipe.execute()
             return seq
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to append session event ({session_id}): {e}")
+            logger.error("[SessionStore] ❌ Failed to append session event (%s): %s", session_id, e)
             return -1
 
     def get_session_events(
@@ -657,28 +695,47 @@ class SessionStore:
             return []
 
         try:
-            events_key = self._session_events_key(session_id)
-            min_score = f"({int(after_seq)}" if int(after_seq) >= 0 else "-inf"
-            raw_values = self.redis_client.zrangebyscore(
-                events_key,
-                min_score,
-                "+inf",
-                start=0,
-                num=max(int(limit), 1),
+            entries = self.redis_client.xrange(
+                self._session_event_stream_key(session_id),
+                min=f"{max(int(after_seq), 0) + 1}-0",
+                max="+",
+                count=max(int(limit), 1),
             )
+            if not entries and self.redis_client.exists(self._session_events_key(session_id)):
+                return self._get_legacy_session_events(session_id, after_seq, limit)
             events: List[Dict[str, Any]] = []
-            for item in raw_values:
+            for _entry_id, fields in entries:
                 try:
-                    parsed = json.loads(item)
+                    parsed = json.loads(fields.get("data") or "")
                     if isinstance(parsed, dict):
                         events.append(parsed)
                 except Exception:
                     continue
             return events
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get session events ({session_id}): {e}")
+            logger.error("[SessionStore] ❌ Failed to get session events (%s): %s", session_id, e)
             return []
 
+    def _get_legacy_session_events(self, session_id: str, after_seq: int, limit: int) -> List[Dict[str, Any]]:
+        """Read events written by the previous sorted-set layout."""
+        min_score = f"({int(after_seq)}" if int(after_seq) >= 0 else "-inf"
+        raw_values = self.redis_client.zrangebyscore(
+            self._session_events_key(session_id),
+            min_score,
+            "+inf",
+            start=0,
+            num=max(int(limit), 1),
+        )
+        events: List[Dict[str, Any]] = []
+        for item in raw_values:
+            try:
+                parsed = json.loads(item)
+                if isinstance(parsed, dict):
+                    events.append(parsed)
+            except Exception:
+                continue
+        return events
+
     def get_latest_session_event_seq(self, session_id: str) -> int:
         if not session_id:
             return 0
@@ -693,12 +750,13 @@ class SessionStore:
             return 0
         try:
             keys = [
+                self._session_event_stream_key(session_id),
                 self._session_events_key(session_id),
                 self._session_events_seq_key(session_id),
             ]
             return int(self.redis_client.delete(*keys))
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to clear session events ({session_id}): {e}")
+            logger.error("[SessionStore] ❌ Failed to clear session events (%s): %s", session_id, e)
             return 0
 
     # ==================== Utility Methods ====================
@@ -730,7 +788,7 @@ class SessionStore:
             }
 
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get stats: {e}")
+            logger.error("[SessionStore] ❌ Failed to get stats: %s", e)
             return {
                 'sessions': 0,
                 'reports': 0,
@@ -768,16 +826,16 @@ class SessionStore:
                     continue
             return sessions
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to list sessions: {e}")
+            logger.error("[SessionStore] ❌ Failed to list sessions: %s", e)
             return []
 
     def close(self):
         """Close Redis connection."""
         try:
             self.redis_client.close()
-            print("[SessionStore] ✅ Closed Redis connection")
+            logger.info("[SessionStore] ✅ Closed Redis connection")
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to close connection: {e}")
+            logger.error("[SessionStore] ❌ Failed to close connection: %s", e)
 
     # ==================== Uploaded File Ownership ====================
 
@@ -793,7 +851,7 @@ class SessionStore:
             )
             return True
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to set file owner for {file_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to set file owner for %s: %s", file_id, e)
             return False
 
     def get_uploaded_file_owner(self, file_id: str) -> Optional[str]:
@@ -806,5 +864,5 @@ class SessionStore:
                 return None
             return str(value)
         except Exception as e:
-            print(f"[SessionStore] ❌ Failed to get file owner for {file_id}: {e}")
+            logger.error("[SessionStore] ❌ Failed to get file owner for %s: %s", file_id, e)
             return None
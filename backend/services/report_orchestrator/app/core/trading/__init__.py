@@ -16,24 +16,56 @@ Refactored Architecture (v2.0):
 - Orchestration: LangGraph workflow (TradingGraph)
 """
 
-# Trading Backends
-from .paper_trader import PaperTrader, get_paper_trader
-from .okx_client import OKXClient, get_okx_client
+import importlib
 
-# Trading Components
-from .trading_tools import TradingToolkit
-from .trading_agents import create_trading_agents
-from .trading_meeting import TradingMeeting
-from .agent_memory import AgentMemory, AgentMemoryStore
-from .scheduler import TradingScheduler
+# 导出项按需加载 (PEP 562): 导入任一子模块 (如 trading_config) 都会先执行本文件，
+# 若在此处直接导入 TradingMeeting/TradingGraph 会连带加载 langgraph、aiohttp、pandas (~1s)
+_LAZY_EXPORTS = {
+    # Trading Backends
+    'PaperTrader': '.paper_trader',
+    'get_paper_trader': '.paper_trader',
+    'OKXClient': '.okx_client',
+    'get_okx_client': '.okx_client',
+
+    # Trading Components
+    'TradingToolkit': '.trading_tools',
+    'create_trading_agents': '.trading_agents',
+    'TradingMeeting': '.trading_meeting',
+    'AgentMemory': '.agent_memory',
+    'AgentMemoryStore': '.agent_memory',
+    'TradingScheduler': '.scheduler',
+
+    # Phase 1-4 Refactored Modules
+    'Position': '.domain',
+    'PositionSource': '.domain',
+    'SafetyGuard': '.safety',
+    'SafetyCheckResult': '.safety',
+    'BlockReason': '.safety',
+    'ReflectionEngine': '.reflection',
+    'TradeReflection': '.reflection',
+    'ReflectionMemory': '.reflection',
+    'ExecutorAgent': '.executor_agent',
+    'TradingGraph': '.orchestration',
+    'TradingState': '.orchestration',
+    'create_initial_state': '.orchestration',
+    'TradingDecision': '.decision_store',
+    'TradingDecisionStore': '.decision_store',
+    'get_decision_store': '.decision_store',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-# Phase 1-4 Refactored Modules
-from .domain import Position, PositionSource
-from .safety import SafetyGuard, SafetyCheckResult, BlockReason
-from .reflection import ReflectionEngine, TradeReflection, ReflectionMemory
-from .executor_agent import ExecutorAgent
-from .orchestration import TradingGraph, TradingState, create_initial_state
-from .decision_store import TradingDecision, TradingDecisionStore, get_decision_store
 
 __all__ = [
     # Trading Backends
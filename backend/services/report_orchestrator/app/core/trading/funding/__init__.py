@@ -7,6 +7,7 @@ of holding positions and make informed decisions.
 
 Modules:
 - data_service: OKX API integration for funding rate data
+- rate_store: Shared funding-rate time series with precomputed averages/trend
 - calculator: Cost calculation and break-even analysis
 - entry_timing: Settlement-aware entry timing control
 - holding_manager: Dynamic holding time recommendations
@@ -29,6 +30,7 @@ from .models import (
     HoldingAdvice,
     HoldingAlertLevel
 )
+from .rate_store import FundingRateStore, FundingRateStats, get_funding_rate_store
 from .data_service import FundingDataService, get_funding_data_service
 from .calculator import FundingCostCalculator, get_funding_calculator
 from .entry_timing import EntryTimingController, get_entry_timing_controller
@@ -55,6 +57,9 @@ __all__ = [
     'HoldingAlertLevel',
     
     # Services
+    'FundingRateStore',
+    'FundingRateStats',
+    'get_funding_rate_store',
     'FundingDataService',
     'get_funding_data_service',
     'FundingCostCalculator',
@@ -5,12 +5,13 @@ Provides OKX API integration for funding rate data collection.
 """
 
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import List, Optional, Dict
 import aiohttp
 
 from .models import FundingRate, FundingBill, RateTrend
 from .config import get_funding_config
+from .rate_store import get_funding_rate_store, calculate_avg_rate, determine_trend
 from ..trading_config import get_infra_config
 from ..okx_credentials_store import get_okx_credentials_store
 from app.core.auth import get_current_user_id
@@ -27,6 +28,9 @@ class FundingDataService:
     - Current funding rate
     - Historical rates (for trend analysis)
     - Position funding bills
+
+    Public rate data is served from the shared FundingRateStore, which only
+    goes to the exchange for a stale current rate or new settlements.
     """
 
     def __init__(self, user_id: Optional[str] = None):
@@ -34,6 +38,7 @@ class FundingDataService:
         self.base_url = get_infra_config().okx_base_url
         self.user_id = get_current_user_id(user_id)
         self._session: Optional[aiohttp.ClientSession] = None
+        self._store = get_funding_rate_store()
 
         # API credentials (for authenticated endpoints like bills)
         self.api_key = ""
@@ -92,7 +97,8 @@ class FundingDataService:
         """
         Get current funding rate from OKX
         
-        OKX API: GET /api/v5/public/funding-rate
+        OKX API: GET /api/v5/public/funding-rate (via FundingRateStore;
+        cached within the store's TTL, averages/trend precomputed)
         
         Args:
             symbol: Trading pair (e.g., "BTC-USDT-SWAP")
@@ -101,56 +107,23 @@ class FundingDataService:
             FundingRate object or None if failed
         """
         try:
-            await self._ensure_session()
-            
-            url = f"{self.base_url}/api/v5/public/funding-rate?instId={symbol}"
-            proxy = self._get_proxy()
-            
-            async with self._session.get(url, proxy=proxy) as resp:
-                data = await resp.json()
-                
-                if data.get('code') == '0' and data.get('data'):
-                    rate_data = data['data'][0]
-                    
-                    # Parse rate
-                    rate = float(rate_data.get('fundingRate', 0) or 0)
-                    next_rate = float(rate_data.get('nextFundingRate', rate) or rate)
-                    
-                    # Parse next settlement time
-                    next_time_ms = int(rate_data.get('fundingTime', 0) or 0)
-                    next_settlement = datetime.fromtimestamp(next_time_ms / 1000) if next_time_ms else None
-                    
-                    # Get historical rates for averages
-                    history = await self.get_rate_history(symbol, hours=168)  # 7 days
-                    
-                    avg_24h = self._calculate_avg_rate(history, hours=24)
-                    avg_7d = self._calculate_avg_rate(history, hours=168)
-                    trend = self._determine_trend(history)
-                    
-                    funding_rate = FundingRate(
-                        symbol=symbol,
-                        rate=rate,
-                        next_settlement_time=next_settlement,
-                        avg_24h=avg_24h,
-                        avg_7d=avg_7d,
-                        trend=trend
-                    )
-                    
-                    logger.info(
-                        f"[FundingData] {symbol}: rate={rate*100:.4f}%, "
-                        f"next_settlement={funding_rate.minutes_to_settlement}min, "
-                        f"avg_24h={avg_24h*100:.4f}%, trend={trend.value}"
-                    )
-                    
-                    return funding_rate
-                else:
-                    logger.error(f"[FundingData] API error: {data.get('msg')}")
-                    return None
-                    
+            stats = await self._store.get_stats(symbol)
+            if stats is None:
+                logger.error(f"[FundingData] No funding rate available for {symbol}")
+                return None
+
+            funding_rate = stats.to_funding_rate()
+            logger.debug(
+                f"[FundingData] {symbol}: rate={stats.current_rate*100:.4f}%, "
+                f"next_settlement={funding_rate.minutes_to_settlement}min, "
+                f"avg_24h={stats.avg_24h*100:.4f}%, trend={stats.trend.value}"
+            )
+            return funding_rate
+
         except Exception as e:
             logger.error(f"[FundingData] Error fetching current rate: {e}")
             return None
-    
+
     async def get_rate_history(
         self, 
         symbol: str = "BTC-USDT-SWAP", 
@@ -159,47 +132,22 @@ class FundingDataService:
         """
         Get historical funding rates
         
-        OKX API: GET /api/v5/public/funding-rate-history
+        OKX API: GET /api/v5/public/funding-rate-history (via FundingRateStore;
+        only settlements newer than the cached ones are fetched)
         
         Args:
             symbol: Trading pair
-            hours: How many hours of history to fetch
+            hours: How many hours of history to return
             
         Returns:
             List of FundingRate objects (newest first)
         """
         try:
-            await self._ensure_session()
-            
-            # Calculate limit (3 per day for 8h intervals)
-            limit = min(hours // 8 + 1, 100)  # Max 100 records
-            
-            url = f"{self.base_url}/api/v5/public/funding-rate-history?instId={symbol}&limit={limit}"
-            proxy = self._get_proxy()
-            
-            async with self._session.get(url, proxy=proxy) as resp:
-                data = await resp.json()
-                
-                if data.get('code') == '0' and data.get('data'):
-                    rates = []
-                    for item in data['data']:
-                        rate = float(item.get('fundingRate', 0) or 0)
-                        timestamp_ms = int(item.get('fundingTime', 0) or 0)
-                        timestamp = datetime.fromtimestamp(timestamp_ms / 1000) if timestamp_ms else datetime.now()
-                        
-                        rates.append(FundingRate(
-                            symbol=symbol,
-                            rate=rate,
-                            next_settlement_time=None,
-                            timestamp=timestamp
-                        ))
-                    
-                    logger.debug(f"[FundingData] Fetched {len(rates)} historical rates for {symbol}")
-                    return rates
-                else:
-                    logger.warning(f"[FundingData] History API error: {data.get('msg')}")
-                    return []
-                    
+            await self._store.get_stats(symbol)
+            rates = self._store.history(symbol, hours=hours)
+            logger.debug(f"[FundingData] {len(rates)} cached historical rates for {symbol}")
+            return rates
+
         except Exception as e:
             logger.error(f"[FundingData] Error fetching rate history: {e}")
             return []
@@ -230,40 +178,11 @@ class FundingDataService:
     
     def _calculate_avg_rate(self, history: List[FundingRate], hours: int) -> float:
         """Calculate average rate over specified hours"""
-        if not history:
-            return 0.0
-        
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent = [r for r in history if r.timestamp > cutoff]
-        
-        if not recent:
-            return 0.0
-        
-        return sum(r.rate for r in recent) / len(recent)
+        return calculate_avg_rate(history, hours)
     
     def _determine_trend(self, history: List[FundingRate]) -> RateTrend:
         """Determine rate trend from history"""
-        if len(history) < 6:  # Need at least 2 days of data
-            return RateTrend.STABLE
-        
-        # Compare recent 24h avg vs previous 24h avg
-        recent = history[:9]  # Last ~3 days
-        older = history[9:18] if len(history) >= 18 else history[9:]
-        
-        if not older:
-            return RateTrend.STABLE
-        
-        recent_avg = sum(r.rate for r in recent) / len(recent) if recent else 0
-        older_avg = sum(r.rate for r in older) / len(older) if older else 0
-        
-        diff = recent_avg - older_avg
-        threshold = 0.0001  # 0.01% change is significant
-        
-        if diff > threshold:
-            return RateTrend.RISING
-        elif diff < -threshold:
-            return RateTrend.FALLING
-        return RateTrend.STABLE
+        return determine_trend(history)
     
     async def close(self):
         """Close aiohttp session"""
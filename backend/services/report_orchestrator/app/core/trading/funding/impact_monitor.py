@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any, Callable, Awaitable
 from .models import HoldingAlertLevel, TruePnL
 from .config import get_funding_config
 from .calculator import get_funding_calculator
+from .rate_store import FundingRateStats, get_funding_rate_store
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +27,15 @@ class FundingImpact:
         alert_level: HoldingAlertLevel,
         should_close: bool,
         reason: str,
-        true_pnl: Optional[TruePnL] = None
+        true_pnl: Optional[TruePnL] = None,
+        rate_stats: Optional[FundingRateStats] = None
     ):
         self.impact_percent = impact_percent
         self.alert_level = alert_level
         self.should_close = should_close
         self.reason = reason
         self.true_pnl = true_pnl
+        self.rate_stats = rate_stats  # Precomputed rate/avg/trend at check time
 
 
 class FundingImpactMonitor:
@@ -183,6 +186,14 @@ class FundingImpactMonitor:
             margin=margin,
             funding_count=funding_count
         )
+
+        # Attach precomputed rate stats (no exchange call)
+        impact.rate_stats = get_funding_rate_store().peek(symbol)
+        if impact.rate_stats and impact.alert_level != HoldingAlertLevel.NORMAL:
+            impact.reason += (
+                f" 当前费率 {impact.rate_stats.current_rate * 100:.4f}%，"
+                f"24h均值 {impact.rate_stats.avg_24h * 100:.4f}%，趋势 {impact.rate_stats.trend.value}。"
+            )
         
         # Take action if needed
         if impact.should_close:
@@ -0,0 +1,318 @@
+"""
+Funding Rate Store
+
+Process-wide time-series cache of funding rates per symbol.
+
+- Keeps a rolling settlement history (newest first) per symbol
+- After the initial load, only settlements newer than the last known one
+  are fetched, and only once the known next settlement time has passed
+- The current (predicted) rate is refreshed on a short TTL
+- avg_24h / avg_7d / trend are recomputed when data changes, so readers
+  (context provider, vote builders, impact monitor) get precomputed stats
+  without touching the exchange
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import aiohttp
+
+from .models import FundingRate, RateTrend
+from ..trading_config import get_infra_config
+from ..request_scheduler import get_request_scheduler
+
+logger = logging.getLogger(__name__)
+
+FetchJson = Callable[[str], Awaitable[Dict]]
+
+
+def calculate_avg_rate(history: List[FundingRate], hours: int, now: Optional[datetime] = None) -> float:
+    """Average rate of settlements within the last ``hours``"""
+    if not history:
+        return 0.0
+
+    cutoff = (now or datetime.now()) - timedelta(hours=hours)
+    recent = [r.rate for r in history if r.timestamp > cutoff]
+
+    if not recent:
+        return 0.0
+
+    return sum(recent) / len(recent)
+
+
+def determine_trend(history: List[FundingRate]) -> RateTrend:
+    """Compare the newest 9 settlements (~3 days) against the 9 before them (history newest first)"""
+    if len(history) < 6:  # Need at least 2 days of data
+        return RateTrend.STABLE
+
+    recent = history[:9]
+    older = history[9:18]
+
+    if not older:
+        return RateTrend.STABLE
+
+    recent_avg = sum(r.rate for r in recent) / len(recent)
+    older_avg = sum(r.rate for r in older) / len(older)
+
+    diff = recent_avg - older_avg
+    threshold = 0.0001  # 0.01% change is significant
+
+    if diff > threshold:
+        return RateTrend.RISING
+    elif diff < -threshold:
+        return RateTrend.FALLING
+    return RateTrend.STABLE
+
+
+@dataclass(frozen=True)
+class FundingRateStats:
+    """Precomputed funding snapshot for one symbol"""
+    symbol: str
+    current_rate: float
+    next_settlement_time: Optional[datetime]
+    avg_24h: float
+    avg_7d: float
+    trend: RateTrend
+    history_count: int
+    last_settlement_time: Optional[datetime]
+    updated_at: datetime
+
+    def to_funding_rate(self) -> FundingRate:
+        return FundingRate(
+            symbol=self.symbol,
+            rate=self.current_rate,
+            next_settlement_time=self.next_settlement_time,
+            avg_24h=self.avg_24h,
+            avg_7d=self.avg_7d,
+            trend=self.trend
+        )
+
+
+class _SymbolSeries:
+    """Settlement history for one symbol, newest first"""
+
+    def __init__(self, symbol: str, retention: int):
+        self.symbol = symbol
+        self.settlements: Deque[FundingRate] = deque(maxlen=retention)
+        self.current_rate: Optional[float] = None
+        self.next_settlement_time: Optional[datetime] = None
+        self.current_fetched_at: Optional[datetime] = None
+        # Settlement we know happened but have not seen in history yet
+        self.pending_settlement: Optional[datetime] = None
+        self.history_loaded = False
+        self.stats: Optional[FundingRateStats] = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def last_settlement_time(self) -> Optional[datetime]:
+        return self.settlements[0].timestamp if self.settlements else None
+
+    def merge(self, rates: List[FundingRate]) -> int:
+        """Prepend settlements newer than the latest known one; returns count added"""
+        last = self.last_settlement_time
+        fresh = sorted(
+            (r for r in rates if last is None or r.timestamp > last),
+            key=lambda r: r.timestamp
+        )
+        for rate in fresh:
+            self.settlements.appendleft(rate)
+        return len(fresh)
+
+    def recompute(self, now: datetime):
+        history = list(self.settlements)
+        self.stats = FundingRateStats(
+            symbol=self.symbol,
+            current_rate=self.current_rate if self.current_rate is not None else 0.0,
+            next_settlement_time=self.next_settlement_time,
+            avg_24h=calculate_avg_rate(history, 24, now),
+            avg_7d=calculate_avg_rate(history, 168, now),
+            trend=determine_trend(history),
+            history_count=len(history),
+            last_settlement_time=self.last_settlement_time,
+            updated_at=now
+        )
+
+
+class FundingRateStore:
+    """
+    Rolling funding-rate cache shared by all funding consumers.
+
+    Funding rates are public market data, so one store serves every user.
+    """
+
+    def __init__(
+        self,
+        fetch_json: Optional[FetchJson] = None,
+        retention: int = 100,
+        current_ttl_seconds: float = 60.0
+    ):
+        self.retention = retention
+        self.current_ttl = timedelta(seconds=current_ttl_seconds)
+        self._fetch_json = fetch_json or self._default_fetch
+        self._series: Dict[str, _SymbolSeries] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.base_url = get_infra_config().okx_base_url
+        self.fetch_count = 0
+
+    def _get_series(self, symbol: str) -> _SymbolSeries:
+        series = self._series.get(symbol)
+        if series is None:
+            series = self._series[symbol] = _SymbolSeries(symbol, self.retention)
+        return series
+
+    async def _default_fetch(self, path: str) -> Dict:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        proxy = None
+        if os.getenv("USE_PROXY", "false").lower() == "true":
+            proxy = os.getenv("PROXY_URL", "") or None
+        session = self._session
+        url = f"{self.base_url}{path}"
+
+        async def _send() -> Dict:
+            async with session.get(url, proxy=proxy) as resp:
+                return await resp.json()
+
+        return await get_request_scheduler().run(path, _send, coalesce=True)
+
+    async def _fetch(self, path: str) -> Dict:
+        self.fetch_count += 1
+        return await self._fetch_json(path)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def peek(self, symbol: str) -> Optional[FundingRateStats]:
+        """Latest precomputed stats without any I/O (None if never loaded)"""
+        series = self._series.get(symbol)
+        return series.stats if series else None
+
+    def history(self, symbol: str, hours: Optional[int] = None) -> List[FundingRate]:
+        """Cached settlements, newest first, optionally limited to the last ``hours``"""
+        series = self._series.get(symbol)
+        if not series:
+            return []
+        if hours is None:
+            return list(series.settlements)
+        cutoff = datetime.now() - timedelta(hours=hours)
+        return [r for r in series.settlements if r.timestamp > cutoff]
+
+    async def get_stats(self, symbol: str) -> Optional[FundingRateStats]:
+        """Stats for ``symbol``, refreshing only what is stale"""
+        series = self._get_series(symbol)
+        if not self._needs_refresh(series, datetime.now()):
+            return series.stats
+        return await self.refresh(symbol)
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def _needs_refresh(self, series: _SymbolSeries, now: datetime) -> bool:
+        if series.stats is None or not series.history_loaded:
+            return True
+        if series.current_fetched_at is None or now - series.current_fetched_at >= self.current_ttl:
+            return True
+        return bool(series.next_settlement_time and now >= series.next_settlement_time)
+
+    async def refresh(self, symbol: str, force: bool = False) -> Optional[FundingRateStats]:
+        series = self._get_series(symbol)
+        async with series.lock:
+            now = datetime.now()
+            # Another waiter may have refreshed while we queued on the lock
+            if not force and not self._needs_refresh(series, now):
+                return series.stats
+
+            if series.next_settlement_time and now >= series.next_settlement_time:
+                series.pending_settlement = series.next_settlement_time
+                current_stale = True
+            else:
+                current_stale = (
+                    force
+                    or series.current_fetched_at is None
+                    or now - series.current_fetched_at >= self.current_ttl
+                )
+
+            changed = False
+            if current_stale:
+                changed |= await self._refresh_current(series, now)
+
+            last = series.last_settlement_time
+            pending = series.pending_settlement
+            if force or not series.history_loaded or (pending and (last is None or last < pending)):
+                changed |= await self._refresh_history(series)
+                last = series.last_settlement_time
+                if pending and last is not None and last >= pending:
+                    series.pending_settlement = None
+
+            if changed or series.stats is None:
+                if series.current_rate is None and not series.settlements:
+                    return None
+                series.recompute(now)
+            return series.stats
+
+    async def _refresh_current(self, series: _SymbolSeries, now: datetime) -> bool:
+        data = await self._fetch(f"/api/v5/public/funding-rate?instId={series.symbol}")
+        if data.get('code') != '0' or not data.get('data'):
+            logger.error(f"[FundingStore] Current rate API error for {series.symbol}: {data.get('msg')}")
+            return False
+
+        rate_data = data['data'][0]
+        series.current_rate = float(rate_data.get('fundingRate', 0) or 0)
+        next_time_ms = int(rate_data.get('fundingTime', 0) or 0)
+        series.next_settlement_time = datetime.fromtimestamp(next_time_ms / 1000) if next_time_ms else None
+        series.current_fetched_at = now
+        return True
+
+    async def _refresh_history(self, series: _SymbolSeries) -> bool:
+        if series.history_loaded and series.settlements:
+            # Only settlements newer than the latest one we hold
+            since_ms = int(series.last_settlement_time.timestamp() * 1000)
+            path = f"/api/v5/public/funding-rate-history?instId={series.symbol}&before={since_ms}&limit=100"
+        else:
+            path = f"/api/v5/public/funding-rate-history?instId={series.symbol}&limit={min(self.retention, 100)}"
+
+        data = await self._fetch(path)
+        if data.get('code') != '0':
+            logger.warning(f"[FundingStore] History API error for {series.symbol}: {data.get('msg')}")
+            return False
+
+        rates = []
+        for item in data.get('data') or []:
+            timestamp_ms = int(item.get('fundingTime', 0) or 0)
+            if not timestamp_ms:
+                continue
+            rates.append(FundingRate(
+                symbol=series.symbol,
+                rate=float(item.get('fundingRate', 0) or 0),
+                next_settlement_time=None,
+                timestamp=datetime.fromtimestamp(timestamp_ms / 1000)
+            ))
+
+        added = series.merge(rates)
+        series.history_loaded = True
+        if added:
+            logger.debug(f"[FundingStore] {series.symbol}: +{added} settlements (total {len(series.settlements)})")
+        return added > 0
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
+_store: Optional[FundingRateStore] = None
+
+
+def get_funding_rate_store() -> FundingRateStore:
+    """Get the process-wide funding rate store"""
+    global _store
+    if _store is None:
+        _store = FundingRateStore()
+    return _store
@@ -11,6 +11,9 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 
+from ..metrics import record_latency
+from ..observability.tracing import start_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,8 +100,11 @@ class TradingMetricsCollector:
         metrics = PhaseMetrics(phase_name=phase_name)
         metrics.start_time = time.time()
         
+        # 阶段同时记录为 span，会议的火焰图/关键路径可看到每个阶段的耗时
+        span = start_span("meeting.phase", phase=phase_name)
         try:
-            yield metrics
+            with span:
+                yield metrics
             metrics.success = True
         except Exception as e:
             metrics.success = False
@@ -108,6 +114,7 @@ class TradingMetricsCollector:
             metrics.end_time = time.time()
             metrics.duration_ms = (metrics.end_time - metrics.start_time) * 1000
             self._phase_metrics.append(metrics)
+            record_latency("phase", phase_name, metrics.duration_ms / 1000, ok=metrics.success)
             
             # Trim history
             if len(self._phase_metrics) > self.max_history:
@@ -20,6 +20,7 @@ from app.models.trading_models import (
     Position, AccountBalance, MarketData
 )
 from app.core.trading.trading_config import get_infra_config
+from app.core.trading.request_scheduler import get_request_scheduler, RATE_LIMIT_CODES
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,8 @@ class OKXClient:
 
         self._session: Optional[aiohttp.ClientSession] = None
         self._initialized = False
+        # Private endpoint rate limits are per account; public ones are shared per IP
+        self._scheduler_owner = f"okx:{self.api_key[-6:]}:{'demo' if self.demo_mode else 'real'}"
 
     def _get_timestamp(self) -> str:
         """Get ISO format timestamp for API calls"""
@@ -249,61 +252,81 @@ class OKXClient:
         proxy = os.getenv('http_proxy') or os.getenv('HTTP_PROXY')
         return proxy
     
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if not self._session:
+            # Increase timeout to 30 seconds
+            timeout = aiohttp.ClientTimeout(total=30)
+            self._session = aiohttp.ClientSession(timeout=timeout)
+        return self._session
+
+    async def _public_get(self, path: str) -> Dict:
+        """Unauthenticated GET through the shared session and request scheduler"""
+        session = self._ensure_session()
+        url = self.base_url + path
+        proxy = self._get_proxy()
+
+        async def _send() -> Dict:
+            async with session.get(url, proxy=proxy) as resp:
+                return await resp.json()
+
+        return await get_request_scheduler().run(path, _send, coalesce=True)
+
     async def _request(self, method: str, path: str, body: Optional[Dict] = None, max_retries: int = 3) -> Dict:
         """
         Make authenticated API request with retry mechanism
-        
+
+        All calls go through the shared request scheduler, which enforces
+        OKX per-endpoint rate limits, serves order/TP-SL requests ahead of
+        reads and coalesces identical in-flight GETs. On rate-limit codes the
+        scheduler pauses the endpoint bucket, so a retry simply re-queues.
+
         Args:
             method: HTTP method (GET/POST)
             path: API path
             body: Request body for POST
             max_retries: Maximum retry attempts for transient errors
         """
-        if not self._session:
-            # Increase timeout to 30 seconds
-            timeout = aiohttp.ClientTimeout(total=30)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+        session = self._ensure_session()
+        scheduler = get_request_scheduler()
 
+        method = method.upper()
         body_str = json.dumps(body) if body else ''
         url = self.base_url + path
         proxy = self._get_proxy()
-        
+
+        async def _send() -> Dict:
+            # Headers are built after queueing so the signed timestamp is current
+            headers = self._get_headers(method, path, body_str)
+            if method == 'GET':
+                async with session.get(url, headers=headers, proxy=proxy) as resp:
+                    return await resp.json()
+            async with session.post(url, headers=headers, data=body_str, proxy=proxy) as resp:
+                return await resp.json()
+
         last_error = None
         
         for attempt in range(max_retries):
             try:
-                # Generate fresh headers for each attempt (timestamp must be current)
-                headers = self._get_headers(method.upper(), path, body_str)
-                
-                if method.upper() == 'GET':
-                    async with self._session.get(url, headers=headers, proxy=proxy) as resp:
-                        result = await resp.json()
-                        logger.debug(f"OKX API GET {path}: code={result.get('code')}")
-                        
-                        # Check for rate limit or server errors that warrant retry
-                        if result.get('code') in ['50001', '50004', '50011', '50013']:
-                            # Rate limit or system busy - retry with backoff
-                            if attempt < max_retries - 1:
-                                wait_time = (2 ** attempt) + 0.5  # Exponential backoff
-                                logger.warning(f"[OKX API] Rate limited/busy, retrying in {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
-                                await asyncio.sleep(wait_time)
-                                continue
-                        
-                        return result
-                else:
-                    async with self._session.post(url, headers=headers, data=body_str, proxy=proxy) as resp:
-                        result = await resp.json()
-                        logger.debug(f"OKX API POST {path}: code={result.get('code')}")
-                        
-                        # Check for rate limit or server errors
-                        if result.get('code') in ['50001', '50004', '50011', '50013']:
-                            if attempt < max_retries - 1:
-                                wait_time = (2 ** attempt) + 0.5
-                                logger.warning(f"[OKX API] Rate limited/busy, retrying in {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
-                                await asyncio.sleep(wait_time)
-                                continue
-                        
-                        return result
+                result = await scheduler.run(
+                    path, _send, owner=self._scheduler_owner, coalesce=(method == 'GET')
+                )
+                code = result.get('code')
+                logger.debug(f"OKX API {method} {path}: code={code}")
+
+                if code in RATE_LIMIT_CODES and attempt < max_retries - 1:
+                    # Bucket already paused by the scheduler; re-queue
+                    logger.warning(f"[OKX API] Rate limited on {path}, re-queueing (attempt {attempt + 1}/{max_retries})")
+                    continue
+
+                # Check for server errors that warrant retry
+                if code in ['50001', '50004', '50013'] and attempt < max_retries - 1:
+                    wait_time = (2 ** attempt) + 0.5  # Exponential backoff
+                    logger.warning(f"[OKX API] System busy, retrying in {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
+                    await asyncio.sleep(wait_time)
+                    continue
+
+                return result
                         
             except asyncio.TimeoutError as e:
                 last_error = e
@@ -364,6 +387,44 @@ class OKXClient:
 
         return 0.0
 
+    @staticmethod
+    def parse_balance_row(account: Dict[str, Any], max_avail_size: Optional[float] = None) -> AccountBalance:
+        """
+        Convert an OKX account row (REST ``/account/balance`` or the private
+        ``account`` WebSocket channel) into an AccountBalance.
+        """
+        usdt_balance = 0.0
+        frozen_balance = 0.0  # Frozen balance = used margin
+        unrealized_pnl = 0.0
+
+        for d in account.get('details', []) or []:
+            if d.get('ccy') == 'USDT':
+                usdt_balance = float(d.get('availBal', 0) or 0)
+                frozen_balance = float(d.get('frozenBal', 0) or 0)  # Get frozen balance
+                unrealized_pnl = float(d.get('upl', 0) or 0)  # Get unrealized PnL
+                break
+
+        # 🆕 Calculate trading-specific equity: USDT balance + position value
+        # This is what we WANT for tracking BTC-USDT trading performance:
+        # - usdt_balance: Available USDT for trading
+        # - frozen_balance: USDT used as margin in positions
+        # - unrealized_pnl: Current profit/loss of open positions
+        #
+        # OKX's totalEq includes ALL assets (BTC, ETH, etc.) which doesn't
+        # reflect our trading performance - only this pair matters
+        trading_equity = usdt_balance + frozen_balance + unrealized_pnl
+
+        return AccountBalance(
+            total_equity=trading_equity,  # 🔑 Use trading-specific equity
+            available_balance=usdt_balance,
+            used_margin=frozen_balance,  # USDT margin in positions
+            unrealized_pnl=unrealized_pnl,
+            realized_pnl_today=0.0,
+            max_avail_size=max_avail_size,  # OKX calculated real max available size
+            calculated_equity=trading_equity,  # Same as total_equity now
+            currency="USDT"
+        )
+
     async def get_account_balance(self) -> AccountBalance:
         """Get account balance - including OKX calculated real max available size"""
         try:
@@ -372,52 +433,21 @@ class OKXClient:
 
                 if data.get('code') == '0':
                     account = data.get('data', [{}])[0]
-                    details = account.get('details', [])
-
-                    usdt_balance = 0.0
-                    frozen_balance = 0.0  # Frozen balance = used margin
-                    unrealized_pnl = 0.0
-
-                    for d in details:
-                        if d.get('ccy') == 'USDT':
-                            usdt_balance = float(d.get('availBal', 0) or 0)
-                            frozen_balance = float(d.get('frozenBal', 0) or 0)  # Get frozen balance
-                            unrealized_pnl = float(d.get('upl', 0) or 0)  # Get unrealized PnL
-                            break
-
-                    total_equity = float(account.get('totalEq', 0) or 0)
 
                     # Get OKX calculated real max available size
                     max_avail_size = await self.get_max_avail_size()
 
-                    # 🆕 Calculate trading-specific equity: USDT balance + position value
-                    # This is what we WANT for tracking BTC-USDT trading performance:
-                    # - usdt_balance: Available USDT for trading
-                    # - frozen_balance: USDT used as margin in positions
-                    # - unrealized_pnl: Current profit/loss of open positions
-                    # 
-                    # OKX's totalEq includes ALL assets (BTC, ETH, etc.) which doesn't 
-                    # reflect our trading performance - only this pair matters
-                    trading_equity = usdt_balance + frozen_balance + unrealized_pnl
-                    
+                    balance = self.parse_balance_row(account, max_avail_size=max_avail_size)
+
                     # Log: record account status with both values for comparison
                     logger.info(
                         f"[OKXClient] Account status: maxAvail=${max_avail_size:.2f}, "
-                        f"USDTBalance=${usdt_balance:.2f}, frozenBal=${frozen_balance:.2f}, "
-                        f"upl=${unrealized_pnl:.2f}, totalEq(全资产)=${total_equity:.2f}, "
-                        f"tradingEq(交易权益)=${trading_equity:.2f}"
+                        f"USDTBalance=${balance.available_balance:.2f}, frozenBal=${balance.used_margin:.2f}, "
+                        f"upl=${balance.unrealized_pnl:.2f}, totalEq(全资产)=${float(account.get('totalEq', 0) or 0):.2f}, "
+                        f"tradingEq(交易权益)=${balance.total_equity:.2f}"
                     )
 
-                    return AccountBalance(
-                        total_equity=trading_equity,  # 🔑 Use trading-specific equity
-                        available_balance=usdt_balance,
-                        used_margin=frozen_balance,  # USDT margin in positions
-                        unrealized_pnl=unrealized_pnl,
-                        realized_pnl_today=0.0,
-                        max_avail_size=max_avail_size,  # OKX calculated real max available size
-                        calculated_equity=trading_equity,  # Same as total_equity now
-                        currency="USDT"
-                    )
+                    return balance
 
         except Exception as e:
             logger.error(f"Error fetching balance: {e}")
@@ -426,33 +456,27 @@ class OKXClient:
     async def get_market_price(self, symbol: str = "BTC-USDT-SWAP") -> MarketData:
         """Get current market data (public API - no auth needed)"""
         try:
-            timeout = aiohttp.ClientTimeout(total=30)
-            proxy = self._get_proxy()
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Use public API for ticker
-                inst_id = symbol  # e.g., "BTC-USDT-SWAP"
-                url = f"{self.base_url}/api/v5/market/ticker?instId={inst_id}"
-
-                async with session.get(url, proxy=proxy) as resp:
-                    data = await resp.json()
-
-                    if data.get('code') == '0' and data.get('data'):
-                        ticker = data['data'][0]
-                        logger.info(f"OKX ticker: {symbol} price=${ticker.get('last')}")
-                        return MarketData(
-                            symbol=symbol,
-                            price=float(ticker.get('last', 0)),
-                            price_24h_change=float(ticker.get('sodUtc0', 0)) if ticker.get('sodUtc0') else 0,
-                            volume_24h=float(ticker.get('vol24h', 0) or 0),
-                            high_24h=float(ticker.get('high24h', 0) or 0),
-                            low_24h=float(ticker.get('low24h', 0) or 0),
-                            open_24h=float(ticker.get('open24h', 0) or 0),
-                            funding_rate=None,
-                            open_interest=None
-                        )
-                    else:
-                        logger.error(f"OKX API error: {data.get('msg')}")
-                        raise RuntimeError(f"OKX API error: {data.get('msg')}")
+            # Use public API for ticker
+            inst_id = symbol  # e.g., "BTC-USDT-SWAP"
+            data = await self._public_get(f"/api/v5/market/ticker?instId={inst_id}")
+
+            if data.get('code') == '0' and data.get('data'):
+                ticker = data['data'][0]
+                logger.info(f"OKX ticker: {symbol} price=${ticker.get('last')}")
+                return MarketData(
+                    symbol=symbol,
+                    price=float(ticker.get('last', 0)),
+                    price_24h_change=float(ticker.get('sodUtc0', 0)) if ticker.get('sodUtc0') else 0,
+                    volume_24h=float(ticker.get('vol24h', 0) or 0),
+                    high_24h=float(ticker.get('high24h', 0) or 0),
+                    low_24h=float(ticker.get('low24h', 0) or 0),
+                    open_24h=float(ticker.get('open24h', 0) or 0),
+                    funding_rate=None,
+                    open_interest=None
+                )
+            else:
+                logger.error(f"OKX API error: {data.get('msg')}")
+                raise RuntimeError(f"OKX API error: {data.get('msg')}")
 
         except asyncio.TimeoutError:
             logger.error(f"Timeout fetching market price for {symbol}")
@@ -461,6 +485,66 @@ class OKXClient:
             logger.error(f"Error fetching market price: {e}")
             raise RuntimeError(f"Failed to fetch market price from OKX: {e}")
 
+    @staticmethod
+    def parse_position_row(
+        pos: Dict[str, Any],
+        symbol: str,
+        tp_price: Optional[float] = None,
+        sl_price: Optional[float] = None
+    ) -> Optional[Position]:
+        """
+        Convert one OKX position row into a Position.
+
+        The REST ``/account/positions`` endpoint and the private ``positions``
+        WebSocket channel share the same row layout, so both paths use this.
+        Returns None for flat rows (pos == 0).
+        """
+        pos_amt = float(pos.get('pos', 0) or 0)
+        if abs(pos_amt) <= 0:
+            return None
+
+        pos_side = pos.get('posSide', '')
+        if pos_side in ['long', 'short']:
+            side = pos_side
+        else:
+            side = 'long' if pos_amt > 0 else 'short'
+
+        entry_price = float(pos.get('avgPx', 0) or 0)
+        mark_price = float(pos.get('markPx', entry_price) or entry_price)
+        leverage = int(float(pos.get('lever', 1) or 1))
+        upl = float(pos.get('upl', 0) or 0)
+        margin = float(pos.get('margin', 0) or 0)
+        liq_price = float(pos.get('liqPx', 0) or 0)
+
+        # 🔧 FIX: pos_amt is in CONTRACTS (e.g., 5), need to convert to BTC
+        # BTC-USDT-SWAP: 1 contract = 0.01 BTC
+        contract_val = 0.01
+        size_in_btc = abs(pos_amt) * contract_val
+
+        # Calculate margin from position value / leverage
+        position_value = size_in_btc * entry_price
+        calculated_margin = position_value / leverage if leverage > 0 else position_value
+        actual_margin = margin if margin > 0 else calculated_margin
+
+        # Calculate PnL percent using actual margin
+        pnl_percent = (upl / actual_margin * 100) if actual_margin > 0 else 0
+
+        return Position(
+            symbol=symbol,
+            direction=side,
+            size=size_in_btc,  # 🔧 FIX: Use BTC not contracts
+            entry_price=entry_price,
+            current_price=mark_price,
+            leverage=leverage,
+            unrealized_pnl=upl,
+            unrealized_pnl_percent=pnl_percent,
+            margin=actual_margin,
+            liquidation_price=liq_price,
+            take_profit_price=tp_price,
+            stop_loss_price=sl_price,
+            opened_at=datetime.now()
+        )
+
     async def get_current_position(self, symbol: str = "BTC-USDT-SWAP") -> Optional[Position]:
         """Get current open position
         
@@ -489,49 +573,15 @@ class OKXClient:
                             else:
                                 # Fallback to pos sign for net mode
                                 side = 'long' if pos_amt > 0 else 'short'
-                            
-                            entry_price = float(pos.get('avgPx', 0) or 0)
-                            mark_price = float(pos.get('markPx', entry_price) or entry_price)
-                            leverage = int(pos.get('lever', 1) or 1)
-                            upl = float(pos.get('upl', 0) or 0)
-                            margin = float(pos.get('margin', 0) or 0)
-                            liq_price = float(pos.get('liqPx', 0) or 0)
-                            utime = int(pos.get('uTime', 0) or 0)  # Update time for priority
 
                             # Get TP/SL prices
                             tp_price, sl_price = await self._get_tp_sl_prices(symbol, side)
-                            
-                            # Calculate margin from position value / leverage
-                            # 🔧 FIX: pos_amt is in CONTRACTS (e.g., 5), need to convert to BTC
-                            # BTC-USDT-SWAP: 1 contract = 0.01 BTC
-                            contract_val = 0.01
-                            size_in_btc = abs(pos_amt) * contract_val
-                            
-                            position_value = size_in_btc * entry_price
-                            calculated_margin = position_value / leverage if leverage > 0 else position_value
-                            actual_margin = margin if margin > 0 else calculated_margin
-                            
-                            # Calculate PnL percent using actual margin
-                            pnl_percent = (upl / actual_margin * 100) if actual_margin > 0 else 0
 
+                            position = self.parse_position_row(pos, symbol, tp_price, sl_price)
                             active_positions.append({
-                                'position': Position(
-                                    symbol=symbol,
-                                    direction=side,
-                                    size=size_in_btc,  # 🔧 FIX: Use BTC not contracts
-                                    entry_price=entry_price,
-                                    current_price=mark_price,
-                                    leverage=leverage,
-                                    unrealized_pnl=upl,
-                                    unrealized_pnl_percent=pnl_percent,
-                                    margin=actual_margin,
-                                    liquidation_price=liq_price,
-                                    take_profit_price=tp_price,
-                                    stop_loss_price=sl_price,
-                                    opened_at=datetime.now()
-                                ),
-                                'utime': utime,
-                                'size': size_in_btc  # 🔧 FIX: Use BTC not contracts
+                                'position': position,
+                                'utime': int(pos.get('uTime', 0) or 0),  # Update time for priority
+                                'size': position.size
                             })
                     
                     if active_positions:
@@ -999,36 +1049,30 @@ class OKXClient:
     ) -> List[Dict]:
         """Get candlestick data for technical analysis"""
         try:
-            timeout = aiohttp.ClientTimeout(total=30)
-            proxy = self._get_proxy()
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Map timeframe to OKX format
-                bar_map = {
-                    '1m': '1m', '5m': '5m', '15m': '15m', '30m': '30m',
-                    '1h': '1H', '4h': '4H', '1d': '1D', '1w': '1W'
-                }
-                bar = bar_map.get(timeframe.lower(), '4H')
-
-                url = f"{self.base_url}/api/v5/market/candles?instId={symbol}&bar={bar}&limit={limit}"
-
-                async with session.get(url, proxy=proxy) as resp:
-                    data = await resp.json()
-
-                    if data.get('code') == '0':
-                        return [
-                            {
-                                'timestamp': int(candle[0]),
-                                'open': float(candle[1]),
-                                'high': float(candle[2]),
-                                'low': float(candle[3]),
-                                'close': float(candle[4]),
-                                'volume': float(candle[5])
-                            }
-                            for candle in data.get('data', [])
-                        ]
-                    else:
-                        logger.error(f"OKX klines API error: {data.get('msg')}")
-                        return []
+            # Map timeframe to OKX format
+            bar_map = {
+                '1m': '1m', '5m': '5m', '15m': '15m', '30m': '30m',
+                '1h': '1H', '4h': '4H', '1d': '1D', '1w': '1W'
+            }
+            bar = bar_map.get(timeframe.lower(), '4H')
+
+            data = await self._public_get(f"/api/v5/market/candles?instId={symbol}&bar={bar}&limit={limit}")
+
+            if data.get('code') == '0':
+                return [
+                    {
+                        'timestamp': int(candle[0]),
+                        'open': float(candle[1]),
+                        'high': float(candle[2]),
+                        'low': float(candle[3]),
+                        'close': float(candle[4]),
+                        'volume': float(candle[5])
+                    }
+                    for candle in data.get('data', [])
+                ]
+            else:
+                logger.error(f"OKX klines API error: {data.get('msg')}")
+                return []
 
         except asyncio.TimeoutError:
             logger.error(f"Timeout fetching klines for {symbol}")
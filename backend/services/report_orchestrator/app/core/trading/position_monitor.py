@@ -3,6 +3,10 @@ Position Monitor
 
 Real-time monitoring of open positions.
 Tracks PnL, checks TP/SL triggers, and initiates new analysis cycles when needed.
+
+Updates arrive from a PositionStream (OKX private WebSocket) when one is
+connected; otherwise the monitor polls REST with an adaptive interval that
+shrinks as price approaches TP/SL/liquidation and backs off while flat.
 """
 
 import asyncio
@@ -11,7 +15,8 @@ from datetime import datetime
 from typing import Optional, Callable, Dict, Any, List
 from dataclasses import dataclass, field
 
-from app.models.trading_models import Position, EquitySnapshot
+from app.models.trading_models import Position, AccountBalance, EquitySnapshot
+from app.core.trading.position_stream import PositionStream, PositionUpdate
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +31,13 @@ class MonitoringState:
     unrealized_pnl_percent: float = 0.0
     tp_distance_percent: Optional[float] = None
     sl_distance_percent: Optional[float] = None
+    liquidation_distance_percent: Optional[float] = None
     last_check: Optional[datetime] = None
     check_count: int = 0
+    stream_connected: bool = False
+    stream_update_count: int = 0
+    last_source: Optional[str] = None  # "rest" | "stream"
+    next_check_seconds: Optional[float] = None
 
 
 @dataclass
@@ -60,20 +70,31 @@ class EquityHistory:
 class PositionMonitorConfig:
     """Position Monitor Configuration"""
     default_balance: float = 10000.0  # Default balance (for simulation/testing)
-    check_interval_seconds: int = 60
+    check_interval_seconds: int = 60  # Base polling interval with an open position
     tp_warning_threshold: float = 2.0  # TP proximity warning threshold (percent)
     sl_warning_threshold: float = 2.0  # SL proximity warning threshold (percent)
 
+    # Adaptive polling
+    min_check_interval_seconds: float = 5.0  # Interval when price is at the near threshold
+    near_trigger_percent: float = 0.5  # Distance to TP/SL/liquidation treated as "near"
+    max_idle_interval_seconds: float = 300.0  # Backoff ceiling while flat
+    idle_backoff_factor: float = 2.0
+
+    # Stream handling
+    stream_reconcile_interval_seconds: float = 120.0  # REST cross-check while stream is healthy
+    stream_reconnect_max_seconds: float = 30.0
+
 
 class PositionMonitor:
     """
     Real-time position monitoring service.
 
     Features:
-    - Monitor open positions at configurable intervals
+    - Push updates from a PositionStream, REST polling as fallback
+    - Adaptive polling: faster near TP/SL/liquidation, backoff when flat
     - Track unrealized PnL
     - Detect TP/SL proximity
-    - Trigger callbacks on position close
+    - Trigger callbacks on position close and TP/SL hits
     - Maintain equity history for charting
     """
 
@@ -85,11 +106,15 @@ class PositionMonitor:
         on_tp_hit: Optional[Callable] = None,
         on_sl_hit: Optional[Callable] = None,
         on_pnl_update: Optional[Callable] = None,
-        config: PositionMonitorConfig = None
+        config: PositionMonitorConfig = None,
+        stream: Optional[PositionStream] = None,
+        symbol: str = "BTC-USDT-SWAP"
     ):
         self.config = config or PositionMonitorConfig(check_interval_seconds=check_interval_seconds)
         self.okx_client = okx_client
-        self.check_interval = check_interval_seconds
+        self.stream = stream
+        self.symbol = symbol
+        self.check_interval = self.config.check_interval_seconds
         self.on_position_closed = on_position_closed
         self.on_tp_hit = on_tp_hit
         self.on_sl_hit = on_sl_hit
@@ -98,8 +123,15 @@ class PositionMonitor:
         self._state = MonitoringState()
         self._equity_history = EquityHistory()
         self._task: Optional[asyncio.Task] = None
+        self._stream_task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
+        self._wake_event = asyncio.Event()
         self._last_position: Optional[Position] = None
+        # Stream and REST loops both apply observations; serialize so an open/close
+        # is detected (and its handlers run) exactly once
+        self._apply_lock = asyncio.Lock()
+        self._last_balance: Optional[AccountBalance] = None
+        self._idle_interval: Optional[float] = None
 
     @property
     def state(self) -> MonitoringState:
@@ -109,6 +141,10 @@ class PositionMonitor:
     def equity_history(self) -> EquityHistory:
         return self._equity_history
 
+    def request_check(self):
+        """Wake the polling loop now (e.g. right after our own order was placed)"""
+        self._wake_event.set()
+
     async def start(self):
         """Start position monitoring"""
         if self._state.is_monitoring:
@@ -116,9 +152,15 @@ class PositionMonitor:
             return
 
         self._stop_event.clear()
+        self._wake_event.clear()
         self._state.is_monitoring = True
         self._task = asyncio.create_task(self._monitor_loop())
-        logger.info(f"Position monitor started (interval: {self.check_interval}s)")
+        if self.stream is not None:
+            self._stream_task = asyncio.create_task(self._stream_loop())
+        logger.info(
+            f"Position monitor started (interval: {self.check_interval}s, "
+            f"stream: {'on' if self.stream is not None else 'off'})"
+        )
 
     async def stop(self):
         """Stop position monitoring"""
@@ -126,33 +168,45 @@ class PositionMonitor:
             return
 
         self._stop_event.set()
+        self._wake_event.set()
         self._state.is_monitoring = False
 
-        if self._task:
-            self._task.cancel()
+        for task in (self._task, self._stream_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._stream_task = None
+
+        if self.stream is not None:
             try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
+                await self.stream.close()
+            except Exception as e:
+                logger.warning(f"Error closing position stream: {e}")
+        self._state.stream_connected = False
 
         logger.info("Position monitor stopped")
 
     async def _monitor_loop(self):
-        """Main monitoring loop"""
+        """Main polling loop (primary source without a stream, reconciliation with one)"""
         while not self._stop_event.is_set():
             try:
                 await self._check_position()
 
-                # Wait for next check or stop event
+                interval = self._next_interval()
+                if self._stream_healthy():
+                    interval = max(interval, self.config.stream_reconcile_interval_seconds)
+                self._state.next_check_seconds = interval
+
+                # Wait for next check, an explicit wake-up or stop
                 try:
-                    await asyncio.wait_for(
-                        self._stop_event.wait(),
-                        timeout=self.check_interval
-                    )
-                    break  # Stop was requested
+                    await asyncio.wait_for(self._wake_event.wait(), timeout=interval)
                 except asyncio.TimeoutError:
                     pass  # Normal timeout, continue monitoring
+                self._wake_event.clear()
 
             except asyncio.CancelledError:
                 break
@@ -160,8 +214,99 @@ class PositionMonitor:
                 logger.error(f"Error in monitor loop: {e}")
                 await asyncio.sleep(10)  # Brief pause before retrying
 
+    def _stream_healthy(self) -> bool:
+        return self.stream is not None and self.stream.connected
+
+    async def _stream_loop(self):
+        """Consume stream updates, reconnecting with backoff"""
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                await self.stream.connect()
+                self._state.stream_connected = True
+                backoff = 1.0
+                async for update in self.stream.updates():
+                    await self._apply_stream_update(update)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Position stream error, falling back to polling: {e}")
+
+            self._state.stream_connected = False
+            if self._stop_event.is_set():
+                break
+            # Poll immediately so the gap is covered, then retry the stream
+            self.request_check()
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, self.config.stream_reconnect_max_seconds)
+
+    async def _apply_stream_update(self, update: PositionUpdate):
+        self._state.stream_update_count += 1
+        if update.channel == "positions":
+            await self._apply_position(update.position, source="stream", carry_tp_sl=True)
+        elif update.channel == "account" and update.balance is not None:
+            self._last_balance = update.balance
+            self._record_equity(update.balance, self._last_position)
+
+    def _carry_tp_sl(self, position: Optional[Position]) -> Optional[Position]:
+        """Stream rows may omit attached TP/SL; keep the last known values for the same side"""
+        last = self._last_position
+        if position is None or last is None or last.direction != position.direction:
+            return position
+        if position.take_profit_price is None and position.stop_loss_price is None:
+            return position.model_copy(update={
+                "take_profit_price": last.take_profit_price,
+                "stop_loss_price": last.stop_loss_price,
+            })
+        return position
+
+    def _next_interval(self) -> float:
+        """
+        Adaptive polling interval.
+
+        - Flat: back off geometrically from the base interval to max_idle_interval_seconds
+        - In a position: interpolate between min_check_interval_seconds (at the
+          near threshold) and the base interval (at the TP/SL warning threshold),
+          using the closest of TP, SL and liquidation
+        """
+        cfg = self.config
+        base = float(self.check_interval)
+
+        if not self._state.has_position:
+            if self._idle_interval is None:
+                self._idle_interval = base
+            else:
+                self._idle_interval = min(
+                    cfg.max_idle_interval_seconds, self._idle_interval * cfg.idle_backoff_factor
+                )
+            return self._idle_interval
+
+        self._idle_interval = None
+        distances = [
+            abs(d) for d in (
+                self._state.tp_distance_percent,
+                self._state.sl_distance_percent,
+                self._state.liquidation_distance_percent,
+            ) if d is not None
+        ]
+        if not distances:
+            return base
+
+        nearest = min(distances)
+        near = cfg.near_trigger_percent
+        far = max(cfg.tp_warning_threshold, cfg.sl_warning_threshold, near)
+        if nearest <= near:
+            return cfg.min_check_interval_seconds
+        if nearest >= far:
+            return base
+        ratio = (nearest - near) / (far - near)
+        return cfg.min_check_interval_seconds + ratio * (base - cfg.min_check_interval_seconds)
+
     async def _check_position(self):
-        """Check current position status"""
+        """Check current position status via REST"""
         self._state.check_count += 1
         self._state.last_check = datetime.now()
 
@@ -171,8 +316,11 @@ class PositionMonitor:
             balance = None
 
             if self.okx_client:
-                position = await self.okx_client.get_current_position()
-                balance = await self.okx_client.get_account_balance()
+                # Independent endpoints: fetch concurrently
+                position, balance = await asyncio.gather(
+                    self.okx_client.get_current_position(self.symbol),
+                    self.okx_client.get_account_balance()
+                )
             else:
                 # Mock data for testing - use config default balance
                 balance = type('Balance', (), {
@@ -181,94 +329,106 @@ class PositionMonitor:
                     'unrealized_pnl': 0.0
                 })()
 
-            # Check if position was closed
-            if self._last_position and not position:
-                await self._handle_position_closed()
-
-            # Update state
-            if position:
-                self._state.has_position = True
-                self._state.current_position = {
-                    "symbol": position.symbol,
-                    "direction": position.direction,
-                    "size": position.size,
-                    "entry_price": position.entry_price,
-                    "current_price": position.current_price,
-                    "leverage": position.leverage,
-                    "unrealized_pnl": position.unrealized_pnl,
-                    "unrealized_pnl_percent": position.unrealized_pnl_percent
-                }
-                self._state.unrealized_pnl = position.unrealized_pnl
-                self._state.unrealized_pnl_percent = position.unrealized_pnl_percent
-
-                # Calculate distance to TP/SL
-                if position.take_profit_price:
-                    if position.direction == "long":
-                        self._state.tp_distance_percent = (
-                            (position.take_profit_price - position.current_price) /
-                            position.current_price * 100
-                        )
-                    else:
-                        self._state.tp_distance_percent = (
-                            (position.current_price - position.take_profit_price) /
-                            position.current_price * 100
-                        )
-
-                if position.stop_loss_price:
-                    if position.direction == "long":
-                        self._state.sl_distance_percent = (
-                            (position.current_price - position.stop_loss_price) /
-                            position.current_price * 100
-                        )
-                    else:
-                        self._state.sl_distance_percent = (
-                            (position.stop_loss_price - position.current_price) /
-                            position.current_price * 100
-                        )
-
-                # Check for TP/SL triggers
-                await self._check_tp_sl_triggers(position)
-
-                # Callback for PnL update
-                if self.on_pnl_update:
-                    try:
-                        await self.on_pnl_update(
-                            pnl=position.unrealized_pnl,
-                            pnl_percent=position.unrealized_pnl_percent,
-                            position=position
-                        )
-                    except Exception as e:
-                        logger.error(f"Error in PnL update callback: {e}")
-
-            else:
-                self._state.has_position = False
-                self._state.current_position = None
-                self._state.unrealized_pnl = 0.0
-                self._state.unrealized_pnl_percent = 0.0
-                self._state.tp_distance_percent = None
-                self._state.sl_distance_percent = None
-
-            # Record equity snapshot
-            equity = balance.total_equity if balance else self.config.default_balance
-            available = balance.available_balance if balance else self.config.default_balance
-            unrealized = balance.unrealized_pnl if balance else 0.0
-
-            snapshot = EquitySnapshot(
-                timestamp=datetime.now(),
-                equity=equity,
-                balance=available,
-                unrealized_pnl=unrealized,
-                has_position=self._state.has_position,
-                position_direction=position.direction if position else None
-            )
-            self._equity_history.add_snapshot(snapshot)
-
-            # Update last position
-            self._last_position = position
+            await self._apply_position(position, source="rest")
+            self._last_balance = balance
+            self._record_equity(balance, position)
 
         except Exception as e:
             logger.error(f"Error checking position: {e}")
 
+    async def _apply_position(self, position: Optional[Position], source: str, carry_tp_sl: bool = False):
+        """Update state from a position observation and emit events"""
+        async with self._apply_lock:
+            if carry_tp_sl:
+                position = self._carry_tp_sl(position)
+            previous = self._last_position
+            # Record the new observation before awaiting any handler
+            self._last_position = position
+            await self._apply_position_locked(previous, position, source)
+
+    async def _apply_position_locked(self, previous: Optional[Position], position: Optional[Position], source: str):
+        self._state.last_source = source
+
+        # Check if position was closed
+        if previous and not position:
+            await self._handle_position_closed(previous, source=source)
+
+        # Update state
+        if position:
+            self._state.has_position = True
+            self._state.current_position = {
+                "symbol": position.symbol,
+                "direction": position.direction,
+                "size": position.size,
+                "entry_price": position.entry_price,
+                "current_price": position.current_price,
+                "leverage": position.leverage,
+                "unrealized_pnl": position.unrealized_pnl,
+                "unrealized_pnl_percent": position.unrealized_pnl_percent
+            }
+            self._state.unrealized_pnl = position.unrealized_pnl
+            self._state.unrealized_pnl_percent = position.unrealized_pnl_percent
+            self._update_distances(position)
+
+            # Check for TP/SL triggers
+            await self._check_tp_sl_triggers(position)
+
+            # Callback for PnL update
+            if self.on_pnl_update:
+                try:
+                    await self.on_pnl_update(
+                        pnl=position.unrealized_pnl,
+                        pnl_percent=position.unrealized_pnl_percent,
+                        position=position
+                    )
+                except Exception as e:
+                    logger.error(f"Error in PnL update callback: {e}")
+
+        else:
+            self._state.has_position = False
+            self._state.current_position = None
+            self._state.unrealized_pnl = 0.0
+            self._state.unrealized_pnl_percent = 0.0
+            self._state.tp_distance_percent = None
+            self._state.sl_distance_percent = None
+            self._state.liquidation_distance_percent = None
+
+    def _update_distances(self, position: Position):
+        """Calculate distance (percent of current price) to TP/SL/liquidation"""
+        current = position.current_price
+        if not current:
+            return
+        sign = 1 if position.direction == "long" else -1
+
+        self._state.tp_distance_percent = (
+            sign * (position.take_profit_price - current) / current * 100
+            if position.take_profit_price else None
+        )
+        self._state.sl_distance_percent = (
+            sign * (current - position.stop_loss_price) / current * 100
+            if position.stop_loss_price else None
+        )
+        self._state.liquidation_distance_percent = (
+            sign * (current - position.liquidation_price) / current * 100
+            if position.liquidation_price else None
+        )
+
+    def _record_equity(self, balance, position: Optional[Position]):
+        """Record equity snapshot"""
+        equity = balance.total_equity if balance else self.config.default_balance
+        available = balance.available_balance if balance else self.config.default_balance
+        unrealized = balance.unrealized_pnl if balance else 0.0
+
+        snapshot = EquitySnapshot(
+            timestamp=datetime.now(),
+            equity=equity,
+            balance=available,
+            unrealized_pnl=unrealized,
+            has_position=position is not None,
+            position_direction=position.direction if position else None
+        )
+        self._equity_history.add_snapshot(snapshot)
+
     async def _check_tp_sl_triggers(self, position: Position):
         """Check if TP or SL is about to be triggered"""
         if not position.take_profit_price and not position.stop_loss_price:
@@ -304,20 +464,17 @@ class PositionMonitor:
                 if self.on_sl_hit:
                     await self.on_sl_hit(position=position, price=current)
 
-    async def _handle_position_closed(self):
+    async def _handle_position_closed(self, closed: Position, source: str = "rest"):
         """Handle position closure"""
-        if not self._last_position:
-            return
-
-        logger.info(f"Position closed detected")
+        logger.info(f"Position closed detected ({source})")
 
         # Calculate final PnL
-        final_pnl = self._last_position.unrealized_pnl
+        final_pnl = closed.unrealized_pnl
 
         if self.on_position_closed:
             try:
                 await self.on_position_closed(
-                    position=self._last_position,
+                    position=closed,
                     pnl=final_pnl,
                     reason="position_monitor_detected"
                 )
@@ -334,8 +491,13 @@ class PositionMonitor:
             "unrealized_pnl_percent": self._state.unrealized_pnl_percent,
             "tp_distance_percent": self._state.tp_distance_percent,
             "sl_distance_percent": self._state.sl_distance_percent,
+            "liquidation_distance_percent": self._state.liquidation_distance_percent,
             "last_check": self._state.last_check.isoformat() if self._state.last_check else None,
-            "check_count": self._state.check_count
+            "check_count": self._state.check_count,
+            "stream_connected": self._state.stream_connected,
+            "stream_update_count": self._state.stream_update_count,
+            "last_source": self._state.last_source,
+            "next_check_seconds": self._state.next_check_seconds
         }
 
     def get_equity_chart_data(self, limit: int = 100) -> List[Dict]:
@@ -0,0 +1,253 @@
+"""
+Position Stream
+
+Push-based sources of position/account updates for PositionMonitor.
+
+- OKXPrivatePositionStream: OKX private WebSocket (``positions`` + ``account`` channels)
+- LocalPositionStream: in-process stand-in used by tests and paper trading
+
+PositionMonitor consumes ``updates()`` while the stream is connected and falls
+back to REST polling whenever it is not.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from app.models.trading_models import Position, AccountBalance
+from app.core.trading.trading_config import get_infra_config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PositionUpdate:
+    """A single push from a position stream"""
+    channel: str  # "positions" | "account"
+    position: Optional[Position] = None  # For "positions": None means flat
+    balance: Optional[AccountBalance] = None  # For "account"
+    received_at: datetime = field(default_factory=datetime.now)
+
+
+class PositionStream(ABC):
+    """Interface for push-based position/account sources"""
+
+    @property
+    @abstractmethod
+    def connected(self) -> bool:
+        """Whether the stream is currently delivering updates"""
+
+    @abstractmethod
+    async def connect(self):
+        """Open the stream (login + subscribe)"""
+
+    @abstractmethod
+    async def close(self):
+        """Close the stream"""
+
+    @abstractmethod
+    def updates(self) -> AsyncIterator[PositionUpdate]:
+        """Iterate updates until the stream disconnects"""
+
+
+class LocalPositionStream(PositionStream):
+    """
+    In-process position stream.
+
+    Producers call ``push_position`` / ``push_balance``; ``disconnect`` simulates
+    a dropped connection so the consumer falls back to polling.
+    """
+
+    _DISCONNECT = object()
+
+    def __init__(self, max_queue: int = 1000):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def connect(self):
+        self._connected = True
+
+    async def close(self):
+        await self.disconnect()
+
+    async def disconnect(self):
+        if self._connected:
+            self._connected = False
+            await self._queue.put(self._DISCONNECT)
+
+    async def push_position(self, position: Optional[Position]):
+        await self._queue.put(PositionUpdate(channel="positions", position=position))
+
+    async def push_balance(self, balance: AccountBalance):
+        await self._queue.put(PositionUpdate(channel="account", balance=balance))
+
+    async def updates(self) -> AsyncIterator[PositionUpdate]:
+        while self._connected:
+            item = await self._queue.get()
+            if item is self._DISCONNECT:
+                return
+            yield item
+
+
+class OKXPrivatePositionStream(PositionStream):
+    """
+    OKX private WebSocket stream for one instrument.
+
+    Subscribes to the ``positions`` channel (filtered by instId) and the
+    ``account`` channel (USDT). OKX closes idle connections after 30s, so a
+    text ``ping`` is sent whenever nothing has been received for
+    ``ping_interval_seconds``.
+    """
+
+    def __init__(
+        self,
+        okx_client,
+        symbol: str = "BTC-USDT-SWAP",
+        url: Optional[str] = None,
+        ping_interval_seconds: float = 25.0,
+        login_timeout_seconds: float = 10.0
+    ):
+        infra = get_infra_config()
+        self.okx_client = okx_client
+        self.symbol = symbol
+        self.url = url or (
+            infra.okx_ws_private_demo_url if okx_client.demo_mode else infra.okx_ws_private_url
+        )
+        self.ping_interval = ping_interval_seconds
+        self.login_timeout = login_timeout_seconds
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        # Latest row per posSide (hedge mode can hold both long and short)
+        self._rows: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def is_available(okx_client) -> bool:
+        """Private channels need full API credentials"""
+        return bool(
+            okx_client
+            and getattr(okx_client, "api_key", "")
+            and getattr(okx_client, "secret_key", "")
+            and getattr(okx_client, "passphrase", "")
+        )
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    def _login_args(self) -> Dict[str, str]:
+        timestamp = str(int(time.time()))
+        return {
+            "apiKey": self.okx_client.api_key,
+            "passphrase": self.okx_client.passphrase,
+            "timestamp": timestamp,
+            "sign": self.okx_client._sign(timestamp, "GET", "/users/self/verify"),
+        }
+
+    async def connect(self):
+        if self.connected:
+            return
+        if not self.is_available(self.okx_client):
+            raise RuntimeError("OKX credentials not configured for private WebSocket")
+
+        if not self._session or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        self._ws = await self._session.ws_connect(self.url, proxy=self.okx_client._get_proxy())
+        self._rows.clear()
+
+        await self._ws.send_str(json.dumps({"op": "login", "args": [self._login_args()]}))
+        msg = await self._ws.receive(timeout=self.login_timeout)
+        reply = json.loads(msg.data) if msg.type == aiohttp.WSMsgType.TEXT else {}
+        if reply.get("event") != "login" or reply.get("code") not in ("0", 0):
+            await self.close()
+            raise RuntimeError(f"OKX WebSocket login failed: {reply.get('msg', reply)}")
+
+        await self._ws.send_str(json.dumps({
+            "op": "subscribe",
+            "args": [
+                {"channel": "positions", "instType": "SWAP", "instId": self.symbol},
+                {"channel": "account", "ccy": "USDT"},
+            ]
+        }))
+        logger.info(f"[PositionStream] OKX private stream connected for {self.symbol}")
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def updates(self) -> AsyncIterator[PositionUpdate]:
+        while self.connected:
+            try:
+                msg = await self._ws.receive(timeout=self.ping_interval)
+            except asyncio.TimeoutError:
+                await self._ws.send_str("ping")
+                continue
+
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                    logger.warning(f"[PositionStream] OKX stream closed ({msg.type})")
+                    self._ws = None
+                    return
+                continue
+            if msg.data == "pong":
+                continue
+
+            update = self._parse_message(json.loads(msg.data))
+            if update is not None:
+                yield update
+
+    def _parse_message(self, payload: Dict[str, Any]) -> Optional[PositionUpdate]:
+        if payload.get("event") == "error":
+            logger.error(f"[PositionStream] OKX stream error: {payload.get('msg')}")
+            return None
+
+        channel = (payload.get("arg") or {}).get("channel")
+        rows = payload.get("data")
+        if rows is None:
+            return None
+
+        if channel == "positions":
+            for row in rows:
+                if row.get("instId", self.symbol) != self.symbol:
+                    continue
+                self._rows[row.get("posSide") or "net"] = row
+            return PositionUpdate(channel="positions", position=self._current_position())
+
+        if channel == "account" and rows:
+            return PositionUpdate(
+                channel="account",
+                balance=self.okx_client.parse_balance_row(rows[0])
+            )
+
+        return None
+
+    def _current_position(self) -> Optional[Position]:
+        """Most recently updated non-flat row, matching OKXClient.get_current_position"""
+        active = [r for r in self._rows.values() if abs(float(r.get("pos", 0) or 0)) > 0]
+        if not active:
+            return None
+        row = max(active, key=lambda r: int(r.get("uTime", 0) or 0))
+
+        tp_price = sl_price = None
+        for algo in row.get("closeOrderAlgo") or []:
+            if algo.get("tpTriggerPx") and not tp_price:
+                tp_price = float(algo["tpTriggerPx"])
+            if algo.get("slTriggerPx") and not sl_price:
+                sl_price = float(algo["slTriggerPx"])
+
+        return self.okx_client.parse_position_row(row, self.symbol, tp_price, sl_price)
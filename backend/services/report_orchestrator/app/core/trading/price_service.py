@@ -1,14 +1,24 @@
 """
 Price Service
 
-Fetches real-time BTC price from multiple APIs.
-Uses Binance as primary, OKX as secondary, CoinGecko as tertiary.
+Fetches real-time prices from multiple APIs (Binance, OKX, CoinGecko).
 NO hardcoded fallback prices - raises error if all sources fail.
+
+Sources are queried as hedged requests: the historically fastest healthy
+source goes first, the next one is started if no answer arrives within a
+short hedge delay, and the first valid price wins (the rest are cancelled).
+Latency and failures are tracked per (symbol, source) to order future attempts.
+
+History is served from a cached candle series per (symbol, interval); after
+the first load only bars since the newest cached one are fetched.
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 
 import httpx
 
@@ -22,31 +32,149 @@ class PriceServiceError(Exception):
     pass
 
 
+# Base asset -> CoinGecko coin id
+COINGECKO_IDS: Dict[str, str] = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "SOL": "solana",
+    "BNB": "binancecoin",
+    "XRP": "ripple",
+    "DOGE": "dogecoin",
+    "ADA": "cardano",
+    "AVAX": "avalanche-2",
+    "LINK": "chainlink",
+    "DOT": "polkadot",
+}
+
+# History interval -> (seconds, Binance interval, OKX bar)
+HISTORY_INTERVALS: Dict[str, Tuple[int, str, str]] = {
+    "1h": (3600, "1h", "1H"),
+    "4h": (14400, "4h", "4H"),
+    "1d": (86400, "1d", "1Dutc"),
+}
+
+
+def normalize_asset(symbol: str) -> str:
+    """'BTC', 'BTC-USDT', 'BTC-USDT-SWAP', 'BTCUSDT' -> 'BTC'"""
+    base = symbol.upper().split("-")[0]
+    if base.endswith("USDT") and len(base) > 4:
+        base = base[:-4]
+    return base
+
+
+def history_interval(hours: int) -> Tuple[str, int]:
+    """Pick the candle interval and bar count for ``hours`` of history"""
+    if hours <= 24:
+        return "1h", max(1, hours)
+    if hours <= 168:  # 1 week
+        return "4h", max(1, hours // 4)
+    return "1d", max(1, hours // 24)
+
+
+@dataclass
+class SourceHealth:
+    """Latency / reliability of one source for one symbol"""
+    ewma_latency_ms: Optional[float] = None
+    failure_rate: float = 0.0  # EWMA of failures (0..1)
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    wins: int = 0
+    cooldown_until: float = 0.0
+
+    ALPHA = 0.3
+
+    def record(self, ok: bool, latency_ms: float, cooldown_after: int, cooldown_seconds: float):
+        self.failure_rate = (1 - self.ALPHA) * self.failure_rate + self.ALPHA * (0.0 if ok else 1.0)
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if self.ewma_latency_ms is None:
+                self.ewma_latency_ms = latency_ms
+            else:
+                self.ewma_latency_ms = (1 - self.ALPHA) * self.ewma_latency_ms + self.ALPHA * latency_ms
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= cooldown_after:
+                self.cooldown_until = time.monotonic() + cooldown_seconds
+
+    def score(self, default_latency_ms: float) -> float:
+        """Lower is better; unknown sources get the default latency"""
+        latency = self.ewma_latency_ms if self.ewma_latency_ms is not None else default_latency_ms
+        penalty = 1e6 if time.monotonic() < self.cooldown_until else 0.0
+        return latency * (1.0 + 4.0 * self.failure_rate) + penalty
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ewma_latency_ms": round(self.ewma_latency_ms, 1) if self.ewma_latency_ms is not None else None,
+            "failure_rate": round(self.failure_rate, 3),
+            "successes": self.successes,
+            "failures": self.failures,
+            "wins": self.wins,
+            "cooling_down": time.monotonic() < self.cooldown_until,
+        }
+
+
+@dataclass
+class _HistorySeries:
+    """Cached close prices for one (symbol, interval), oldest first"""
+    bars: List[Tuple[int, float]] = field(default_factory=list)  # (open_ts_ms, close)
+    refreshed_at: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def merge(self, fresh: List[Tuple[int, float]], keep: int):
+        by_ts = dict(self.bars)
+        by_ts.update(fresh)  # Newest bar is still forming: replace it
+        self.bars = sorted(by_ts.items())[-keep:]
+
+
 class PriceService:
     """
-    Real-time price service for BTC.
+    Real-time price service.
 
     Features:
-    - Multiple API sources: Binance (primary), OKX (secondary), CoinGecko (tertiary)
-    - Caching to avoid rate limits
+    - Multiple API sources: Binance, OKX, CoinGecko (hedged, latency-ordered)
+    - Per-symbol price cache and in-flight request sharing
+    - Cached, incrementally refreshed price history
     - NO hardcoded fallback prices - raises error if all sources fail
     """
 
     # Cache settings
     CACHE_TTL_SECONDS = 30  # Cache price for 30 seconds
+    HISTORY_REFRESH_SECONDS = 60  # Re-check history for new bars at most once a minute
+    HISTORY_RETENTION = 500
+    STALE_GRACE_SECONDS = 300  # Serve last valid price this long when every source fails
+
+    # Hedging
+    HEDGE_MIN_DELAY_MS = 150
+    HEDGE_MAX_DELAY_MS = 1000
+    DEFAULT_LATENCY_MS = 400
+    COOLDOWN_AFTER_FAILURES = 3
+    COOLDOWN_SECONDS = 30
+
+    PRICE_SOURCES = ("binance", "okx", "coingecko")
+    HISTORY_SOURCES = ("binance", "okx")  # Candle sources that can be merged incrementally
 
     def __init__(self, demo_mode: bool = False):
         self.demo_mode = demo_mode
-        self._cache: Dict[str, Any] = {}
-        self._last_fetch: Optional[datetime] = None
-        self._last_valid_price: Optional[float] = None  # Store last valid price for short-term failures
+        self._cache: Dict[str, Tuple[float, float]] = {}  # asset -> (price, fetched_at monotonic)
+        self._last_valid: Dict[str, Tuple[float, float]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._health: Dict[Tuple[str, str], SourceHealth] = {}
+        self._history: Dict[Tuple[str, str], _HistorySeries] = {}
         self._client: Optional[httpx.AsyncClient] = None
+        self._cache_hits = 0
+        self._cache_misses = 0
 
         # API endpoints from config
         infra = get_infra_config()
         self.binance_url = f"{infra.binance_base_url}/api/v3/ticker/price"
         self.okx_url = f"{infra.okx_base_url}/api/v5/market/ticker"
         self.coingecko_url = f"{infra.coingecko_base_url}/api/v3/simple/price"
+        self.binance_klines_url = f"{infra.binance_base_url}/api/v3/klines"
+        self.okx_candles_url = f"{infra.okx_base_url}/api/v5/market/candles"
+        self.coingecko_chart_url = f"{infra.coingecko_base_url}/api/v3/coins/{{coin_id}}/market_chart"
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client"""
@@ -60,261 +188,338 @@ class PriceService:
             await self._client.aclose()
             self._client = None
 
-    async def get_btc_price(self) -> float:
+    # ------------------------------------------------------------------
+    # Source health / ordering
+    # ------------------------------------------------------------------
+
+    def _source_health(self, asset: str, source: str) -> SourceHealth:
+        key = (asset, source)
+        health = self._health.get(key)
+        if health is None:
+            health = self._health[key] = SourceHealth()
+        return health
+
+    def _ordered_sources(self, asset: str, sources: Tuple[str, ...]) -> List[str]:
+        # sorted() is stable, so untried sources keep the configured order
+        return sorted(sources, key=lambda s: self._source_health(asset, s).score(self.DEFAULT_LATENCY_MS))
+
+    def _hedge_delay(self, asset: str, source: str) -> float:
+        latency = self._source_health(asset, source).ewma_latency_ms or self.DEFAULT_LATENCY_MS
+        return min(max(latency * 2, self.HEDGE_MIN_DELAY_MS), self.HEDGE_MAX_DELAY_MS) / 1000
+
+    async def _timed(self, asset: str, source: str, coro):
+        started = time.monotonic()
+        try:
+            result = await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[PriceService] {source} failed for {asset}: {e}")
+            result = None
+        self._source_health(asset, source).record(
+            result is not None,
+            (time.monotonic() - started) * 1000,
+            self.COOLDOWN_AFTER_FAILURES,
+            self.COOLDOWN_SECONDS
+        )
+        return result
+
+    async def _hedged(self, asset: str, sources: List[str], make_call) -> Tuple[Optional[Any], Optional[str]]:
         """
-        Get current BTC price in USD.
+        Run ``make_call(source)`` across ``sources`` with hedging.
 
-        Tries multiple sources in order: Binance -> OKX -> CoinGecko
-        Raises PriceServiceError if all sources fail.
+        The next source starts when the current leader has not answered within
+        its hedge delay or has failed; the first non-empty result wins.
+        """
+        pending: Dict[asyncio.Task, str] = {}
+        remaining = list(sources)
+        try:
+            while remaining or pending:
+                if remaining:
+                    source = remaining.pop(0)
+                    task = asyncio.ensure_future(self._timed(asset, source, make_call(source)))
+                    pending[task] = source
+                    timeout = self._hedge_delay(asset, source) if remaining else None
+                else:
+                    timeout = None
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source = pending.pop(task)
+                    result = task.result()
+                    if result:
+                        self._source_health(asset, source).wins += 1
+                        return result, source
+            return None, None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # ------------------------------------------------------------------
+    # Spot price
+    # ------------------------------------------------------------------
 
-        Returns:
-            Current BTC price
+    async def get_btc_price(self) -> float:
+        """
+        Get current BTC price in USD.
 
         Raises:
             PriceServiceError: If all price sources fail
         """
-        # Check cache first
-        if self._is_cache_valid():
-            cached_price = self._cache.get("btc_price")
-            if cached_price is not None:
-                return cached_price
+        return await self.get_price("BTC")
 
-        # Try multiple sources in order
-        errors: List[str] = []
+    async def get_price(self, symbol: str = "BTC") -> float:
+        """
+        Get current price in USD for ``symbol`` (base asset or OKX instId).
 
-        # 1. Try Binance (most reliable for crypto)
-        price = await self._fetch_binance_price()
-        if price:
-            self._update_cache(price)
-            self._last_valid_price = price
-            return price
-        errors.append("Binance failed")
+        Concurrent callers for the same asset share one hedged fetch.
 
-        # 2. Try OKX
-        price = await self._fetch_okx_price()
-        if price:
-            self._update_cache(price)
-            self._last_valid_price = price
-            return price
-        errors.append("OKX failed")
+        Raises:
+            PriceServiceError: If all price sources fail
+        """
+        asset = normalize_asset(symbol)
+        cached = self._cache.get(asset)
+        if cached and time.monotonic() - cached[1] < self.CACHE_TTL_SECONDS:
+            self._cache_hits += 1
+            return cached[0]
+        self._cache_misses += 1
+
+        inflight = self._inflight.get(asset)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_price(asset))
+            self._inflight[asset] = inflight
+            inflight.add_done_callback(lambda _f: self._inflight.pop(asset, None))
+        return await asyncio.shield(inflight)
+
+    async def _fetch_price(self, asset: str) -> float:
+        sources = self._ordered_sources(asset, self.PRICE_SOURCES)
+        fetchers = {
+            "binance": self._fetch_binance_price,
+            "okx": self._fetch_okx_price,
+            "coingecko": self._fetch_coingecko_price,
+        }
+        price, source = await self._hedged(asset, sources, lambda s: fetchers[s](asset))
 
-        # 3. Try CoinGecko
-        price = await self._fetch_coingecko_price()
         if price:
-            self._update_cache(price)
-            self._last_valid_price = price
+            now = time.monotonic()
+            self._cache[asset] = (price, now)
+            self._last_valid[asset] = (price, now)
+            logger.debug(f"[PriceService] {asset} ${price:,.2f} from {source}")
             return price
-        errors.append("CoinGecko failed")
 
-        # 4. Use last valid price if within 5 minutes (grace period for temporary outages)
-        if self._last_valid_price and self._last_fetch:
-            time_since_fetch = datetime.now() - self._last_fetch
-            if time_since_fetch < timedelta(minutes=5):
-                logger.warning(f"All price sources failed, using last valid price from {time_since_fetch.seconds}s ago")
-                return self._last_valid_price
+        # Use last valid price if within grace period (temporary outages)
+        last = self._last_valid.get(asset)
+        if last and time.monotonic() - last[1] < self.STALE_GRACE_SECONDS:
+            age = int(time.monotonic() - last[1])
+            logger.warning(f"All price sources failed for {asset}, using last valid price from {age}s ago")
+            return last[0]
 
-        # All sources failed - raise error
-        error_msg = f"All price sources failed: {', '.join(errors)}"
+        error_msg = f"All price sources failed for {asset}: {', '.join(sources)}"
         logger.error(error_msg)
         raise PriceServiceError(error_msg)
 
-    async def _fetch_binance_price(self) -> Optional[float]:
-        """Fetch BTC price from Binance API (primary source)"""
-        try:
-            client = await self._get_client()
-            response = await client.get(
-                self.binance_url,
-                params={"symbol": "BTCUSDT"}
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                price = data.get("price")
-                if price:
-                    price_float = float(price)
-                    logger.info(f"Fetched BTC price from Binance: ${price_float:,.2f}")
-                    return price_float
-            else:
-                logger.warning(f"Binance API returned status {response.status_code}")
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch price from Binance: {e}")
-
+    async def _fetch_binance_price(self, asset: str = "BTC") -> Optional[float]:
+        """Fetch price from Binance API"""
+        client = await self._get_client()
+        response = await client.get(self.binance_url, params={"symbol": f"{asset}USDT"})
+        if response.status_code != 200:
+            logger.warning(f"Binance API returned status {response.status_code}")
+            return None
+        price = response.json().get("price")
+        return float(price) if price else None
+
+    async def _fetch_okx_price(self, asset: str = "BTC") -> Optional[float]:
+        """Fetch price from OKX API"""
+        client = await self._get_client()
+        response = await client.get(self.okx_url, params={"instId": f"{asset}-USDT"})
+        if response.status_code != 200:
+            logger.warning(f"OKX API returned status {response.status_code}")
+            return None
+        data = response.json()
+        # OKX response format: {"code": "0", "data": [{"last": "95000", ...}]}
+        if data.get("code") == "0" and data.get("data"):
+            price = data["data"][0].get("last")
+            return float(price) if price else None
         return None
 
-    async def _fetch_okx_price(self) -> Optional[float]:
-        """Fetch BTC price from OKX API (secondary source)"""
-        try:
-            client = await self._get_client()
-            response = await client.get(
-                self.okx_url,
-                params={"instId": "BTC-USDT"}
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                # OKX response format: {"code": "0", "data": [{"last": "95000", ...}]}
-                if data.get("code") == "0" and data.get("data"):
-                    price = data["data"][0].get("last")
-                    if price:
-                        price_float = float(price)
-                        logger.info(f"Fetched BTC price from OKX: ${price_float:,.2f}")
-                        return price_float
-            else:
-                logger.warning(f"OKX API returned status {response.status_code}")
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch price from OKX: {e}")
-
-        return None
-
-    async def _fetch_coingecko_price(self) -> Optional[float]:
-        """Fetch BTC price from CoinGecko API (tertiary source)"""
-        try:
-            client = await self._get_client()
-            response = await client.get(
-                self.coingecko_url,
-                params={
-                    "ids": "bitcoin",
-                    "vs_currencies": "usd"
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                price = data.get("bitcoin", {}).get("usd")
-                if price:
-                    price_float = float(price)
-                    logger.info(f"Fetched BTC price from CoinGecko: ${price_float:,.2f}")
-                    return price_float
-            else:
-                logger.warning(f"CoinGecko API returned status {response.status_code}")
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch price from CoinGecko: {e}")
-
-        return None
-
-    def _is_cache_valid(self) -> bool:
-        """Check if cached price is still valid"""
-        if not self._last_fetch:
-            return False
-        return datetime.now() - self._last_fetch < timedelta(seconds=self.CACHE_TTL_SECONDS)
-
-    def _update_cache(self, price: float):
-        """Update price cache"""
-        self._cache["btc_price"] = price
-        self._last_fetch = datetime.now()
-
-    async def get_price_history(self, hours: int = 24) -> list:
+    async def _fetch_coingecko_price(self, asset: str = "BTC") -> Optional[float]:
+        """Fetch price from CoinGecko API"""
+        coin_id = COINGECKO_IDS.get(asset)
+        if not coin_id:
+            return None
+        client = await self._get_client()
+        response = await client.get(self.coingecko_url, params={"ids": coin_id, "vs_currencies": "usd"})
+        if response.status_code != 200:
+            logger.warning(f"CoinGecko API returned status {response.status_code}")
+            return None
+        price = response.json().get(coin_id, {}).get("usd")
+        return float(price) if price else None
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+
+    async def get_price_history(self, hours: int = 24, symbol: str = "BTC") -> list:
         """
-        Get historical price data from multiple sources.
+        Get historical price data.
 
-        Tries: Binance -> CoinGecko
-        Raises PriceServiceError if all sources fail.
+        Served from a cached candle series; only new bars are fetched on refresh.
+        CoinGecko is used as an uncached last resort.
 
         Args:
             hours: Number of hours of history to fetch
+            symbol: Base asset or OKX instId
 
         Returns:
-            List of {timestamp, price} dictionaries
+            List of {timestamp, price} dictionaries, oldest first
 
         Raises:
             PriceServiceError: If all history sources fail
         """
-        errors: List[str] = []
-
-        # 1. Try Binance klines
-        history = await self._fetch_binance_history(hours)
-        if history:
-            return history
-        errors.append("Binance history failed")
-
-        # 2. Try CoinGecko
-        history = await self._fetch_coingecko_history(hours)
+        asset = normalize_asset(symbol)
+        interval, limit = history_interval(hours)
+        limit = min(limit, self.HISTORY_RETENTION)
+        key = (asset, interval)
+        series = self._history.get(key)
+        if series is None:
+            series = self._history[key] = _HistorySeries()
+
+        async with series.lock:
+            if not (len(series.bars) >= limit and self._history_fresh(series)):
+                await self._refresh_history(asset, interval, limit, series)
+
+            # Re-check after the refresh: refreshed_at only moves on success, so this
+            # serves current bars (including a young listing with fewer bars than
+            # requested) and sends a failed refresh of stale bars to the fallback
+            if series.bars and self._history_fresh(series):
+                return self._format_history(series.bars[-limit:])
+
+        # Candle sources failed: CoinGecko full fetch (not merged, different sampling);
+        # stale cached bars are served only if that fails too
+        history = await self._timed(asset, "coingecko", self._fetch_coingecko_history(asset, hours))
         if history:
             return history
-        errors.append("CoinGecko history failed")
+        if series.bars:
+            logger.warning(f"[PriceService] {asset} history refresh failed, serving {len(series.bars)} cached bars")
+            return self._format_history(series.bars[-limit:])
 
-        # All sources failed
-        error_msg = f"All price history sources failed: {', '.join(errors)}"
+        error_msg = f"All price history sources failed for {asset}"
         logger.error(error_msg)
         raise PriceServiceError(error_msg)
 
-    async def _fetch_binance_history(self, hours: int = 24) -> Optional[list]:
-        """Fetch price history from Binance klines API"""
-        try:
-            client = await self._get_client()
-            # Determine interval based on hours
-            if hours <= 24:
-                interval = "1h"
-                limit = hours
-            elif hours <= 168:  # 1 week
-                interval = "4h"
-                limit = hours // 4
-            else:
-                interval = "1d"
-                limit = hours // 24
-
-            response = await client.get(
-                f"{self.binance_url.rsplit('/api', 1)[0]}/api/v3/klines",
-                params={
-                    "symbol": "BTCUSDT",
-                    "interval": interval,
-                    "limit": min(limit, 500)
-                }
-            )
-
-            if response.status_code == 200:
-                klines = response.json()
-                if klines:
-                    history = [
-                        {
-                            "timestamp": datetime.fromtimestamp(k[0] / 1000).isoformat(),
-                            "price": float(k[4])  # Close price
-                        }
-                        for k in klines
-                    ]
-                    logger.info(f"Fetched {len(history)} price history points from Binance")
-                    return history
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch price history from Binance: {e}")
-
-        return None
-
-    async def _fetch_coingecko_history(self, hours: int = 24) -> Optional[list]:
+    def _history_fresh(self, series: _HistorySeries) -> bool:
+        return time.monotonic() - series.refreshed_at < self.HISTORY_REFRESH_SECONDS
+
+    async def _refresh_history(self, asset: str, interval: str, limit: int, series: _HistorySeries):
+        interval_seconds = HISTORY_INTERVALS[interval][0]
+        if len(series.bars) >= limit:
+            newest_ts = series.bars[-1][0]
+            elapsed_bars = int((time.time() * 1000 - newest_ts) // (interval_seconds * 1000))
+            count = min(limit, elapsed_bars + 1)  # +1: the newest cached bar was still forming
+        else:
+            count = limit
+
+        sources = self._ordered_sources(asset, self.HISTORY_SOURCES)
+        fetchers = {
+            "binance": self._fetch_binance_history,
+            "okx": self._fetch_okx_history,
+        }
+        bars, source = await self._hedged(
+            asset, sources, lambda s: fetchers[s](asset, interval, count)
+        )
+        if not bars:
+            return
+
+        series.merge(bars, keep=max(self.HISTORY_RETENTION, limit))
+        series.refreshed_at = time.monotonic()
+        logger.debug(f"[PriceService] {asset} {interval} history +{len(bars)} bars from {source}")
+
+    @staticmethod
+    def _format_history(bars: List[Tuple[int, float]]) -> list:
+        return [
+            {"timestamp": datetime.fromtimestamp(ts / 1000).isoformat(), "price": close}
+            for ts, close in bars
+        ]
+
+    async def _fetch_binance_history(self, asset: str, interval: str, limit: int) -> Optional[List[Tuple[int, float]]]:
+        """Fetch close prices from Binance klines API (oldest first)"""
+        client = await self._get_client()
+        response = await client.get(
+            self.binance_klines_url,
+            params={
+                "symbol": f"{asset}USDT",
+                "interval": HISTORY_INTERVALS[interval][1],
+                "limit": min(limit, 500)
+            }
+        )
+        if response.status_code != 200:
+            return None
+        klines = response.json()
+        return [(int(k[0]), float(k[4])) for k in klines] or None
+
+    async def _fetch_okx_history(self, asset: str, interval: str, limit: int) -> Optional[List[Tuple[int, float]]]:
+        """Fetch close prices from OKX candles API (returned newest first)"""
+        client = await self._get_client()
+        response = await client.get(
+            self.okx_candles_url,
+            params={
+                "instId": f"{asset}-USDT",
+                "bar": HISTORY_INTERVALS[interval][2],
+                "limit": str(min(limit, 300))
+            }
+        )
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        if data.get("code") != "0":
+            return None
+        return [(int(c[0]), float(c[4])) for c in reversed(data.get("data") or [])] or None
+
+    async def _fetch_coingecko_history(self, asset: str, hours: int = 24) -> Optional[list]:
         """Fetch price history from CoinGecko"""
-        try:
-            client = await self._get_client()
-            days = max(1, hours // 24)
-
-            response = await client.get(
-                f"{self.coingecko_url.rsplit('/api', 1)[0]}/api/v3/coins/bitcoin/market_chart",
-                params={
-                    "vs_currency": "usd",
-                    "days": days
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                prices = data.get("prices", [])
-                if prices:
-                    history = [
-                        {
-                            "timestamp": datetime.fromtimestamp(p[0] / 1000).isoformat(),
-                            "price": p[1]
-                        }
-                        for p in prices
-                    ]
-                    logger.info(f"Fetched {len(history)} price history points from CoinGecko")
-                    return history
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch price history from CoinGecko: {e}")
-
-        return None
+        coin_id = COINGECKO_IDS.get(asset)
+        if not coin_id:
+            return None
+        client = await self._get_client()
+        days = max(1, hours // 24)
+
+        response = await client.get(
+            self.coingecko_chart_url.format(coin_id=coin_id),
+            params={
+                "vs_currency": "usd",
+                "days": days
+            }
+        )
+        if response.status_code != 200:
+            return None
+        prices = response.json().get("prices", [])
+        if not prices:
+            return None
+        history = [
+            {
+                "timestamp": datetime.fromtimestamp(p[0] / 1000).isoformat(),
+                "price": p[1]
+            }
+            for p in prices
+        ]
+        logger.info(f"Fetched {len(history)} price history points from CoinGecko")
+        return history
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "cached_assets": sorted(self._cache),
+            "history_series": len(self._history),
+            "sources": {
+                f"{asset}:{source}": health.to_dict()
+                for (asset, source), health in self._health.items()
+            },
+        }
 
 
 # Singleton instance
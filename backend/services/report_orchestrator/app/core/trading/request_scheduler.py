@@ -0,0 +1,424 @@
+"""
+Exchange Request Scheduler
+
+Central gate for every OKX REST call made by this process (OKXClient,
+FastMonitor, FundingDataService, PositionMonitor, ...).
+
+- Per-endpoint token buckets modelled on OKX's documented rate limits
+  (public endpoints are limited per IP, private endpoints per account)
+- Priority ordering: order placement / TP-SL > account reads > market data,
+  both inside a bucket and for the global in-flight budget
+- Identical in-flight GETs are coalesced into a single exchange call
+- Rate-limit responses (50011/50061) pause the affected bucket for one window
+  instead of each caller sleeping blindly
+- Queue depth, queue wait and request latency metrics per endpoint
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.parallel.adaptive_scheduler import report_dependency_throttled
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Lower value = served first"""
+    ORDER = 0        # Order placement, close, TP/SL algo orders
+    ACCOUNT = 1      # Positions, balance, pending algo queries
+    MARKET_DATA = 2  # Public tickers, candles, funding, open interest
+
+
+@dataclass(frozen=True)
+class EndpointLimit:
+    """Rate limit for one endpoint: ``requests`` per ``per_seconds``"""
+    requests: int
+    per_seconds: float
+    priority: RequestPriority
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.per_seconds
+
+
+# OKX v5 documented limits (requests / 2s)
+OKX_ENDPOINT_LIMITS: Dict[str, EndpointLimit] = {
+    # Trade
+    "/api/v5/trade/order": EndpointLimit(60, 2.0, RequestPriority.ORDER),
+    "/api/v5/trade/batch-orders": EndpointLimit(300, 2.0, RequestPriority.ORDER),
+    "/api/v5/trade/cancel-order": EndpointLimit(60, 2.0, RequestPriority.ORDER),
+    "/api/v5/trade/close-position": EndpointLimit(20, 2.0, RequestPriority.ORDER),
+    "/api/v5/trade/order-algo": EndpointLimit(20, 2.0, RequestPriority.ORDER),
+    "/api/v5/trade/cancel-algos": EndpointLimit(20, 2.0, RequestPriority.ORDER),
+    "/api/v5/trade/orders-algo-pending": EndpointLimit(20, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/trade/fills": EndpointLimit(60, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/trade/fills-history": EndpointLimit(10, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/trade/orders-history": EndpointLimit(40, 2.0, RequestPriority.ACCOUNT),
+    # Account
+    "/api/v5/account/balance": EndpointLimit(10, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/account/positions": EndpointLimit(10, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/account/positions-history": EndpointLimit(10, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/account/max-avail-size": EndpointLimit(20, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/account/config": EndpointLimit(5, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/account/set-leverage": EndpointLimit(20, 2.0, RequestPriority.ORDER),
+    "/api/v5/account/set-position-mode": EndpointLimit(5, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/account/set-account-level": EndpointLimit(5, 2.0, RequestPriority.ACCOUNT),
+    "/api/v5/account/bills": EndpointLimit(5, 1.0, RequestPriority.ACCOUNT),
+    # Market data (per IP)
+    "/api/v5/market/ticker": EndpointLimit(20, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/market/tickers": EndpointLimit(20, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/market/candles": EndpointLimit(40, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/market/history-candles": EndpointLimit(20, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/market/books": EndpointLimit(40, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/public/funding-rate": EndpointLimit(20, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/public/funding-rate-history": EndpointLimit(10, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/public/open-interest": EndpointLimit(20, 2.0, RequestPriority.MARKET_DATA),
+    "/api/v5/public/mark-price": EndpointLimit(10, 2.0, RequestPriority.MARKET_DATA),
+}
+
+DEFAULT_PUBLIC_LIMIT = EndpointLimit(10, 2.0, RequestPriority.MARKET_DATA)
+DEFAULT_PRIVATE_LIMIT = EndpointLimit(10, 2.0, RequestPriority.ACCOUNT)
+
+# OKX response codes meaning "you are over the limit"
+RATE_LIMIT_CODES = frozenset({"50011", "50061"})
+
+PUBLIC_OWNER = "public"
+
+
+def endpoint_of(path: str) -> str:
+    """Strip query string and host: '/api/v5/market/candles?instId=..' -> '/api/v5/market/candles'"""
+    path = path.split("?", 1)[0]
+    idx = path.find("/api/v5/")
+    return path[idx:] if idx >= 0 else path
+
+
+def is_public_endpoint(endpoint: str) -> bool:
+    return endpoint.startswith("/api/v5/market/") or endpoint.startswith("/api/v5/public/")
+
+
+class _PriorityQueueGate:
+    """
+    Shared machinery for priority-ordered waiting.
+
+    Waiters are kept in a heap of (priority, seq); only the head may proceed.
+    State changes are broadcast by swapping an asyncio.Event.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._heap)
+
+    def _signal(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _enqueue(self, priority: int) -> Tuple[int, int]:
+        waiter = (int(priority), next(self._seq))
+        heapq.heappush(self._heap, waiter)
+        return waiter
+
+    def _dequeue(self, waiter: Tuple[int, int]):
+        if self._heap and self._heap[0] == waiter:
+            heapq.heappop(self._heap)
+        else:
+            try:
+                self._heap.remove(waiter)
+                heapq.heapify(self._heap)
+            except ValueError:
+                pass
+        self._signal()
+
+    async def _wait(self, timeout: Optional[float]):
+        event = self._changed
+        if timeout is None:
+            await event.wait()
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            pass
+
+
+class TokenBucket(_PriorityQueueGate):
+    """Token bucket whose waiters are served in priority order"""
+
+    def __init__(self, limit: EndpointLimit):
+        super().__init__()
+        self.limit = limit
+        self.capacity = float(limit.requests)
+        self.rate = limit.rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill(time.monotonic())
+        return self._tokens
+
+    async def acquire(self, priority: int = RequestPriority.MARKET_DATA):
+        waiter = self._enqueue(priority)
+        try:
+            while True:
+                if self._heap[0] != waiter:
+                    await self._wait(None)
+                    continue
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+                await self._wait(delay)
+        finally:
+            self._dequeue(waiter)
+
+    def penalize(self, seconds: Optional[float] = None):
+        """Exchange reported a rate-limit breach: drain tokens and pause for one window"""
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self._blocked_until = self._updated + (seconds if seconds is not None else self.limit.per_seconds)
+        self._signal()
+
+
+class PrioritySemaphore(_PriorityQueueGate):
+    """Semaphore that admits waiters in priority order"""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.in_flight = 0
+
+    async def acquire(self, priority: int = RequestPriority.MARKET_DATA):
+        waiter = self._enqueue(priority)
+        try:
+            while self._heap[0] != waiter or self.in_flight >= self.limit:
+                await self._wait(None)
+            self.in_flight += 1
+        finally:
+            self._dequeue(waiter)
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        self._signal()
+
+
+class _LatencyWindow:
+    """Rolling window of latencies (ms)"""
+
+    def __init__(self, size: int = 500):
+        self._values: Deque[float] = deque(maxlen=size)
+
+    def add(self, ms: float):
+        self._values.append(ms)
+
+    def summary(self) -> Dict[str, float]:
+        if not self._values:
+            return {"count": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self._values)
+        n = len(ordered)
+        return {
+            "count": n,
+            "avg_ms": round(sum(ordered) / n, 2),
+            "p50_ms": round(ordered[int(0.50 * (n - 1))], 2),
+            "p95_ms": round(ordered[int(0.95 * (n - 1))], 2),
+            "max_ms": round(ordered[-1], 2),
+        }
+
+
+@dataclass
+class _EndpointStats:
+    submitted: int = 0
+    executed: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+
+
+class ExchangeRequestScheduler:
+    """
+    Process-wide scheduler for exchange REST calls.
+
+    Usage:
+        result = await scheduler.run(
+            "/api/v5/market/candles?instId=BTC-USDT-SWAP&bar=1H",
+            lambda: fetch(...),
+            coalesce=True,
+        )
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, EndpointLimit]] = None,
+        max_in_flight: int = 16,
+        latency_window: int = 500
+    ):
+        self.limits = dict(OKX_ENDPOINT_LIMITS if limits is None else limits)
+        self.max_in_flight = max_in_flight
+        self._latency_window = latency_window
+        self._slots: Optional[PrioritySemaphore] = None
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._stats: Dict[str, _EndpointStats] = {}
+        self._queue_wait: Dict[str, _LatencyWindow] = {}
+        self._latency: Dict[str, _LatencyWindow] = {}
+
+    def limit_for(self, endpoint: str) -> EndpointLimit:
+        if endpoint in self.limits:
+            return self.limits[endpoint]
+        return DEFAULT_PUBLIC_LIMIT if is_public_endpoint(endpoint) else DEFAULT_PRIVATE_LIMIT
+
+    def _scope(self, endpoint: str, owner: str) -> str:
+        # Public endpoints are limited per IP, i.e. shared by every account in this process
+        return PUBLIC_OWNER if is_public_endpoint(endpoint) else (owner or PUBLIC_OWNER)
+
+    def _bucket(self, endpoint: str, owner: str) -> TokenBucket:
+        key = (self._scope(endpoint, owner), endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.limit_for(endpoint))
+            self._buckets[key] = bucket
+        return bucket
+
+    def _get_slots(self) -> PrioritySemaphore:
+        if self._slots is None:
+            self._slots = PrioritySemaphore(self.max_in_flight)
+        return self._slots
+
+    def _stat(self, endpoint: str) -> _EndpointStats:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = _EndpointStats()
+            self._queue_wait[endpoint] = _LatencyWindow(self._latency_window)
+            self._latency[endpoint] = _LatencyWindow(self._latency_window)
+        return stats
+
+    async def run(
+        self,
+        path: str,
+        fn: Callable[[], Awaitable[Any]],
+        *,
+        owner: str = PUBLIC_OWNER,
+        priority: Optional[RequestPriority] = None,
+        coalesce: bool = False
+    ) -> Any:
+        """
+        Execute ``fn`` once rate-limit budget is available.
+
+        Args:
+            path: Request path (query string included); used for bucket lookup and coalescing
+            fn: Zero-arg coroutine factory performing the actual HTTP call
+            owner: Account identity for private endpoints
+            priority: Override the endpoint's default priority
+            coalesce: Share the result with identical concurrent calls (GET only)
+        """
+        endpoint = endpoint_of(path)
+        stats = self._stat(endpoint)
+        stats.submitted += 1
+
+        if not coalesce:
+            return await self._execute(endpoint, owner, priority, fn)
+
+        key = (self._scope(endpoint, owner), path)
+        shared = self._inflight.get(key)
+        if shared is not None:
+            stats.coalesced += 1
+            return await asyncio.shield(shared)
+
+        task = asyncio.ensure_future(self._execute(endpoint, owner, priority, fn))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        return await asyncio.shield(task)
+
+    async def _execute(
+        self,
+        endpoint: str,
+        owner: str,
+        priority: Optional[RequestPriority],
+        fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        stats = self._stats[endpoint]
+        prio = int(priority if priority is not None else self.limit_for(endpoint).priority)
+        slots = self._get_slots()
+
+        queued_at = time.monotonic()
+        await self._bucket(endpoint, owner).acquire(prio)
+        await slots.acquire(prio)
+        started = time.monotonic()
+        self._queue_wait[endpoint].add((started - queued_at) * 1000)
+
+        try:
+            result = await fn()
+            stats.executed += 1
+            if isinstance(result, dict) and str(result.get("code")) in RATE_LIMIT_CODES:
+                self.penalize(endpoint, owner)
+            return result
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self._latency[endpoint].add((time.monotonic() - started) * 1000)
+            slots.release()
+
+    def penalize(self, path: str, owner: str = PUBLIC_OWNER, seconds: Optional[float] = None):
+        """Pause an endpoint bucket after the exchange reported a rate-limit breach"""
+        endpoint = endpoint_of(path)
+        self._stat(endpoint).rate_limited += 1
+        self._bucket(endpoint, owner).penalize(seconds)
+        # 同时收缩交易会议 Agent 调度器的 okx 并发窗口
+        report_dependency_throttled("okx")
+        logger.warning(f"[RequestScheduler] Rate limited on {endpoint}, pausing bucket")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, coalescing and latency metrics per endpoint"""
+        endpoints: Dict[str, Any] = {}
+        for endpoint, stats in self._stats.items():
+            buckets = [b for (scope, ep), b in self._buckets.items() if ep == endpoint]
+            endpoints[endpoint] = {
+                "priority": self.limit_for(endpoint).priority.name.lower(),
+                "submitted": stats.submitted,
+                "executed": stats.executed,
+                "coalesced": stats.coalesced,
+                "errors": stats.errors,
+                "rate_limited": stats.rate_limited,
+                "queue_depth": sum(b.waiting for b in buckets),
+                "queue_wait": self._queue_wait[endpoint].summary(),
+                "latency": self._latency[endpoint].summary(),
+            }
+        slots = self._slots
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": slots.in_flight if slots else 0,
+            "waiting_for_slot": slots.waiting if slots else 0,
+            "coalescing": len(self._inflight),
+            "endpoints": endpoints,
+        }
+
+
+_scheduler: Optional[ExchangeRequestScheduler] = None
+
+
+def get_request_scheduler() -> ExchangeRequestScheduler:
+    """Get the process-wide exchange request scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ExchangeRequestScheduler()
+    return _scheduler
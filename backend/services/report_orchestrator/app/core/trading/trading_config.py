@@ -64,6 +64,8 @@ class InfrastructureConfig:
         REDIS_URL: Redis connection URL (default: redis://redis:6379)
         LLM_GATEWAY_URL: LLM gateway service URL (default: http://llm_gateway:8003)
         OKX_BASE_URL: OKX API base URL (default: https://www.okx.com)
+        OKX_WS_PRIVATE_URL: OKX private WebSocket URL (default: wss://ws.okx.com:8443/ws/v5/private)
+        OKX_WS_PRIVATE_DEMO_URL: OKX demo-trading private WebSocket URL
         BINANCE_BASE_URL: Binance API base URL (default: https://api.binance.com)
         COINGECKO_BASE_URL: CoinGecko API base URL (default: https://api.coingecko.com)
         TAVILY_API_URL: Tavily search API URL (default: https://api.tavily.com/search)
@@ -77,6 +79,8 @@ class InfrastructureConfig:
 
     # External APIs
     okx_base_url: str = field(default_factory=lambda: _get_env_str("OKX_BASE_URL", "https://www.okx.com"))
+    okx_ws_private_url: str = field(default_factory=lambda: _get_env_str("OKX_WS_PRIVATE_URL", "wss://ws.okx.com:8443/ws/v5/private"))
+    okx_ws_private_demo_url: str = field(default_factory=lambda: _get_env_str("OKX_WS_PRIVATE_DEMO_URL", "wss://wspap.okx.com:8443/ws/v5/private?brokerId=9999"))
     binance_base_url: str = field(default_factory=lambda: _get_env_str("BINANCE_BASE_URL", "https://api.binance.com"))
     coingecko_base_url: str = field(default_factory=lambda: _get_env_str("COINGECKO_BASE_URL", "https://api.coingecko.com"))
     tavily_api_url: str = field(default_factory=lambda: _get_env_str("TAVILY_API_URL", "https://api.tavily.com/search"))
@@ -8,6 +8,7 @@ Extends the base Meeting class with trading-specific phases and signal generatio
 import logging
 import json
 import re
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Callable
 
@@ -39,6 +40,9 @@ from app.core.trading.vote_calculator import (
 from app.core.trading.safety.guards import SafetyGuard
 from app.core.trading.executor_agent import ExecutorAgent  # Unified agent-based executor
 from app.core.trading.reflection.engine import ReflectionEngine
+from app.core.trading.metrics import get_metrics_collector
+from app.core.observability.tracing import start_span
+from app.core.metrics import record_latency
 
 # 🆕 LangGraph orchestration imports
 from app.core.trading.orchestration.graph import TradingGraph
@@ -716,6 +720,16 @@ Current Streak: {"🔥 " if getattr(memory, 'consecutive_wins', 0) > 0 else "❄
         Returns:
             TradingSignal if a trade decision is made, None otherwise
         """
+        # 整场会议是一棵 span 树的根: 阶段 → Agent 回合 → ReWOO 阶段 → 工具/LLM 调用
+        async with start_span(
+            "trading_meeting",
+            symbol=self.config.symbol,
+            trigger=context or "scheduled",
+        ) as meeting_span:
+            self._meeting_span = meeting_span
+            return await self._run_meeting(context)
+
+    async def _run_meeting(self, context: Optional[str] = None) -> Optional[TradingSignal]:
         # 🆕 Phase 4: Use LangGraph workflow if enabled
         if self._trading_graph is not None and self.config.use_langgraph:
             logger.info("[TradingMeeting] 🔄 Using LangGraph workflow")
@@ -733,6 +747,8 @@ Current Streak: {"🔥 " if getattr(memory, 'consecutive_wins', 0) > 0 else "❄
         # 🆕 Context Engineering P0: Cycle ID for tracking (Cache removed by user request)
         cycle_id = f"meeting_{self.config.symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         user_scope = getattr(self.toolkit, "user_id", None)
+        self._meeting_span.set_attribute("meeting_id", cycle_id)
+        phase_metrics = get_metrics_collector()
 
         
         # 🆕 Context Engineering P1: Create shared market data snapshot
@@ -768,25 +784,31 @@ Current Streak: {"🔥 " if getattr(memory, 'consecutive_wins', 0) > 0 else "❄
 
         try:
             # Phase 1: Market Analysis (with position context)
-            await self._run_market_analysis_phase(position_context)
+            async with phase_metrics.track_phase("market_analysis"):
+                await self._run_market_analysis_phase(position_context)
 
             # Calculate dynamic agent weights before voting
-            await self._calculate_agent_weights()
+            async with phase_metrics.track_phase("agent_weights"):
+                await self._calculate_agent_weights()
 
             # Phase 2: Signal Generation (collect votes, with position context)
-            await self._run_signal_generation_phase(position_context)
+            async with phase_metrics.track_phase("signal_generation"):
+                await self._run_signal_generation_phase(position_context)
 
             # Phase 3: Risk Assessment (with position context)
-            await self._run_risk_assessment_phase(position_context)
+            async with phase_metrics.track_phase("risk_assessment"):
+                await self._run_risk_assessment_phase(position_context)
 
             # Phase 4: Consensus Building (Leader summarizes meeting)
-            _temp_signal = await self._run_consensus_phase(position_context)
+            async with phase_metrics.track_phase("consensus"):
+                _temp_signal = await self._run_consensus_phase(position_context)
             # Note: Phase 4 no longer produces final signal, only Leader's summary
 
             # Phase 5: Trade Execution (TradeExecutor analyzes and decides)
             # NEW: TradeExecutor analyzes Leader's summary and makes decision
             # Regardless of what Leader said, TradeExecutor will run
-            await self._run_execution_phase(_temp_signal, position_context)
+            async with phase_metrics.track_phase("execution"):
+                await self._run_execution_phase(_temp_signal, position_context)
 
             # Final signal comes from TradeExecutor
             if self._final_signal:
@@ -1181,7 +1203,8 @@ Provide your analysis and views based on real data."""
         # Get rate limiter
         rate_limiter = get_rate_limiter()
         
-        logger.info(f"[ParallelSignalGen] Starting parallel execution with {len(AGENT_BATCHES)} batches")
+        mode = "adaptive" if rate_limiter.config.adaptive_scheduling else f"{len(AGENT_BATCHES)} batches"
+        logger.info(f"[ParallelSignalGen] Starting parallel execution ({mode})")
         
         # Execute all batches
         results = await rate_limiter.execute_all_batches(
@@ -2431,6 +2454,21 @@ Based on **your professional analysis**, choose recommended action (**do NOT fav
         return "Leader did not provide summary"
 
     async def _run_agent_turn(self, agent: Agent, prompt: str) -> str:
+        started_at = time.perf_counter()
+        ok = False
+        try:
+            async with start_span(
+                "agent.turn",
+                agent=agent.name,
+                mode="rewoo" if isinstance(agent, ReWOOAgent) else "direct",
+            ):
+                result = await self._run_agent_turn_inner(agent, prompt)
+            ok = True
+            return result
+        finally:
+            record_latency("agent", agent.name, time.perf_counter() - started_at, ok=ok)
+
+    async def _run_agent_turn_inner(self, agent: Agent, prompt: str) -> str:
         """Run a single agent's turn using agent's own LLM call method with tool execution
         
         For ReWOOAgent instances, uses the 3-phase ReWOO architecture:
@@ -12,6 +12,8 @@ from .lock import TriggerLock
 from .news_crawler import NewsCrawler, NewsItem
 from .ta_calculator import TACalculator, TAData
 from .fast_monitor import FastMonitor, FastTriggerResult, FastMonitorConfig
+from .market_hub import MarketDataHub, get_market_hub
+from .multi_symbol import MultiSymbolTriggerRuntime, MultiSymbolConfig
 from .prompts import build_trigger_prompt
 
 __all__ = [
@@ -30,6 +32,11 @@ __all__ = [
     "FastMonitor",
     "FastTriggerResult", 
     "FastMonitorConfig",
+    # Multi-symbol runtime
+    "MarketDataHub",
+    "get_market_hub",
+    "MultiSymbolTriggerRuntime",
+    "MultiSymbolConfig",
     # Utilities
     "build_trigger_prompt"
 ]
@@ -21,6 +21,7 @@ from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlencode
 
 # Import centralized config and constants
 try:
@@ -35,9 +36,11 @@ try:
         calculate_ema,
         get_closes_from_candles
     )
+    from ..request_scheduler import get_request_scheduler
     USE_SHARED_INDICATORS = True
 except ImportError:
     get_infra_config = None
+    get_request_scheduler = None
     PRICE = None
     VOLUME = None
     RSI = None
@@ -164,7 +167,8 @@ class FastMonitor:
     def __init__(
         self,
         symbol: str = "BTC-USDT-SWAP",
-        config: FastMonitorConfig = None
+        config: FastMonitorConfig = None,
+        market_hub=None
     ):
         """
         初始化快速监控器。
@@ -172,10 +176,14 @@ class FastMonitor:
         Args:
             symbol: 交易对符号，默认 "BTC-USDT-SWAP"
             config: 监控配置，默认使用 FastMonitorConfig()
+            market_hub: 共享行情数据 (MarketDataHub)，提供时不再单独请求
         """
         self.symbol = symbol
         self.config = config or FastMonitorConfig()
+        self.market_hub = market_hub
         self.base_url = get_infra_config().okx_base_url if get_infra_config else "https://www.okx.com"
+        # 监控器自有的会话: 合并的请求可能被其他调用方等待，不能随单次 check 关闭
+        self._session: Optional[aiohttp.ClientSession] = None
 
         # 价格历史 (用于计算变化和状态报告)
         history_maxlen = CACHE.PRICE_HISTORY_MAXLEN if CACHE else 60
@@ -270,26 +278,40 @@ class FastMonitor:
         Returns:
             FastTriggerResult - 包含是否触发及触发条件详情
         """
-        triggered_conditions: List[FastTriggerCondition] = []
-
         try:
-            async with aiohttp.ClientSession() as session:
-                data = await self._fetch_all_market_data(session)
-                triggered_conditions = self._run_all_checks(data)
-
+            if self.market_hub is not None:
+                data = await self.market_hub.fast_monitor_data(self.symbol)
+            else:
+                data = await self._fetch_all_market_data(self._get_session())
         except Exception as e:
             logger.error(f"[FastMonitor] Check failed: {e}")
             import traceback
             traceback.print_exc()
+            return self._build_trigger_result([])
+
+        return self.evaluate(data)
+
+    def evaluate(self, data: Dict[str, Any]) -> FastTriggerResult:
+        """
+        对已获取的市场数据执行硬条件检测 (多品种运行时批量取数后调用)
+
+        Args:
+            data: 与 _fetch_all_market_data 返回结构相同的字典
+        """
+        triggered_conditions: List[FastTriggerCondition] = []
+        try:
+            triggered_conditions = self._run_all_checks(data)
+        except Exception as e:
+            logger.error(f"[FastMonitor] Check failed for {self.symbol}: {e}")
 
         result = self._build_trigger_result(triggered_conditions)
-        
+
         if result.should_trigger:
             conditions_str = ", ".join([c.name for c in triggered_conditions])
-            logger.warning(f"[FastMonitor] [ALERT] Triggered: {conditions_str} (Urgency: {max_urgency})")
+            logger.warning(f"[FastMonitor] [ALERT] {self.symbol} triggered: {conditions_str} (Urgency: {result.urgency})")
         else:
-            logger.debug("[FastMonitor] [OK] No triggers")
-        
+            logger.debug(f"[FastMonitor] [OK] {self.symbol}: no triggers")
+
         return result
     
     # ========== 价格检测 ==========
@@ -532,18 +554,42 @@ class FastMonitor:
         return conditions
     
     # ========== 数据获取 ==========
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self._session
+
+    async def close(self):
+        """关闭监控器自有的 HTTP 会话"""
+        if self._session:
+            await self._session.close()
+            self._session = None
     
+    async def _okx_get(self, session: aiohttp.ClientSession, path: str, params: Dict[str, str]) -> Dict:
+        """GET an OKX public endpoint via the shared request scheduler (rate limits + coalescing)"""
+        full_path = f"{path}?{urlencode(params)}"
+        url = f"{self.base_url}{full_path}"
+
+        async def _send() -> Dict:
+            async with session.get(url, timeout=10) as resp:
+                if resp.status != 200:
+                    return {}
+                return await resp.json()
+
+        if get_request_scheduler is None:
+            return await _send()
+        return await get_request_scheduler().run(full_path, _send, coalesce=True)
+
     async def _fetch_ticker(self, session: aiohttp.ClientSession) -> Dict:
         """获取当前行情"""
-        url = f"{self.base_url}/api/v5/market/ticker"
+        path = "/api/v5/market/ticker"
         params = {"instId": self.symbol}
         
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status == 200:
-                    result = await resp.json()
-                    if result.get("code") == "0" and result.get("data"):
-                        return result["data"][0]
+            result = await self._okx_get(session, path, params)
+            if result.get("code") == "0" and result.get("data"):
+                return result["data"][0]
         except Exception as e:
             logger.debug(f"[FastMonitor] Ticker fetch error: {e}")
         
@@ -556,7 +602,7 @@ class FastMonitor:
         limit: int
     ) -> List[Dict]:
         """获取 K 线数据"""
-        url = f"{self.base_url}/api/v5/market/candles"
+        path = "/api/v5/market/candles"
         params = {
             "instId": self.symbol,
             "bar": bar,
@@ -564,22 +610,20 @@ class FastMonitor:
         }
         
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status == 200:
-                    result = await resp.json()
-                    if result.get("code") == "0":
-                        # OKX: [ts, o, h, l, c, vol, volCcy, volCcyQuote, confirm]
-                        return [
-                            {
-                                "ts": int(c[0]),
-                                "open": float(c[1]),
-                                "high": float(c[2]),
-                                "low": float(c[3]),
-                                "close": float(c[4]),
-                                "volume": float(c[5])
-                            }
-                            for c in result.get("data", [])
-                        ]
+            result = await self._okx_get(session, path, params)
+            if result.get("code") == "0":
+                # OKX: [ts, o, h, l, c, vol, volCcy, volCcyQuote, confirm]
+                return [
+                    {
+                        "ts": int(c[0]),
+                        "open": float(c[1]),
+                        "high": float(c[2]),
+                        "low": float(c[3]),
+                        "close": float(c[4]),
+                        "volume": float(c[5])
+                    }
+                    for c in result.get("data", [])
+                ]
         except Exception as e:
             logger.debug(f"[FastMonitor] Candles fetch error ({bar}): {e}")
         
@@ -587,15 +631,13 @@ class FastMonitor:
     
     async def _fetch_funding_rate(self, session: aiohttp.ClientSession) -> Dict:
         """获取资金费率"""
-        url = f"{self.base_url}/api/v5/public/funding-rate"
+        path = "/api/v5/public/funding-rate"
         params = {"instId": self.symbol}
         
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status == 200:
-                    result = await resp.json()
-                    if result.get("code") == "0" and result.get("data"):
-                        return result["data"][0]
+            result = await self._okx_get(session, path, params)
+            if result.get("code") == "0" and result.get("data"):
+                return result["data"][0]
         except Exception as e:
             logger.debug(f"[FastMonitor] Funding rate fetch error: {e}")
         
@@ -603,15 +645,13 @@ class FastMonitor:
     
     async def _fetch_open_interest(self, session: aiohttp.ClientSession) -> Dict:
         """获取持仓量"""
-        url = f"{self.base_url}/api/v5/public/open-interest"
+        path = "/api/v5/public/open-interest"
         params = {"instId": self.symbol}
         
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status == 200:
-                    result = await resp.json()
-                    if result.get("code") == "0" and result.get("data"):
-                        return result["data"][0]
+            result = await self._okx_get(session, path, params)
+            if result.get("code") == "0" and result.get("data"):
+                return result["data"][0]
         except Exception as e:
             logger.debug(f"[FastMonitor] Open interest fetch error: {e}")
         
@@ -735,5 +775,6 @@ if __name__ == "__main__":
         print("\n" + "="*50)
         print("Monitor Status:")
         print(monitor.get_status())
+        await monitor.close()
     
     asyncio.run(test())
@@ -0,0 +1,300 @@
+"""
+MarketDataHub - 多品种共享行情数据
+
+One hub serves every symbol evaluated by the trigger layer:
+
+- Tickers and open interest come from the instType-wide endpoints, so one
+  request covers all perpetuals regardless of how many symbols are watched
+- Candles are cached per (symbol, bar); after the first load only the bars
+  that elapsed since the newest cached one are fetched and merged
+- Funding rates come from the shared FundingRateStore (TTL cached)
+- FastMonitor and TACalculator read from the same candle cache, so a symbol
+  watched by both layers is fetched once per tick
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from ..trading_config import get_infra_config
+from ..request_scheduler import get_request_scheduler
+from ..funding.rate_store import FundingRateStore, get_funding_rate_store
+
+logger = logging.getLogger(__name__)
+
+FetchJson = Callable[[str], Awaitable[Dict]]
+
+# OKX bar -> seconds
+BAR_SECONDS: Dict[str, int] = {
+    "1m": 60,
+    "3m": 180,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1H": 3600,
+    "2H": 7200,
+    "4H": 14400,
+    "1D": 86400,
+}
+
+# Bars FastMonitor needs per symbol: (bar, limit)
+FAST_MONITOR_BARS: Tuple[Tuple[str, int], ...] = (("1m", 10), ("5m", 25), ("15m", 50))
+
+
+def parse_candles(rows: List[List]) -> List[Dict]:
+    """OKX: [ts, o, h, l, c, vol, volCcy, volCcyQuote, confirm] -> dicts, newest first"""
+    return [
+        {
+            "ts": int(c[0]),
+            "open": float(c[1]),
+            "high": float(c[2]),
+            "low": float(c[3]),
+            "close": float(c[4]),
+            "volume": float(c[5])
+        }
+        for c in rows
+    ]
+
+
+@dataclass
+class _CandleSeries:
+    """Cached candles for one (symbol, bar), newest first"""
+    candles: List[Dict] = field(default_factory=list)
+    fetched_at: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def merge(self, fresh: List[Dict], keep: int):
+        """Replace overlapping bars (the newest is still forming) and prepend new ones"""
+        if not self.candles:
+            self.candles = fresh[:keep]
+            return
+        by_ts = {c["ts"]: c for c in self.candles}
+        for candle in fresh:
+            by_ts[candle["ts"]] = candle
+        self.candles = sorted(by_ts.values(), key=lambda c: c["ts"], reverse=True)[:keep]
+
+
+class MarketDataHub:
+    """
+    Shared, batched market data for many perpetual swaps.
+
+    Attributes:
+        inst_type: OKX instType for the batch endpoints
+        candle_ttl_seconds: Candle reads within this window are served from cache
+        ticker_ttl_seconds: Batch ticker/OI snapshots are reused within this window
+    """
+
+    def __init__(
+        self,
+        fetch_json: Optional[FetchJson] = None,
+        funding_store: Optional[FundingRateStore] = None,
+        inst_type: str = "SWAP",
+        candle_ttl_seconds: float = 5.0,
+        ticker_ttl_seconds: float = 5.0
+    ):
+        self.inst_type = inst_type
+        self.candle_ttl = candle_ttl_seconds
+        self.ticker_ttl = ticker_ttl_seconds
+        self.base_url = get_infra_config().okx_base_url
+        self._fetch_json = fetch_json or self._default_fetch
+        self._funding_store = funding_store or get_funding_rate_store()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self._candles: Dict[Tuple[str, str], _CandleSeries] = {}
+        self._tickers: Dict[str, Dict] = {}
+        self._tickers_at = 0.0
+        self._open_interest: Dict[str, Dict] = {}
+        self._oi_at = 0.0
+        self._batch_lock = asyncio.Lock()
+
+        self.fetch_count = 0
+        self.candle_fetch_count = 0
+        self.incremental_fetch_count = 0
+
+    async def _default_fetch(self, path: str) -> Dict:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        proxy = None
+        if os.getenv("USE_PROXY", "false").lower() == "true":
+            proxy = os.getenv("PROXY_URL", "") or None
+        session = self._session
+        url = f"{self.base_url}{path}"
+
+        async def _send() -> Dict:
+            async with session.get(url, proxy=proxy) as resp:
+                if resp.status != 200:
+                    return {}
+                return await resp.json()
+
+        return await get_request_scheduler().run(path, _send, coalesce=True)
+
+    async def _fetch(self, path: str) -> Dict:
+        self.fetch_count += 1
+        return await self._fetch_json(path)
+
+    # ------------------------------------------------------------------
+    # Batch endpoints (one request for all symbols)
+    # ------------------------------------------------------------------
+
+    async def _refresh_batches(self, now: float):
+        async with self._batch_lock:
+            tasks = []
+            if now - self._tickers_at >= self.ticker_ttl:
+                tasks.append(self._refresh_tickers(now))
+            if now - self._oi_at >= self.ticker_ttl:
+                tasks.append(self._refresh_open_interest(now))
+            if tasks:
+                await asyncio.gather(*tasks)
+
+    async def _refresh_tickers(self, now: float):
+        data = await self._fetch(f"/api/v5/market/tickers?instType={self.inst_type}")
+        if data.get("code") != "0":
+            logger.warning(f"[MarketHub] Tickers API error: {data.get('msg')}")
+            return
+        self._tickers = {row["instId"]: row for row in data.get("data") or [] if row.get("instId")}
+        self._tickers_at = now
+
+    async def _refresh_open_interest(self, now: float):
+        data = await self._fetch(f"/api/v5/public/open-interest?instType={self.inst_type}")
+        if data.get("code") != "0":
+            logger.warning(f"[MarketHub] Open interest API error: {data.get('msg')}")
+            return
+        self._open_interest = {row["instId"]: row for row in data.get("data") or [] if row.get("instId")}
+        self._oi_at = now
+
+    async def get_ticker(self, symbol: str) -> Dict:
+        await self._refresh_batches(time.monotonic())
+        return self._tickers.get(symbol, {})
+
+    async def get_open_interest(self, symbol: str) -> Dict:
+        await self._refresh_batches(time.monotonic())
+        return self._open_interest.get(symbol, {})
+
+    # ------------------------------------------------------------------
+    # Candles (incremental per symbol/bar)
+    # ------------------------------------------------------------------
+
+    def _bars_to_fetch(self, series: _CandleSeries, bar: str, limit: int) -> int:
+        if len(series.candles) < limit or bar not in BAR_SECONDS:
+            return limit
+        bar_ms = BAR_SECONDS[bar] * 1000
+        elapsed = int(time.time() * 1000) - series.candles[0]["ts"]
+        # Bars opened since the newest cached one, plus the newest (still forming) itself
+        missing = max(0, elapsed // bar_ms) + 2
+        return min(limit, missing)
+
+    async def get_candles(self, symbol: str, bar: str, limit: int) -> List[Dict]:
+        """Candles newest first, refreshed incrementally"""
+        key = (symbol, bar)
+        series = self._candles.get(key)
+        if series is None:
+            series = self._candles[key] = _CandleSeries()
+
+        async with series.lock:
+            now = time.monotonic()
+            if len(series.candles) >= limit and now - series.fetched_at < self.candle_ttl:
+                return series.candles[:limit]
+
+            count = self._bars_to_fetch(series, bar, limit)
+            data = await self._fetch(f"/api/v5/market/candles?instId={symbol}&bar={bar}&limit={count}")
+            self.candle_fetch_count += 1
+            if data.get("code") != "0":
+                logger.debug(f"[MarketHub] Candles API error {symbol} {bar}: {data.get('msg')}")
+                return series.candles[:limit]
+
+            if count < limit:
+                self.incremental_fetch_count += 1
+            series.merge(parse_candles(data.get("data") or []), keep=max(limit, len(series.candles)))
+            series.fetched_at = now
+            return series.candles[:limit]
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    async def get_funding(self, symbol: str) -> Dict:
+        """Funding rate in the raw OKX shape FastMonitor expects"""
+        stats = await self._funding_store.get_stats(symbol)
+        if stats is None:
+            return {}
+        return {"instId": symbol, "fundingRate": str(stats.current_rate)}
+
+    async def fast_monitor_data(self, symbol: str) -> Dict:
+        """All inputs FastMonitor._run_all_checks needs for one symbol"""
+        await self._refresh_batches(time.monotonic())
+        return await self._collect(symbol)
+
+    async def _collect(self, symbol: str) -> Dict:
+        candles = await asyncio.gather(
+            *(self.get_candles(symbol, bar, limit) for bar, limit in FAST_MONITOR_BARS),
+            return_exceptions=True
+        )
+        funding = await asyncio.gather(self.get_funding(symbol), return_exceptions=True)
+        funding_data = funding[0] if not isinstance(funding[0], Exception) else {}
+        candles_1m, candles_5m, candles_15m = (
+            c if not isinstance(c, Exception) else [] for c in candles
+        )
+        return {
+            "ticker": self._tickers.get(symbol, {}),
+            "candles_1m": candles_1m,
+            "candles_5m": candles_5m,
+            "candles_15m": candles_15m,
+            "funding_data": funding_data,
+            "oi_data": self._open_interest.get(symbol, {}),
+        }
+
+    async def snapshot(self, symbols: Iterable[str], concurrency: int = 10) -> Dict[str, Dict]:
+        """
+        FastMonitor inputs for every symbol in one pass.
+
+        The two batch endpoints are fetched once; per-symbol candle and funding
+        reads run with bounded concurrency on top of the request scheduler.
+        """
+        symbols = list(symbols)
+        await self._refresh_batches(time.monotonic())
+
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(symbol: str) -> Tuple[str, Dict]:
+            async with sem:
+                return symbol, await self._collect(symbol)
+
+        results = await asyncio.gather(*(_one(s) for s in symbols), return_exceptions=True)
+        snapshot: Dict[str, Dict] = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning(f"[MarketHub] Snapshot failed for {symbol}: {result}")
+                continue
+            snapshot[symbol] = result[1]
+        return snapshot
+
+    def get_status(self) -> Dict:
+        return {
+            "inst_type": self.inst_type,
+            "cached_series": len(self._candles),
+            "tickers": len(self._tickers),
+            "fetch_count": self.fetch_count,
+            "candle_fetch_count": self.candle_fetch_count,
+            "incremental_fetch_count": self.incremental_fetch_count,
+        }
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
+_hub: Optional[MarketDataHub] = None
+
+
+def get_market_hub() -> MarketDataHub:
+    """Get the process-wide market data hub"""
+    global _hub
+    if _hub is None:
+        _hub = MarketDataHub()
+    return _hub
@@ -0,0 +1,281 @@
+"""
+Multi-Symbol Trigger Runtime - 多品种触发运行时
+
+在单个进程内对 N 个永续合约执行 Layer 1 (FastMonitor) 检测：
+
+- 每个 tick 通过共享的 MarketDataHub 批量取数 (tickers / OI 一次请求覆盖全部品种，
+  K 线按品种增量更新)，再逐个品种运行纯规则检测
+- 每个品种保留自己的 FastMonitor (资金费率/持仓量的变化量状态) 和 TriggerLock (冷却期)
+- 触发后的交易会议 (Layer 2/3) 共享一个全局并发预算，按紧急程度排队
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..trading_config import get_env_bool, get_env_int, get_env_float, get_env_str
+from ..request_scheduler import PrioritySemaphore
+from .fast_monitor import FastMonitor, FastMonitorConfig, FastTriggerResult
+from .lock import TriggerLock
+from .market_hub import MarketDataHub, get_market_hub
+from .ta_calculator import TACalculator
+
+logger = logging.getLogger(__name__)
+
+# 紧急程度 -> 会议排队优先级 (数值越小越先执行)
+URGENCY_PRIORITY: Dict[str, int] = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+OnSymbolTrigger = Callable[[str, FastTriggerResult], Awaitable[None]]
+
+
+def parse_symbols(value: str) -> List[str]:
+    """'BTC-USDT-SWAP, eth-usdt-swap' -> ['BTC-USDT-SWAP', 'ETH-USDT-SWAP'] (order kept, deduped)"""
+    symbols: List[str] = []
+    for part in value.split(","):
+        symbol = part.strip().upper()
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+
+@dataclass
+class MultiSymbolConfig:
+    """
+    多品种运行时配置
+
+    Environment Variables:
+        TRIGGER_MULTI_SYMBOL_ENABLED: TradingSystem 用本运行时替代单品种 TriggerScheduler (default: false)
+        TRIGGER_SYMBOLS: 逗号分隔的合约列表 (default: BTC-USDT-SWAP)
+        MULTI_SYMBOL_INTERVAL_SECONDS: 检测间隔 (default: 60)
+        MAX_CONCURRENT_MEETINGS: 全局同时运行的交易会议数 (default: 2)
+        MAX_PENDING_MEETINGS: 排队等待预算的会议上限 (default: 10)
+        MULTI_SYMBOL_FETCH_CONCURRENCY: 每个 tick 同时取数的品种数 (default: 10)
+        TRIGGER_COOLDOWN_MINUTES: 单品种会议后的冷却时间 (default: 30)
+    """
+    enabled: bool = field(default_factory=lambda: get_env_bool("TRIGGER_MULTI_SYMBOL_ENABLED", False))
+    symbols: List[str] = field(
+        default_factory=lambda: parse_symbols(get_env_str("TRIGGER_SYMBOLS", "BTC-USDT-SWAP"))
+    )
+    interval_seconds: float = field(default_factory=lambda: get_env_float("MULTI_SYMBOL_INTERVAL_SECONDS", 60.0))
+    max_concurrent_meetings: int = field(default_factory=lambda: get_env_int("MAX_CONCURRENT_MEETINGS", 2))
+    max_pending_meetings: int = field(default_factory=lambda: get_env_int("MAX_PENDING_MEETINGS", 10))
+    fetch_concurrency: int = field(default_factory=lambda: get_env_int("MULTI_SYMBOL_FETCH_CONCURRENCY", 10))
+    cooldown_minutes: int = field(default_factory=lambda: get_env_int("TRIGGER_COOLDOWN_MINUTES", 30))
+
+
+class MultiSymbolTriggerRuntime:
+    """
+    多品种触发运行时
+
+    Attributes:
+        config: 运行时配置
+        hub: 共享行情数据
+        on_trigger: 品种触发后的会议回调 ``(symbol, fast_result)``，受全局并发预算约束
+    """
+
+    def __init__(
+        self,
+        config: Optional[MultiSymbolConfig] = None,
+        on_trigger: Optional[OnSymbolTrigger] = None,
+        market_hub: Optional[MarketDataHub] = None,
+        monitor_config: Optional[FastMonitorConfig] = None
+    ):
+        self.config = config or MultiSymbolConfig()
+        self.on_trigger = on_trigger
+        self.hub = market_hub or get_market_hub()
+        self._monitor_config = monitor_config or FastMonitorConfig()
+
+        self._monitors: Dict[str, FastMonitor] = {}
+        self._locks: Dict[str, TriggerLock] = {}
+        self._ta: Dict[str, TACalculator] = {}
+        for symbol in self.config.symbols:
+            self._add(symbol)
+
+        self._meeting_budget = PrioritySemaphore(max(1, self.config.max_concurrent_meetings))
+        self._meetings: Dict[str, asyncio.Task] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._tick_count = 0
+        self._trigger_count = 0
+        self._meeting_count = 0
+        self._dropped_count = 0
+        self._last_tick_time: Optional[datetime] = None
+        self._last_tick_ms = 0.0
+        self._last_results: Dict[str, FastTriggerResult] = {}
+
+        logger.info(
+            f"[MultiSymbol] Initialized for {len(self.config.symbols)} symbols, "
+            f"meeting budget={self.config.max_concurrent_meetings}"
+        )
+
+    # ------------------------------------------------------------------
+    # Symbols
+    # ------------------------------------------------------------------
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._monitors)
+
+    def _add(self, symbol: str):
+        self._monitors[symbol] = FastMonitor(symbol=symbol, config=self._monitor_config, market_hub=self.hub)
+        self._locks[symbol] = TriggerLock(cooldown_minutes=self.config.cooldown_minutes)
+
+    def add_symbol(self, symbol: str):
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in self._monitors:
+            self._add(symbol)
+            logger.info(f"[MultiSymbol] Added {symbol}")
+
+    def remove_symbol(self, symbol: str):
+        self._monitors.pop(symbol, None)
+        self._locks.pop(symbol, None)
+        self._ta.pop(symbol, None)
+        self._last_results.pop(symbol, None)
+
+    def get_lock(self, symbol: str) -> Optional[TriggerLock]:
+        return self._locks.get(symbol)
+
+    def get_ta_calculator(self, symbol: str) -> TACalculator:
+        """Per-symbol TACalculator reading from the shared candle cache"""
+        ta = self._ta.get(symbol)
+        if ta is None:
+            ta = self._ta[symbol] = TACalculator(symbol=symbol, market_hub=self.hub)
+        return ta
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        if self._running:
+            logger.warning("[MultiSymbol] Already running")
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info(f"[MultiSymbol] Started, interval={self.config.interval_seconds}s")
+
+    async def stop(self):
+        self._running = False
+        tasks = [t for t in [self._task, *self._meetings.values()] if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._meetings.clear()
+        logger.info("[MultiSymbol] Stopped")
+
+    async def _run_loop(self):
+        while self._running:
+            try:
+                await self.run_tick()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[MultiSymbol] Tick failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.config.interval_seconds)
+
+    # ------------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------------
+
+    async def run_tick(self) -> Dict[str, FastTriggerResult]:
+        """
+        对所有品种执行一次 Layer 1 检测，并为触发的品种安排会议
+
+        Returns:
+            symbol -> FastTriggerResult
+        """
+        self._tick_count += 1
+        started = asyncio.get_running_loop().time()
+        self._last_tick_time = datetime.now()
+
+        snapshot = await self.hub.snapshot(self.symbols, concurrency=self.config.fetch_concurrency)
+        results: Dict[str, FastTriggerResult] = {}
+        for symbol, data in snapshot.items():
+            monitor = self._monitors.get(symbol)
+            if monitor is not None:
+                results[symbol] = monitor.evaluate(data)
+        self._last_results = results
+
+        triggered = sorted(
+            (s for s, r in results.items() if r.should_trigger),
+            key=lambda s: (URGENCY_PRIORITY.get(results[s].urgency, 3), -len(results[s].conditions))
+        )
+        for symbol in triggered:
+            self._trigger_count += 1
+            self._schedule_meeting(symbol, results[symbol])
+
+        self._last_tick_ms = (asyncio.get_running_loop().time() - started) * 1000
+        logger.info(
+            f"[MultiSymbol] Tick #{self._tick_count}: {len(results)}/{len(self._monitors)} symbols, "
+            f"{len(triggered)} triggered, {len(self._meetings)} meetings active/queued "
+            f"({self._last_tick_ms:.0f}ms)"
+        )
+        return results
+
+    def _schedule_meeting(self, symbol: str, result: FastTriggerResult) -> bool:
+        if self.on_trigger is None:
+            return False
+        if symbol in self._meetings:
+            logger.debug(f"[MultiSymbol] {symbol}: meeting already queued/running")
+            return False
+
+        lock = self._locks.get(symbol)
+        can, reason = lock.can_trigger() if lock else (True, "")
+        if not can:
+            logger.info(f"[MultiSymbol] {symbol}: triggered but skipped ({reason})")
+            return False
+
+        if len(self._meetings) >= self.config.max_concurrent_meetings + self.config.max_pending_meetings:
+            self._dropped_count += 1
+            logger.warning(f"[MultiSymbol] {symbol}: meeting queue full, dropping trigger")
+            return False
+
+        task = asyncio.create_task(self._run_meeting(symbol, result))
+        self._meetings[symbol] = task
+        task.add_done_callback(lambda _t, s=symbol: self._meetings.pop(s, None))
+        return True
+
+    async def _run_meeting(self, symbol: str, result: FastTriggerResult):
+        priority = URGENCY_PRIORITY.get(result.urgency, 3)
+        await self._meeting_budget.acquire(priority)
+        lock = self._locks.get(symbol)
+        acquired = False
+        try:
+            if lock is not None:
+                acquired = await lock.acquire(timeout=0)
+                if not acquired:
+                    return
+            self._meeting_count += 1
+            logger.info(f"[MultiSymbol] {symbol}: meeting started (urgency={result.urgency})")
+            await self.on_trigger(symbol, result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[MultiSymbol] {symbol}: meeting failed: {type(e).__name__}: {e}")
+        finally:
+            self._meeting_budget.release()
+            if acquired:
+                lock.release()
+
+    def get_status(self) -> Dict:
+        return {
+            "running": self._running,
+            "symbols": self.symbols,
+            "interval_seconds": self.config.interval_seconds,
+            "tick_count": self._tick_count,
+            "trigger_count": self._trigger_count,
+            "meeting_count": self._meeting_count,
+            "dropped_count": self._dropped_count,
+            "meetings_active": self._meeting_budget.in_flight,
+            "meetings_queued": len(self._meetings) - self._meeting_budget.in_flight,
+            "meeting_budget": self.config.max_concurrent_meetings,
+            "last_tick_time": self._last_tick_time.isoformat() if self._last_tick_time else None,
+            "last_tick_ms": round(self._last_tick_ms, 1),
+            "triggered": {s: r.urgency for s, r in self._last_results.items() if r.should_trigger},
+            "locks": {s: lock.state for s, lock in self._locks.items()},
+            "market_hub": self.hub.get_status(),
+        }
@@ -101,6 +101,7 @@ class TriggerScheduler:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        await self.fast_monitor.close()
         logger.info("[TriggerScheduler] Stopped")
     
     async def _run_loop(self):
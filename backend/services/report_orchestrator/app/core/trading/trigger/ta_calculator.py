@@ -90,14 +90,19 @@ class TACalculator:
     使用 OKX 公开 API 获取 K 线数据并计算指标。
     """
 
-    def __init__(self, symbol: str = "BTC-USDT-SWAP"):
+    def __init__(self, symbol: str = "BTC-USDT-SWAP", market_hub=None):
         self.symbol = symbol
+        # 共享行情数据 (MarketDataHub)，多品种运行时与 FastMonitor 共用 K 线缓存
+        self.market_hub = market_hub
         # Use centralized config for OKX base URL
         self.base_url = get_infra_config().okx_base_url if get_infra_config else "https://www.okx.com"
         self._last_data: Optional[TAData] = None
 
     async def _fetch_all_candles(self, session) -> Dict[str, Any]:
         """并行获取所有周期的K线数据"""
+        if self.market_hub is not None:
+            return await self._fetch_from_hub()
+
         tasks = [
             self._fetch_candles(session, "15m", 50),
             self._fetch_candles(session, "1H", 50),
@@ -113,6 +118,22 @@ class TACalculator:
             "ticker": results[3] if not isinstance(results[3], Exception) else {},
         }
 
+    async def _fetch_from_hub(self) -> Dict[str, Any]:
+        hub = self.market_hub
+        results = await asyncio.gather(
+            hub.get_candles(self.symbol, "15m", 50),
+            hub.get_candles(self.symbol, "1H", 50),
+            hub.get_candles(self.symbol, "4H", 20),
+            hub.get_ticker(self.symbol),
+            return_exceptions=True
+        )
+        return {
+            "candles_15m": results[0] if not isinstance(results[0], Exception) else [],
+            "candles_1h": results[1] if not isinstance(results[1], Exception) else [],
+            "candles_4h": results[2] if not isinstance(results[2], Exception) else [],
+            "ticker": results[3] if not isinstance(results[3], Exception) else {},
+        }
+
     def _calculate_15m_indicators(self, data: TAData, candles: List[Dict]) -> None:
         """计算15分钟周期指标"""
         if not candles:
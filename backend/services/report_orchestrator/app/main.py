@@ -68,6 +68,7 @@ from .core.memory.governance import compact_text, make_provenance_metadata, shou
 from .core.model_policy import resolve_model_for_role
 from .core.orchestration_templates import get_orchestration_templates
 from .core.skills import build_skill_instruction_context
+from .core.prompt_assembly import ContextSection, fit_sections
 from .core.expert_chat import (
     build_execution_stages,
     extract_specialist_response,
@@ -79,6 +80,7 @@ from .core.metrics import (
     record_route_decision,
 )
 from .core.observability.metrics_snapshot import MetricsSnapshotCache
+from .core.observability.logging import set_trace_id
 
 # Configure logging (JSON in production, console in development)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -143,6 +145,10 @@ EXPERT_CHAT_AUDIT_REPORT_PERSIST_INTERVAL_SECONDS = max(
 EXPERT_CHAT_EVIDENCE_MAX_ITEMS = max(
     1, int(os.getenv("EXPERT_CHAT_EVIDENCE_MAX_ITEMS", "24"))
 )
+# 历史/技能/记忆/共享证据/专家输出共享的 token 预算 (估算值)
+EXPERT_CHAT_CONTEXT_TOKEN_BUDGET = max(
+    500, int(os.getenv("EXPERT_CHAT_CONTEXT_TOKEN_BUDGET", "6000"))
+)
 
 # In-memory chat sessions (PoC scope)
 active_chat_sessions: Dict[str, Dict[str, Any]] = {}
@@ -853,8 +859,9 @@ async def _build_expert_chat_memory_context(
         logger.warning("[ExpertChat] memory query failed for %s: %s", agent_id, e)
         return ""
 
-    agent_text = format_memory_hits(agent_hits, max_items=ATOMIC_MEMORY_TOP_K, max_chars=1400)
-    shared_text = format_memory_hits(shared_hits, max_items=ATOMIC_MEMORY_TOP_K, max_chars=900)
+    # 长度由 _build_agent_task_prompt 的统一预算裁剪
+    agent_text = format_memory_hits(agent_hits, max_items=ATOMIC_MEMORY_TOP_K)
+    shared_text = format_memory_hits(shared_hits, max_items=ATOMIC_MEMORY_TOP_K)
     chunks: List[str] = []
     if agent_text:
         chunks.append(f"## {agent_id} historical memory\n{agent_text}")
@@ -1080,8 +1087,6 @@ def _build_agent_task_prompt(
         user_message=user_message,
         language=language,
     )
-    history_limit = 6 if (shared_evidence_context or skill_context) else 10
-    history_text = _format_history_window(history, limit=history_limit)
     normalized_category = _normalize_expert_chat_knowledge_category(knowledge_category)
 
     specialist_outputs_text = ""
@@ -1092,6 +1097,27 @@ def _build_agent_task_prompt(
             if item.get("content")
         )
 
+    # 各段共享同一个 token 预算: 附件/技能/证据优先，证据与历史都按时间正序，保留最近的条目
+    history_window = _format_history_window(history, limit=10)
+    assembled = fit_sections(
+        [
+            ContextSection("attachment", text=attachment_context, priority=0),
+            ContextSection("skills", text=skill_context, priority=1, min_tokens=300),
+            ContextSection("evidence", text=shared_evidence_context, priority=2, keep="tail"),
+            ContextSection("specialists", text=specialist_outputs_text, priority=2),
+            ContextSection("memory", text=memory_context, priority=3),
+            ContextSection("history", items=history_window.splitlines(), priority=4, keep="tail", min_tokens=400),
+        ],
+        EXPERT_CHAT_CONTEXT_TOKEN_BUDGET,
+    )
+    assembled.record(source="expert_chat", model=str(EXPERT_CHAT_PROVIDER or "default"))
+    history_text = assembled.texts.get("history") or "(empty)"
+    attachment_context = assembled.texts.get("attachment", "")
+    skill_context = assembled.texts.get("skills", "")
+    shared_evidence_context = assembled.texts.get("evidence", "")
+    specialist_outputs_text = assembled.texts.get("specialists", "")
+    memory_context = assembled.texts.get("memory", "")
+
     if _is_zh(language):
         prompt = (
             f"最近对话历史:\n{history_text}\n\n"
@@ -2560,6 +2586,54 @@ startup_time = time.time()
 # inject_human_input and generate_summary endpoints have been migrated
 # See: app/api/routers/roundtable.py
 
+async def _relay_roundtable_stream(
+    websocket: WebSocket,
+    event_stream: Any,
+    session_id: str,
+    after_id: str = "0",
+):
+    """
+    Serve a roundtable WebSocket from the session's Redis Stream.
+
+    Used when the meeting runs on another worker. Frames carry ``stream_id`` so the
+    client can reconnect with ``last_event_id`` and continue where it left off.
+    """
+    from .core.event_stream import TERMINAL_FRAME_TYPES
+
+    await websocket.send_json({
+        "type": "agents_ready",
+        "session_id": session_id,
+        "agents": [],
+        "message": "已恢复讨论会话",
+    })
+
+    async def _forward():
+        async for entry_id, frame in event_stream.follow(session_id, after_id=after_id):
+            await websocket.send_json({**frame, "stream_id": entry_id})
+            if frame.get("type") in TERMINAL_FRAME_TYPES:
+                return
+        # 未收到结束帧就停止跟随: 会议所在 worker 已退出或长时间无事件
+        await websocket.send_json({"type": "error", "message": "讨论会话已中断，请重新发起讨论。"})
+        await websocket.send_json({"type": "session_closed", "session_id": session_id, "status": "error"})
+
+    async def _answer_pings():
+        while True:
+            msg = await websocket.receive_json()
+            if isinstance(msg, dict) and msg.get("type") == "ping":
+                await websocket.send_json({"type": "pong", "timestamp": datetime.now().isoformat()})
+
+    forward_task = asyncio.create_task(_forward())
+    ping_task = asyncio.create_task(_answer_pings())
+    try:
+        done, _ = await asyncio.wait({forward_task, ping_task}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not task.cancelled() and task.exception() and not isinstance(task.exception(), WebSocketDisconnect):
+                logger.warning(f"[ROUNDTABLE] Stream relay for {session_id} ended: {task.exception()}")
+    finally:
+        forward_task.cancel()
+        ping_task.cancel()
+
+
 @app.websocket("/ws/roundtable")
 async def websocket_roundtable_endpoint(websocket: WebSocket):
     """
@@ -2612,8 +2686,10 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
         reset_roundtable_knowledge_preferences,
         set_roundtable_knowledge_preferences,
     )
-    from .core.agent_event_bus import AgentEventBus
+    from .core.agent_event_bus import FLUSH_TIMEOUT_SECONDS as AGENT_EVENT_FLUSH_TIMEOUT, AgentEventBus
+    from .core.event_stream import get_event_stream, stream_publisher
     registry = get_registry()
+    event_stream = get_event_stream()
 
     session_id = None
     runtime_state: Optional[Dict[str, Any]] = None
@@ -2642,6 +2718,20 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
         if action == "resume_discussion":
             session_id = str(initial_request.get("session_id") or "").strip()
             runtime_state = roundtable_sessions.get(session_id)
+            if session_id and not runtime_state and event_stream is not None:
+                # 会议运行在其他 worker 上: 从 Redis Stream 跟随事件
+                meta = await event_stream.get_meta(session_id)
+                if meta:
+                    if meta.get("user_id") != str(current_user.id):
+                        await websocket.close(code=1008, reason="Session ownership mismatch")
+                        return
+                    await _relay_roundtable_stream(
+                        websocket,
+                        event_stream,
+                        session_id,
+                        after_id=str(initial_request.get("last_event_id") or "0"),
+                    )
+                    return
             if not session_id or not runtime_state:
                 await websocket.send_json({
                     "type": "error",
@@ -2666,7 +2756,14 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
 
             # Replay persisted event history first (full stream), fallback to in-memory event bus.
             replay_payloads: List[Dict[str, Any]] = []
-            if session_store:
+            if event_stream is not None:
+                try:
+                    for _entry_id, frame in await event_stream.read_after(session_id, count=5000):
+                        if frame.get("type") == "agent_event" and isinstance(frame.get("event"), dict):
+                            replay_payloads.append(frame["event"])
+                except Exception as replay_err:
+                    logger.warning(f"[ROUNDTABLE] Failed to replay stream events for {session_id}: {replay_err}")
+            elif session_store:
                 try:
                     persisted_events = session_store.get_session_events(
                         session_id,
@@ -2680,7 +2777,7 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
                     logger.warning(f"[ROUNDTABLE] Failed to replay persisted events for {session_id}: {replay_err}")
 
             if not replay_payloads:
-                replay_payloads = [evt.dict() for evt in event_bus.get_history()]
+                replay_payloads = [evt.model_dump() for evt in event_bus.get_history()]
 
             for evt in replay_payloads:
                 try:
@@ -2754,7 +2851,9 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
             # Generate session ID
             safe_company_name = _safe_roundtable_id_component(company_name or topic)
             session_id = f"roundtable_{safe_company_name}_{uuid.uuid4().hex[:8]}"
-            print(f"[ROUNDTABLE] Starting discussion for: {company_name}, session: {session_id}", flush=True)
+            # 本次讨论产生的日志 (含 LLM Gateway 侧) 都带上 session_id 作为 trace_id
+            set_trace_id(session_id)
+            logger.info("[ROUNDTABLE] Starting discussion for: %s, session: %s", company_name, session_id)
 
             # Create agent event bus for real-time updates
             event_bus = AgentEventBus()
@@ -2764,14 +2863,15 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
             async def _persist_roundtable_event(event):
                 if runtime_state is not None:
                     runtime_state["updated_at"] = datetime.now().isoformat()
-                if not session_store:
+                if event_stream is not None or not session_store:
+                    # 启用 EventStream 时事件只写入它 (stream_publisher)，既做持久化也做跨 worker 扇出
                     return
                 try:
                     session_store.append_session_event(
                         session_id,
                         {
                             "type": "agent_event",
-                            "event": event.dict(),
+                            "event": event.model_dump(),
                         },
                         ttl_days=30,
                         max_events=5000,
@@ -2780,6 +2880,10 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
                     logger.warning(f"[ROUNDTABLE] Failed to persist event for {session_id}: {persist_err}")
 
             event_bus.add_local_handler(_persist_roundtable_event)
+            if event_stream is not None:
+                # 事件写入 Redis Stream，断线回放与其他 worker 上的 WebSocket 订阅/续传都读它
+                event_bus.add_local_handler(stream_publisher(event_stream, session_id))
+                await event_stream.set_meta(session_id, user_id=str(current_user.id), status="running", pid=os.getpid())
 
             # Get selected experts from context (sent by frontend)
             selected_experts = context.get('experts', [])
@@ -3149,6 +3253,17 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
                 if runtime_state is not None:
                     runtime_state["summary"] = result
 
+                # 结束帧之前先把已入队的 result/completed 等事件发完
+                await event_bus.drain(timeout=AGENT_EVENT_FLUSH_TIMEOUT)
+                if event_stream is not None:
+                    await event_stream.publish(session_id, {
+                        "type": "discussion_complete",
+                        "session_id": session_id,
+                        "report_id": result.get("report_id"),
+                        "summary": result,
+                    })
+                    await event_stream.set_meta(session_id, status="completed", report_id=result.get("report_id"))
+
                 # Send completion summary (check WebSocket state first)
                 try:
                     from starlette.websockets import WebSocketState
@@ -3170,6 +3285,19 @@ async def websocket_roundtable_endpoint(websocket: WebSocket):
                     runtime_state["status"] = "error"
                     runtime_state["error"] = str(meeting_error)
                     runtime_state["updated_at"] = datetime.now().isoformat()
+                await event_bus.drain(timeout=AGENT_EVENT_FLUSH_TIMEOUT)
+                if event_stream is not None:
+                    # 先发与本地 WebSocket 相同的 error 帧，再发结束跟随的 session_closed
+                    await event_stream.publish(session_id, {
+                        "type": "error",
+                        "message": f"讨论过程中出现错误: {str(meeting_error)}",
+                    })
+                    await event_stream.publish(session_id, {
+                        "type": "session_closed",
+                        "session_id": session_id,
+                        "status": "error",
+                    })
+                    await event_stream.set_meta(session_id, status="error")
 
                 # Check if WebSocket is still open before sending error
                 try:
@@ -4011,6 +4139,7 @@ async def websocket_expert_chat_endpoint(websocket: WebSocket):
                         shared_evidence_context = format_shared_evidence_context(
                             shared_evidence_board,
                             language=language,
+                            max_chars=None,  # 由任务提示词的统一预算裁剪
                         )
                         await _safe_send(
                             {
@@ -4214,6 +4343,7 @@ async def websocket_expert_chat_endpoint(websocket: WebSocket):
                             shared_evidence_context = format_shared_evidence_context(
                                 shared_evidence_board,
                                 language=language,
+                                max_chars=None,  # 由任务提示词的统一预算裁剪
                             )
                             stage_tasks: Dict[str, asyncio.Task] = {}
                             for sid in stage_agent_ids:
@@ -0,0 +1,48 @@
+"""
+Message Codec
+消息编解码
+
+Kafka 消息体的序列化/反序列化:
+- pydantic 消息直接用 pydantic_core.to_json (Rust 实现，省去 model_dump + json.dumps 两次遍历)
+- 普通 dict 优先用 orjson，未安装时回退到标准库 json
+"""
+import json
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def encode_value(value: Any) -> bytes:
+    """序列化消息体为 bytes (已是 bytes 时原样返回)"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if isinstance(value, BaseModel):
+        return to_json(value)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=str, ensure_ascii=False).encode("utf-8")
+
+
+def decode_value(raw: Optional[bytes]) -> Any:
+    """反序列化消息体"""
+    if raw is None:
+        return None
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def encode_key(key: Optional[str]) -> Optional[bytes]:
+    return key.encode("utf-8") if key else None
+
+
+def decode_key(raw: Optional[bytes]) -> Optional[str]:
+    return raw.decode("utf-8") if raw else None
@@ -0,0 +1,238 @@
+"""
+Concurrent Consumer
+并发消费者
+
+原来的消费循环逐条 await 每个处理器，一个慢处理器 (如审计写入) 会卡住整个 Topic。
+ConcurrentConsumer 在 aiokafka 消费者之上提供:
+- 每个分区有界并发 (同一消息 key 仍按顺序处理，保持会话内顺序)
+- 有序 offset 提交: 只提交连续处理完成的前缀，崩溃后不会跳过未完成的消息
+- 背压: 分区积压超过上限时 pause，消化到一半后 resume
+- 分区被回收时等待在途消息并提交
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+try:
+    from aiokafka.abc import ConsumerRebalanceListener
+except ImportError:
+    ConsumerRebalanceListener = object
+
+RecordHandler = Callable[[Any], Awaitable[None]]
+
+
+class OffsetTracker:
+    """
+    单个分区的 offset 跟踪
+
+    消息可以乱序完成，但 position 只推进到连续完成的前缀之后。
+    """
+
+    def __init__(self):
+        self._order: Deque[int] = deque()
+        self._done: Set[int] = set()
+        self.position: Optional[int] = None      # 下一次提交的 offset (最后连续完成的 offset + 1)
+        self.committed: Optional[int] = None
+
+    def add(self, offset: int):
+        self._order.append(offset)
+
+    def done(self, offset: int):
+        self._done.add(offset)
+        while self._order and self._order[0] in self._done:
+            finished = self._order.popleft()
+            self._done.discard(finished)
+            self.position = finished + 1
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._order)
+
+    def pending_commit(self) -> Optional[int]:
+        if self.position is not None and self.position != self.committed:
+            return self.position
+        return None
+
+
+class _PartitionState:
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.tracker = OffsetTracker()
+        self.tails: Dict[Any, asyncio.Task] = {}
+        self.tasks: Set[asyncio.Task] = set()
+        self.pending = 0
+
+
+class ConcurrentConsumer:
+    """
+    分区内有界并发的消费调度器
+
+    Args:
+        consumer: aiokafka 消费者 (enable_auto_commit=False)，需支持 getmany/pause/resume/commit
+        handler: 单条消息处理函数，接收 ConsumerRecord
+        concurrency: 每个分区的最大并发处理数
+        max_buffered: 每个分区最多积压的未完成消息数，超过后 pause 该分区
+        commit_interval_ms: offset 提交间隔
+    """
+
+    def __init__(
+        self,
+        consumer: Any,
+        handler: RecordHandler,
+        concurrency: Optional[int] = None,
+        max_buffered: Optional[int] = None,
+        commit_interval_ms: Optional[int] = None,
+        poll_timeout_ms: int = 500,
+        max_records: int = 500,
+    ):
+        self.consumer = consumer
+        self.handler = handler
+        self.concurrency = concurrency or int(os.getenv("KAFKA_CONSUMER_CONCURRENCY", "8"))
+        self.max_buffered = max_buffered or int(os.getenv("KAFKA_CONSUMER_MAX_BUFFERED", "500"))
+        self.commit_interval = (
+            commit_interval_ms if commit_interval_ms is not None
+            else int(os.getenv("KAFKA_COMMIT_INTERVAL_MS", "1000"))
+        ) / 1000
+        self.poll_timeout_ms = poll_timeout_ms
+        self.max_records = max_records
+        self._partitions: Dict[Any, _PartitionState] = {}
+        self._paused: Set[Any] = set()
+        self._running = False
+        self._last_commit = 0.0
+        self.stats = {"processed": 0, "errors": 0, "commits": 0, "pauses": 0}
+
+    def rebalance_listener(self) -> "ConsumerRebalanceListener":
+        return _RevokeListener(self)
+
+    async def run(self):
+        """拉取并分发消息，直到 stop()"""
+        self._running = True
+        self._last_commit = time.monotonic()
+        try:
+            while self._running:
+                batches = await self.consumer.getmany(
+                    timeout_ms=self.poll_timeout_ms, max_records=self.max_records
+                )
+                for tp, records in batches.items():
+                    for record in records:
+                        self._submit(tp, record)
+                    state = self._partitions.get(tp)
+                    if state and state.pending >= self.max_buffered and tp not in self._paused:
+                        self.consumer.pause(tp)
+                        self._paused.add(tp)
+                        self.stats["pauses"] += 1
+                if time.monotonic() - self._last_commit >= self.commit_interval:
+                    await self.commit()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[ConcurrentConsumer] Consume loop error: {e}")
+        finally:
+            self._running = False
+
+    def _submit(self, tp: Any, record: Any):
+        state = self._partitions.get(tp)
+        if state is None:
+            state = self._partitions[tp] = _PartitionState(self.concurrency)
+        state.tracker.add(record.offset)
+        state.pending += 1
+
+        key = record.key
+        previous = state.tails.get(key) if key is not None else None
+        task = asyncio.create_task(self._process(tp, state, record, previous))
+        state.tasks.add(task)
+        task.add_done_callback(state.tasks.discard)
+        if key is not None:
+            state.tails[key] = task
+            task.add_done_callback(
+                lambda t, k=key: state.tails.pop(k, None) if state.tails.get(k) is t else None
+            )
+
+    async def _process(self, tp: Any, state: _PartitionState, record: Any, previous: Optional[asyncio.Task]):
+        if previous is not None:
+            # 同一 key 的消息按到达顺序处理
+            await asyncio.wait([previous])
+        try:
+            async with state.semaphore:
+                await self.handler(record)
+            self.stats["processed"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"[ConcurrentConsumer] Handler error at {tp}@{record.offset}: {e}")
+        finally:
+            state.tracker.done(record.offset)
+            state.pending -= 1
+            if tp in self._paused and state.pending <= self.max_buffered // 2:
+                self._paused.discard(tp)
+                self.consumer.resume(tp)
+
+    async def commit(self, partitions: Optional[Iterable[Any]] = None):
+        """提交已连续完成的 offset"""
+        self._last_commit = time.monotonic()
+        targets = list(partitions) if partitions is not None else list(self._partitions)
+        offsets = {}
+        for tp in targets:
+            state = self._partitions.get(tp)
+            position = state.tracker.pending_commit() if state else None
+            if position is not None:
+                offsets[tp] = position
+        if not offsets:
+            return
+        try:
+            await self.consumer.commit(offsets)
+        except Exception as e:
+            logger.warning(f"[ConcurrentConsumer] Offset commit failed: {e}")
+            return
+        for tp, position in offsets.items():
+            self._partitions[tp].tracker.committed = position
+        self.stats["commits"] += 1
+
+    async def drain(self, partitions: Optional[Iterable[Any]] = None, timeout: float = 30.0):
+        """等待在途消息处理完成并提交 offset"""
+        targets = list(partitions) if partitions is not None else list(self._partitions)
+        tasks = set()
+        for tp in targets:
+            state = self._partitions.get(tp)
+            if state:
+                tasks.update(state.tasks)
+        if tasks:
+            _, still_running = await asyncio.wait(tasks, timeout=timeout)
+            if still_running:
+                logger.warning(f"[ConcurrentConsumer] {len(still_running)} handlers still running after {timeout}s")
+        await self.commit(targets)
+
+    async def release(self, partitions: Iterable[Any]):
+        """分区被回收: 处理完在途消息、提交后丢弃状态"""
+        partitions = list(partitions)
+        await self.drain(partitions)
+        for tp in partitions:
+            self._partitions.pop(tp, None)
+            self._paused.discard(tp)
+
+    async def stop(self, timeout: float = 30.0):
+        self._running = False
+        await self.drain(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "partitions": len(self._partitions),
+            "paused": len(self._paused),
+            "in_flight": sum(s.pending for s in self._partitions.values()),
+        }
+
+
+class _RevokeListener(ConsumerRebalanceListener):
+    def __init__(self, dispatcher: ConcurrentConsumer):
+        self.dispatcher = dispatcher
+
+    async def on_partitions_revoked(self, revoked):
+        await self.dispatcher.release(revoked)
+
+    async def on_partitions_assigned(self, assigned):
+        pass
@@ -3,11 +3,13 @@ Kafka Client
 Kafka 客户端
 
 提供统一的 Kafka 生产者/消费者接口
+
+生产端: send() 入队后由 aiokafka 按 linger/batch 打包发送，ack 可批量收集 (send_batch / flush)
+消费端: ConcurrentConsumer 分区内有界并发 + 有序 offset 提交
 """
 import asyncio
-import json
 import logging
-from typing import Dict, Any, List, Optional, Callable, Awaitable
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Set
 from datetime import datetime
 import os
 
@@ -16,6 +18,10 @@ logger = logging.getLogger(__name__)
 # Kafka 配置
 KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:29092")
 KAFKA_CLIENT_ID = os.getenv("KAFKA_CLIENT_ID", "magellan-client")
+# 生产者批量参数: 等待 linger_ms 攒批，按 batch 压缩发送
+KAFKA_LINGER_MS = int(os.getenv("KAFKA_LINGER_MS", "5"))
+KAFKA_MAX_BATCH_BYTES = int(os.getenv("KAFKA_MAX_BATCH_BYTES", str(64 * 1024)))
+KAFKA_COMPRESSION_TYPE = os.getenv("KAFKA_COMPRESSION_TYPE", "gzip") or None
 
 # 尝试导入 aiokafka，如果不可用则使用 mock
 try:
@@ -28,6 +34,9 @@ except ImportError:
     AIOKafkaProducer = None
     AIOKafkaConsumer = None
 
+from ..core.observability.tracing import extract_kafka_headers, inject_kafka_headers, start_span
+from .codec import decode_key, decode_value, encode_key, encode_value
+from .consumer import ConcurrentConsumer
 from .messages import MagellanMessage
 from .topics import MagellanTopics, get_partition_key
 
@@ -42,6 +51,7 @@ class KafkaClient:
     _instance: Optional['KafkaClient'] = None
     _producer: Optional[Any] = None
     _consumers: Dict[str, Any] = {}
+    _dispatchers: Dict[str, ConcurrentConsumer] = {}
     _running: bool = False
 
     def __new__(cls):
@@ -56,6 +66,9 @@ class KafkaClient:
         self._initialized = True
         self._message_handlers: Dict[str, List[Callable]] = {}
         self._fallback_queue: asyncio.Queue = asyncio.Queue()  # 降级队列
+        self._pending_acks: Set[asyncio.Future] = set()  # wait=False 发送的未确认消息
+        self._consume_tasks: Dict[str, asyncio.Task] = {}
+        self._send_stats = {"sent": 0, "acked": 0, "failed": 0}
 
     @property
     def is_available(self) -> bool:
@@ -76,9 +89,12 @@ class KafkaClient:
             self._producer = AIOKafkaProducer(
                 bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
                 client_id=KAFKA_CLIENT_ID,
-                value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8'),
-                key_serializer=lambda k: k.encode('utf-8') if k else None,
-                acks='all'  # 等待所有副本确认
+                value_serializer=encode_value,
+                key_serializer=encode_key,
+                acks='all',  # 等待所有副本确认
+                linger_ms=KAFKA_LINGER_MS,
+                max_batch_size=KAFKA_MAX_BATCH_BYTES,
+                compression_type=KAFKA_COMPRESSION_TYPE,
             )
             await self._producer.start()
             self._running = True
@@ -92,23 +108,56 @@ class KafkaClient:
         """停止 Kafka 客户端"""
         self._running = False
 
-        # 停止所有消费者
+        # 先处理完在途消息并提交 offset，再停止消费者
+        for dispatcher in self._dispatchers.values():
+            await dispatcher.stop()
+        for task in self._consume_tasks.values():
+            task.cancel()
+        self._dispatchers.clear()
+        self._consume_tasks.clear()
         for consumer in self._consumers.values():
             await consumer.stop()
         self._consumers.clear()
 
         # 停止生产者
         if self._producer:
+            await self.flush()
             await self._producer.stop()
             self._producer = None
 
         logger.info("Kafka client stopped")
 
+    def _queue_fallback(self, topic: MagellanTopics, message: MagellanMessage):
+        self._fallback_queue.put_nowait({
+            "topic": topic.value,
+            "message": message.model_dump(),
+            "timestamp": datetime.now().isoformat()
+        })
+
+    @staticmethod
+    def _partition_key(topic: MagellanTopics, message: MagellanMessage) -> str:
+        # 分区键只依赖少数字段，不必为此 model_dump 整条消息
+        return get_partition_key(topic, {
+            "session_id": message.session_id,
+            "correlation_id": message.correlation_id,
+            "message_id": message.message_id,
+        })
+
+    async def _enqueue(self, topic: MagellanTopics, message: MagellanMessage, key: str = None) -> asyncio.Future:
+        """写入生产者缓冲区，返回 ack future (仅在缓冲区满时等待)"""
+        return await self._producer.send(
+            topic.value,
+            value=encode_value(message),
+            key=key or self._partition_key(topic, message),
+            headers=inject_kafka_headers() or None,
+        )
+
     async def send(
         self,
         topic: MagellanTopics,
         message: MagellanMessage,
-        key: str = None
+        key: str = None,
+        wait: bool = True,
     ) -> bool:
         """
         发送消息到指定 Topic
@@ -117,45 +166,48 @@ class KafkaClient:
             topic: 目标 Topic
             message: 消息对象
             key: 分区键（可选，自动从消息中提取）
+            wait: 是否等待 broker 确认。False 时消息入队即返回，
+                  ack 在后台收集，失败的消息进入降级队列 (见 flush)
 
         Returns:
-            是否发送成功
+            是否发送成功 (wait=False 时表示是否入队成功)
         """
         if not self.is_available:
             # 降级到内存队列
             logger.debug(f"Kafka unavailable, queueing message to fallback")
-            await self._fallback_queue.put({
-                "topic": topic.value,
-                "message": message.model_dump(),
-                "timestamp": datetime.now().isoformat()
-            })
+            self._queue_fallback(topic, message)
             return True
 
         try:
-            # 获取分区键
-            if not key:
-                key = get_partition_key(topic, message.model_dump())
-
-            # 发送消息
-            await self._producer.send_and_wait(
-                topic.value,
-                value=message.model_dump(),
-                key=key
-            )
+            ack = await self._enqueue(topic, message, key)
+            self._send_stats["sent"] += 1
+            if not wait:
+                self._pending_acks.add(ack)
+                ack.add_done_callback(lambda f, t=topic, m=message: self._on_ack(f, t, m))
+                return True
+            await ack
+            self._send_stats["acked"] += 1
 
             logger.debug(f"Message sent to {topic.value}: {message.message_id}")
             return True
 
         except Exception as e:
+            self._send_stats["failed"] += 1
             logger.error(f"Failed to send message to {topic.value}: {e}")
             # 降级到内存队列
-            await self._fallback_queue.put({
-                "topic": topic.value,
-                "message": message.model_dump(),
-                "timestamp": datetime.now().isoformat()
-            })
+            self._queue_fallback(topic, message)
             return False
 
+    def _on_ack(self, ack: asyncio.Future, topic: MagellanTopics, message: MagellanMessage):
+        self._pending_acks.discard(ack)
+        if ack.cancelled() or ack.exception() is not None:
+            self._send_stats["failed"] += 1
+            error = "cancelled" if ack.cancelled() else ack.exception()
+            logger.error(f"Failed to deliver message to {topic.value}: {error}")
+            self._queue_fallback(topic, message)
+        else:
+            self._send_stats["acked"] += 1
+
     async def send_batch(
         self,
         topic: MagellanTopics,
@@ -164,6 +216,8 @@ class KafkaClient:
         """
         批量发送消息
 
+        所有消息先进入生产者缓冲区 (由 linger/batch 合并为少量请求)，再统一等待 ack。
+
         Args:
             topic: 目标 Topic
             messages: 消息列表
@@ -171,12 +225,38 @@ class KafkaClient:
         Returns:
             成功发送的消息数量
         """
-        success_count = 0
+        if not self.is_available:
+            for msg in messages:
+                self._queue_fallback(topic, msg)
+            return len(messages)
+
+        acks: List[Any] = []
         for msg in messages:
-            if await self.send(topic, msg):
+            try:
+                acks.append(await self._enqueue(topic, msg))
+            except Exception as e:
+                acks.append(e)
+
+        success_count = 0
+        pending = [a for a in acks if not isinstance(a, Exception)]
+        results = iter(await asyncio.gather(*pending, return_exceptions=True))
+        for msg, ack in zip(messages, acks):
+            result = ack if isinstance(ack, Exception) else next(results)
+            if isinstance(result, BaseException):
+                self._send_stats["failed"] += 1
+                logger.error(f"Failed to send message to {topic.value}: {result}")
+                self._queue_fallback(topic, msg)
+            else:
                 success_count += 1
+        self._send_stats["sent"] += len(messages)
+        self._send_stats["acked"] += success_count
         return success_count
 
+    async def flush(self, timeout: float = 10.0):
+        """等待所有 wait=False 发送的消息确认"""
+        if self._pending_acks:
+            await asyncio.wait(set(self._pending_acks), timeout=timeout)
+
     async def subscribe(
         self,
         topic: MagellanTopics,
@@ -205,50 +285,43 @@ class KafkaClient:
         if consumer_key not in self._consumers:
             try:
                 consumer = AIOKafkaConsumer(
-                    topic.value,
                     bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
                     group_id=group_id,
-                    value_deserializer=lambda v: json.loads(v.decode('utf-8')),
-                    key_deserializer=lambda k: k.decode('utf-8') if k else None,
+                    value_deserializer=decode_value,
+                    key_deserializer=decode_key,
                     auto_offset_reset='latest',
-                    enable_auto_commit=True,
-                    auto_commit_interval_ms=5000
+                    enable_auto_commit=False,  # 由 ConcurrentConsumer 按完成顺序提交
                 )
+                dispatcher = ConcurrentConsumer(
+                    consumer,
+                    lambda record, t=topic.value: self._dispatch(t, record),
+                )
+                consumer.subscribe([topic.value], listener=dispatcher.rebalance_listener())
                 await consumer.start()
                 self._consumers[consumer_key] = consumer
+                self._dispatchers[consumer_key] = dispatcher
 
                 # 启动消费循环
-                asyncio.create_task(self._consume_loop(consumer_key))
+                self._consume_tasks[consumer_key] = asyncio.create_task(dispatcher.run())
 
                 logger.info(f"Subscribed to {topic.value} with group {group_id}")
 
             except Exception as e:
                 logger.error(f"Failed to subscribe to {topic.value}: {e}")
 
-    async def _consume_loop(self, consumer_key: str):
-        """消费循环"""
-        consumer = self._consumers.get(consumer_key)
-        if not consumer:
-            return
-
-        topic = consumer_key.split(":")[0]
-
-        try:
-            async for msg in consumer:
-                if not self._running:
-                    break
-
-                handlers = self._message_handlers.get(topic, [])
-                for handler in handlers:
-                    try:
-                        # Phase 7: 直接传递原始 dict 给处理器
-                        # 让处理器根据 topic 类型重建正确的消息类型
-                        await handler(msg.value)
-                    except Exception as e:
-                        logger.error(f"Handler error for {topic}: {e}")
-
-        except Exception as e:
-            logger.error(f"Consumer loop error for {topic}: {e}")
+    async def _dispatch(self, topic: str, record: Any):
+        """把一条消息交给该 Topic 的所有处理器"""
+        # 生产方的 traceparent 消息头作为父 span，消费处理接在发送方的 trace 下
+        parent = extract_kafka_headers(getattr(record, "headers", None))
+        async with start_span("kafka.consume", kind="consumer", parent=parent, topic=topic,
+                              partition=record.partition, offset=record.offset):
+            for handler in self._message_handlers.get(topic, []):
+                try:
+                    # Phase 7: 直接传递原始 dict 给处理器
+                    # 让处理器根据 topic 类型重建正确的消息类型
+                    await handler(record.value)
+                except Exception as e:
+                    logger.error(f"Handler error for {topic}: {e}")
 
     async def get_fallback_messages(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -279,7 +352,9 @@ class KafkaClient:
             "running": self._running,
             "consumers_count": len(self._consumers),
             "handlers_count": sum(len(h) for h in self._message_handlers.values()),
-            "fallback_queue_size": self._fallback_queue.qsize()
+            "fallback_queue_size": self._fallback_queue.qsize(),
+            "producer": {**self._send_stats, "pending_acks": len(self._pending_acks)},
+            "consumers": {key: d.get_stats() for key, d in self._dispatchers.items()},
         }
 
 
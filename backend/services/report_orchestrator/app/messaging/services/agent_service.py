@@ -333,7 +333,8 @@ class AgentMessageService:
                 result=result.get("status", "unknown")
             )
 
-            await self._kafka_client.send(MagellanTopics.AUDIT_LOG, audit)
+            # 审计日志不阻塞调用方，ack 在后台收集
+            await self._kafka_client.send(MagellanTopics.AUDIT_LOG, audit, wait=False)
 
         except Exception as e:
             logger.warning(f"Failed to log audit: {e}")
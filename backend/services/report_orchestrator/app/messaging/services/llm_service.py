@@ -222,7 +222,8 @@ class LLMMessageService:
                 result="success" if "content" in result else "error"
             )
 
-            await self._kafka_client.send(MagellanTopics.AUDIT_LOG, audit)
+            # 审计日志不阻塞调用方，ack 在后台收集
+            await self._kafka_client.send(MagellanTopics.AUDIT_LOG, audit, wait=False)
 
         except Exception as e:
             logger.warning(f"Failed to log audit: {e}")
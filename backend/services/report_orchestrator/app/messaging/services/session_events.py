@@ -16,6 +16,7 @@ from enum import Enum
 from ..messages import SessionEvent
 from ..topics import MagellanTopics
 from ..kafka_client import get_kafka_client
+from ...core.event_stream import get_event_stream
 
 logger = logging.getLogger(__name__)
 
@@ -106,10 +107,15 @@ class SessionEventPublisher:
         # 发送到 Kafka
         if self._kafka_client and self._kafka_client.is_available:
             try:
-                await self._kafka_client.send(MagellanTopics.SESSION_EVENTS, event)
+                await self._kafka_client.send(MagellanTopics.SESSION_EVENTS, event, wait=False)
             except Exception as e:
                 logger.warning(f"Failed to publish event to Kafka: {e}")
 
+        # 写入会话的 Redis Stream，任意 worker 上的 WebSocket 都能跟随
+        stream = get_event_stream()
+        if stream is not None:
+            await stream.publish(session_id, {"type": "session_event", "event": event.model_dump(mode="json")})
+
         # 同时通知本地处理器（用于 WebSocket）
         for handler in self._local_handlers:
             try:
@@ -1,44 +1,216 @@
 """
 Response Caching Middleware
 Implements in-memory caching for API responses with configurable TTL
+
+- Pure ASGI middleware: uncached routes pass straight through with no per-request overhead
+- TTL-LRU: OrderedDict for recency, expiry heap for O(log n) purges
+- Single-flight: concurrent misses for the same key share one upstream call
+- Strong ETags + If-None-Match: polling clients get 304 without a body
+- Optional shared Redis tier (RESPONSE_CACHE_REDIS_ENABLED=true) so replicas agree
 """
-import time
+import asyncio
 import hashlib
+import heapq
+import itertools
 import json
-from typing import Dict, Optional, Callable
+import os
+import time
+from collections import OrderedDict
 from functools import wraps
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from starlette.datastructures import Headers
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is a hard dependency of the service
+    aioredis = None
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+# 命中时由中间件重新生成的响应头
+_REGENERATED_HEADERS = {b"content-length", b"etag", b"cache-control", b"x-cache", b"x-cache-age"}
+
+
+def _normalize_headers(headers: Union[Dict[str, str], RawHeaders, None]) -> RawHeaders:
+    if not headers:
+        return []
+    if isinstance(headers, dict):
+        headers = headers.items()
+    return [
+        (k if isinstance(k, bytes) else str(k).lower().encode("latin-1"),
+         v if isinstance(v, bytes) else str(v).encode("latin-1"))
+        for k, v in headers
+    ]
+
+
+def make_etag(content: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
 
 class CacheEntry:
     """Represents a cached response entry."""
 
-    def __init__(self, content: bytes, headers: dict, status_code: int, ttl: int):
+    def __init__(
+        self,
+        content: bytes,
+        headers: Union[Dict[str, str], RawHeaders, None],
+        status_code: int,
+        ttl: int,
+        etag: Optional[str] = None,
+        path: str = "",
+        created_at: Optional[float] = None,
+    ):
         self.content = content
-        self.headers = headers
+        self.headers = _normalize_headers(headers)
         self.status_code = status_code
-        self.created_at = time.time()
+        self.created_at = created_at if created_at is not None else time.time()
         self.ttl = ttl
+        self.expires_at = self.created_at + ttl
+        self.path = path
+        self.etag = etag or make_etag(content)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) > self.expires_at
+
+    def to_redis(self) -> Dict[str, Any]:
+        return {
+            "content": self.content,
+            "headers": json.dumps([[k.decode("latin-1"), v.decode("latin-1")] for k, v in self.headers]),
+            "status_code": self.status_code,
+            "ttl": self.ttl,
+            "etag": self.etag,
+            "path": self.path,
+            "created_at": repr(self.created_at),
+        }
+
+    @classmethod
+    def from_redis(cls, data: Dict[bytes, bytes]) -> "CacheEntry":
+        return cls(
+            content=data[b"content"],
+            headers=[tuple(h) for h in json.loads(data[b"headers"])],
+            status_code=int(data[b"status_code"]),
+            ttl=int(data[b"ttl"]),
+            etag=data[b"etag"].decode(),
+            path=data.get(b"path", b"").decode(),
+            created_at=float(data[b"created_at"]),
+        )
+
+
+class RedisResponseTier:
+    """
+    Shared response cache tier in Redis.
+
+    Redis failures pause the tier for a few seconds; the local cache keeps working.
+    """
+
+    def __init__(self, client: Any, prefix: str = "response_cache"):
+        self.client = client
+        self.prefix = prefix
+        self._retry_at = 0.0
+        self._tasks: set = set()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def _failed(self, action: str, error: Exception):
+        self._retry_at = time.monotonic() + 5.0
+        logger.warning(f"[Cache] Redis tier {action} failed, pausing for 5s: {error}")
 
-    def is_expired(self) -> bool:
-        return time.time() - self.created_at > self.ttl
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        if not self.available:
+            return None
+        try:
+            data = await self.client.hgetall(self._key(key))
+            if not data:
+                return None
+            entry = CacheEntry.from_redis(data)
+            return None if entry.is_expired() else entry
+        except Exception as e:
+            self._failed("read", e)
+            return None
+
+    async def set(self, key: str, entry: CacheEntry):
+        if not self.available:
+            return
+        remaining = int(entry.expires_at - time.time())
+        if remaining <= 0:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(self._key(key), mapping=entry.to_redis())
+            pipe.expire(self._key(key), remaining)
+            await pipe.execute()
+        except Exception as e:
+            self._failed("write", e)
+
+    async def invalidate(self, pattern: Optional[str] = None):
+        try:
+            async for redis_key in self.client.scan_iter(match=f"{self.prefix}:*"):
+                if pattern is not None:
+                    path = await self.client.hget(redis_key, "path")
+                    if not path or pattern not in path.decode():
+                        continue
+                await self.client.delete(redis_key)
+        except Exception as e:
+            self._failed("invalidate", e)
+
+    def spawn(self, coro):
+        """Run a tier write in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
 
 
 class ResponseCache:
     """
-    In-memory response cache with TTL support.
+    In-memory TTL-LRU response cache, optionally backed by a shared Redis tier.
 
-    In production, consider using Redis for distributed caching.
+    Recency lives in an OrderedDict (O(1) get/set/evict); expiries live in a heap so
+    purging expired entries never scans the whole cache.
     """
 
-    def __init__(self, max_size: int = 1000):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(self, max_size: int = 1000, shared: Optional[RedisResponseTier] = None):
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
         self._max_size = max_size
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.shared = shared
+        self.counters = {
+            "hits": 0, "misses": 0, "shared_hits": 0, "coalesced": 0,
+            "not_modified": 0, "evictions": 0, "expired": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def get(self, key: str) -> Optional[CacheEntry]:
         """Get a cache entry if it exists and is not expired."""
@@ -47,65 +219,110 @@ class ResponseCache:
             return None
         if entry.is_expired():
             del self._cache[key]
+            self.counters["expired"] += 1
             return None
+        self._cache.move_to_end(key)
         return entry
 
     def set(self, key: str, entry: CacheEntry):
-        """Set a cache entry, evicting old entries if necessary."""
-        # Simple LRU-like eviction: remove expired entries first
-        if len(self._cache) >= self._max_size:
+        """Set a cache entry, evicting expired entries first and then the least recently used."""
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (entry.expires_at, next(self._seq), key))
+        if len(self._cache) > self._max_size:
             self._evict_expired()
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self.counters["evictions"] += 1
+        if len(self._expiry_heap) > 2 * self._max_size + 64:
+            self._rebuild_heap()
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        """Local lookup, then the shared tier (promoting hits into the local cache)."""
+        entry = self.get(key)
+        if entry is not None or self.shared is None:
+            return entry
+        entry = await self.shared.get(key)
+        if entry is not None:
+            self.counters["shared_hits"] += 1
+            self.set(key, entry)
+        return entry
 
-        # If still over limit, remove oldest entries
-        if len(self._cache) >= self._max_size:
-            oldest_key = min(
-                self._cache.keys(),
-                key=lambda k: self._cache[k].created_at
-            )
-            del self._cache[oldest_key]
-
-        self._cache[key] = entry
+    def store(self, key: str, entry: CacheEntry):
+        """Store locally and write through to the shared tier in the background."""
+        self.set(key, entry)
+        if self.shared is not None:
+            self.shared.spawn(self.shared.set(key, entry))
 
     def invalidate(self, pattern: str = None):
-        """Invalidate cache entries matching a pattern."""
+        """Invalidate cache entries whose request path (or key) contains pattern."""
         if pattern is None:
             self._cache.clear()
+            self._expiry_heap.clear()
         else:
             keys_to_delete = [
-                k for k in self._cache.keys()
-                if pattern in k
+                k for k, v in self._cache.items()
+                if pattern in v.path or pattern in k
             ]
             for k in keys_to_delete:
                 del self._cache[k]
+        if self.shared is not None:
+            try:
+                self.shared.spawn(self.shared.invalidate(pattern))
+            except RuntimeError:
+                logger.warning("[Cache] No running loop, shared tier not invalidated")
 
     def _evict_expired(self):
-        """Remove all expired entries."""
-        expired_keys = [
-            k for k, v in self._cache.items()
-            if v.is_expired()
-        ]
-        for k in expired_keys:
-            del self._cache[k]
+        """Pop expired entries off the expiry heap (stale heap records are skipped)."""
+        now = time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry.expires_at == expires_at and entry.is_expired(now):
+                del self._cache[key]
+                self.counters["expired"] += 1
+
+    def _rebuild_heap(self):
+        self._expiry_heap = [(e.expires_at, next(self._seq), k) for k, e in self._cache.items()]
+        heapq.heapify(self._expiry_heap)
 
     def stats(self) -> dict:
         """Get cache statistics."""
         self._evict_expired()
+        now = time.time()
+        lookups = self.counters["hits"] + self.counters["misses"]
         return {
             "size": len(self._cache),
             "max_size": self._max_size,
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "inflight": len(self._inflight),
+            "shared_tier": self.shared is not None,
             "entries": [
                 {
                     "key": k[:50],
-                    "age_seconds": int(time.time() - v.created_at),
+                    "path": v.path,
+                    "age_seconds": int(now - v.created_at),
                     "ttl": v.ttl
                 }
-                for k, v in list(self._cache.items())[:10]
+                for k, v in itertools.islice(reversed(self._cache.items()), 10)
             ]
         }
 
 
+def _build_shared_tier() -> Optional[RedisResponseTier]:
+    if os.getenv("RESPONSE_CACHE_REDIS_ENABLED", "false").lower() != "true" or aioredis is None:
+        return None
+    client = aioredis.from_url(os.getenv("REDIS_URL", "redis://redis:6379"), socket_connect_timeout=2)
+    return RedisResponseTier(client)
+
+
 # Global cache instance
-response_cache = ResponseCache()
+response_cache = ResponseCache(
+    max_size=int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "1000")),
+    shared=_build_shared_tier(),
+)
 
 
 # Cache configuration for different endpoints
@@ -163,73 +380,126 @@ def get_cache_config(path: str, method: str) -> Optional[dict]:
     return None
 
 
-class CachingMiddleware(BaseHTTPMiddleware):
+class CachingMiddleware:
     """
     Middleware to cache API responses.
 
-    Only caches GET requests for configured endpoints.
+    Only caches 200 responses to GET requests for configured endpoints; every other
+    request is handed to the app untouched.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Only cache GET requests
-        if request.method != "GET":
-            return await call_next(request)
+    def __init__(self, app: ASGIApp, cache: Optional[ResponseCache] = None):
+        self.app = app
+        self.cache = cache if cache is not None else response_cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
 
         # Check if this path should be cached
-        cache_config = get_cache_config(request.url.path, request.method)
+        cache_config = get_cache_config(scope["path"], scope["method"])
         if not cache_config:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        # Generate cache key
+        request = Request(scope)
         cache_key = generate_cache_key(request)
-
-        # Check cache
-        cached = response_cache.get(cache_key)
-        if cached:
-            logger.debug(f"[Cache] HIT for {request.url.path}")
-            response = Response(
-                content=cached.content,
-                status_code=cached.status_code,
-                headers=dict(cached.headers)
-            )
-            response.headers["X-Cache"] = "HIT"
-            response.headers["X-Cache-Age"] = str(
-                int(time.time() - cached.created_at)
-            )
-            return response
-
-        # Get response
-        response = await call_next(request)
-
-        # Only cache successful responses
-        if response.status_code == 200:
-            # Read response body
-            body = b""
-            async for chunk in response.body_iterator:
-                body += chunk
-
-            # Store in cache
+        if_none_match = request.headers.get("if-none-match")
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.cache.counters["hits"] += 1
+            logger.debug(f"[Cache] HIT for {scope['path']}")
+            await self._send_entry(send, cached, if_none_match, "HIT")
+            return
+
+        # 同一 key 的并发未命中只回源一次
+        pending = self.cache._inflight.get(cache_key)
+        if pending is not None:
+            entry = await asyncio.shield(pending)
+            if entry is not None:
+                self.cache.counters["coalesced"] += 1
+                await self._send_entry(send, entry, if_none_match, "HIT")
+                return
+            # 领头请求不可缓存 (非 200 或失败)，自行回源
+            await self.app(scope, receive, send)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.cache._inflight[cache_key] = future
+        try:
+            shared = await self.cache.aget(cache_key) if self.cache.shared is not None else None
+            if shared is not None:
+                self.cache.counters["hits"] += 1
+                future.set_result(shared)
+                await self._send_entry(send, shared, if_none_match, "HIT")
+                return
+            self.cache.counters["misses"] += 1
+            await self._fill(scope, receive, send, cache_key, cache_config, if_none_match, future)
+        finally:
+            if self.cache._inflight.get(cache_key) is future:
+                del self.cache._inflight[cache_key]
+            if not future.done():
+                future.set_result(None)
+
+    async def _fill(self, scope, receive, send, cache_key, cache_config, if_none_match, future):
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def capture(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                cache_control = Headers(raw=message.get("headers", [])).get("cache-control", "")
+                if message["status"] != 200 or "no-store" in cache_control:
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            raw_headers = start.get("headers", [])
             entry = CacheEntry(
-                content=body,
-                headers=dict(response.headers),
-                status_code=response.status_code,
-                ttl=cache_config["ttl"]
-            )
-            response_cache.set(cache_key, entry)
-
-            logger.debug(f"[Cache] MISS - stored for {request.url.path}")
-
-            # Return new response with body
-            new_response = Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers)
+                content=b"".join(chunks),
+                headers=[(k, v) for k, v in raw_headers if k.lower() not in _REGENERATED_HEADERS],
+                # 上游自带的 ETag 在过滤前取出，命中时原样重发
+                etag=Headers(raw=raw_headers).get("etag"),
+                status_code=200,
+                ttl=cache_config["ttl"],
+                path=scope["path"],
             )
-            new_response.headers["X-Cache"] = "MISS"
-            new_response.headers["Cache-Control"] = f"max-age={cache_config['ttl']}"
-            return new_response
-
-        return response
+            self.cache.store(cache_key, entry)
+            future.set_result(entry)
+            logger.debug(f"[Cache] MISS - stored for {scope['path']}")
+            await self._send_entry(send, entry, if_none_match, "MISS")
+
+        await self.app(scope, receive, capture)
+
+    async def _send_entry(self, send: Send, entry: CacheEntry, if_none_match: Optional[str], status: str):
+        remaining = max(int(entry.expires_at - time.time()), 0)
+        headers = [
+            (b"etag", entry.etag.encode("latin-1")),
+            (b"cache-control", f"max-age={remaining}".encode()),
+            (b"x-cache", status.encode()),
+            (b"x-cache-age", str(int(time.time() - entry.created_at)).encode()),
+        ]
+        if etag_matches(if_none_match, entry.etag):
+            self.cache.counters["not_modified"] += 1
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers = entry.headers + headers + [(b"content-length", str(len(entry.content)).encode())]
+        await send({"type": "http.response.start", "status": entry.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.content})
 
 
 def cache_response(ttl: int = 60):
@@ -266,7 +536,8 @@ def cache_response(ttl: int = 60):
                 content=json.dumps(result).encode(),
                 headers={},
                 status_code=200,
-                ttl=ttl
+                ttl=ttl,
+                path=func.__name__,
             )
             response_cache.set(cache_key, entry)
 
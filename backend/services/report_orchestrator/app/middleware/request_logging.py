@@ -9,6 +9,10 @@ from starlette.requests import Request
 from starlette.responses import Response
 import logging
 
+from ..core.metrics import record_latency
+from ..core.observability.logging import set_trace_id
+from ..core.observability.tracing import parse_traceparent, start_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,8 +40,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         if request.url.path in self.EXCLUDED_PATHS:
             return await call_next(request)
 
-        # Generate request ID
-        request_id = str(uuid.uuid4())[:8]
+        # Generate request ID (reuse the caller's trace ID when one is propagated)
+        request_id = request.headers.get("X-Trace-Id") or str(uuid.uuid4())[:8]
+        set_trace_id(request_id)
 
         # Get client IP
         client_ip = request.client.host if request.client else "unknown"
@@ -62,9 +67,18 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             }
         )
 
-        # Process request
+        # Process request (as a server span, continuing the caller's traceparent if any)
+        span = start_span(
+            "http.request",
+            kind="server",
+            parent=parse_traceparent(request.headers.get("traceparent")),
+            method=request.method,
+            path=request.url.path,
+        )
         try:
-            response = await call_next(request)
+            with span:
+                response = await call_next(request)
+                span.set_attribute("http.status_code", response.status_code)
             status_code = response.status_code
             error_detail = None
         except Exception as e:
@@ -85,6 +99,15 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # Calculate duration
         duration_ms = (time.time() - start_time) * 1000
 
+        # 按路由模板 (而非原始路径) 记录延迟，序列数不随路径参数增长
+        route = request.scope.get("route")
+        record_latency(
+            "route",
+            f"{request.method} {getattr(route, 'path', 'unmatched')}",
+            duration_ms / 1000,
+            ok=status_code < 500,
+        )
+
         # Determine log level based on status code
         if status_code >= 500:
             log_level = logging.ERROR
@@ -257,9 +257,10 @@ class WorkflowStepTemplate(BaseModel):
     quick_mode: bool = False
     condition: Optional[str] = None
     inputs: List[str] = Field(default_factory=list)
-    data_sources: List[str] = Field(default_factory=list)
+    data_sources: Optional[List[str]] = None  # 步骤使用的数据源 (None 表示未声明，步骤结果不复用)
     expected_output: List[str] = Field(default_factory=list)
     expected_duration: Optional[int] = None  # 秒
+    input_keys: Optional[List[str]] = None  # 步骤读取的 target 字段 (None 表示整个 target)，用于步骤结果复用
 
 
 class ScenarioWorkflow(BaseModel):
@@ -6,6 +6,7 @@ Provides advanced search capabilities with hybrid search, reranking, and context
 提供混合搜索、重排序和上下文组装的高级搜索能力。
 """
 
+import logging
 from typing import List, Dict, Any, Optional, Tuple
 from rank_bm25 import BM25Okapi
 import numpy as np
@@ -13,6 +14,8 @@ import re
 import inspect
 import os
 
+logger = logging.getLogger(__name__)
+
 
 class RAGService:
     """Service for advanced retrieval and context assembly"""
@@ -29,7 +32,7 @@ class RAGService:
         # Keep reranker disabled by default to avoid local model downloads.
         # (Can be replaced by remote reranking service later if needed.)
         self.reranker = None
-        print("[RAGService] ℹ️ Local cross-encoder reranker disabled")
+        logger.info("[RAGService] ℹ️ Local cross-encoder reranker disabled")
 
         # BM25 index cache (will be built on-demand)
         self.bm25_index = None
@@ -44,7 +47,7 @@ class RAGService:
             documents: List of documents with 'text' and 'id' fields
         """
         if not documents:
-            print("[RAGService] No documents to index for BM25")
+            logger.info("[RAGService] No documents to index for BM25")
             return
 
         # Tokenize documents for BM25
@@ -65,7 +68,7 @@ class RAGService:
 
         # Build BM25 index
         self.bm25_index = BM25Okapi(tokenized_docs)
-        print(f"[RAGService] ✅ BM25 index built with {len(documents)} documents")
+        logger.info("[RAGService] ✅ BM25 index built with %s documents", len(documents))
 
     def _tokenize(self, text: str) -> List[str]:
         """
@@ -94,7 +97,7 @@ class RAGService:
             List of (doc_id, score) tuples
         """
         if self.bm25_index is None:
-            print("[RAGService] BM25 index not built, skipping BM25 search")
+            logger.debug("[RAGService] BM25 index not built, skipping BM25 search")
             return []
 
         # Tokenize query
@@ -112,7 +115,7 @@ class RAGService:
                 doc_id = self.bm25_doc_ids[idx]
                 results.append((doc_id, float(scores[idx])))
 
-        print(f"[RAGService] BM25 search found {len(results)} results")
+        logger.debug("[RAGService] BM25 search found %s results", len(results))
         return results
 
     def _reciprocal_rank_fusion(
@@ -157,7 +160,7 @@ class RAGService:
                 result['rrf_score'] = rrf_scores[doc_id]
                 fused_results.append(result)
 
-        print(f"[RAGService] RRF fusion combined {len(fused_results)} unique documents")
+        logger.debug("[RAGService] RRF fusion combined %s unique documents", len(fused_results))
         return fused_results
 
     def _rerank_results(
@@ -194,11 +197,11 @@ class RAGService:
             # Sort by rerank score
             reranked = sorted(results, key=lambda x: x['rerank_score'], reverse=True)
 
-            print(f"[RAGService] Reranked {len(results)} results, returning top {top_k}")
+            logger.debug("[RAGService] Reranked %s results, returning top %s", len(results), top_k)
             return reranked[:top_k]
 
         except Exception as e:
-            print(f"[RAGService] Error during reranking: {e}. Returning original results.")
+            logger.error("[RAGService] Error during reranking: %s. Returning original results.", e)
             return results[:top_k]
 
     def hybrid_search(
@@ -224,7 +227,7 @@ class RAGService:
         Returns:
             List of search results with scores
         """
-        print(f"[RAGService] Starting hybrid search for query: '{query[:50]}...'")
+        logger.debug("[RAGService] Starting hybrid search for query: '%s...'", query[:50])
 
         # Step 1: Vector search
         vector_results = self.vector_store.search(
@@ -251,7 +254,7 @@ class RAGService:
         else:
             final_results = fused_results[:top_k]
 
-        print(f"[RAGService] ✅ Hybrid search completed, returning {len(final_results)} results")
+        logger.debug("[RAGService] ✅ Hybrid search completed, returning %s results", len(final_results))
         return final_results
 
     def build_context(
@@ -329,13 +332,13 @@ class RAGService:
             True if successful
         """
         try:
-            print("[RAGService] Refreshing BM25 index...")
+            logger.info("[RAGService] Refreshing BM25 index...")
 
             # Get all documents from vector store
             documents = self.vector_store.list_documents(limit=10000, include_full_text=True)
 
             if not documents:
-                print("[RAGService] No documents found to index")
+                logger.info("[RAGService] No documents found to index")
                 return False
 
             # Rebuild index
@@ -343,7 +346,7 @@ class RAGService:
             return True
 
         except Exception as e:
-            print(f"[RAGService] Error refreshing BM25 index: {e}")
+            logger.error("[RAGService] Error refreshing BM25 index: %s", e)
             return False
 
     async def get_answer_with_sources(
@@ -393,7 +396,7 @@ class RAGService:
                 'num_sources': rag_context['num_sources']
             }
         except Exception as e:
-            print(f"[RAGService] Error generating answer: {e}")
+            logger.error("[RAGService] Error generating answer: %s", e)
             return {
                 'query': query,
                 'context': rag_context['context'],
@@ -10,25 +10,35 @@ import os
 import logging
 import asyncio
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Union
 from fastapi import APIRouter, WebSocket
 
 from app.core.auth import get_current_user_id
 from app.core.trading.paper_trader import PaperTrader, get_paper_trader
 from app.core.trading.okx_trader import OKXTrader, get_okx_trader
-from app.core.trading.trading_tools import TradingToolkit
 from app.core.trading.trading_agents import create_trading_agents, get_trading_agent_config
-from app.core.trading.trading_meeting import TradingMeeting, TradingMeetingConfig
+from app.core.trading.trading_config import TradingMeetingConfig
 from app.core.trading.agent_memory import get_memory_store
 from app.core.trading.decision_store import get_decision_store
 from app.core.trading.scheduler import TradingScheduler, CooldownManager
-from app.core.trading.trigger import TriggerScheduler, TriggerAgent
+from app.core.trading.trigger import (
+    FastTriggerResult,
+    MultiSymbolConfig,
+    MultiSymbolTriggerRuntime,
+    TriggerAgent,
+    TriggerScheduler,
+)
 from app.models.trading_models import TradingConfig, TradingSignal
 from app.core.trading.okx_credentials_store import get_okx_credentials_store
 from app.core.trading.trading_settings_store import get_trading_settings_store, TradingSettings
 from app.services.web_search_access import search_web as shared_search_web
 from app.core.service_endpoints import get_web_search_url
 
+if TYPE_CHECKING:
+    # TradingMeeting (langgraph) / TradingToolkit (pandas) 约 1s 导入耗时，首次 initialize / 开会时再加载
+    from app.core.trading.trading_meeting import TradingMeeting
+    from app.core.trading.trading_tools import TradingToolkit
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/trading", tags=["trading"])
@@ -58,13 +68,15 @@ class TradingSystem:
         # Keep paper_trader as alias for compatibility
         self.paper_trader: Optional[Union[PaperTrader, OKXTrader]] = None
 
-        self.toolkit: Optional[TradingToolkit] = None
+        self.toolkit: Optional["TradingToolkit"] = None
         self.scheduler: Optional[TradingScheduler] = None
         self.trigger_scheduler: Optional[TriggerScheduler] = None  # Event-driven trigger
+        self.multi_symbol_trigger: Optional[MultiSymbolTriggerRuntime] = None  # TRIGGER_MULTI_SYMBOL_ENABLED
+        self._symbol_cycle_count = 0
         self.cooldown_manager = CooldownManager()
 
         self._ws_clients: Dict[str, WebSocket] = {}
-        self._current_meeting: Optional[TradingMeeting] = None
+        self._current_meeting: Optional["TradingMeeting"] = None
         self._trade_history: List[Dict] = []
         self._discussion_messages: List[Dict] = []  # Store discussion messages for persistence
         self._monitor_task: Optional[asyncio.Task] = None
@@ -134,6 +146,8 @@ class TradingSystem:
         self.trader.on_sl_hit = self._on_sl_hit
 
         # Initialize toolkit with trader
+        from app.core.trading.trading_tools import TradingToolkit
+
         self.toolkit = TradingToolkit(paper_trader=self.trader, user_id=self.user_id)
 
         # Initialize scheduler
@@ -143,15 +157,25 @@ class TradingSystem:
             on_state_change=self._on_scheduler_state_change
         )
 
-        # Initialize event-driven trigger scheduler
-        # Runs every 15 minutes, uses LLM to decide if immediate analysis needed
-        self.trigger_scheduler = TriggerScheduler(
-            trigger_agent=TriggerAgent(paper_trader=self.paper_trader),
-            on_trigger=self._on_trigger_event,
-            interval_minutes=15,
-            cooldown_minutes=30
-        )
-        logger.info("✅ TriggerScheduler initialized (15min interval, LLM-driven, position-aware)")
+        multi_symbol_config = MultiSymbolConfig()
+        if multi_symbol_config.enabled:
+            # Multi-symbol Layer 1 trigger: one shared market-data hub, per-symbol cooldowns,
+            # triggered symbols run trading meetings under a global concurrency budget
+            self.multi_symbol_trigger = MultiSymbolTriggerRuntime(
+                config=multi_symbol_config,
+                on_trigger=self._on_symbol_trigger,
+            )
+            logger.info(f"✅ MultiSymbolTriggerRuntime initialized for {multi_symbol_config.symbols}")
+        else:
+            # Initialize event-driven trigger scheduler
+            # Runs every 15 minutes, uses LLM to decide if immediate analysis needed
+            self.trigger_scheduler = TriggerScheduler(
+                trigger_agent=TriggerAgent(paper_trader=self.paper_trader),
+                on_trigger=self._on_trigger_event,
+                interval_minutes=15,
+                cooldown_minutes=30
+            )
+            logger.info("✅ TriggerScheduler initialized (15min interval, LLM-driven, position-aware)")
 
         self._initialized = True
         logger.info(f"Trading system initialized with {self.trader_type} trader for user={self.user_id}")
@@ -188,6 +212,9 @@ class TradingSystem:
         if self.trigger_scheduler:
             await self.trigger_scheduler.start()
             logger.info("🎯 Trigger scheduler started (event-driven analysis)")
+        if self.multi_symbol_trigger:
+            await self.multi_symbol_trigger.start()
+            logger.info("🎯 Multi-symbol trigger started")
 
         # Start position monitoring task
         self._monitor_task = asyncio.create_task(self._monitor_loop())
@@ -211,6 +238,9 @@ class TradingSystem:
         if self.trigger_scheduler:
             await self.trigger_scheduler.stop()
             logger.info("🛑 Trigger scheduler stopped")
+        if self.multi_symbol_trigger:
+            await self.multi_symbol_trigger.stop()
+            logger.info("🛑 Multi-symbol trigger stopped")
 
         if self._monitor_task:
             self._monitor_task.cancel()
@@ -288,9 +318,39 @@ class TradingSystem:
             else:
                 logger.warning("⚠️ Could not trigger immediate analysis (scheduler busy or cooldown)")
 
+    async def _on_symbol_trigger(self, symbol: str, result: FastTriggerResult):
+        """
+        Handle a Layer 1 trigger from the multi-symbol runtime.
+
+        Runs an analysis cycle for that symbol directly; the runtime already applies
+        the per-symbol cooldown and the global meeting budget.
+        """
+        descriptions = [c.description for c in result.conditions]
+        logger.info(f"🎯 {symbol} triggered ({result.urgency}): {descriptions}")
+        await self._broadcast({
+            "type": "trigger_event",
+            "symbol": symbol,
+            "urgency": result.urgency,
+            "reasoning": "; ".join(descriptions),
+            "key_events": descriptions,
+            "timestamp": result.timestamp or datetime.now().isoformat(),
+        })
+        self._symbol_cycle_count += 1
+        await self._on_analysis_cycle(
+            self._symbol_cycle_count,
+            reason=f"fast_trigger: {symbol} {result.urgency} urgency",
+            timestamp=datetime.now(),
+            symbol=symbol,
+        )
 
-    async def _on_analysis_cycle(self, cycle_number: int, reason: str, timestamp: datetime):
-        """Handle analysis cycle"""
+    async def _on_analysis_cycle(
+        self,
+        cycle_number: int,
+        reason: str,
+        timestamp: datetime,
+        symbol: Optional[str] = None,
+    ):
+        """Handle analysis cycle (symbol defaults to the configured trading symbol)"""
         logger.info(f"Starting analysis cycle #{cycle_number}, reason: {reason}")
 
         # ⚠️ CRITICAL: Check Tavily/MCP health before any analysis
@@ -318,6 +378,7 @@ class TradingSystem:
         await self._broadcast({
             "type": "analysis_started",
             "cycle_number": cycle_number,
+            "symbol": symbol or self.config.symbol,
             "reason": reason,
             "timestamp": timestamp.isoformat()
         })
@@ -325,7 +386,7 @@ class TradingSystem:
         try:
             # Run trading meeting
             logger.info(f"[SIGNAL_DEBUG] Starting trading meeting for cycle #{cycle_number}")
-            signal = await self._run_trading_meeting(reason)
+            signal = await self._run_trading_meeting(reason, symbol=symbol)
             logger.info(f"[SIGNAL_DEBUG] Trading meeting returned signal: {signal}")
 
             if signal:
@@ -364,6 +425,7 @@ class TradingSystem:
                         confidence=signal.confidence,
                         reasoning=signal.reasoning,
                         amount_percent=signal.amount_percent,
+                        symbol=signal.symbol,
                     )
 
                     self._trade_history.append({
@@ -498,21 +560,23 @@ class TradingSystem:
             logger.error(f"Error executing signal: {e}")
             return {"success": False, "error": str(e)}
 
-    async def _run_trading_meeting(self, reason: str) -> Optional[TradingSignal]:
-        """Run a trading meeting"""
+    async def _run_trading_meeting(self, reason: str, symbol: Optional[str] = None) -> Optional[TradingSignal]:
+        """Run a trading meeting (for ``symbol``, default: the configured trading symbol)"""
+        from app.core.trading.trading_meeting import TradingMeeting
+
         # Create agents with toolkit
         agents = create_trading_agents(toolkit=self.toolkit)
 
         # Create meeting config
         meeting_config = TradingMeetingConfig(
-            symbol=self.config.symbol,
+            symbol=symbol or self.config.symbol,
             max_leverage=self.config.risk_limits.max_leverage,
             max_position_percent=self.config.risk_limits.max_position_percent,
             min_confidence=self.config.risk_limits.min_confidence
         )
 
         # Create meeting
-        self._current_meeting = TradingMeeting(
+        meeting = self._current_meeting = TradingMeeting(
             agents=agents,
             llm_service=self.llm_service,
             config=meeting_config,
@@ -521,8 +585,9 @@ class TradingSystem:
         )
 
         # Run meeting
-        signal = await self._current_meeting.run(context=reason)
-        self._current_meeting = None
+        signal = await meeting.run(context=reason)
+        if self._current_meeting is meeting:  # multi-symbol meetings may overlap
+            self._current_meeting = None
 
         return signal
 
@@ -884,6 +949,7 @@ class TradingSystem:
             "symbol": self.config.symbol,
             "trader_type": self.trader_type,  # "paper" or "okx"
             "scheduler": self.scheduler.get_status() if self.scheduler else None,
+            "multi_symbol_trigger": self.multi_symbol_trigger.get_status() if self.multi_symbol_trigger else None,
             "paper_trader": trader_status,
             "trader": trader_status,  # Alias for clarity
             "cooldown": self.cooldown_manager.get_cooldown_status(),
@@ -10,12 +10,21 @@ import math
 import os
 import uuid
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import TYPE_CHECKING, List, Dict, Optional, Any
 
-from google import genai
-from google.genai import types
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
+if TYPE_CHECKING:
+    from qdrant_client.models import Filter
+
+
+def _qdrant_models():
+    # qdrant-client / google-genai 导入耗时约 1.4s，推迟到首次使用 (启动时无 GOOGLE_API_KEY 则完全跳过)
+    from qdrant_client import models
+    return models
+
+
+def _genai_types():
+    from google.genai import types
+    return types
 
 
 class VectorStoreService:
@@ -33,6 +42,13 @@ class VectorStoreService:
             qdrant_url: URL of Qdrant server
             collection_name: Name of the collection to use
         """
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise RuntimeError("GOOGLE_API_KEY is required for Gemini embeddings")
+
+        from google import genai
+        from qdrant_client import QdrantClient
+
         self.client = QdrantClient(url=qdrant_url)
         self.collection_name = collection_name
 
@@ -43,9 +59,6 @@ class VectorStoreService:
         self.query_task_type = os.getenv("GEMINI_EMBEDDING_TASK_QUERY", "RETRIEVAL_QUERY")
         self.auto_recreate_on_dim_mismatch = os.getenv("QDRANT_AUTO_RECREATE_COLLECTION", "true").lower() == "true"
 
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise RuntimeError("GOOGLE_API_KEY is required for Gemini embeddings")
         self.genai_client = genai.Client(api_key=api_key)
 
         # Create collection if it doesn't exist
@@ -67,9 +80,10 @@ class VectorStoreService:
             return None
 
     def _create_collection(self):
+        models = _qdrant_models()
         self.client.create_collection(
             collection_name=self.collection_name,
-            vectors_config=VectorParams(size=self.vector_size, distance=Distance.COSINE),
+            vectors_config=models.VectorParams(size=self.vector_size, distance=models.Distance.COSINE),
         )
 
     def _ensure_collection_exists(self):
@@ -122,7 +136,7 @@ class VectorStoreService:
     def _embed_contents(self, contents: List[str], task_type: str) -> List[List[float]]:
         cleaned_contents = [(c if c and c.strip() else " ") for c in contents]
         try:
-            config = types.EmbedContentConfig(
+            config = _genai_types().EmbedContentConfig(
                 task_type=task_type,
                 output_dimensionality=self.vector_size,
             )
@@ -133,7 +147,7 @@ class VectorStoreService:
             )
         except TypeError:
             # Backward compatibility with older google-genai SDKs.
-            config = types.EmbedContentConfig(task_type=task_type)
+            config = _genai_types().EmbedContentConfig(task_type=task_type)
             response = self.genai_client.models.embed_content(
                 model=self.embedding_model,
                 contents=cleaned_contents,
@@ -178,6 +192,7 @@ class VectorStoreService:
         Returns:
             Document ID
         """
+        models = _qdrant_models()
         if not doc_id:
             doc_id = str(uuid.uuid4())
 
@@ -193,7 +208,7 @@ class VectorStoreService:
         })
 
         # Upload point
-        point = PointStruct(
+        point = models.PointStruct(
             id=doc_id,
             vector=embedding,
             payload=payload
@@ -220,6 +235,7 @@ class VectorStoreService:
         Returns:
             List of document IDs
         """
+        models = _qdrant_models()
         points = []
         doc_ids = []
         texts = []
@@ -248,7 +264,7 @@ class VectorStoreService:
                 "doc_id": doc_id
             })
 
-            points.append(PointStruct(
+            points.append(models.PointStruct(
                 id=doc_id,
                 vector=embedding,
                 payload=payload
@@ -282,6 +298,7 @@ class VectorStoreService:
         Returns:
             List of search results with scores and metadata
         """
+        models = _qdrant_models()
         # Generate query embedding
         query_embedding = self._embed_text(query, task_type=self.query_task_type)
 
@@ -290,12 +307,12 @@ class VectorStoreService:
         if filter_conditions:
             conditions = []
             for key, value in filter_conditions.items():
-                conditions.append(FieldCondition(
+                conditions.append(models.FieldCondition(
                     key=key,
-                    match=MatchValue(value=value)
+                    match=models.MatchValue(value=value)
                 ))
             if conditions:
-                query_filter = Filter(must=conditions)
+                query_filter = models.Filter(must=conditions)
 
         # Search (compatible with old/new qdrant-client)
         results = self._query_points_compat(
@@ -326,7 +343,7 @@ class VectorStoreService:
         query_embedding: List[float],
         limit: int,
         score_threshold: float,
-        query_filter: Optional[Filter],
+        query_filter: Optional["Filter"],
     ) -> List[Any]:
         if hasattr(self.client, "query_points"):
             try:
@@ -445,17 +462,18 @@ class VectorStoreService:
         Returns:
             List of documents
         """
+        models = _qdrant_models()
         # Prepare filter if provided
         query_filter = None
         if filter_conditions:
             conditions = []
             for key, value in filter_conditions.items():
-                conditions.append(FieldCondition(
+                conditions.append(models.FieldCondition(
                     key=key,
-                    match=MatchValue(value=value)
+                    match=models.MatchValue(value=value)
                 ))
             if conditions:
-                query_filter = Filter(must=conditions)
+                query_filter = models.Filter(must=conditions)
 
         if limit <= 0:
             return []
@@ -0,0 +1,182 @@
+"""
+EDGAR Fixture Server
+
+Local HTTP server that mimics the SEC EDGAR endpoints used by EdgarMirror /
+SECEdgarTool, including ETag-based conditional GETs, so the mirror can be
+exercised offline.
+
+Endpoints:
+    /files/company_tickers.json
+    /api/xbrl/companyfacts/CIK##########.json
+    /submissions/CIK##########.json
+
+Usage:
+    with EdgarFixtureServer() as server:
+        mirror = EdgarMirror(db_path=..., base_url=server.url, tickers_url=server.tickers_url)
+
+    # or standalone for manual testing
+    python -m tests.mocks.edgar_fixture_server 8765
+"""
+
+import hashlib
+import json
+import re
+import sys
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+def _fact(val, end, form="10-K", fy=None, fp="FY", start=None, filed=None):
+    year = int(end[:4])
+    return {
+        "start": start, "end": end, "val": val, "form": form,
+        "fy": fy or year, "fp": fp, "filed": filed or f"{year}-11-01",
+        "accn": f"0000320193-{str(year)[2:]}-000106",
+    }
+
+
+DEFAULT_TICKERS: Dict[str, Dict[str, Any]] = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 1045810, "ticker": "NVDA", "title": "NVIDIA CORP"},
+    "2": {"cik_str": 1999999, "ticker": "ZZZT", "title": "Fixture Test Corp"},
+}
+
+DEFAULT_COMPANY_FACTS: Dict[str, Dict[str, Any]] = {
+    "1999999": {
+        "cik": 1999999,
+        "entityName": "Fixture Test Corp",
+        "facts": {
+            "dei": {
+                "EntityCommonStockSharesOutstanding": {
+                    "units": {"shares": [_fact(1_000_000, "2025-09-30", form="10-K")]}
+                }
+            },
+            "us-gaap": {
+                "Revenues": {
+                    "units": {"USD": [
+                        _fact(2_000_000_000, "2024-09-30", start="2023-10-01"),
+                        _fact(2_500_000_000, "2025-09-30", start="2024-10-01"),
+                        _fact(700_000_000, "2025-06-30", form="10-Q", fp="Q3", start="2025-04-01", filed="2025-08-01"),
+                    ]}
+                },
+                "NetIncomeLoss": {
+                    "units": {"USD": [
+                        _fact(300_000_000, "2024-09-30", start="2023-10-01"),
+                        _fact(450_000_000, "2025-09-30", start="2024-10-01"),
+                    ]}
+                },
+                "Assets": {
+                    "units": {"USD": [_fact(9_000_000_000, "2025-09-30")]}
+                },
+            },
+        },
+    },
+}
+
+DEFAULT_SUBMISSIONS: Dict[str, Dict[str, Any]] = {
+    "1999999": {
+        "name": "Fixture Test Corp",
+        "filings": {"recent": {
+            "form": ["10-K", "8-K", "10-Q"],
+            "filingDate": ["2025-11-01", "2025-10-15", "2025-08-01"],
+            "accessionNumber": ["0001999999-25-000010", "0001999999-25-000009", "0001999999-25-000008"],
+            "primaryDocument": ["ztt-20250930.htm", "ztt-8k.htm", "ztt-20250630.htm"],
+        }},
+    },
+}
+
+_CIK_PATH = re.compile(r"^/(?P<kind>api/xbrl/companyfacts|submissions)/CIK(?P<cik>\d{10})\.json$")
+
+
+class EdgarFixtureServer:
+    """Threaded fixture server; counts requests per (path, status)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.tickers = json.loads(json.dumps(DEFAULT_TICKERS))
+        self.company_facts = json.loads(json.dumps(DEFAULT_COMPANY_FACTS))
+        self.submissions = json.loads(json.dumps(DEFAULT_SUBMISSIONS))
+        self.requests: Counter = Counter()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def tickers_url(self) -> str:
+        return f"{self.url}/files/company_tickers.json"
+
+    def count(self, path_fragment: str, status: Optional[int] = None) -> int:
+        return sum(
+            n for (path, code), n in self.requests.items()
+            if path_fragment in path and (status is None or code == status)
+        )
+
+    def _resolve(self, path: str) -> Optional[Any]:
+        if path == "/files/company_tickers.json":
+            return self.tickers
+        match = _CIK_PATH.match(path)
+        if not match:
+            return None
+        cik = match.group("cik").lstrip("0")
+        store = self.company_facts if match.group("kind") == "api/xbrl/companyfacts" else self.submissions
+        return store.get(cik)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                payload = server._resolve(self.path.split("?")[0])
+                if payload is None:
+                    self._reply(404, b'{"error": "not found"}')
+                    return
+                body = json.dumps(payload).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._reply(304, b"", etag)
+                    return
+                self._reply(200, body, etag)
+
+            def _reply(self, status: int, body: bytes, etag: Optional[str] = None):
+                server.requests[(self.path, status)] += 1
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):  # keep test output quiet
+                pass
+
+        return Handler
+
+    def start(self) -> "EdgarFixtureServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "EdgarFixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    fixture = EdgarFixtureServer(port=port)
+    print(f"EDGAR fixture server on {fixture.url} (tickers: {fixture.tickers_url})")
+    fixture._server.serve_forever()
@@ -0,0 +1,175 @@
+"""
+In-memory Redis fakes covering the commands used by SessionStore and EventStream.
+
+FakeRedisStreams mirrors the sync redis client, AsyncFakeRedisStreams the redis.asyncio one
+(XREAD BLOCK waits on an asyncio.Condition instead of polling).
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _parse_id(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = str(entry_id).partition("-")
+    return int(ms), int(seq or 0)
+
+
+class FakeRedisStreams:
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+        self.streams: Dict[str, List[Tuple[str, Dict[str, str]]]] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.sorted_sets: Dict[str, Dict[str, float]] = {}
+        self.expires: Dict[str, Any] = {}
+        self._clock = 0
+
+    # ---- keys ----
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.expires[key] = ttl
+        return True
+
+    def incr(self, key):
+        value = int(self.values.get(key) or 0) + 1
+        self.values[key] = str(value)
+        return value
+
+    def exists(self, *keys):
+        return sum(
+            1 for key in keys
+            if key in self.values or key in self.streams or key in self.hashes or key in self.sorted_sets
+        )
+
+    def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            for table in (self.values, self.streams, self.hashes, self.sorted_sets):
+                if key in table:
+                    del table[key]
+                    deleted += 1
+        return deleted
+
+    def expire(self, key, ttl):
+        self.expires[key] = ttl
+        return True
+
+    # ---- streams ----
+    def xadd(self, key, fields, id="*", maxlen=None, approximate=True):
+        entries = self.streams.setdefault(key, [])
+        if id == "*":
+            self._clock += 1
+            entry_id = f"{self._clock}-0"
+        else:
+            entry_id = id
+        if entries and _parse_id(entry_id) <= _parse_id(entries[-1][0]):
+            raise ValueError("ERR The ID specified in XADD is equal or smaller than the target stream top item")
+        entries.append((entry_id, dict(fields)))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        return entry_id
+
+    def xrange(self, key, min="-", max="+", count=None):
+        low = (0, 0) if min == "-" else _parse_id(min)
+        high = None if max == "+" else _parse_id(max)
+        result = [
+            (entry_id, fields) for entry_id, fields in self.streams.get(key, [])
+            if _parse_id(entry_id) >= low and (high is None or _parse_id(entry_id) <= high)
+        ]
+        return result[:count] if count else result
+
+    def _read(self, streams: Dict[str, str], count: Optional[int]):
+        response = []
+        for key, after_id in streams.items():
+            after = _parse_id(after_id)
+            entries = [(i, f) for i, f in self.streams.get(key, []) if _parse_id(i) > after]
+            if entries:
+                response.append([key, entries[:count] if count else entries])
+        return response
+
+    def xread(self, streams, count=None, block=None):
+        return self._read(streams, count)
+
+    # ---- hashes / sorted sets ----
+    def hset(self, key, mapping=None, **kwargs):
+        self.hashes.setdefault(key, {}).update(mapping or {})
+        return len(mapping or {})
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def zrangebyscore(self, key, min, max, start=None, num=None):
+        low = float(str(min).lstrip("(")) if min != "-inf" else float("-inf")
+        exclusive = str(min).startswith("(")
+        members = sorted(self.sorted_sets.get(key, {}).items(), key=lambda kv: kv[1])
+        result = [m for m, score in members if (score > low if exclusive else score >= low)]
+        return result[: num] if num else result
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def _run(self):
+        calls, self.calls = self.calls, []
+        return [getattr(FakeRedisStreams, name)(self.client, *args, **kwargs) for name, args, kwargs in calls]
+
+    def execute(self):
+        return self._run()
+
+
+class _AsyncFakePipeline(_FakePipeline):
+    async def execute(self):
+        result = self._run()
+        await self.client._notify()
+        return result
+
+
+class AsyncFakeRedisStreams(FakeRedisStreams):
+    def __init__(self):
+        super().__init__()
+        self._changed = asyncio.Condition()
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def get(self, key):
+        return super().get(key)
+
+    async def delete(self, *keys):
+        return super().delete(*keys)
+
+    async def hgetall(self, key):
+        return super().hgetall(key)
+
+    async def xadd(self, key, fields, **kwargs):
+        entry_id = super().xadd(key, fields, **kwargs)
+        await self._notify()
+        return entry_id
+
+    async def xread(self, streams, count=None, block=None):
+        response = self._read(streams, count)
+        if response or block is None:
+            return response
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=block / 1000)
+            except asyncio.TimeoutError:
+                return []
+        return self._read(streams, count)
+
+    def pipeline(self, transaction=True):
+        return _AsyncFakePipeline(self)
@@ -0,0 +1,194 @@
+"""
+In-memory Kafka stand-in
+
+Just enough of the aiokafka producer/consumer surface for KafkaClient and ConcurrentConsumer:
+- InMemoryProducer buffers send() calls for linger_ms and ships each batch as one simulated
+  broker request (request_latency), resolving the returned ack futures together.
+- InMemoryConsumer reads every partition of its topics, honours pause/resume and records commits.
+"""
+
+import asyncio
+import zlib
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TopicPartition = namedtuple("TopicPartition", ["topic", "partition"])
+RecordMetadata = namedtuple("RecordMetadata", ["topic", "partition", "offset"])
+ConsumerRecord = namedtuple("ConsumerRecord", ["topic", "partition", "offset", "key", "value", "headers"], defaults=((),))
+
+
+class InMemoryBroker:
+    def __init__(self, partitions: int = 3, request_latency: float = 0.001):
+        self.partitions = partitions
+        self.request_latency = request_latency
+        self.logs: Dict[TopicPartition, List[Tuple[Optional[bytes], bytes]]] = {}
+        self.committed: Dict[TopicPartition, int] = {}
+        self.headers: Dict[Tuple[TopicPartition, int], Tuple] = {}
+        self.requests = 0
+        self._appended = asyncio.Event()
+
+    def partition_for(self, topic: str, key: Optional[bytes]) -> TopicPartition:
+        partition = zlib.crc32(key) % self.partitions if key else 0
+        return TopicPartition(topic, partition)
+
+    async def produce(self, batch: List[Tuple[str, Optional[bytes], bytes, Tuple]]) -> List[RecordMetadata]:
+        """One round trip for the whole batch"""
+        self.requests += 1
+        await asyncio.sleep(self.request_latency)
+        metadata = []
+        for topic, key, value, headers in batch:
+            tp = self.partition_for(topic, key)
+            log = self.logs.setdefault(tp, [])
+            log.append((key, value))
+            if headers:
+                self.headers[(tp, len(log) - 1)] = tuple(headers)
+            metadata.append(RecordMetadata(topic, tp.partition, len(log) - 1))
+        self._appended.set()
+        return metadata
+
+    async def wait_for_data(self, timeout: float):
+        self._appended.clear()
+        try:
+            await asyncio.wait_for(self._appended.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class InMemoryProducer:
+    def __init__(
+        self,
+        broker: InMemoryBroker,
+        value_serializer: Optional[Callable[[Any], bytes]] = None,
+        key_serializer: Optional[Callable[[Any], Optional[bytes]]] = None,
+        linger_ms: int = 0,
+        max_batch_size: int = 16384,
+        **_: Any,
+    ):
+        self.broker = broker
+        self.value_serializer = value_serializer or (lambda v: v)
+        self.key_serializer = key_serializer or (lambda k: k)
+        self.linger = linger_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._buffer: List[Tuple[str, Optional[bytes], bytes, asyncio.Future]] = []
+        self._buffer_bytes = 0
+        self._flusher: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        await self.flush()
+
+    async def send(self, topic: str, value: Any = None, key: Any = None, headers: Any = None) -> asyncio.Future:
+        ack = asyncio.get_running_loop().create_future()
+        encoded = self.value_serializer(value)
+        self._buffer.append((topic, self.key_serializer(key), encoded, headers or (), ack))
+        self._buffer_bytes += len(encoded)
+        if self._buffer_bytes >= self.max_batch_size:
+            self._ship()
+        elif self._flusher is None:
+            self._flusher = asyncio.create_task(self._linger())
+        return ack
+
+    async def send_and_wait(self, topic: str, value: Any = None, key: Any = None, headers: Any = None) -> RecordMetadata:
+        return await (await self.send(topic, value=value, key=key, headers=headers))
+
+    async def flush(self):
+        self._ship()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def _linger(self):
+        await asyncio.sleep(self.linger)
+        self._flusher = None
+        self._ship()
+
+    def _ship(self):
+        if self._flusher is not None and self._flusher is not asyncio.current_task():
+            self._flusher.cancel()
+            self._flusher = None
+        batch, self._buffer, self._buffer_bytes = self._buffer, [], 0
+        if batch:
+            task = asyncio.create_task(self._request(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _request(self, batch):
+        try:
+            metadata = await self.broker.produce([(t, k, v, h) for t, k, v, h, _ in batch])
+        except Exception as e:
+            for *_, ack in batch:
+                if not ack.done():
+                    ack.set_exception(e)
+            return
+        for (*_, ack), meta in zip(batch, metadata):
+            if not ack.done():
+                ack.set_result(meta)
+
+
+class InMemoryConsumer:
+    def __init__(
+        self,
+        broker: InMemoryBroker,
+        *topics: str,
+        value_deserializer: Optional[Callable[[bytes], Any]] = None,
+        key_deserializer: Optional[Callable[[Optional[bytes]], Any]] = None,
+        **_: Any,
+    ):
+        self.broker = broker
+        self.topics = list(topics)
+        self.value_deserializer = value_deserializer or (lambda v: v)
+        self.key_deserializer = key_deserializer or (lambda k: k)
+        self.positions: Dict[TopicPartition, int] = {}
+        self.paused: set = set()
+        self.commits: List[Dict[TopicPartition, int]] = []
+        self.listener = None
+
+    def subscribe(self, topics: List[str], listener: Any = None):
+        self.topics = list(topics)
+        self.listener = listener
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def pause(self, *partitions):
+        self.paused.update(partitions)
+
+    def resume(self, *partitions):
+        self.paused.difference_update(partitions)
+
+    async def commit(self, offsets: Dict[TopicPartition, int]):
+        self.commits.append(dict(offsets))
+        self.broker.committed.update(offsets)
+
+    def _poll(self, max_records: int) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        result = {}
+        for topic in self.topics:
+            for partition in range(self.broker.partitions):
+                tp = TopicPartition(topic, partition)
+                if tp in self.paused:
+                    continue
+                log = self.broker.logs.get(tp, [])
+                start = self.positions.get(tp, self.broker.committed.get(tp, 0))
+                chunk = log[start:start + max_records]
+                if chunk:
+                    result[tp] = [
+                        ConsumerRecord(
+                            topic, partition, start + i, self.key_deserializer(k), self.value_deserializer(v),
+                            self.broker.headers.get((tp, start + i), ()),
+                        )
+                        for i, (k, v) in enumerate(chunk)
+                    ]
+                    self.positions[tp] = start + len(chunk)
+        return result
+
+    async def getmany(self, timeout_ms: int = 0, max_records: int = 500):
+        result = self._poll(max_records)
+        if not result and timeout_ms:
+            await self.broker.wait_for_data(timeout_ms / 1000)
+            result = self._poll(max_records)
+        return result
@@ -0,0 +1,112 @@
+import pytest
+
+from app.core.parallel import adaptive_scheduler
+from app.core.parallel.adaptive_scheduler import (
+    AdaptiveAgentScheduler,
+    AIMDWindow,
+    DependencyLimit,
+    is_rate_limit_error,
+)
+from app.core.parallel.simulation import SimulatedDependency, simulate_vote_round
+from app.core.roundtable.search_router import SearchRouter
+from app.core.roundtable.search_routing import SearchRoutingEngine
+from app.core.trading.request_scheduler import EndpointLimit, ExchangeRequestScheduler, RequestPriority
+
+
+def test_aimd_window_grows_additively_and_halves_once_per_interval():
+    window = AIMDWindow("tavily", DependencyLimit(initial_window=2, max_window=4, decrease_interval_seconds=1.0))
+
+    window.on_success()
+    assert window.window == pytest.approx(2.5)
+    for _ in range(20):
+        window.on_success()
+    assert window.window == 4
+
+    assert window.on_throttle(now=100.0) is True
+    assert window.on_throttle(now=100.5) is False  # same congestion event
+    assert window.window == 2
+    assert window.on_throttle(now=102.0) is True
+    assert window.window == 1
+    assert window.on_throttle(now=104.0) is True
+    assert window.window == 1  # floor
+
+
+def test_rate_limit_error_detection():
+    assert is_rate_limit_error("HTTP 429 Too Many Requests")
+    assert is_rate_limit_error(RuntimeError("Rate limit exceeded"))
+    assert not is_rate_limit_error("Failed to parse vote")
+
+
+@pytest.mark.asyncio
+async def test_adaptive_round_beats_static_batches():
+    batched = await simulate_vote_round("batched", time_scale=0.005)
+    adaptive = await simulate_vote_round("adaptive", time_scale=0.005)
+
+    assert batched.successful == adaptive.successful == 6
+    assert adaptive.wall_clock_seconds < batched.wall_clock_seconds * 0.75
+
+
+@pytest.mark.asyncio
+async def test_throttling_shrinks_the_dependency_window():
+    dependencies = {
+        "llm": SimulatedDependency("llm", latency_seconds=2.0, capacity=1),
+        "tavily": SimulatedDependency("tavily", latency_seconds=1.0, capacity=10),
+        "okx": SimulatedDependency("okx", latency_seconds=0.2, capacity=10),
+        "onchain": SimulatedDependency("onchain", latency_seconds=1.0, capacity=10),
+    }
+    report = await simulate_vote_round("adaptive", dependencies=dependencies, time_scale=0.005, max_retries=10)
+
+    llm = report.scheduler_metrics["dependencies"]["llm"]
+    assert report.throttled_calls > 0
+    assert llm["decreases"] >= 1
+    assert llm["throttles"] == report.throttled_calls
+    assert report.successful == 6
+
+
+class _NoopCache:
+    async def get(self, query, priority, search_params=None):
+        return None
+
+    async def set(self, query, priority, result, search_params=None):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_okx_penalty_and_search_rate_limits_shrink_scheduler_windows(monkeypatch):
+    scheduler = AdaptiveAgentScheduler(limits={
+        "okx": DependencyLimit(initial_window=8, max_window=8, decrease_interval_seconds=0),
+        "tavily": DependencyLimit(initial_window=4, max_window=4, decrease_interval_seconds=0),
+        "serper": DependencyLimit(initial_window=4, max_window=4, decrease_interval_seconds=0),
+    })
+    monkeypatch.setattr(adaptive_scheduler, "_agent_scheduler", scheduler)
+
+    # OKX 返回限流码 → RequestScheduler 暂停 bucket，同时收缩 okx 窗口
+    exchange = ExchangeRequestScheduler(
+        limits={"/api/v5/market/ticker": EndpointLimit(10, 0.01, RequestPriority.MARKET_DATA)}
+    )
+
+    async def fetch():
+        return {"code": "50011", "msg": "Too Many Requests"}
+
+    await exchange.run("/api/v5/market/ticker", fetch)
+    assert scheduler.get_metrics()["dependencies"]["okx"]["window"] == 4
+
+    # 搜索提供商 429 → 回退到下一个提供商，只收缩返回 429 的提供商的窗口
+    router = SearchRouter()
+    router._cache = _NoopCache()
+    router.routing = SearchRoutingEngine(daily_quotas={})
+
+    async def _throttled(query, **kwargs):
+        return {"success": False, "error": "HTTP 429 Too Many Requests"}
+
+    async def _ok(query, **kwargs):
+        return {"success": True, "results": [{"title": "t", "url": "", "content": "ok"}]}
+
+    monkeypatch.setattr(router, "_search_with_serper", _throttled)
+    monkeypatch.setattr(router, "_search_with_tavily", _ok)
+    result = await router.search("rate limited query", priority="critical")
+    assert result["success"] is True
+    dependencies = scheduler.get_metrics()["dependencies"]
+    assert dependencies["serper"]["throttles"] == 1
+    assert dependencies["serper"]["window"] == 2
+    assert "tavily" not in dependencies  # the fallback that answered is not penalised
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from app.core.agent_event_bus import AgentEvent, AgentEventBus, AgentEventType
+
+
+class _Socket:
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.events = []
+        self.closed_with = None
+
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.events.append(json.loads(text)["event"])
+
+    async def close(self, code=1000):
+        self.closed_with = code
+        self.client_state = WebSocketState.DISCONNECTED
+
+    def types(self):
+        return [e["event_type"] for e in self.events]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_block_publishers_or_other_subscribers():
+    bus = AgentEventBus()
+    fast, slow = _Socket(), _Socket(delay=0.02)
+    await bus.subscribe(fast)
+    await bus.subscribe(slow)
+
+    started = time.perf_counter()
+    for i in range(100):
+        await bus.publish_progress("Analyst", f"step {i}", progress=i / 100)
+    await bus.publish_result("Analyst", "final answer")
+    assert time.perf_counter() - started < 0.5
+
+    await asyncio.sleep(0.01)
+    assert fast.types()[-1] == "result"
+    await bus.drain()
+
+    # 慢订阅者的进度事件被合并为最新一条，但结果事件必达
+    assert slow.types()[-1] == "result"
+    assert len(slow.events) < 10
+    assert [e["message"] for e in slow.events if e["event_type"] == "progress"][-1] == "step 99"
+    assert bus.get_stats()["coalesced"] > 90
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_logs_keeps_results_and_evicts_hopeless_subscribers():
+    bus = AgentEventBus(subscriber_queue_size=8)
+    blocked = _Socket(delay=10)
+    await bus.subscribe(blocked)
+
+    for i in range(20):
+        await bus.publish_log("Analyst", f"log {i}")
+    await bus.publish_result("Analyst", "kept")
+    sub = bus._subscribers[0]
+    assert any(json.loads(item.text)["event"]["message"] == "kept" for item in sub.queue)
+    assert sub.stats["dropped"] >= 12
+
+    for i in range(10):
+        await bus.publish_result("Analyst", f"result {i}")
+    await asyncio.sleep(0)
+    assert bus.subscribers == []
+    assert blocked.closed_with == 1013
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded_and_local_handlers_run_in_order():
+    bus = AgentEventBus()
+    bus.max_history = 5
+    seen = []
+
+    async def handler(event):
+        await asyncio.sleep(0)
+        seen.append(event.message)
+
+    bus.add_local_handler(handler)
+    for i in range(12):
+        await bus.publish(AgentEvent(agent_name="A", event_type=AgentEventType.LOG, message=str(i)))
+    await bus.drain()
+
+    assert [e.message for e in bus.get_history()] == [str(i) for i in range(7, 12)]
+    assert seen == [str(i) for i in range(12)]
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_flushes_queue_and_coalescing_keeps_agent_order():
+    bus = AgentEventBus()
+    socket = _Socket(delay=0.005)
+    await bus.subscribe(socket)
+
+    await bus.publish_log("Other", "busy")  # 占住写任务，后续事件排队
+    await bus.publish_thinking("Analyst", "planning")
+    await bus.publish_result("Analyst", "answer")
+    await bus.publish_thinking("Analyst", "reviewing")  # 不能合并到 result 之前的 thinking
+    await bus.publish_completed("Analyst")
+    await bus.unsubscribe(socket)
+
+    assert [(e["event_type"], e["message"]) for e in socket.events if e["agent_name"] == "Analyst"] == [
+        ("thinking", "planning"),
+        ("result", "answer"),
+        ("thinking", "reviewing"),
+        ("completed", "完成"),
+    ]
+    assert bus.subscribers == []
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_gives_up_after_flush_timeout():
+    bus = AgentEventBus()
+    stuck = _Socket(delay=10)
+    await bus.subscribe(stuck)
+    await bus.publish_result("Analyst", "never sent")
+
+    started = time.perf_counter()
+    await bus.unsubscribe(stuck, flush_timeout=0.05)
+    assert time.perf_counter() - started < 1
+    assert bus.subscribers == []
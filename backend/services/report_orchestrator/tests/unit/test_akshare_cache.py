@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+
+from app.core.roundtable.akshare_cache import AkShareTableCache
+from app.core.roundtable.akshare_tool import AkShareTool
+
+
+class _FakeAk:
+    def __init__(self):
+        self.calls = {"spot": 0, "industry": 0}
+        self.threads = []
+
+    def stock_zh_a_spot_em(self):
+        self.calls["spot"] += 1
+        self.threads.append(threading.current_thread().name)
+        rows = []
+        for i, (code, name) in enumerate([("600519", "贵州茅台"), ("000001", "平安银行"), ("300750", "宁德时代")]):
+            rows.append({
+                "代码": code, "名称": name, "最新价": 100.0 + i, "涨跌幅": 1.5, "涨跌额": 1.0,
+                "成交量": 10000.0, "成交额": 1e8, "今开": 99.0, "最高": 101.0, "最低": 98.0,
+                "昨收": 99.0, "换手率": 0.5, "市盈率-动态": 20.0, "市净率": 5.0,
+                "总市值": 2e12, "流通市值": 1e12,
+            })
+        return pd.DataFrame(rows)
+
+    def stock_board_industry_name_em(self):
+        self.calls["industry"] += 1
+        return pd.DataFrame([{"板块名称": f"板块{i}", "涨跌幅": float(i)} for i in range(30)])
+
+
+@pytest.fixture
+def tool():
+    tool = AkShareTool()
+    tool._ak = _FakeAk()
+    tool.cache = AkShareTableCache(max_workers=2)
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_quotes_share_one_market_table_fetched_off_loop(tool):
+    results = await asyncio.gather(
+        tool.execute("quote", symbol="600519"),
+        tool.execute("quote", symbol="SZ000001"),
+        tool.execute("quote", symbol="300750"),
+    )
+
+    assert [r["data"]["name"] for r in results] == ["贵州茅台", "平安银行", "宁德时代"]
+    assert tool._ak.calls["spot"] == 1
+    assert tool._ak.threads[0].startswith("akshare")
+    assert tool.cache.stats["coalesced"] == 2
+
+    missing = await tool.execute("quote", symbol="999999")
+    assert missing["success"] is False
+    assert tool._ak.calls["spot"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tables_expire_by_ttl_and_prefetch_warms_cache(tool):
+    cache = tool.cache
+    warmed = await cache.prefetch({"stock_board_industry_name_em": tool._ak.stock_board_industry_name_em})
+    assert warmed == {"stock_board_industry_name_em": True}
+
+    industry = await tool.execute("industry")
+    assert industry["data"]["top_gainers"][0]["板块名称"] == "板块19"
+    assert tool._ak.calls["industry"] == 1
+
+    cache.ttls["stock_board_industry_name_em"] = 0
+    cache.clear()
+    await tool.execute("industry")
+    await tool.execute("industry")
+    assert tool._ak.calls["industry"] == 3
+    assert cache.get_stats()["tables"] == 1
@@ -70,11 +70,19 @@ def setup_redis_mock():
 
 
 # Setup once at module level
+_saved_redis_modules = {name: sys.modules.get(name) for name in ('redis', 'redis.asyncio')}
 _redis_mock, FakeRedis = setup_redis_mock()
 
 # Now import the module under test
 from app.core.trading.decision_store import TradingDecision, TradingDecisionStore
 
+# Restore the real redis modules so later test modules don't import the mock
+for _name, _module in _saved_redis_modules.items():
+    if _module is None:
+        sys.modules.pop(_name, None)
+    else:
+        sys.modules[_name] = _module
+
 
 # =============================================================================
 # DS-001: TradingDecision Creation
@@ -0,0 +1,101 @@
+import pytest
+
+from app.core.roundtable.edgar_mirror import EdgarMirror
+from app.core.roundtable.sec_edgar_tool import SECEdgarTool
+from tests.mocks.edgar_fixture_server import EdgarFixtureServer
+
+
+@pytest.fixture
+def fixture_server():
+    with EdgarFixtureServer() as server:
+        yield server
+
+
+@pytest.fixture
+def mirror(tmp_path, fixture_server):
+    return EdgarMirror(
+        db_path=str(tmp_path / "edgar.sqlite3"),
+        base_url=fixture_server.url,
+        tickers_url=fixture_server.tickers_url,
+    )
+
+
+@pytest.mark.asyncio
+async def test_ticker_index_and_concepts_are_served_locally(mirror, fixture_server):
+    assert await mirror.lookup_cik("zzzt") == "1999999"
+    assert await mirror.lookup_cik("NVDA") == "1045810"
+    assert await mirror.lookup_cik("NOPE") is None
+    assert fixture_server.count("company_tickers") == 1
+
+    revenues = await mirror.get_concept("0001999999", "Revenues", form="10-K")
+    assert [r["val"] for r in revenues] == [2_500_000_000, 2_000_000_000]
+    quarterly = await mirror.get_concept("1999999", "Revenues", form="10-Q")
+    assert quarterly[0]["fp"] == "Q3"
+    shares = await mirror.get_concept("1999999", "EntityCommonStockSharesOutstanding", unit="shares", taxonomy="dei")
+    assert shares[0]["val"] == 1_000_000
+
+    # Everything after the first download is read from SQLite
+    assert fixture_server.count("companyfacts") == 1
+    assert mirror.stats["local_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_facts_refresh_with_conditional_get(mirror, fixture_server):
+    mirror.facts_max_age_seconds = 0
+
+    await mirror.ensure_company_facts("1999999")
+    await mirror.ensure_company_facts("1999999")
+    assert fixture_server.count("companyfacts", 200) == 1
+    assert fixture_server.count("companyfacts", 304) == 1
+
+    us_gaap = fixture_server.company_facts["1999999"]["facts"]["us-gaap"]
+    us_gaap["Revenues"]["units"]["USD"].append(
+        {"start": "2025-10-01", "end": "2026-09-30", "val": 3_000_000_000, "form": "10-K",
+         "fy": 2026, "fp": "FY", "filed": "2026-11-01", "accn": "x"}
+    )
+    latest = await mirror.get_concept("1999999", "Revenues", form="10-K", limit=1)
+    assert latest[0]["val"] == 3_000_000_000
+    assert fixture_server.count("companyfacts", 200) == 2
+
+
+@pytest.mark.asyncio
+async def test_sec_tool_uses_mirror_for_facts_and_concepts(mirror, fixture_server):
+    tool = SECEdgarTool(base_url=fixture_server.url, mirror=mirror)
+
+    facts = await tool.execute("get_company_facts", ticker="ZZZT")
+    assert facts["success"] is True
+    assert facts["company_name"] == "Fixture Test Corp"
+    assert facts["metrics"]["Revenue"]["value"] == 2_500_000_000
+    assert facts["metrics"]["NetIncome"]["fy"] == 2025
+
+    concept = await tool.execute("get_concept", ticker="ZZZT", concept="NetIncomeLoss")
+    assert [v["value"] for v in concept["values"]] == [450_000_000, 300_000_000]
+
+    filings = await tool.execute("search_filings", ticker="ZZZT", form_type="8-K")
+    assert filings["filings"][0]["primary_document"] == "ztt-8k.htm"
+    assert fixture_server.count("companyfacts") == 1
+
+
+@pytest.mark.asyncio
+async def test_concepts_are_scoped_to_us_gaap_and_skip_missing_values(mirror, fixture_server):
+    facts = fixture_server.company_facts["1999999"]["facts"]
+    facts["ifrs-full"] = {
+        "Revenues": {"units": {"USD": [
+            {"start": "2025-10-01", "end": "2026-09-30", "val": 9_999, "form": "10-K",
+             "fy": 2026, "fp": "FY", "filed": "2026-11-01", "accn": "ifrs"},
+        ]}},
+    }
+    facts["us-gaap"]["NetIncomeLoss"]["units"]["USD"].append(
+        {"start": "2025-10-01", "end": "2026-09-30", "val": None, "form": "10-K",
+         "fy": 2026, "fp": "FY", "filed": "2026-11-01", "accn": "null"}
+    )
+
+    revenues = await mirror.get_concept("1999999", "Revenues", form="10-K")
+    assert [r["val"] for r in revenues] == [2_500_000_000, 2_000_000_000]
+    assert (await mirror.get_concept("1999999", "Revenues", form="10-K", taxonomy="ifrs-full"))[0]["val"] == 9_999
+
+    tool = SECEdgarTool(base_url=fixture_server.url, mirror=mirror)
+    concept = await tool.execute("get_concept", ticker="ZZZT", concept="NetIncomeLoss")
+    assert [v["value"] for v in concept["values"]] == [450_000_000, 300_000_000]
+    facts_result = await tool.execute("get_company_facts", ticker="ZZZT")
+    assert facts_result["metrics"]["NetIncome"]["value"] == 450_000_000
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.agent_event_bus import AgentEventBus
+from app.core.event_stream import EventStream, stream_publisher
+from app.core.session_store import SessionStore
+from tests.mocks.fake_redis_streams import AsyncFakeRedisStreams, FakeRedisStreams
+
+
+def _build_store(fake_redis: FakeRedisStreams) -> SessionStore:
+    store = SessionStore.__new__(SessionStore)
+    store.redis_client = fake_redis
+    return store
+
+
+def test_session_events_are_read_by_seq_and_trimmed():
+    fake_redis = FakeRedisStreams()
+    store = _build_store(fake_redis)
+
+    seqs = [store.append_session_event("s1", {"type": "progress", "i": i}, max_events=5) for i in range(8)]
+    assert seqs == list(range(1, 9))
+    assert store.get_latest_session_event_seq("s1") == 8
+
+    # 只保留最近 5 条；after_seq 之后按 seq 升序返回
+    assert [e["seq"] for e in store.get_session_events("s1", after_seq=0)] == [4, 5, 6, 7, 8]
+    assert [e["i"] for e in store.get_session_events("s1", after_seq=6, limit=1)] == [6]
+
+    # 旧的 sorted-set 布局仍可读取
+    fake_redis.sorted_sets["session_events:old"] = {json.dumps({"seq": 1}): 1, json.dumps({"seq": 2}): 2}
+    assert [e["seq"] for e in store.get_session_events("old", after_seq=1)] == [2]
+
+
+@pytest.mark.asyncio
+async def test_follow_resumes_after_last_id_and_stops_at_terminal_frame():
+    stream = EventStream(AsyncFakeRedisStreams(), maxlen=100)
+    first = await stream.publish("s1", {"type": "agent_event", "n": 1})
+    await stream.publish("s1", {"type": "agent_event", "n": 2})
+
+    async def follower():
+        return [frame async for _, frame in stream.follow("s1", after_id=first, block_ms=1000)]
+
+    task = asyncio.create_task(follower())
+    await asyncio.sleep(0.01)
+    await stream.publish("s1", {"type": "agent_event", "n": 3})
+    await stream.publish("s1", {"type": "discussion_complete"})
+    await stream.publish("s1", {"type": "agent_event", "n": 4})
+
+    frames = await asyncio.wait_for(task, timeout=1)
+    assert [f.get("n") for f in frames] == [2, 3, None]
+    assert frames[-1]["type"] == "discussion_complete"
+
+
+@pytest.mark.asyncio
+async def test_agent_event_bus_frames_reach_another_worker():
+    redis_client = AsyncFakeRedisStreams()
+    meeting_worker = EventStream(redis_client)
+    other_worker = EventStream(redis_client)
+
+    bus = AgentEventBus()
+    bus.add_local_handler(stream_publisher(meeting_worker, "s1"))
+    await meeting_worker.set_meta("s1", user_id="u1", status="running")
+    await bus.publish_progress("Analyst", "collecting data", progress=0.3)
+    await bus.publish_result("Analyst", "done")
+    await bus.drain()
+
+    assert (await other_worker.get_meta("s1"))["user_id"] == "u1"
+    frames = await other_worker.read_after("s1")
+    assert [f["event"]["event_type"] for _, f in frames] == ["progress", "result"]
+    assert all(f["type"] == "agent_event" for _, f in frames)
+
+
+@pytest.mark.asyncio
+async def test_follow_stops_when_writer_dies_without_terminal_frame():
+    stream = EventStream(AsyncFakeRedisStreams(), maxlen=100)
+    await stream.set_meta("s1", user_id="u1", status="running")
+    await stream.publish("s1", {"type": "agent_event", "n": 1})
+
+    # 写入方退出，状态一直是 running：空闲超时后结束
+    frames = await asyncio.wait_for(
+        _collect(stream.follow("s1", block_ms=10, idle_timeout=0.05)), timeout=1
+    )
+    assert [f["n"] for f in frames] == [1]
+
+    # 会话已结束但结束帧丢失 (被裁剪)：下一次空读即结束
+    await stream.set_meta("s1", status="error")
+    frames = await asyncio.wait_for(_collect(stream.follow("s1", block_ms=10, idle_timeout=60)), timeout=1)
+    assert [f["n"] for f in frames] == [1]
+
+
+async def _collect(follower):
+    return [frame async for _, frame in follower]
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.core.trading.request_scheduler import (
+    EndpointLimit,
+    ExchangeRequestScheduler,
+    RequestPriority,
+)
+
+
+@pytest.mark.asyncio
+async def test_identical_inflight_gets_are_coalesced():
+    scheduler = ExchangeRequestScheduler()
+    calls = {"count": 0}
+
+    async def fetch():
+        calls["count"] += 1
+        await asyncio.sleep(0.02)
+        return {"code": "0", "data": [{"last": "100"}]}
+
+    path = "/api/v5/market/ticker?instId=BTC-USDT-SWAP"
+    results = await asyncio.gather(*(scheduler.run(path, fetch, coalesce=True) for _ in range(5)))
+
+    assert calls["count"] == 1
+    assert all(r["data"][0]["last"] == "100" for r in results)
+    stats = scheduler.get_metrics()["endpoints"]["/api/v5/market/ticker"]
+    assert stats["coalesced"] == 4
+    assert stats["executed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_burst_rate():
+    scheduler = ExchangeRequestScheduler(
+        limits={"/api/v5/market/candles": EndpointLimit(5, 0.1, RequestPriority.MARKET_DATA)}
+    )
+
+    async def fetch():
+        return {"code": "0"}
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*(
+        scheduler.run(f"/api/v5/market/candles?limit={i}", fetch) for i in range(10)
+    ))
+    elapsed = loop.time() - started
+
+    # 5 tokens up front, the other 5 refill at 50/s
+    assert elapsed >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_orders_jump_ahead_of_queued_market_data():
+    scheduler = ExchangeRequestScheduler(max_in_flight=1)
+    order = []
+    gate = asyncio.Event()
+
+    async def slow_read():
+        await gate.wait()
+        order.append("first-read")
+        return {"code": "0"}
+
+    def tagged(tag):
+        async def fetch():
+            order.append(tag)
+            return {"code": "0"}
+        return fetch
+
+    first = asyncio.create_task(scheduler.run("/api/v5/market/ticker?instId=A", slow_read))
+    await asyncio.sleep(0.01)
+    reads = [
+        asyncio.create_task(scheduler.run(f"/api/v5/market/ticker?instId=R{i}", tagged(f"read-{i}")))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    placed = asyncio.create_task(scheduler.run("/api/v5/trade/order", tagged("order")))
+    await asyncio.sleep(0.01)
+
+    gate.set()
+    await asyncio.gather(first, placed, *reads)
+
+    assert order[0] == "first-read"
+    assert order[1] == "order"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_code_pauses_bucket():
+    scheduler = ExchangeRequestScheduler(
+        limits={"/api/v5/account/balance": EndpointLimit(10, 0.1, RequestPriority.ACCOUNT)}
+    )
+    responses = [{"code": "50011", "msg": "Too Many Requests"}, {"code": "0"}]
+
+    async def fetch():
+        return responses.pop(0)
+
+    loop = asyncio.get_running_loop()
+    first = await scheduler.run("/api/v5/account/balance", fetch, owner="acct")
+    started = loop.time()
+    second = await scheduler.run("/api/v5/account/balance", fetch, owner="acct")
+
+    assert first["code"] == "50011"
+    assert second["code"] == "0"
+    assert loop.time() - started >= 0.09
+    assert scheduler.get_metrics()["endpoints"]["/api/v5/account/balance"]["rate_limited"] == 1
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.trading.funding.models import RateTrend
+from app.core.trading.funding.rate_store import FundingRateStore
+
+
+def _ms(dt: datetime) -> str:
+    return str(int(dt.timestamp() * 1000))
+
+
+class _FakeOKX:
+    """Serves funding-rate and funding-rate-history from an in-memory series"""
+
+    def __init__(self, now: datetime, count: int = 21):
+        self.now = now
+        # Oldest first; rates rise over time
+        self.settlements = [
+            (now - timedelta(hours=8 * (count - i)), 0.0001 + 0.00003 * i) for i in range(count)
+        ]
+        self.next_settlement = now + timedelta(hours=4)
+        self.paths = []
+
+    async def fetch(self, path: str):
+        self.paths.append(path)
+        if path.startswith("/api/v5/public/funding-rate?"):
+            return {"code": "0", "data": [{
+                "fundingRate": "0.0009",
+                "fundingTime": _ms(self.next_settlement),
+            }]}
+        if "before=" in path:
+            since = int(path.split("before=")[1].split("&")[0])
+            rows = [(t, r) for t, r in self.settlements if int(_ms(t)) > since]
+        else:
+            rows = self.settlements
+        return {"code": "0", "data": [
+            {"fundingRate": str(r), "fundingTime": _ms(t)} for t, r in reversed(rows)
+        ]}
+
+
+@pytest.mark.asyncio
+async def test_store_precomputes_stats_and_serves_reads_from_cache():
+    fake = _FakeOKX(datetime.now())
+    store = FundingRateStore(fetch_json=fake.fetch)
+
+    stats = await store.get_stats("BTC-USDT-SWAP")
+    again = await store.get_stats("BTC-USDT-SWAP")
+
+    assert len(fake.paths) == 2  # current + full history, once
+    assert again is stats
+    assert stats.current_rate == pytest.approx(0.0009)
+    assert stats.history_count == 21
+    assert stats.trend == RateTrend.RISING
+    last_day = [r for t, r in fake.settlements if t > datetime.now() - timedelta(hours=24)]
+    expected_24h = sum(last_day) / len(last_day)
+    assert stats.avg_24h == pytest.approx(expected_24h)
+    assert store.peek("BTC-USDT-SWAP") is stats
+
+
+@pytest.mark.asyncio
+async def test_store_fetches_only_new_settlements_after_settlement_passes():
+    now = datetime.now()
+    fake = _FakeOKX(now)
+    store = FundingRateStore(fetch_json=fake.fetch)
+    await store.get_stats("BTC-USDT-SWAP")
+
+    # Settlement happens: exchange publishes one new record and a new next time
+    series = store._series["BTC-USDT-SWAP"]
+    series.next_settlement_time = now - timedelta(seconds=1)
+    fake.settlements.append((now - timedelta(seconds=1), 0.002))
+    fake.next_settlement = now + timedelta(hours=8)
+
+    stats = await store.get_stats("BTC-USDT-SWAP")
+
+    history_calls = [p for p in fake.paths if "history" in p]
+    assert len(history_calls) == 2
+    assert "before=" in history_calls[-1]
+    assert stats.history_count == 22
+    assert store.history("BTC-USDT-SWAP")[0].rate == pytest.approx(0.002)
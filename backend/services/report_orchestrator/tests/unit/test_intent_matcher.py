@@ -0,0 +1,93 @@
+import pytest
+
+from app.core import intent_classifier
+from app.core.intent_classifier import HashedNgramClassifier, IntentLog, IntentRouteCache
+from app.core.intent_matcher import AhoCorasick
+from app.core.intent_recognizer import IntentRecognizer, IntentType
+
+
+def test_aho_corasick_reports_overlapping_keywords():
+    patterns = ["分析", "分析公司", "析公", "he", "she", "hers"]
+    automaton = AhoCorasick(patterns)
+
+    text = "ushers 想分析公司"
+    expected = {i for i, p in enumerate(patterns) if p in text}
+    assert automaton.matched(text) == expected
+    assert automaton.matched("无关输入") == set()
+
+
+def test_classifier_learns_from_logged_intents_and_round_trips(tmp_path):
+    log = IntentLog(str(tmp_path / "intent_log.jsonl"))
+    samples = {
+        "dd_analysis": ["帮忙做一份水杉智算的尽职调查", "出具完整投研报告", "全面评估这家企业的投资价值"],
+        "upload_bp": ["我这有份商业计划书要发给你", "附件是项目BP", "传一下融资材料"],
+        "free_chat": ["随便聊聊行业趋势", "最近市场情绪怎么样", "讲讲估值方法"],
+    }
+    for label, texts in samples.items():
+        for text in texts:
+            log.append(text, label, 0.85)
+    log.append("bad line", "free_chat", 0.5)
+
+    records = log.read(min_confidence=0.6)
+    assert len(records) == 9
+    model = HashedNgramClassifier(dim=1 << 12).fit((r["text"], r["intent"]) for r in records)
+    assert model.predict("附件是项目BP")[0] == "upload_bp"
+
+    path = tmp_path / "model.json"
+    model.save(str(path))
+    loaded = HashedNgramClassifier.load(str(path))
+    assert loaded.predict_proba("尽职调查") == pytest.approx(model.predict_proba("尽职调查"))
+
+
+@pytest.mark.asyncio
+async def test_route_cache_skips_repeat_llm_calls(monkeypatch, tmp_path):
+    monkeypatch.setattr(intent_classifier, "_intent_route_cache", IntentRouteCache(max_size=16))
+    monkeypatch.setattr(intent_classifier, "_intent_log", IntentLog(str(tmp_path / "log.jsonl")))
+    intent_classifier.set_intent_classifier(None)
+    recognizer = IntentRecognizer(llm_gateway_url="http://llm_gateway:8003")
+    calls = []
+
+    async def _fake_llm_call(prompt: str, response_format: str = "text", **kwargs):
+        calls.append(prompt)
+        return {"content": "quick_overview"}
+
+    monkeypatch.setattr(recognizer.llm, "call", _fake_llm_call)
+
+    text = "这家做算力租赁的初创团队背景和融资情况整体来看值得跟进"
+    first = await recognizer.recognize(text)
+    second = await recognizer.recognize("  " + text.upper() + " ")
+
+    assert first.type == second.type == IntentType.QUICK_OVERVIEW
+    assert len(calls) == 1
+    assert [r["intent"] for r in intent_classifier.get_intent_log().read()] == ["quick_overview"]
+
+
+@pytest.mark.asyncio
+async def test_llm_fallback_is_not_cached_and_intent_log_is_opt_in_and_rotates(monkeypatch, tmp_path):
+    monkeypatch.setattr(intent_classifier, "_intent_route_cache", IntentRouteCache(max_size=16))
+    monkeypatch.delenv("INTENT_LOG_PATH", raising=False)
+    monkeypatch.setattr(intent_classifier, "_intent_log", None)
+    intent_classifier.set_intent_classifier(None)
+    recognizer = IntentRecognizer(llm_gateway_url="http://llm_gateway:8003")
+    replies = [RuntimeError("gateway down"), {"content": "dd_analysis"}]
+
+    async def _flaky_llm_call(prompt: str, response_format: str = "text", **kwargs):
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(recognizer.llm, "call", _flaky_llm_call)
+
+    text = "这家做算力租赁的初创团队背景和融资情况整体来看值得跟进"
+    assert (await recognizer.recognize(text)).type == IntentType.FREE_CHAT
+    assert len(intent_classifier.get_intent_route_cache()) == 0
+    assert (await recognizer.recognize(text)).type == IntentType.DD_ANALYSIS
+    assert not intent_classifier.get_intent_log().enabled  # 未配置路径时不落盘
+
+    log = IntentLog(str(tmp_path / "log.jsonl"), max_bytes=400)
+    for i in range(6):
+        await log.append_async(f"样本 {i} " + "x" * 60, "free_chat", 0.85)
+    assert (tmp_path / "log.jsonl.1").exists()
+    assert (tmp_path / "log.jsonl").stat().st_size <= 400
+    assert "样本 5 " + "x" * 60 in {r["text"] for r in log.read()}
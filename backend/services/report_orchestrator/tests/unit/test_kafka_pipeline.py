@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.messaging.codec import decode_value, encode_key, encode_value
+from app.messaging.consumer import ConcurrentConsumer
+from app.messaging.kafka_client import KafkaClient
+from app.messaging.messages import SessionEvent
+from app.messaging.topics import MagellanTopics
+from tests.mocks.memory_kafka import ConsumerRecord, InMemoryBroker, InMemoryConsumer, InMemoryProducer, TopicPartition
+
+
+def _event(session_id: str, i: int) -> SessionEvent:
+    return SessionEvent(source="test", destination="ws", session_id=session_id, event_type="progress", progress=i)
+
+
+@pytest.mark.asyncio
+async def test_send_batch_ships_messages_in_few_requests(monkeypatch):
+    broker = InMemoryBroker(partitions=3)
+    producer = InMemoryProducer(broker, value_serializer=encode_value, key_serializer=encode_key, linger_ms=5, max_batch_size=64 * 1024)
+    client = KafkaClient()
+    monkeypatch.setattr(client, "_producer", producer)
+
+    sent = await client.send_batch(MagellanTopics.SESSION_EVENTS, [_event(f"s{i % 4}", i) for i in range(50)])
+    assert sent == 50
+    assert broker.requests == 1
+
+    assert await client.send(MagellanTopics.SESSION_EVENTS, _event("s1", 99), wait=False) is True
+    await client.flush()
+    assert client.get_stats()["producer"]["pending_acks"] == 0
+
+    stored = [decode_value(v) for log in broker.logs.values() for _, v in log]
+    assert len(stored) == 51
+    assert sorted(e["progress"] for e in stored) == list(range(50)) + [99]
+    # 同一 session 的消息落在同一分区
+    for tp, log in broker.logs.items():
+        sessions = {decode_value(v)["session_id"] for _, v in log}
+        assert all(broker.partition_for(tp.topic, encode_key(s)) == tp for s in sessions)
+
+
+@pytest.mark.asyncio
+async def test_slow_message_does_not_block_partition_and_commits_stay_ordered():
+    tp = TopicPartition("t", 0)
+    consumer = InMemoryConsumer(InMemoryBroker(partitions=1), "t")
+    release = asyncio.Event()
+    handled = []
+
+    async def handler(record):
+        if record.offset == 0:
+            await release.wait()
+        handled.append(record.offset)
+
+    dispatcher = ConcurrentConsumer(consumer, handler, concurrency=4, max_buffered=100, commit_interval_ms=0)
+    for offset in range(6):
+        dispatcher._submit(tp, ConsumerRecord("t", 0, offset, f"k{offset}", {}))
+    await asyncio.sleep(0.01)
+
+    assert handled == [1, 2, 3, 4, 5]
+    await dispatcher.commit()
+    assert consumer.commits == []  # offset 0 未完成，不能越过它提交
+
+    release.set()
+    await dispatcher.drain()
+    assert consumer.commits == [{tp: 6}]
+
+
+@pytest.mark.asyncio
+async def test_same_key_stays_ordered_and_backlog_pauses_partition():
+    broker = InMemoryBroker(partitions=1)
+    producer = InMemoryProducer(broker, value_serializer=encode_value, key_serializer=encode_key)
+    for i in range(20):
+        await producer.send("t", value={"i": i}, key="session-1")
+    await producer.flush()
+
+    consumer = InMemoryConsumer(broker, "t", value_deserializer=decode_value)
+    seen = []
+    paused_during_run = []
+
+    async def handler(record):
+        paused_during_run.append(bool(consumer.paused))
+        await asyncio.sleep(0.001)
+        seen.append(record.value["i"])
+
+    dispatcher = ConcurrentConsumer(consumer, handler, concurrency=8, max_buffered=10, poll_timeout_ms=10, max_records=20)
+    task = asyncio.create_task(dispatcher.run())
+    while len(seen) < 20:
+        await asyncio.sleep(0.005)
+    await dispatcher.stop()
+    await task
+
+    assert seen == list(range(20))
+    assert dispatcher.stats["pauses"] == 1 and any(paused_during_run)
+    assert consumer.paused == set()
+    assert broker.committed[TopicPartition("t", 0)] == 20
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from app.api.routers import monitoring
+from app.core.observability import latency_sketch
+from app.core.observability.latency_sketch import LatencyRegistry, LatencySketch, parse_slos
+
+
+def test_sketch_quantiles_are_accurate_mergeable_and_bounded():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1.2) for _ in range(20000)]
+    left, right, whole = LatencySketch(alpha=0.01), LatencySketch(alpha=0.01), LatencySketch(alpha=0.01)
+    for i, value in enumerate(values):
+        (left if i % 2 else right).add(value)
+        whole.add(value)
+    left.merge(right)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(left.quantile(q) - exact) / exact <= 0.02
+        assert left.quantile(q) == whole.quantile(q)
+    assert left.count == len(values)
+
+    small = LatencySketch(alpha=0.01, max_buckets=160)
+    for value in values:
+        small.add(value)
+    assert len(small.buckets) <= 160 < len(whole.buckets)
+    # 合并只牺牲低分位精度
+    assert abs(small.quantile(0.99) - whole.quantile(0.99)) / whole.quantile(0.99) <= 0.02
+
+
+def test_rolling_windows_expire_old_slots_and_cap_series():
+    registry = LatencyRegistry(slot_seconds=60, slots=60, max_series=3, slos=[])
+    now = 1_000_000.0
+    for _ in range(100):
+        registry.observe("route", "GET /api/reports", 2.0, now=now - 1800)  # 30 分钟前的慢请求
+    for _ in range(100):
+        registry.observe("route", "GET /api/reports", 0.05, now=now)
+
+    [row_5m] = registry.snapshot(window="5m", now=now)
+    [row_1h] = registry.snapshot(window="1h", now=now)
+    assert row_5m["count"] == 100 and row_5m["p99_ms"] == pytest.approx(50, rel=0.02)
+    assert row_1h["count"] == 200 and row_1h["p99_ms"] == pytest.approx(2000, rel=0.02)
+
+    for name in ("a", "b", "c", "d"):
+        registry.observe("tool", name, 0.1, now=now)
+    names = {(r["kind"], r["name"]) for r in registry.snapshot(window="1m", now=now)}
+    assert names == {("route", "GET /api/reports"), ("tool", "a"), ("tool", "b"), ("tool", "_other")}
+
+
+@pytest.mark.asyncio
+async def test_slo_burn_rate_flags_breaching_series(monkeypatch):
+    slos = parse_slos("provider:*=1000@0.99,bad-entry,route:GET /x=200@1.5")
+    assert [s.key for s in slos] == ["provider:*"]
+    registry = LatencyRegistry(slot_seconds=60, slots=60, slos=slos)
+    monkeypatch.setattr(latency_sketch, "_latency_registry", registry)
+
+    for i in range(200):
+        # llm:slow 20% 超过 1s → 燃烧率 20x；llm:fast 全部达标
+        registry.observe("provider", "llm:slow", 3.0 if i % 5 == 0 else 0.2)
+        registry.observe("provider", "llm:fast", 0.2, ok=i != 0)
+
+    result = await monitoring.get_slo_burn_rates()
+    by_name = {r["name"]: r for r in result["slos"]}
+    assert by_name["llm:slow"]["burn_rate_5m"] == pytest.approx(20, rel=0.01)
+    assert by_name["llm:slow"]["status"] == "critical"
+    assert by_name["llm:fast"]["burn_rate_1h"] == pytest.approx(0.5, rel=0.01)
+    assert by_name["llm:fast"]["status"] == "ok"
+    assert [r["name"] for r in result["breaching"]] == ["llm:slow"]
+
+    latency = await monitoring.get_latency_percentiles(window="5m", kind="provider")
+    assert latency["series"][0]["name"] == "llm:slow"
+    assert latency["series"][0]["p99_ms"] == pytest.approx(3000, rel=0.02)
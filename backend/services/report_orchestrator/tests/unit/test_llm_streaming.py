@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from starlette.websockets import WebSocketState
+
+import app.core.roundtable.rewoo_agent as rewoo_module
+from app.core.agent_event_bus import AgentEventBus
+from app.core.roundtable.llm_streaming import DeltaCoalescer, parse_sse_line
+from app.core.roundtable.meeting import Meeting
+from app.core.roundtable.rewoo_agent import ReWOOAgent
+
+
+class _FakeWebSocket:
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+    def deltas(self):
+        return [f["event"] for f in self.frames if f["event"]["event_type"] == "message_delta"]
+
+
+def _patch_gateway(monkeypatch, handler):
+    real_client = httpx.AsyncClient
+
+    def factory(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(rewoo_module.httpx, "AsyncClient", factory)
+
+
+def _sse(chunks):
+    lines = [f"data: {json.dumps({'content': c, 'done': False})}\n\n" for c in chunks]
+    lines.append(f"data: {json.dumps({'content': '', 'done': True})}\n\n")
+    return "".join(lines).encode()
+
+
+async def _meeting_agent():
+    ws = _FakeWebSocket()
+    bus = AgentEventBus()
+    await bus.subscribe(ws)
+    agent = ReWOOAgent(name="Analyst", role_prompt="analyst", llm_gateway_url="http://gateway.test")
+    Meeting(agents=[agent], agent_event_bus=bus)
+    return agent, bus, ws
+
+
+def test_parse_sse_line():
+    assert parse_sse_line('data: {"content": "a", "done": false}') == {"content": "a", "done": False}
+    assert parse_sse_line(": keep-alive") is None
+    assert parse_sse_line("data: not-json") is None
+
+
+@pytest.mark.asyncio
+async def test_coalescer_merges_deltas_when_sink_is_slow():
+    received = []
+
+    async def slow_sink(delta, offset, done):
+        received.append((delta, offset, done))
+        await asyncio.sleep(0.02)
+
+    coalescer = DeltaCoalescer(slow_sink, flush_interval_ms=0).start()
+    for i in range(50):
+        coalescer.feed(f"t{i} ")
+        if i % 5 == 0:
+            await asyncio.sleep(0)
+    await coalescer.close()
+
+    assert "".join(d for d, _, _ in received) == "".join(f"t{i} " for i in range(50))
+    assert len(received) < 50
+    assert received[-1][2] is True
+    offsets = [o for _, o, _ in received]
+    assert offsets == sorted(offsets) and offsets[0] == 0
+
+
+@pytest.mark.asyncio
+async def test_solve_phase_streams_deltas_to_websocket(monkeypatch):
+    chunks = ["贵州茅台", "估值合理，", "建议持有。"]
+
+    def handler(request):
+        assert request.url.path == "/chat/stream"
+        return httpx.Response(200, content=_sse(chunks), headers={"content-type": "text/event-stream"})
+
+    _patch_gateway(monkeypatch, handler)
+    agent, bus, ws = await _meeting_agent()
+
+    result = await agent._solve_phase("分析", {}, [], [])
+    await bus.drain()
+
+    assert result == "".join(chunks)
+    deltas = ws.deltas()
+    assert "".join(d["message"] for d in deltas) == result
+    assert deltas[-1]["data"]["done"] is True
+    assert {d["data"]["stream_id"] for d in deltas} == {agent._last_stream_id}
+
+
+@pytest.mark.asyncio
+async def test_stream_failure_falls_back_to_blocking_chat(monkeypatch):
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/chat/stream":
+            return httpx.Response(503)
+        return httpx.Response(200, json={"content": "完整回答"})
+
+    _patch_gateway(monkeypatch, handler)
+    agent, _, _ = await _meeting_agent()
+
+    assert await agent._solve_phase("分析", {}, [], []) == "完整回答"
+    assert paths == ["/chat/stream", "/chat"]
+
+
+@pytest.mark.asyncio
+async def test_solve_phase_skips_streaming_without_websocket_subscribers(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"content": "完整回答"})
+
+    _patch_gateway(monkeypatch, handler)
+    agent, bus, ws = await _meeting_agent()
+    await bus.unsubscribe(ws)
+
+    assert not agent.message_bus.has_delta_listeners
+    assert await agent._solve_phase("分析", {}, [], []) == "完整回答"
+    assert [path for path, _ in requests] == ["/chat"]
+    assert "temperature" not in requests[0][1]
@@ -0,0 +1,85 @@
+import logging
+
+from app.core.observability.log_pipeline import DEFAULT_SAMPLE_RATES, LogPipeline, parse_sample_rates
+from app.core.observability.logging import trace_id_var
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.setFormatter(logging.Formatter("%(trace_id)s %(message)s"))
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class _CountingArg:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "payload"
+
+
+def _logger(name, pipeline):
+    logger = logging.getLogger(name)
+    logger.handlers = [pipeline.handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_messages_are_formatted_on_the_writer_thread_with_caller_trace_id():
+    sink = _ListHandler()
+    pipeline = LogPipeline([sink], max_size=100)
+    logger = _logger("tests.log_pipeline.lazy", pipeline)
+    arg = _CountingArg()
+
+    token = trace_id_var.set("trace-abc")
+    try:
+        logger.info("event %s", arg)
+    finally:
+        trace_id_var.reset(token)
+    logger.debug("no trace")
+
+    assert arg.formatted == 0 and pipeline.queue.qsize() == 2
+    pipeline.start()
+    pipeline.stop()
+    assert sink.lines == ["trace-abc event payload", "- no trace"]
+    assert arg.formatted == 1
+
+
+def test_sampling_applies_per_module_below_warning():
+    assert parse_sample_rates("a.b=5, c=1,bad,d=x") == {"a.b": 5}
+    assert parse_sample_rates(DEFAULT_SAMPLE_RATES) == {}  # 采样需显式开启
+    sink = _ListHandler()
+    pipeline = LogPipeline([sink], max_size=1000, sample_rates={"tests.hot": 5})
+    hot = _logger("tests.hot.store", pipeline)
+    cold = _logger("tests.cold", pipeline)
+
+    for i in range(20):
+        hot.info("hot %d", i)
+        cold.info("cold %d", i)
+    hot.warning("hot warning")
+
+    pipeline.start()
+    pipeline.stop()
+    assert [line for line in sink.lines if "hot " in line] == ["- hot 0", "- hot 5", "- hot 10", "- hot 15", "- hot warning"]
+    assert sum("cold" in line for line in sink.lines) == 20
+    assert pipeline.get_stats()["sampled_out"] == 16
+
+
+def test_full_queue_drops_instead_of_blocking():
+    sink = _ListHandler()
+    pipeline = LogPipeline([sink], max_size=2)
+    logger = _logger("tests.log_pipeline.full", pipeline)
+
+    for i in range(5):
+        logger.error("burst %d", i)
+
+    assert pipeline.get_stats()["dropped"] == 3
+    pipeline.start()
+    pipeline.stop()
+    assert sink.lines == ["- burst 0", "- burst 1"]
@@ -0,0 +1,90 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.roundtable.mcp_client import (
+    HTTPMCPConnection,
+    MCPClient,
+    MCPServerConfig,
+    MCPServerType,
+)
+
+
+class _Recorder:
+    def __init__(self, batch_supported=True):
+        self.batch_supported = batch_supported
+        self.paths = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        body = json.loads(request.content or b"{}")
+        if request.url.path == "/mcp/batch":
+            if not self.batch_supported:
+                return httpx.Response(404)
+            return httpx.Response(200, json={"results": [
+                {"id": c["id"], "success": True, "result": {"echo": c["params"]["query"]}}
+                for c in body["calls"]
+            ]})
+        if request.url.path.startswith("/mcp/tools/"):
+            return httpx.Response(200, json={"success": True, "result": {"echo": body["query"]}})
+        return httpx.Response(404)
+
+
+def _client(recorder, **config_overrides) -> MCPClient:
+    config = MCPServerConfig(name="web-search", server_type=MCPServerType.HTTP, url="http://mcp.test", **config_overrides)
+    client = MCPClient()
+    client.register_server(config)
+    connection = HTTPMCPConnection(config)
+    connection.client = httpx.AsyncClient(base_url=config.url, transport=httpx.MockTransport(recorder))
+    connection.connected = True
+    client.servers["web-search"] = connection
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_batch_round_trip():
+    recorder = _Recorder()
+    client = _client(recorder)
+
+    results = await client.call_tools([("web-search", "search", {"query": f"q{i}"}) for i in range(6)])
+
+    assert [r["result"]["echo"] for r in results] == [f"q{i}" for i in range(6)]
+    assert recorder.paths == ["/mcp/batch"]
+    stats = client.get_statistics()
+    assert stats["total_calls"] == 6
+    assert stats["transport"]["web-search"]["batches"] == 1
+    assert stats["latency"]["web-search/search"]["count"] == 6
+    assert stats["latency"]["web-search/search"]["p50_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_missing_batch_endpoint_falls_back_to_single_calls():
+    recorder = _Recorder(batch_supported=False)
+    client = _client(recorder)
+
+    results = await client.call_tools([("web-search", "search", {"query": f"q{i}"}) for i in range(3)])
+    assert all(r["success"] for r in results)
+    assert recorder.paths.count("/mcp/batch") == 1
+    assert recorder.paths.count("/mcp/tools/search") == 3
+
+    # 之后不再尝试批量端点
+    await client.call_tools([("web-search", "search", {"query": "again"})] * 2)
+    assert recorder.paths.count("/mcp/batch") == 1
+
+
+@pytest.mark.asyncio
+async def test_call_history_is_bounded_but_statistics_are_cumulative(monkeypatch):
+    monkeypatch.setenv("MCP_CALL_HISTORY_SIZE", "5")
+    recorder = _Recorder()
+    client = _client(recorder, batching=False)
+
+    for i in range(12):
+        await client.call_tool("web-search", "search", query=f"q{i}")
+
+    assert len(client.call_history) == 5
+    assert [c.params["query"] for c in client.get_call_history(2)] == ["q10", "q11"]
+    stats = client.get_statistics()
+    assert stats["total_calls"] == 12
+    assert stats["success_rate"] == 1
+    assert recorder.paths == ["/mcp/tools/search"] * 12
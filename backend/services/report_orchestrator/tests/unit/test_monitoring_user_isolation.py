@@ -1,15 +1,20 @@
 import pytest
+from fastapi import HTTPException
 
 from app.api.routers.monitoring import (
     FrontendError,
     ErrorReportRequest,
     clear_errors,
+    get_meeting_trace,
     get_recent_errors,
+    get_trace,
+    list_recent_traces,
     report_errors,
     error_buffers,
     user_metrics,
 )
 from app.core.auth import set_current_user_id
+from app.core.observability import tracing
 
 
 def _request(msg: str) -> ErrorReportRequest:
@@ -70,3 +75,31 @@ async def test_clear_errors_only_affects_current_user():
     u2_after = await get_recent_errors(limit=10)
     assert u2_after["total_in_buffer"] == 1
     assert u2_after["errors"][0]["message"] == "u2-before-clear"
+
+
+@pytest.mark.asyncio
+async def test_traces_are_user_scoped(monkeypatch):
+    buffer = tracing.RingBufferExporter()
+    monkeypatch.setattr(tracing, "_ring_buffer", buffer)
+    monkeypatch.setattr(tracing, "_tracer", None)
+
+    set_current_user_id("u1")
+    async with tracing.start_span("trading.meeting", meeting_id="m1") as span:
+        async with tracing.start_span("search", query="u1 secret query"):
+            pass
+    u1_trace = span.trace_id
+
+    set_current_user_id("u2")
+    async with tracing.start_span("trading.meeting", meeting_id="m2"):
+        pass
+
+    u2_view = await list_recent_traces(limit=10)
+    assert [t["attributes"]["meeting_id"] for t in u2_view["traces"]] == ["m2"]
+    with pytest.raises(HTTPException):
+        await get_trace(u1_trace)
+    with pytest.raises(HTTPException):
+        await get_meeting_trace("m1")
+
+    set_current_user_id("u1")
+    assert (await get_meeting_trace("m1"))["trace_id"] == u1_trace
+    assert (await get_trace(u1_trace))["span_count"] == 2
@@ -0,0 +1,172 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.trading.funding.rate_store import FundingRateStore
+from app.core.trading.trigger.fast_monitor import FastMonitorConfig
+from app.core.trading.trigger.market_hub import MarketDataHub
+from app.core.trading.trigger.multi_symbol import MultiSymbolConfig, MultiSymbolTriggerRuntime
+
+SYMBOLS = [f"COIN{i}-USDT-SWAP" for i in range(20)]
+BAR_MS = {"1m": 60_000, "5m": 300_000, "15m": 900_000, "1H": 3_600_000, "4H": 14_400_000}
+
+
+class _FakeOKX:
+    """Flat market for every symbol except those listed in ``spiking``"""
+
+    def __init__(self, spiking=()):
+        self.spiking = set(spiking)
+        self.paths = []
+
+    def _candles(self, symbol, bar, limit):
+        now = int(time.time() * 1000) // BAR_MS[bar] * BAR_MS[bar]
+        rows = []
+        for i in range(limit):
+            close = 100.0 + (i % 2)  # zig-zag keeps RSI neutral
+            if i == 0 and symbol in self.spiking and bar == "15m":
+                close = 110.0  # +10% in the newest 15m bar
+            rows.append([str(now - i * BAR_MS[bar]), "100", "100", "100", str(close), "10"])
+        return rows
+
+    async def fetch(self, path):
+        self.paths.append(path)
+        query = dict(p.split("=") for p in path.split("?", 1)[1].split("&"))
+        if path.startswith("/api/v5/market/tickers"):
+            return {"code": "0", "data": [{"instId": s, "last": "100"} for s in SYMBOLS]}
+        if path.startswith("/api/v5/public/open-interest"):
+            return {"code": "0", "data": [{"instId": s, "oi": "1000"} for s in SYMBOLS]}
+        if path.startswith("/api/v5/market/candles"):
+            return {"code": "0", "data": self._candles(query["instId"], query["bar"], int(query["limit"]))}
+        if path.startswith("/api/v5/public/funding-rate?"):
+            return {"code": "0", "data": [{"fundingRate": "0.0001", "fundingTime": str(int(time.time() * 1000) + 3_600_000)}]}
+        return {"code": "0", "data": []}
+
+
+def _runtime(fake, on_trigger=None, budget=2):
+    hub = MarketDataHub(fetch_json=fake.fetch, funding_store=FundingRateStore(fetch_json=fake.fetch))
+    config = MultiSymbolConfig(symbols=list(SYMBOLS), max_concurrent_meetings=budget, cooldown_minutes=30)
+    return MultiSymbolTriggerRuntime(config=config, on_trigger=on_trigger, market_hub=hub,
+                                     monitor_config=FastMonitorConfig()), hub
+
+
+@pytest.mark.asyncio
+async def test_tick_batches_tickers_and_refreshes_candles_incrementally():
+    fake = _FakeOKX()
+    runtime, hub = _runtime(fake)
+
+    results = await runtime.run_tick()
+    assert set(results) == set(SYMBOLS)
+    assert sum(p.startswith("/api/v5/market/tickers") for p in fake.paths) == 1
+    assert sum(p.startswith("/api/v5/public/open-interest") for p in fake.paths) == 1
+    assert sum(p.startswith("/api/v5/market/candles") for p in fake.paths) == 3 * len(SYMBOLS)
+
+    # Second tick after the TTLs: still one batch call each, candle refreshes are tiny
+    hub.candle_ttl = hub.ticker_ttl = 0
+    fake.paths.clear()
+    await runtime.run_tick()
+    candle_paths = [p for p in fake.paths if p.startswith("/api/v5/market/candles")]
+    assert sum(p.startswith("/api/v5/market/tickers") for p in fake.paths) == 1
+    assert len(candle_paths) == 3 * len(SYMBOLS)
+    assert all(int(p.rsplit("limit=", 1)[1]) <= 3 for p in candle_paths)
+    assert hub.incremental_fetch_count == 3 * len(SYMBOLS)
+
+
+@pytest.mark.asyncio
+async def test_ta_calculator_shares_the_candle_cache():
+    fake = _FakeOKX()
+    runtime, _ = _runtime(fake)
+    await runtime.run_tick()
+    fake.paths.clear()
+
+    data = await runtime.get_ta_calculator(SYMBOLS[0]).calculate()
+
+    assert data.current_price == 100.0
+    # 15m is already cached by FastMonitor; only 1H and 4H are fetched
+    bars = sorted(p.split("bar=")[1].split("&")[0] for p in fake.paths if "candles" in p)
+    assert bars == ["1H", "4H"]
+
+
+@pytest.mark.asyncio
+async def test_meetings_respect_global_budget_and_cooldown():
+    spiking = SYMBOLS[:6]
+    fake = _FakeOKX(spiking=spiking)
+    running, peak, started = 0, 0, []
+
+    async def on_trigger(symbol, result):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        started.append(symbol)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    runtime, _ = _runtime(fake, on_trigger=on_trigger, budget=2)
+    results = await runtime.run_tick()
+    assert {s for s, r in results.items() if r.should_trigger} == set(spiking)
+
+    while runtime._meetings:
+        await asyncio.sleep(0.01)
+
+    assert sorted(started) == sorted(spiking)
+    assert peak == 2
+    assert all(runtime.get_lock(s).state == "cooldown" for s in spiking)
+
+    # Cooldown: the same symbols do not meet again on the next tick
+    started.clear()
+    await runtime.run_tick()
+    await asyncio.sleep(0.05)
+    assert started == []
+
+
+@pytest.mark.asyncio
+async def test_trading_system_runs_meeting_for_triggered_symbol(monkeypatch):
+    from app.core.trading.trigger.fast_monitor import FastTriggerCondition, FastTriggerResult
+    from app.services.trading_system import TradingSystem
+
+    monkeypatch.setenv("TRIGGER_MULTI_SYMBOL_ENABLED", "true")
+    assert MultiSymbolConfig().enabled is True
+
+    system = TradingSystem()
+    meetings = []
+
+    async def _healthy():
+        return True
+
+    async def _meeting(reason, symbol=None):
+        meetings.append((symbol, reason))
+        return None
+
+    monkeypatch.setattr(system, "_check_tavily_health", _healthy)
+    monkeypatch.setattr(system.cooldown_manager, "check_cooldown", lambda: True)
+    monkeypatch.setattr(system, "_run_trading_meeting", _meeting)
+
+    result = FastTriggerResult(
+        should_trigger=True,
+        conditions=[FastTriggerCondition("price_change_15m", 10.0, 2.0, "above", "high", "15m +10%")],
+        urgency="high",
+    )
+    await system._on_symbol_trigger("COIN3-USDT-SWAP", result)
+
+    assert meetings and meetings[0][0] == "COIN3-USDT-SWAP"
+
+
+@pytest.mark.asyncio
+async def test_standalone_fast_monitor_keeps_its_session_open_across_checks():
+    from app.core.trading.trigger.fast_monitor import FastMonitor
+
+    monitor = FastMonitor(symbol="BTC-USDT-SWAP")
+    sessions = []
+
+    async def fetch_all(session):
+        await asyncio.sleep(0.01)
+        sessions.append(session)
+        return {}
+
+    monitor._fetch_all_market_data = fetch_all
+    await asyncio.gather(monitor.check(), monitor.check())
+
+    # 合并的 OKX 请求可能跑在任一调用方的会话上: 会话归监控器所有，check 结束不关闭
+    assert sessions[0] is sessions[1] and not sessions[0].closed
+    await monitor.close()
+    assert sessions[0].closed
@@ -0,0 +1,191 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.trading.okx_client import OKXClient
+from app.core.trading.position_monitor import PositionMonitor, PositionMonitorConfig
+from app.core.trading.position_stream import LocalPositionStream
+from app.models.trading_models import AccountBalance, Position
+
+
+def _position(price: float, tp: float = 110.0, sl: float = 95.0, liq: float = 50.0) -> Position:
+    return Position(
+        symbol="BTC-USDT-SWAP",
+        direction="long",
+        size=0.1,
+        entry_price=100.0,
+        current_price=price,
+        leverage=5,
+        unrealized_pnl=(price - 100.0) * 0.1,
+        unrealized_pnl_percent=0.0,
+        take_profit_price=tp,
+        stop_loss_price=sl,
+        margin=2.0,
+        liquidation_price=liq,
+        opened_at=datetime.now(),
+    )
+
+
+def _balance(equity: float = 1000.0) -> AccountBalance:
+    return AccountBalance(
+        total_equity=equity,
+        available_balance=equity,
+        used_margin=0.0,
+        unrealized_pnl=0.0,
+        realized_pnl_today=0.0,
+    )
+
+
+class _SlowClient:
+    """REST stand-in where each endpoint takes 50ms"""
+
+    def __init__(self, position=None):
+        self.position = position
+        self.calls = []
+
+    async def get_current_position(self, symbol="BTC-USDT-SWAP"):
+        self.calls.append("position")
+        await asyncio.sleep(0.05)
+        return self.position
+
+    async def get_account_balance(self):
+        self.calls.append("balance")
+        await asyncio.sleep(0.05)
+        return _balance()
+
+
+@pytest.mark.asyncio
+async def test_rest_check_fetches_position_and_balance_concurrently():
+    client = _SlowClient(position=_position(100.0))
+    monitor = PositionMonitor(okx_client=client)
+
+    started = asyncio.get_running_loop().time()
+    await monitor._check_position()
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert sorted(client.calls) == ["balance", "position"]
+    assert elapsed < 0.09
+    assert monitor.state.has_position is True
+
+
+@pytest.mark.asyncio
+async def test_interval_shrinks_near_trigger_and_backs_off_when_flat():
+    config = PositionMonitorConfig(
+        check_interval_seconds=60,
+        min_check_interval_seconds=5,
+        near_trigger_percent=0.5,
+        max_idle_interval_seconds=240,
+    )
+    monitor = PositionMonitor(config=config)
+
+    await monitor._apply_position(_position(100.0, tp=120.0, sl=80.0), source="rest")
+    assert monitor._next_interval() == 60
+
+    await monitor._apply_position(_position(109.6), source="rest")  # ~0.36% from TP
+    assert monitor._next_interval() == 5
+
+    await monitor._apply_position(_position(108.0), source="rest")  # ~1.85% from TP
+    assert 5 < monitor._next_interval() < 60
+
+    await monitor._apply_position(None, source="rest")
+    assert [monitor._next_interval() for _ in range(4)] == [60, 120, 240, 240]
+
+
+@pytest.mark.asyncio
+async def test_stream_updates_drive_callbacks_and_state():
+    stream = LocalPositionStream()
+    calls = []
+
+    async def on_tp_hit(position, price):
+        calls.append(("tp_hit", price))
+
+    async def on_closed(position, pnl, reason):
+        calls.append(("closed", monitor.get_status()["last_source"]))
+
+    monitor = PositionMonitor(
+        config=PositionMonitorConfig(stream_reconcile_interval_seconds=3600),
+        stream=stream,
+        on_tp_hit=on_tp_hit,
+        on_position_closed=on_closed,
+    )
+    await monitor.start()
+    await asyncio.sleep(0.01)
+
+    await stream.push_position(_position(101.0))
+    await stream.push_balance(_balance(1010.0))
+    await asyncio.sleep(0.01)
+    assert monitor.get_status()["has_position"] is True
+    assert monitor.get_equity_chart_data()[-1]["equity"] == 1010.0
+
+    await stream.push_position(_position(111.0))
+    await stream.push_position(None)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert calls == [("tp_hit", 111.0), ("closed", "stream")]
+    assert monitor.get_status()["stream_update_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stream_and_rest_observations_fire_close_once():
+    closed = []
+
+    async def on_closed(position, pnl, reason):
+        await asyncio.sleep(0.01)  # 回调期间另一个来源的观测到达
+        closed.append(pnl)
+
+    monitor = PositionMonitor(on_position_closed=on_closed)
+    position = _position(101.0)
+    await asyncio.gather(
+        monitor._apply_position(position, source="stream"),
+        monitor._apply_position(position, source="rest"),
+    )
+    assert monitor.get_status()["has_position"] is True
+    await asyncio.gather(
+        monitor._apply_position(None, source="stream"),
+        monitor._apply_position(None, source="rest"),
+    )
+
+    assert monitor.get_status()["has_position"] is False
+    assert closed == [pytest.approx(0.1)]
+
+
+@pytest.mark.asyncio
+async def test_stream_disconnect_falls_back_to_polling():
+    stream = LocalPositionStream()
+    client = _SlowClient(position=_position(100.0))
+    monitor = PositionMonitor(
+        okx_client=client,
+        config=PositionMonitorConfig(stream_reconcile_interval_seconds=3600),
+        stream=stream,
+    )
+    await monitor.start()
+    await asyncio.sleep(0.15)
+    polls_before = monitor.state.check_count
+
+    await stream.disconnect()
+    await asyncio.sleep(0.15)
+    await monitor.stop()
+
+    assert monitor.state.check_count > polls_before
+
+
+def test_okx_ws_position_row_carries_attached_tp_sl():
+    from app.core.trading.position_stream import OKXPrivatePositionStream
+
+    client = OKXClient(api_key="k", secret_key="s", passphrase="p", demo_mode=True)
+    stream = OKXPrivatePositionStream(client, symbol="BTC-USDT-SWAP")
+    update = stream._parse_message({
+        "arg": {"channel": "positions", "instType": "SWAP"},
+        "data": [{
+            "instId": "BTC-USDT-SWAP", "posSide": "short", "pos": "5", "avgPx": "100",
+            "markPx": "98", "lever": "10", "upl": "1", "margin": "5", "liqPx": "150",
+            "uTime": "1", "closeOrderAlgo": [{"tpTriggerPx": "90", "slTriggerPx": "105"}],
+        }],
+    })
+
+    assert update.position.direction == "short"
+    assert update.position.size == pytest.approx(0.05)
+    assert update.position.take_profit_price == 90.0
+    assert update.position.stop_loss_price == 105.0
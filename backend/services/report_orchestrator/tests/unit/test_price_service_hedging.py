@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.trading.price_service import PriceService, PriceServiceError
+
+
+def _service(binance=None, okx=None, coingecko=None) -> PriceService:
+    service = PriceService()
+    calls = []
+
+    def _source(name, delay, price):
+        async def fetch(asset="BTC"):
+            calls.append(name)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                calls.append(f"{name}:cancelled")
+                raise
+            return price
+        return fetch
+
+    service._fetch_binance_price = _source("binance", *(binance or (0.01, None)))
+    service._fetch_okx_price = _source("okx", *(okx or (0.01, None)))
+    service._fetch_coingecko_price = _source("coingecko", *(coingecko or (0.01, None)))
+    service.calls = calls
+    return service
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    service = _service(binance=(2.0, 100.0), okx=(0.02, 101.0), coingecko=(2.0, 102.0))
+
+    started = time.monotonic()
+    price = await service.get_btc_price()
+    elapsed = time.monotonic() - started
+
+    assert price == 101.0
+    assert elapsed < 1.0
+    assert "binance:cancelled" in service.calls
+    # The winner is now tried first
+    assert service._ordered_sources("BTC", service.PRICE_SOURCES)[0] == "okx"
+
+
+@pytest.mark.asyncio
+async def test_failed_source_falls_through_immediately_and_callers_share_fetch():
+    service = _service(binance=(0.01, None), okx=(0.01, 99.0))
+
+    prices = await asyncio.gather(*(service.get_price("BTC-USDT-SWAP") for _ in range(10)))
+
+    assert prices == [99.0] * 10
+    assert service.calls.count("okx") == 1
+    assert await service.get_btc_price() == 99.0  # cache hit
+    assert service.calls.count("okx") == 1
+
+
+@pytest.mark.asyncio
+async def test_all_sources_failing_raises():
+    service = _service()
+    with pytest.raises(PriceServiceError):
+        await service.get_btc_price()
+
+
+@pytest.mark.asyncio
+async def test_history_is_cached_and_refreshed_incrementally():
+    service = PriceService()
+    hour_ms = 3_600_000
+    now = int(time.time() * 1000) // hour_ms * hour_ms
+    limits = []
+
+    async def binance_history(asset, interval, limit):
+        limits.append(limit)
+        return [(now - i * hour_ms, 100.0 + i) for i in reversed(range(limit))]
+
+    async def okx_history(asset, interval, limit):
+        return None
+
+    service._fetch_binance_history = binance_history
+    service._fetch_okx_history = okx_history
+
+    first = await service.get_price_history(hours=24)
+    again = await service.get_price_history(hours=12)
+    assert len(first) == 24 and len(again) == 12
+    assert limits == [24]
+
+    service._history[("BTC", "1h")].refreshed_at = 0
+    await service.get_price_history(hours=24)
+    assert limits == [24, 1]  # only the still-forming newest bar
+
+
+@pytest.mark.asyncio
+async def test_short_history_refresh_is_served_without_coingecko_fallback():
+    service = PriceService()
+    hour_ms = 3_600_000
+    now = int(time.time() * 1000) // hour_ms * hour_ms
+    coingecko = []
+
+    async def binance_history(asset, interval, limit):
+        return [(now - i * hour_ms, 10.0 + i) for i in reversed(range(6))]  # 新上市，只有 6 根
+
+    async def okx_history(asset, interval, limit):
+        return None
+
+    async def coingecko_history(asset, hours):
+        coingecko.append(hours)
+        return [{"timestamp": "x", "price": 1.0}]
+
+    service._fetch_binance_history = binance_history
+    service._fetch_okx_history = okx_history
+    service._fetch_coingecko_history = coingecko_history
+
+    history = await service.get_price_history(hours=24, symbol="NEW")
+    assert [point["price"] for point in history] == [15.0, 14.0, 13.0, 12.0, 11.0, 10.0]
+    assert coingecko == []
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_tries_coingecko_before_serving_stale_history():
+    service = PriceService()
+    hour_ms = 3_600_000
+    now = int(time.time() * 1000) // hour_ms * hour_ms
+    candles_up = True
+    coingecko = []
+
+    async def binance_history(asset, interval, limit):
+        if not candles_up:
+            return None
+        return [(now - i * hour_ms, 100.0 + i) for i in reversed(range(limit))]
+
+    async def okx_history(asset, interval, limit):
+        return None
+
+    async def coingecko_history(asset, hours):
+        coingecko.append(hours)
+        return [{"timestamp": "fresh", "price": 1.0}] if len(coingecko) == 1 else None
+
+    service._fetch_binance_history = binance_history
+    service._fetch_okx_history = okx_history
+    service._fetch_coingecko_history = coingecko_history
+
+    await service.get_price_history(hours=24)
+    service._history[("BTC", "1h")].refreshed_at = 0
+    candles_up = False
+
+    assert await service.get_price_history(hours=24) == [{"timestamp": "fresh", "price": 1.0}]
+    stale = await service.get_price_history(hours=24)  # every source down: cached bars
+    assert len(stale) == 24 and coingecko == [24, 24]
@@ -0,0 +1,115 @@
+from app.core import prompt_assembly
+from app.core.prompt_assembly import TRIM_MARKER, ContextSection, compile_template, estimate_tokens, fit_sections
+from app.core.roundtable import rewoo_agent
+from app.core.roundtable.rewoo_agent import ReWOOAgent
+from app.core.roundtable.tool import FunctionTool
+
+
+def test_fit_sections_grants_by_priority_and_keeps_latest_history():
+    history = [f"- [User] message number {i} " + "x" * 80 for i in range(40)]
+    skills = "skill card " * 40
+    memory = "\n".join(f"memory hit {i} " + "y" * 60 for i in range(30))
+
+    assembled = fit_sections(
+        [
+            ContextSection("history", items=history, priority=4, keep="tail", min_tokens=150),
+            ContextSection("skills", text=skills, priority=1, stable=True),
+            ContextSection("memory", text=memory, priority=3),
+            ContextSection("empty", text=""),
+        ],
+        budget_tokens=600,
+    )
+
+    assert assembled.order == ["skills", "history", "memory"]  # stable 段在前，空段被跳过
+    assert assembled.texts["skills"] == skills.strip("\n")
+    assert assembled.stats["skills"]["dropped_tokens"] == 0
+    # 历史保留尾部最新消息，标记在头部
+    history_text = assembled.texts["history"]
+    assert history_text.startswith(TRIM_MARKER) and history_text.endswith(history[-1])
+    assert "message number 0 " not in history_text
+    assert assembled.stats["history"]["tokens"] <= 150
+    # 记忆从尾部裁剪，保留排名靠前的条目
+    assert assembled.texts["memory"].startswith("memory hit 0 ")
+    assert assembled.texts["memory"].endswith(TRIM_MARKER)
+    assert assembled.truncated == ["history", "memory"]
+    assert assembled.total_tokens <= 600
+    assert estimate_tokens("中文") == 2 and estimate_tokens("abcd") == 1
+
+
+def test_compiled_template_and_rewoo_system_prompts_are_cached_and_stable():
+    template = compile_template("Hello {name}, {{literal}} {name}!")
+    assert template is compile_template("Hello {name}, {{literal}} {name}!")
+    assert template.fields == ("name",)
+    assert template.render(name="Ann") == "Hello {name}, {{literal}} {name}!".format(name="Ann")
+
+    agent = ReWOOAgent(name="Analyst", role_prompt="You analyse markets.")
+    agent.register_tool(FunctionTool("quote", "price quote", lambda symbol="": symbol))
+    first = agent._create_planning_prompt()
+    assert agent._create_planning_prompt() is first
+    assert "**quote**" in first and "You analyse markets." in first
+
+    # 工具变化时缓存失效
+    agent.register_tool(FunctionTool("news", "news search", lambda query="": query))
+    assert "**news**" in agent._create_planning_prompt()
+    assert agent._create_solving_prompt() is agent._create_solving_prompt()
+
+
+def test_rewoo_context_is_trimmed_to_budget_and_section_metrics_recorded(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(prompt_assembly, "record_llm_context_usage", lambda **kw: recorded.append(kw))
+    monkeypatch.setattr(rewoo_agent, "REWOO_CONTEXT_TOKEN_BUDGET", 1200)
+
+    agent = ReWOOAgent(name="Analyst", role_prompt="You analyse markets.")
+    history = [{"role": "user", "content": f"turn {i} " + "z" * 200} for i in range(60)]
+    text = agent._format_context({
+        "symbol": "NVDA",
+        "memory_context": "hit " * 50,
+        "conversation_history": history,
+    })
+
+    assert text.startswith("- **symbol**: NVDA")
+    assert "turn 59 " in text and '"turn 0 ' not in text
+    assert estimate_tokens(text) <= 1300
+    [usage] = recorded
+    assert usage["source"] == "rewoo_agent"
+    assert set(usage["section_tokens"]) == {"symbol", "memory_context", "conversation_history"}
+    assert usage["truncated_sections"] == ["conversation_history"]
+    assert agent._format_context({}) == "None"
+
+
+def test_rewoo_solving_query_fits_observations_and_context_in_one_budget(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(prompt_assembly, "record_llm_context_usage", lambda **kw: recorded.append(kw))
+    monkeypatch.setattr(rewoo_agent, "REWOO_CONTEXT_TOKEN_BUDGET", 2000)
+
+    agent = ReWOOAgent(name="Analyst", role_prompt="You analyse markets.")
+    plan = [{"tool": "search", "params": {"q": i}, "purpose": f"step {i}"} for i in range(12)]
+    observations = [{"success": True, "summary": f"finding {i} " + "w" * 1900} for i in range(12)]
+    history = [{"role": "user", "content": f"turn {i} " + "z" * 200} for i in range(30)]
+
+    text = agent._format_solving_query("Analyse NVDA", {"conversation_history": history}, plan, observations)
+
+    # 工具结果按步骤整条裁剪，保留靠前的步骤
+    assert "## Step 1: search" in text and "## Step 12: search" not in text
+    assert TRIM_MARKER in text and "turn 29 " in text
+    assert estimate_tokens(text) <= 2300
+    [usage] = recorded
+    assert set(usage["section_tokens"]) == {"conversation_history", "observations"}
+
+
+def test_expert_chat_evidence_keeps_latest_items():
+    from app import main
+
+    evidence = "\n".join(f"- evidence {i} " + "e" * 400 for i in range(200))
+    prompt = main._build_agent_task_prompt(
+        agent_id="financial_expert",
+        user_message="latest?",
+        history=[],
+        language="en",
+        knowledge_enabled=False,
+        knowledge_category="",
+        attachment_summary="",
+        attachment_context="",
+        shared_evidence_context=evidence,
+    )
+    assert "evidence 199 " in prompt and "evidence 0 " not in prompt
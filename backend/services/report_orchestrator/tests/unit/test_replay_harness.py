@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.replay import Cassette, LatencyModel, ReplayHarness, ReplayMissError
+from app.core.roundtable.llm_streaming import iter_sse_content
+from app.core.roundtable.tool import FunctionTool, Tool
+
+GATEWAY = "http://llm_gateway:8003"
+
+
+class _QuoteTool(Tool):
+    def __init__(self):
+        super().__init__("quote", "quotes")
+        self.calls = 0
+
+    async def execute(self, **kwargs):
+        self.calls += 1
+        return {"success": True, "summary": f"{kwargs['symbol']} live quote"}
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    """代替真实网络的 Gateway: record 模式下被 harness 当作原始传输层调用"""
+    seen = []
+
+    async def handle_async_request(transport, request):
+        await request.aread()
+        seen.append(request.url.path)
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"content": f"live answer to {body['history'][0]['parts'][0]}"})
+
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request)
+    return seen
+
+
+async def _chat(prompt: str) -> str:
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{GATEWAY}/chat", json={"history": [{"role": "user", "parts": [prompt]}]})
+        return response.json()["content"]
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_offline_with_masked_numbers(fake_network, tmp_path):
+    tool = _QuoteTool()
+    async with ReplayHarness(mode="record") as recorder:
+        assert await _chat("BTC price 65000, analyse") == "live answer to BTC price 65000, analyse"
+        assert (await tool.execute(symbol="BTC"))["summary"] == "BTC live quote"
+    path = tmp_path / "meeting.jsonl"
+    recorder.cassette.save(str(path))
+    assert recorder.get_stats()["recorded"] == 2
+
+    cassette = Cassette.load(str(path))
+    async with ReplayHarness(mode="replay", cassette=cassette, llm_latency="none", tool_latency="none") as harness:
+        # 价格变了，掩码数字后仍精确命中
+        assert await _chat("BTC price 66120.5, analyse") == "live answer to BTC price 65000, analyse"
+        assert (await tool.execute(symbol="BTC"))["summary"] == "BTC live quote"
+        with pytest.raises(ReplayMissError):
+            await _chat("another question")
+
+    assert fake_network == ["/chat"]  # 回放期间没有访问网络
+    assert tool.calls == 1
+    stats = harness.get_stats()
+    assert (stats["llm_calls"], stats["tool_calls"], stats["exact_hits"], stats["misses"]) == (2, 1, 2, 1)
+    # 退出后恢复原始 execute
+    assert _QuoteTool.execute.__name__ == "execute" and not hasattr(_QuoteTool.execute, "__wrapped__")
+
+
+@pytest.mark.asyncio
+async def test_synthetic_mode_streams_blocks_network_and_runs_side_effect_tools():
+    ended = []
+    end_meeting = FunctionTool("end_meeting", "end", lambda reason="": ended.append(reason) or "ok")
+
+    def responder(kind, name, payload):
+        if kind == "llm":
+            return "x" * 150 if name == "/chat/stream" else "plain"
+        return None
+
+    async with ReplayHarness(mode="synthetic", responder=responder, llm_latency="none") as harness:
+        async with httpx.AsyncClient() as client:
+            async with client.stream("POST", f"{GATEWAY}/chat/stream", json={"history": []}) as response:
+                chunks = [chunk async for chunk in iter_sse_content(response)]
+            blocked = await client.get("https://api.binance.com/api/v3/ticker/price", params={"symbol": "BTCUSDT"})
+        await end_meeting.execute(reason="done")
+
+    assert "".join(chunks) == "x" * 150 and len(chunks) == 3
+    assert blocked.status_code == 503
+    assert ended == ["done"]
+    stats = harness.get_stats()
+    assert (stats["live_tools"], stats["blocked_requests"], stats["synthesized"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_latency_models_are_seeded_and_late_tool_classes_are_intercepted():
+    first = [LatencyModel("lognormal:800,0.5", seed=3).sample_ms() for _ in range(2)]
+    model = LatencyModel("lognormal:800,0.5", seed=3)
+    assert [model.sample_ms(), LatencyModel("lognormal:800,0.5", seed=3).sample_ms()] == [first[0], first[0]]
+    assert LatencyModel("recorded:0.5").sample_ms(200) == 100
+    with pytest.raises(ValueError):
+        LatencyModel("gamma:1")
+
+    async with ReplayHarness(mode="synthetic", tool_latency="fixed:20") as harness:
+        class _LateTool(Tool):
+            async def execute(self, **kwargs):
+                raise AssertionError("should be synthesized")
+
+        started = asyncio.get_running_loop().time()
+        result = await _LateTool("late", "defined while harness is active").execute(q=1)
+        assert asyncio.get_running_loop().time() - started >= 0.019
+    assert result["success"] is True
+    assert harness.get_stats()["simulated_wait_s"] == pytest.approx(0.02)
+    with pytest.raises(AssertionError):
+        await _LateTool("late", "harness inactive").execute()
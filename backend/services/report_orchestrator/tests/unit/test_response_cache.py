@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from app.middleware.caching import CacheEntry, CachingMiddleware, ResponseCache
+
+
+def _build_app(cache: ResponseCache):
+    app = FastAPI()
+    calls = {"reports": 0}
+
+    @app.get("/api/reports")
+    async def reports():
+        calls["reports"] += 1
+        await asyncio.sleep(0.02)
+        return {"reports": [1, 2, 3]}
+
+    @app.get("/api/other")
+    async def other():
+        return {"ok": True}
+
+    app.add_middleware(CachingMiddleware, cache=cache)
+    return app, calls
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_lru_eviction_and_expiry():
+    cache = ResponseCache(max_size=2)
+    cache.set("a", CacheEntry(b"a", {}, 200, ttl=60))
+    cache.set("b", CacheEntry(b"b", {}, 200, ttl=60))
+    assert cache.get("a") is not None  # a 变为最近使用
+
+    cache.set("c", CacheEntry(b"c", {}, 200, ttl=60))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.set("old", CacheEntry(b"x", {}, 200, ttl=1, created_at=0))
+    assert cache.stats()["size"] == 2
+    assert cache.get("old") is None
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_returns_304_without_body():
+    app, calls = _build_app(ResponseCache())
+    async with _client(app) as client:
+        first = await client.get("/api/reports")
+        assert first.headers["x-cache"] == "MISS"
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and first.json() == {"reports": [1, 2, 3]}
+
+        revalidated = await client.get("/api/reports", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+
+        changed = await client.get("/api/reports", headers={"If-None-Match": '"stale"'})
+        assert changed.status_code == 200 and changed.headers["x-cache"] == "HIT"
+
+        untouched = await client.get("/api/other")
+        assert "x-cache" not in untouched.headers and "etag" not in untouched.headers
+    assert calls["reports"] == 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_etag_is_kept_and_revalidated():
+    app = FastAPI()
+
+    @app.get("/api/workflows")
+    async def workflows():
+        return Response(content=b'{"workflows": []}', media_type="application/json", headers={"ETag": '"v42"'})
+
+    app.add_middleware(CachingMiddleware, cache=ResponseCache())
+    async with _client(app) as client:
+        first = await client.get("/api/workflows")
+        assert first.headers["etag"] == '"v42"'
+        assert first.headers.get_list("etag") == ['"v42"']
+
+        revalidated = await client.get("/api/workflows", headers={"If-None-Match": '"v42"'})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["x-cache"] == "HIT"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_upstream_call():
+    cache = ResponseCache()
+    app, calls = _build_app(cache)
+    async with _client(app) as client:
+        responses = await asyncio.gather(*(client.get("/api/reports") for _ in range(10)))
+
+    assert calls["reports"] == 1
+    assert {r.json()["reports"][0] for r in responses} == {1}
+    assert len({r.headers["etag"] for r in responses}) == 1
+    assert cache.counters["coalesced"] == 9
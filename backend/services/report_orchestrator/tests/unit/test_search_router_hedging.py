@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.core.roundtable.search_router import SearchRouter
+from app.core.roundtable.search_routing import SearchRoutingEngine
+
+
+class _NoopCache:
+    async def get(self, query, priority, search_params=None):
+        return None
+
+    async def set(self, query, priority, result, search_params=None):
+        return True
+
+
+def _router(**engine_kwargs) -> SearchRouter:
+    router = SearchRouter()
+    router._cache = _NoopCache()
+    router.routing = SearchRoutingEngine(
+        daily_quotas=engine_kwargs.pop("daily_quotas", {}), **engine_kwargs
+    )
+    return router
+
+
+def _ok(source):
+    return {"success": True, "results": [{"title": source, "url": "", "content": source}]}
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled(monkeypatch):
+    router = _router(default_hedge_ms=50, min_hedge_ms=10, hedge_budget_ratio=1.0)
+    cancelled = {"ddg": False}
+
+    async def _slow_ddg(query, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled["ddg"] = True
+            raise
+        return _ok("ddg")
+
+    async def _fast_serper(query, **kwargs):
+        return _ok("serper")
+
+    monkeypatch.setattr(router, "_search_with_ddg", _slow_ddg)
+    monkeypatch.setattr(router, "_search_with_serper", _fast_serper)
+
+    result = await asyncio.wait_for(router.search("slow query", priority="normal"), timeout=2)
+    await asyncio.sleep(0)
+
+    assert result["routed_source"] == "serper_fallback"
+    assert result["hedged"] is True
+    assert cancelled["ddg"] is True
+    stats = router.get_routing_stats()
+    assert stats["hedged"] == 1
+    assert stats["providers"]["serper"]["wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_request(monkeypatch):
+    router = _router()
+    calls = {"ddg": 0}
+
+    async def _fake_ddg(query, **kwargs):
+        calls["ddg"] += 1
+        await asyncio.sleep(0.05)
+        return _ok("ddg")
+
+    monkeypatch.setattr(router, "_search_with_ddg", _fake_ddg)
+
+    results = await asyncio.gather(*(
+        router.search("BTC ETF flows", priority="normal", topic="news") for _ in range(5)
+    ))
+
+    assert calls["ddg"] == 1
+    assert all(r["success"] and r["routed_source"] == "duckduckgo" for r in results)
+    # 每个调用方拿到独立的 dict
+    results[0]["mutated"] = True
+    assert "mutated" not in results[1]
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_skips_provider(monkeypatch):
+    router = _router(daily_quotas={"serper": 1})
+    calls = {"serper": 0, "tavily": 0}
+
+    async def _fake_serper(query, **kwargs):
+        calls["serper"] += 1
+        return _ok("serper")
+
+    async def _fake_tavily(query, **kwargs):
+        calls["tavily"] += 1
+        return _ok("tavily")
+
+    monkeypatch.setattr(router, "_search_with_serper", _fake_serper)
+    monkeypatch.setattr(router, "_search_with_tavily", _fake_tavily)
+
+    first = await router.search("query one", priority="critical")
+    second = await router.search("query two", priority="critical")
+
+    assert first["routed_source"] == "serper"
+    assert second["routed_source"] == "tavily_fallback"
+    assert calls == {"serper": 1, "tavily": 1}
+    assert router.get_routing_stats()["providers"]["serper"]["remaining_quota"] == 0
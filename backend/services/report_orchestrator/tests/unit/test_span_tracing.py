@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.observability import tracing
+from app.core.observability.tracing import (
+    OTLPFileExporter,
+    RingBufferExporter,
+    Tracer,
+    critical_path,
+    folded_stacks,
+    format_traceparent,
+    parse_traceparent,
+    start_span,
+    traced,
+)
+from app.messaging.codec import decode_value, encode_key, encode_value
+from app.messaging.kafka_client import KafkaClient
+from app.messaging.messages import SessionEvent
+from app.messaging.topics import MagellanTopics
+from tests.mocks.memory_kafka import InMemoryBroker, InMemoryConsumer, InMemoryProducer
+
+
+@pytest.fixture
+def span_buffer():
+    buffer = RingBufferExporter()
+    tracing.set_tracer(Tracer(exporters=[buffer]))
+    yield buffer
+    tracing.set_tracer(None)
+
+
+@pytest.mark.asyncio
+async def test_nested_spans_across_gather_and_critical_path(span_buffer):
+    @traced("tool.call", attributes=lambda name, delay: {"tool": name})
+    async def call_tool(name, delay):
+        await asyncio.sleep(delay)
+
+    async def agent_turn(agent, delay):
+        async with start_span("agent.turn", agent=agent):
+            await call_tool(f"{agent}_search", delay)
+
+    async with start_span("trading_meeting", meeting_id="m-1") as root:
+        async with start_span("meeting.phase", phase="analysis"):
+            await asyncio.gather(agent_turn("fast", 0.01), agent_turn("slow", 0.05))
+
+    spans = span_buffer.get_trace(root.trace_id)
+    assert len(spans) == 6
+    by_id = {s.span_id: s for s in spans}
+    for span in spans:
+        if span.name == "agent.turn":
+            assert by_id[span.parent_id].name == "meeting.phase"
+        if span.name == "tool.call":
+            parent = by_id[span.parent_id]
+            assert parent.name == "agent.turn"
+            assert span.attributes["tool"].startswith(parent.attributes["agent"])
+
+    path = critical_path(spans)
+    assert [p["name"] for p in path] == ["trading_meeting", "meeting.phase", "agent.turn", "tool.call"]
+    assert path[2]["attributes"]["agent"] == "slow"
+    assert any(line.startswith("trading_meeting;meeting.phase[analysis];agent.turn[slow];tool.call[slow_search] ")
+               for line in folded_stacks(spans))
+    assert span_buffer.find_traces(meeting_id="m-1") == [root.trace_id]
+
+
+@pytest.mark.asyncio
+async def test_traceparent_propagates_through_kafka_headers(span_buffer, monkeypatch):
+    with start_span("outer") as outer:
+        header = format_traceparent()
+    context = parse_traceparent(header)
+    assert (context.trace_id, context.span_id, context.sampled) == (outer.trace_id, outer.span_id, True)
+    assert parse_traceparent("00-bad-trace-01") is None
+
+    broker = InMemoryBroker(partitions=1)
+    client = KafkaClient()
+    monkeypatch.setattr(client, "_producer", InMemoryProducer(broker, value_serializer=encode_value, key_serializer=encode_key))
+    handled = []
+
+    async def handler(value):
+        handled.append((value["progress"], tracing.current_span_context().trace_id))
+
+    client._message_handlers[MagellanTopics.SESSION_EVENTS.value] = [handler]
+
+    async with start_span("publish") as publish:
+        event = SessionEvent(source="test", destination="ws", session_id="s1", event_type="progress", progress=1)
+        assert await client.send(MagellanTopics.SESSION_EVENTS, event) is True
+
+    consumer = InMemoryConsumer(broker, MagellanTopics.SESSION_EVENTS.value, value_deserializer=decode_value)
+    for records in (await consumer.getmany()).values():
+        for record in records:
+            await client._dispatch(MagellanTopics.SESSION_EVENTS.value, record)
+
+    assert handled == [(1, publish.trace_id)]
+    consume = next(s for s in span_buffer.get_trace(publish.trace_id) if s.name == "kafka.consume")
+    assert consume.kind == "consumer"
+    assert consume.parent_id == publish.span_id
+
+
+@pytest.mark.asyncio
+async def test_unsampled_traces_export_nothing_and_otlp_file_output(tmp_path):
+    buffer = RingBufferExporter()
+    tracer = Tracer(sample_rate=0.0, exporters=[buffer])
+    with tracer.start_span("root"):
+        with tracer.start_span("child"):
+            pass
+    assert tracer.get_stats()["exported"] == 0
+    assert buffer.recent_roots() == []
+
+    path = tmp_path / "spans.jsonl"
+    exporter = OTLPFileExporter(str(path))
+    tracer = Tracer(exporters=[exporter])
+    with tracer.start_span("llm.call", kind="client", provider="gemini") as span:
+        span.set_attribute("tokens", 12)
+    exporter.shutdown()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    otlp_spans = [s for line in lines for rs in line["resourceSpans"] for ss in rs["scopeSpans"] for s in ss["spans"]]
+    assert len(otlp_spans) == 1
+    assert otlp_spans[0]["traceId"] == span.trace_id
+    assert otlp_spans[0]["kind"] == 3
+    attrs = {a["key"]: a["value"] for a in otlp_spans[0]["attributes"]}
+    assert attrs["provider"] == {"stringValue": "gemini"}
+    assert attrs["tokens"] == {"intValue": "12"}
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import app.core.trading as trading
+from app.core.roundtable import yahoo_finance_tool as yft
+
+SERVICE_DIR = Path(__file__).resolve().parents[2]
+# 这些依赖只应在首次使用时加载 (图表、向量库、交易会议编排、技术指标)
+HEAVY_MODULES = [
+    "matplotlib", "seaborn", "scipy", "qdrant_client", "google.genai",
+    "langgraph", "pandas", "yfinance",
+    "app.exporters.chart_generator", "app.core.trading.trading_meeting", "app.core.trading.trading_tools",
+]
+
+
+def test_importing_app_main_does_not_load_heavy_subsystems():
+    env = {k: v for k, v in os.environ.items() if k != "GOOGLE_API_KEY"}
+    code = (
+        "import json, sys\n"
+        "import app.main\n"
+        f"print('LOADED', json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(SERVICE_DIR), env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    [line] = [l for l in proc.stdout.splitlines() if l.startswith("LOADED ")]
+    assert json.loads(line[len("LOADED "):]) == []
+
+
+def test_trading_package_exports_resolve_lazily():
+    assert set(trading.__all__) == set(trading._LAZY_EXPORTS)
+    assert "TradingMeetingConfig" not in dir(trading)
+    assert "TradingMeeting" in dir(trading)
+
+    from app.core.trading.decision_store import get_decision_store
+
+    assert trading.get_decision_store is get_decision_store
+    assert trading.__dict__["get_decision_store"] is get_decision_store  # 解析后缓存到模块命名空间
+    with pytest.raises(AttributeError):
+        trading.NotAnExport
+
+
+@pytest.mark.asyncio
+async def test_yfinance_is_imported_on_first_use_and_missing_dependency_degrades(monkeypatch):
+    monkeypatch.setattr(yft, "yf", None)
+    monkeypatch.setattr(yft, "_yf_import_attempted", False)
+    monkeypatch.setitem(sys.modules, "yfinance", None)  # 模拟未安装
+
+    tool = yft.YahooFinanceTool()
+    result = await tool.execute(action="price", symbol="MISSING-DEP")
+    assert result["success"] is False
+    assert "yfinance" in result["error"]
+    assert yft._yf_import_attempted is True
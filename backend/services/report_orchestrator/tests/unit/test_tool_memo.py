@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.core.roundtable.meeting import Meeting
+from app.core.roundtable.rewoo_agent import ReWOOAgent
+from app.core.roundtable.tool import FunctionTool, Tool
+from app.core.roundtable.tool_memo import ToolResultMemo, canonical_call_key
+
+
+class _SlowQuoteTool(Tool):
+    def __init__(self):
+        super().__init__("yahoo_finance", "quotes")
+        self.calls = []
+
+    async def execute(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(0.05)
+        return {"success": True, "summary": f"{kwargs['symbol']} quote"}
+
+
+def _agent(name, tools):
+    agent = ReWOOAgent(name=name, role_prompt="analyst")
+    for tool in tools:
+        agent.register_tool(tool)
+    return agent
+
+
+def test_canonical_key_ignores_param_order_and_none_values():
+    assert canonical_call_key("t", {"a": 1, "b": "x"}) == canonical_call_key("t", {"b": "x", "a": 1, "c": None})
+    assert canonical_call_key("t", {"a": 1}) != canonical_call_key("u", {"a": 1})
+
+
+@pytest.mark.asyncio
+async def test_agents_in_one_meeting_share_overlapping_tool_calls():
+    quotes = _SlowQuoteTool()
+    agents = [_agent(name, [quotes]) for name in ("MarketAnalyst", "FinancialExpert", "RiskAssessor")]
+    meeting = Meeting(agents=agents)
+
+    plan = [
+        {"tool": "yahoo_finance", "params": {"action": "price", "symbol": "NVDA"}},
+        {"tool": "yahoo_finance", "params": {"symbol": "NVDA", "action": "price"}},
+    ]
+    results = await asyncio.gather(*(agent._execute_phase(plan) for agent in agents))
+
+    assert len(quotes.calls) == 1
+    assert all(obs["summary"] == "NVDA quote" for agent_obs in results for obs in agent_obs)
+    stats = meeting.tool_memo.get_stats()
+    assert stats["executed"] == 1
+    assert stats["shared_inflight"] == 5
+    assert stats["by_agent"]["MarketAnalyst"] == {"executed": 1, "reused": 1}
+
+    # 完成后的调用直接复用
+    await agents[0]._execute_phase(plan[:1])
+    assert len(quotes.calls) == 1
+    assert meeting.tool_memo.get_stats()["reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_and_function_tools_are_not_reused():
+    memo = ToolResultMemo()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        return {"success": len(attempts) > 1, "error": None if len(attempts) > 1 else "boom"}
+
+    assert (await memo.get_or_execute("search", {"q": "x"}, flaky))["success"] is False
+    assert (await memo.get_or_execute("search", {"q": "x"}, flaky))["success"] is True
+    assert (await memo.get_or_execute("search", {"q": "x"}, flaky))["success"] is True
+    assert len(attempts) == 2
+
+    orders = []
+    open_long = FunctionTool("open_long", "open", lambda **kw: orders.append(kw) or {"success": True})
+    agent = _agent("Trader", [open_long])
+    agent.tool_memo = memo
+    plan = [{"tool": "open_long", "params": {"size": 1}}]
+    await agent._execute_phase(plan)
+    await agent._execute_phase(plan)
+    assert len(orders) == 2
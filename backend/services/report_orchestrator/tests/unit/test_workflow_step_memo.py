@@ -0,0 +1,160 @@
+import pytest
+
+from app.core.orchestrators.base_orchestrator import BaseOrchestrator
+from app.core.agent_registry import registry
+from app.core.orchestrators.step_memo import StepMemo, step_memo_enabled, uses_live_data
+from app.core.session_store import SessionStore
+from app.models.analysis_models import AnalysisRequest, InvestmentScenario, WorkflowStep, WorkflowStepTemplate
+from tests.mocks.fake_redis_streams import FakeRedisStreams
+
+
+class _DummyOrchestrator(BaseOrchestrator):
+    async def _validate_target(self) -> bool:  # pragma: no cover - not used in this unit test
+        return True
+
+    async def _synthesize_final_report(self):  # pragma: no cover - not used in this unit test
+        return {}
+
+
+class _Registry:
+    def get_agent_config(self, agent_id):
+        return {"agent_id": agent_id, "model": "m1"}
+
+
+def _build(store: SessionStore, target, executed, fail_on=None, parse_version=None, as_of="t0", team_sources=()):
+    orch = _DummyOrchestrator.__new__(_DummyOrchestrator)
+    orch.session_id = "s1"
+    orch.websocket = None
+    orch.event_callback = None
+    orch.registry = _Registry()
+    orch.scenario = InvestmentScenario.EARLY_STAGE
+    orch.request = AnalysisRequest(project_name="p", scenario=InvestmentScenario.EARLY_STAGE, target=target)
+    orch.step_memo = StepMemo(store, scope="u1", as_of=as_of)
+    orch.results = {}
+    orch.workflow_templates = [
+        WorkflowStepTemplate(id="bp", name="BP", agent="bp_parser", input_keys=["bp_file_id"], data_sources=["bp_file"]),
+        WorkflowStepTemplate(
+            id="team", name="Team", agent="team_evaluator", inputs=["bp"], input_keys=["company"],
+            data_sources=None if team_sources is None else list(team_sources),
+        ),
+        WorkflowStepTemplate(
+            id="report", name="Report", agent="report_synthesizer", inputs=["all_previous"], input_keys=[],
+            data_sources=[],
+        ),
+    ]
+    orch.workflow = [WorkflowStep(id=t.id, name=t.name, agent=t.agent) for t in orch.workflow_templates]
+
+    async def _fake_execute(step):
+        executed.append(step.id)
+        if step.id == fail_on:
+            step.status = "error"
+            raise RuntimeError("crash")
+        if step.id == "bp":
+            result = {"revenue": 100 if parse_version is None else parse_version}
+        elif step.id == "team":
+            result = {"company": target.get("company"), "seen": sorted(orch.results)}
+        else:
+            result = {"seen": sorted(orch.results)}
+        step.status = "success"
+        step.result = result
+        orch.results[step.id] = result
+
+    orch._execute_step = _fake_execute  # type: ignore[attr-defined]
+    return orch
+
+
+def _store() -> SessionStore:
+    store = SessionStore.__new__(SessionStore)
+    store.redis_client = FakeRedisStreams()
+    return store
+
+
+@pytest.mark.asyncio
+async def test_unchanged_inputs_reuse_every_step_and_edits_rerun_only_downstream():
+    store = _store()
+    first = []
+    await BaseOrchestrator._execute_workflow_dag(_build(store, {"bp_file_id": "f1", "company": "A"}, first))
+    assert first == ["bp", "team", "report"]
+
+    again = []
+    orch = _build(store, {"bp_file_id": "f1", "company": "A"}, again)
+    await BaseOrchestrator._execute_workflow_dag(orch)
+    assert again == []
+    assert all(s.status == "success" for s in orch.workflow)
+    assert orch.step_memo.get_stats()["reused_steps"] == ["bp", "team", "report"]
+
+    # 只改 team 读取的字段: bp 复用，team 和依赖它的 report 重跑
+    edited = []
+    await BaseOrchestrator._execute_workflow_dag(_build(store, {"bp_file_id": "f1", "company": "B"}, edited))
+    assert edited == ["team", "report"]
+
+
+@pytest.mark.asyncio
+async def test_new_upload_with_identical_parse_stops_the_cascade():
+    store = _store()
+    await BaseOrchestrator._execute_workflow_dag(_build(store, {"bp_file_id": "f1", "company": "A"}, []))
+
+    executed = []
+    await BaseOrchestrator._execute_workflow_dag(_build(store, {"bp_file_id": "f2", "company": "A"}, executed))
+    assert executed == ["bp"]  # 解析结果不变，下游直接复用
+
+    executed = []
+    await BaseOrchestrator._execute_workflow_dag(
+        _build(store, {"bp_file_id": "f3", "company": "A"}, executed, parse_version=200)
+    )
+    assert executed == ["bp", "team", "report"]
+
+
+@pytest.mark.asyncio
+async def test_rerun_after_crash_resumes_from_last_completed_step():
+    store = _store()
+    crashed = []
+    with pytest.raises(RuntimeError):
+        await BaseOrchestrator._execute_workflow_dag(
+            _build(store, {"bp_file_id": "f1", "company": "A"}, crashed, fail_on="report")
+        )
+    assert crashed == ["bp", "team", "report"]
+
+    resumed = []
+    orch = _build(store, {"bp_file_id": "f1", "company": "A"}, resumed)
+    await BaseOrchestrator._execute_workflow_dag(orch)
+    assert resumed == ["report"]
+    assert orch.results["report"] == {"seen": ["bp", "team"]}
+
+
+@pytest.mark.asyncio
+async def test_memo_is_opt_in_and_skips_live_data_steps_and_stale_time_buckets(monkeypatch):
+    monkeypatch.delenv("WORKFLOW_STEP_MEMO_ENABLED", raising=False)
+    assert step_memo_enabled() is False
+    assert StepMemo(_store(), scope="u1").ttl_hours == 1
+
+    store = _store()
+    target = {"bp_file_id": "f1", "company": "A"}
+    await BaseOrchestrator._execute_workflow_dag(_build(store, target, [], team_sources=["web_search"]))
+
+    # 使用实时数据源的步骤每次都重跑
+    executed = []
+    await BaseOrchestrator._execute_workflow_dag(_build(store, target, executed, team_sources=["web_search"]))
+    assert executed == ["team"]
+
+    # 未声明数据源的步骤同样不复用
+    executed = []
+    await BaseOrchestrator._execute_workflow_dag(_build(store, target, executed, team_sources=None))
+    assert executed == ["team"]
+
+    # 进入下一个时间桶后全部重跑
+    executed = []
+    await BaseOrchestrator._execute_workflow_dag(_build(store, target, executed, as_of="t1"))
+    assert executed == ["bp", "team", "report"]
+
+
+def test_shipped_workflows_declare_memo_inputs_and_live_data_sources():
+    orch = _DummyOrchestrator.__new__(_DummyOrchestrator)
+    orch.registry = registry
+    templates = orch._load_workflow_from_registry("early-stage-investment", "quick")
+
+    assert all(t.data_sources is not None for t in templates)
+    [bp] = [t for t in templates if t.agent == "bp_parser"]
+    assert not uses_live_data(bp.data_sources) and "bp_file_id" in bp.input_keys
+    # 检索/行情类 Agent 的步骤会被识别为实时数据，不复用
+    assert all(uses_live_data(t.data_sources) for t in templates if t.agent not in ("bp_parser", "report_synthesizer"))
@@ -0,0 +1,91 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from app.core.roundtable import yahoo_finance_tool as yft
+from app.core.roundtable.yahoo_finance_tool import YahooFinanceTool
+
+
+def _frame(closes):
+    index = pd.date_range("2026-01-01", periods=len(closes), freq="D")
+    return pd.DataFrame(
+        {"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": [1000] * len(closes)},
+        index=index,
+    )
+
+
+class _FakeTicker:
+    info_calls = 0
+    threads = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    @property
+    def info(self):
+        _FakeTicker.info_calls += 1
+        _FakeTicker.threads.append(threading.current_thread().name)
+        return {
+            "currentPrice": 110.0,
+            "previousClose": 100.0,
+            "marketCap": 1_000_000,
+            "trailingPE": 20.0,
+            "enterpriseValue": 0,
+            "ebitda": 0,
+            "totalRevenue": 0,
+        }
+
+
+class _FakeYF:
+    download_calls = []
+
+    Ticker = _FakeTicker
+
+    @staticmethod
+    def download(tickers, **kwargs):
+        _FakeYF.download_calls.append(list(tickers))
+        frames = {t: _frame([100.0, 101.0, 102.0 + i]) for i, t in enumerate(tickers)}
+        return pd.concat(frames, axis=1)
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    monkeypatch.setattr(yft, "yf", _FakeYF)
+    _FakeTicker.info_calls = 0
+    _FakeTicker.threads = []
+    _FakeYF.download_calls = []
+    YahooFinanceTool._cache_store.clear()
+    YahooFinanceTool._snapshots.clear()
+    yield YahooFinanceTool()
+    YahooFinanceTool._cache_store.clear()
+    YahooFinanceTool._snapshots.clear()
+
+
+@pytest.mark.asyncio
+async def test_info_is_fetched_once_off_loop_and_shared_across_actions(tool):
+    price = await tool.execute("price", "AAPL")
+    valuation = await tool.execute("valuation", "AAPL")
+
+    assert price["success"] is True
+    assert price["data"]["current_price"] == 110.0
+    assert valuation["data"]["valuation_multiples"]["pe_trailing"] == 20.0
+    assert _FakeTicker.info_calls == 1
+    assert _FakeTicker.threads[0].startswith("yfinance")
+
+
+@pytest.mark.asyncio
+async def test_batch_history_uses_one_download_and_caches_per_symbol(tool):
+    first = await tool.execute("history", "AAPL, MSFT,GOOGL", period="5d")
+    second = await tool.execute_batch("history", ["MSFT", "GOOGL"], period="5d")
+
+    assert first["success"] is True
+    assert list(first["results"]) == ["AAPL", "MSFT", "GOOGL"]
+    assert first["results"]["GOOGL"]["data"]["end_price"] == 104.0
+    assert second["results"]["MSFT"]["data"]["end_price"] == 103.0
+    assert _FakeYF.download_calls == [["AAPL", "MSFT", "GOOGL"]]
+
+    quotes = await tool.execute_batch("price", ["AAPL", "MSFT"])
+    assert quotes["results"]["AAPL"]["data"]["current_price"] == 102.0
+    assert quotes["results"]["AAPL"]["data"]["previous_close"] == 101.0
+    assert len(_FakeYF.download_calls) == 2
@@ -1,5 +1,6 @@
 # backend/services/web_search_service/app/main.py
 import os
+import asyncio
 import httpx
 import json
 from fastapi import FastAPI, HTTPException
@@ -354,6 +355,36 @@ async def execute_mcp_tool(tool_name: str, params: Dict[str, Any]):
         )
 
 
+class MCPBatchCall(BaseModel):
+    """批量请求中的单个工具调用"""
+    id: str
+    tool: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class MCPBatchRequest(BaseModel):
+    """MCP批量工具请求"""
+    calls: List[MCPBatchCall] = Field(..., max_length=64)
+
+
+@app.post("/mcp/batch", tags=["MCP"])
+async def execute_mcp_batch(request: MCPBatchRequest):
+    """
+    批量执行MCP工具
+
+    一次往返执行多个工具调用 (并发)，结果按 id 返回。
+    """
+    responses = await asyncio.gather(
+        *(execute_mcp_tool(call.tool, call.params) for call in request.calls)
+    )
+    return {
+        "results": [
+            {"id": call.id, **response.model_dump()}
+            for call, response in zip(request.calls, responses)
+        ]
+    }
+
+
 @app.get("/mcp/tools", tags=["MCP"])
 async def list_mcp_tools():
     """
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Startup profiler for the report_orchestrator app.
+
+Starts a fresh interpreter with `python -X importtime`, imports app.main, sends
+the first request through httpx.ASGITransport and reports:
+- interpreter start → app.main imported → first response (seconds)
+- slowest modules by cumulative import time, and the app module that pulled in
+  each heavy third-party package (who to make lazy next)
+- import self-time grouped by top-level package
+
+Each run is a new process, so the numbers are cold-start numbers (modulo the OS
+page cache). --repeat takes the median; the module breakdown is from the last run.
+
+Run from the repo root:
+    PYTHONPATH=backend/services/report_orchestrator python scripts/profile_startup.py
+    PYTHONPATH=backend/services/report_orchestrator python scripts/profile_startup.py \\
+        --path /health --lifespan --budget-s 3.0 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SERVICE_DIR = Path(__file__).resolve().parents[1] / "backend" / "services" / "report_orchestrator"
+MARKER = "__STARTUP_PROFILE__"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+# 子进程: 计时 import app.main 与首个请求 (ASGI 直连，不经过网络)
+CHILD = """
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main as orchestrator_main
+t1 = time.perf_counter()
+
+async def first_request():
+    import httpx
+    transport = httpx.ASGITransport(app=orchestrator_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://profile") as client:
+        if {lifespan}:
+            async with orchestrator_main.app.router.lifespan_context(orchestrator_main.app):
+                return (await client.get({path!r})).status_code
+        return (await client.get({path!r})).status_code
+
+status = asyncio.run(first_request())
+t2 = time.perf_counter()
+print({marker!r}, json.dumps({{"import_s": t1 - t0, "first_request_s": t2 - t1, "status": status}}), flush=True)
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """解析 -X importtime 输出 (子模块先于父模块打印，缩进表示深度)，并补上父子关系"""
+    rows: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        row = {
+            "module": match.group(4),
+            "self_ms": int(match.group(1)) / 1000,
+            "cumulative_ms": int(match.group(2)) / 1000,
+            "depth": (len(match.group(3)) - 1) // 2,
+            "children": [],
+        }
+        while pending and pending[-1]["depth"] > row["depth"]:
+            child = pending.pop()
+            child["parent"] = row
+            row["children"].append(child)
+        pending.append(row)
+        rows.append(row)
+    return rows
+
+
+def _importer(row: Dict[str, Any]) -> Optional[str]:
+    parent = row.get("parent")
+    while parent is not None:
+        if parent["module"] == "app" or parent["module"].startswith("app."):
+            return parent["module"]
+        parent = parent.get("parent")
+    return None
+
+
+def summarize(rows: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    by_package: Dict[str, float] = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + row["self_ms"]
+
+    app_rows = [r for r in rows if r["module"] == "app" or r["module"].startswith("app.")]
+    # 第三方包的最外层导入 (父节点是 app 模块或者没有父节点)，按累计耗时排序
+    heavy = [
+        r for r in rows
+        if not r["module"].startswith("app")
+        and (r.get("parent") is None or r["parent"]["module"].startswith("app"))
+    ]
+    return {
+        "modules": len(rows),
+        "total_import_ms": round(sum(r["self_ms"] for r in rows), 1),
+        "slowest_app_modules": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_ms"], 1), "self_ms": round(r["self_ms"], 1)}
+            for r in sorted(app_rows, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+        ],
+        "heavy_dependencies": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_ms"], 1), "imported_by": _importer(r)}
+            for r in sorted(heavy, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+        ],
+        "by_package": [
+            {"package": name, "self_ms": round(ms, 1)}
+            for name, ms in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+    }
+
+
+def run_once(args: argparse.Namespace) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SERVICE_DIR), env.get("PYTHONPATH", "")) if p)
+    env.setdefault("LOG_LEVEL", "WARNING")
+    code = CHILD.format(lifespan=bool(args.lifespan), path=args.path, marker=MARKER)
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(SERVICE_DIR), env=env, capture_output=True, text=True, timeout=args.timeout,
+    )
+    elapsed = time.perf_counter() - started
+    line = next((l for l in proc.stdout.splitlines() if l.startswith(MARKER)), None)
+    if proc.returncode != 0 or line is None:
+        raise RuntimeError(f"startup failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+    timings = json.loads(line[len(MARKER):])
+    # 解释器自身启动 = 子进程总耗时 - import - 首个请求
+    timings["interpreter_s"] = max(0.0, elapsed - timings["import_s"] - timings["first_request_s"])
+    timings["time_to_first_request_s"] = elapsed
+    timings["rows"] = parse_importtime(proc.stderr)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/health", help="first request path")
+    parser.add_argument("--lifespan", action="store_true", help="run the lifespan startup (Kafka init) before the request")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--budget-s", type=float, help="exit 1 if median time to first request exceeds this")
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    args = parser.parse_args()
+
+    runs = [run_once(args) for _ in range(max(1, args.repeat))]
+    result = {
+        "runs": len(runs),
+        "status": runs[-1]["status"],
+        **{
+            key: round(statistics.median(r[key] for r in runs), 3)
+            for key in ("interpreter_s", "import_s", "first_request_s", "time_to_first_request_s")
+        },
+        **summarize(runs[-1]["rows"], args.top),
+    }
+    over_budget = args.budget_s is not None and result["time_to_first_request_s"] > args.budget_s
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(f"interpreter {result['interpreter_s']:.3f}s | import app.main {result['import_s']:.3f}s | "
+              f"first request {result['first_request_s']:.3f}s (HTTP {result['status']}) | "
+              f"total {result['time_to_first_request_s']:.3f}s over {result['runs']} run(s)")
+        print(f"\n{'slowest app modules':<60}{'cum_ms':>10}{'self_ms':>10}")
+        for r in result["slowest_app_modules"]:
+            print(f"{r['module']:<60}{r['cumulative_ms']:>10.1f}{r['self_ms']:>10.1f}")
+        print(f"\n{'heavy dependencies':<40}{'cum_ms':>10}  imported by")
+        for r in result["heavy_dependencies"]:
+            print(f"{r['module']:<40}{r['cumulative_ms']:>10.1f}  {r['imported_by'] or '-'}")
+        print(f"\n{'package':<40}{'self_ms':>10}")
+        for r in result["by_package"]:
+            print(f"{r['package']:<40}{r['self_ms']:>10.1f}")
+        if over_budget:
+            print(f"\nREGRESSION time_to_first_request_s = {result['time_to_first_request_s']} > {args.budget_s}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+AgentEventBus fan-out benchmark.
+
+Simulates a roundtable with many WebSocket subscribers (default 500) and one
+deliberately slow consumer, then compares:
+1) legacy fan-out: await send_json() to every subscriber in turn per event
+2) AgentEventBus: one serialization per event, per-subscriber queues + writers
+
+Run from the repo root:
+    PYTHONPATH=backend/services/report_orchestrator python scripts/run_agent_event_bus_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from starlette.websockets import WebSocketState
+
+from app.core.agent_event_bus import AgentEvent, AgentEventBus, AgentEventType
+
+EVENT_PLAN = (
+    [AgentEventType.PROGRESS] * 6
+    + [AgentEventType.LOG] * 3
+    + [AgentEventType.RESULT]
+)
+
+
+class FakeSocket:
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.frames = 0
+        self.results = 0
+
+    async def _deliver(self, text: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)
+        self.frames += 1
+        if '"result"' in text:
+            self.results += 1
+
+    async def send_text(self, text: str):
+        await self._deliver(text)
+
+    async def send_json(self, payload: Dict[str, Any]):
+        await self._deliver(json.dumps(payload, ensure_ascii=False))
+
+    async def close(self, code: int = 1000):
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+def _event(agent: str, event_type: AgentEventType, i: int) -> AgentEvent:
+    return AgentEvent(agent_name=agent, event_type=event_type, message=f"{agent} {event_type.value} #{i}", progress=0.5)
+
+
+async def _legacy_publish(sockets: List[FakeSocket], event: AgentEvent):
+    """Pre-refactor behaviour: serialize and await per subscriber, sequentially."""
+    for ws in sockets:
+        await ws.send_json({"type": "agent_event", "event": event.dict()})
+
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "publish_p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "publish_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "publish_max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+async def _run_agents(agents: int, rounds: int, publish) -> List[float]:
+    latencies: List[float] = []
+
+    async def agent_loop(name: str):
+        for i in range(rounds):
+            for event_type in EVENT_PLAN:
+                t0 = time.perf_counter()
+                await publish(_event(name, event_type, i))
+                latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(agent_loop(f"agent{a}") for a in range(agents)))
+    return latencies
+
+
+async def benchmark_legacy(subscribers: int, slow_delay: float, agents: int, rounds: int) -> Dict[str, Any]:
+    sockets = [FakeSocket(0.0) for _ in range(subscribers - 1)] + [FakeSocket(slow_delay)]
+    t0 = time.perf_counter()
+    latencies = await _run_agents(agents, rounds, lambda e: _legacy_publish(sockets, e))
+    return {
+        **_summary(latencies),
+        "wall_seconds": round(time.perf_counter() - t0, 3),
+        "fast_subscriber_frames": sockets[0].frames,
+        "slow_subscriber_frames": sockets[-1].frames,
+    }
+
+
+async def benchmark_bus(subscribers: int, slow_delay: float, agents: int, rounds: int) -> Dict[str, Any]:
+    bus = AgentEventBus()
+    sockets = [FakeSocket(0.0) for _ in range(subscribers - 1)] + [FakeSocket(slow_delay)]
+    for ws in sockets:
+        await bus.subscribe(ws)
+
+    t0 = time.perf_counter()
+    latencies = await _run_agents(agents, rounds, bus.publish)
+    published = time.perf_counter() - t0
+    fast = sockets[:-1]
+    while any(ws.results < agents * rounds for ws in fast):
+        await asyncio.sleep(0.001)
+    fast_done = time.perf_counter() - t0
+    await bus.drain()
+    stats = bus.get_stats()
+    return {
+        **_summary(latencies),
+        "publish_wall_seconds": round(published, 3),
+        "fast_subscribers_drained_seconds": round(fast_done, 3),
+        "slow_subscriber_drained_seconds": round(time.perf_counter() - t0, 3),
+        "fast_subscriber_frames": sockets[0].frames,
+        "slow_subscriber_frames": sockets[-1].frames,
+        "slow_subscriber_results": sockets[-1].results,
+        "coalesced": stats["coalesced"],
+        "dropped": stats["dropped"],
+        "disconnected": stats["disconnected"],
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark AgentEventBus fan-out")
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="Per-frame delay of the slow consumer (s)")
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=4, help="Event rounds per agent")
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print pure JSON output")
+    args = parser.parse_args()
+
+    result: Dict[str, Any] = {
+        "subscribers": args.subscribers,
+        "slow_delay_seconds": args.slow_delay,
+        "events": args.agents * args.rounds * len(EVENT_PLAN),
+        "queue_bus": await benchmark_bus(args.subscribers, args.slow_delay, args.agents, args.rounds),
+    }
+    if not args.skip_legacy:
+        result["legacy_sequential"] = await benchmark_legacy(
+            args.subscribers, args.slow_delay, args.agents, args.rounds
+        )
+
+    if not args.json:
+        print("=== AgentEventBus Fan-out Benchmark ===")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    bus = result["queue_bus"]
+    passed = bus["slow_subscriber_results"] == args.agents * args.rounds and bus["disconnected"] == 0
+    return 0 if passed else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark on top of the LLM / tool replay harness.
+
+Each scenario runs a real orchestration path (ReWOO analysis, roundtable
+meeting, expert chat routing, trading meeting) with LLM Gateway HTTP calls,
+Tool.execute and market-data HTTP calls served by app.core.replay.ReplayHarness,
+and reports:
+- wall-clock seconds
+- CPU seconds (process time, i.e. orchestration overhead without simulated waits)
+- LLM calls / tool calls / cassette misses
+
+Modes:
+- synthetic (default): shape-aware synthetic responses, fully offline
+- record: call the real LLM Gateway / tools and write one cassette per scenario
+- replay: replay cassettes from --cassette-dir
+
+Regression gate: --thresholds points at a JSON file
+    {"<scenario>": {"wall_s": 5.0, "cpu_s": 1.0, "llm_calls": 20, "tool_calls": 10, "misses": 0}}
+and the process exits 1 if any metric exceeds its limit.
+
+Run from the repo root:
+    PYTHONPATH=backend/services/report_orchestrator python scripts/run_e2e_benchmark.py \\
+        --llm-latency lognormal:800,0.4 --tool-latency lognormal:300,0.5 \\
+        --thresholds scripts/e2e_benchmark_thresholds.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.core.replay import Cassette, ReplayHarness
+from app.core.roundtable.tool import Tool
+
+SYMBOL = "NVDA"
+_PLAN_TOOL = re.compile(r"\n\*\*([\w\-]+)\*\*:\n  Description")
+
+
+class QuoteTool(Tool):
+    def __init__(self):
+        super().__init__("yahoo_finance", "Stock quotes and fundamentals. params: symbol, action")
+
+    async def execute(self, **kwargs):
+        raise RuntimeError("served by the replay harness")
+
+
+class SearchTool(Tool):
+    def __init__(self):
+        super().__init__("tavily_search", "Web search. params: query")
+
+    async def execute(self, **kwargs):
+        raise RuntimeError("served by the replay harness")
+
+
+def responder(kind: str, name: str, payload: Any) -> Any:
+    """按提示词形状合成回复: ReWOO 计划 → JSON 数组，Leader 路由 → JSON 对象，其余为分析文本"""
+    if kind == "http":
+        # 行情源只合成 Binance (价格服务按健康度排序，其余源返回 503 后自动降级)
+        if name.endswith("/api/v3/ticker/price"):
+            return {"symbol": payload["params"].get("symbol", "BTCUSDT"), "price": "65000.00"}
+        if name.endswith("/api/v3/klines"):
+            start = 1_700_000_000_000
+            return [[start + i * 3_600_000, "64800", "65200", "64600", f"{64800 + i * 10}", "120"]
+                    for i in range(int(payload["params"].get("limit", 100)))]
+        return None
+    if kind == "tool":
+        return {
+            "success": True,
+            "summary": f"{name}: {SYMBOL} 最新价 132.5，成交量放大，近一周上涨 4.2%",
+            "data": {"symbol": SYMBOL, "price": 132.5, "change_pct": 4.2},
+        }
+    prompt = payload.get("prompt", "")
+    if "JSON array" in prompt and '"tool"' in prompt:
+        # 计划使用该 Agent 实际注册的前两个工具
+        tools = _PLAN_TOOL.findall(prompt)[:2]
+        return json.dumps([
+            {"step": i + 1, "tool": tool, "params": {"symbol": SYMBOL, "query": f"{SYMBOL} outlook"}, "purpose": "data"}
+            for i, tool in enumerate(tools)
+        ])
+    if "take_profit_percent" in prompt:
+        vote = {"direction": "long", "confidence": 68, "leverage": 3, "take_profit_percent": 6.0,
+                "stop_loss_percent": 2.5, "reasoning": "趋势与资金面偏多"}
+        return f"结论偏多。\n```json\n{json.dumps(vote, ensure_ascii=False)}\n```"
+    if "need_specialists" in prompt:
+        return json.dumps({
+            "need_specialists": True,
+            "specialists": ["market-analyst"],
+            "leader_reply": "请市场分析师补充行业数据。",
+            "reason": "benchmark",
+        }, ensure_ascii=False)
+    return ("综合价格与新闻数据，需求端仍然强劲，估值处于历史区间上沿。"
+            "短期关注财报指引与供应链产能，风险在于估值回调与出口管制。") * 4
+
+
+def _rewoo_agent(name: str):
+    from app.core.roundtable.rewoo_agent import ReWOOAgent
+
+    agent = ReWOOAgent(name=name, role_prompt=f"You are {name}, an equity analyst.")
+    agent.register_tool(QuoteTool())
+    agent.register_tool(SearchTool())
+    return agent
+
+
+async def scenario_rewoo_analysis() -> None:
+    agent = _rewoo_agent("MarketAnalyst")
+    await agent.analyze_with_rewoo(f"分析 {SYMBOL} 的短期走势与主要风险", {"symbol": SYMBOL})
+
+
+async def scenario_roundtable() -> None:
+    from app.core.roundtable.agent import Agent
+    from app.core.roundtable.meeting import Meeting
+    from app.core.roundtable.message import Message, MessageType
+
+    experts = [_rewoo_agent(name) for name in ("MarketAnalyst", "FinancialExpert", "RiskAssessor")]
+    leader = Agent(name="Leader", role_prompt="You chair the investment committee.")
+    meeting = Meeting(agents=experts + [leader], max_turns=2)
+    await meeting.run(Message(
+        sender="Human",
+        recipient="ALL",
+        content=f"请各位专家评估 {SYMBOL} 的投资价值",
+        message_type=MessageType.BROADCAST,
+    ))
+
+
+async def scenario_expert_chat() -> None:
+    import app.main as orchestrator_main
+
+    orchestrator_main._leader_route_cache.clear()
+    route = await orchestrator_main._leader_plan_route(
+        user_message=f"{SYMBOL} 现在适合建仓吗？",
+        history=[{"role": "user", "content": f"{SYMBOL} 现在适合建仓吗？"}],
+        language="zh",
+        knowledge_enabled=False,
+        knowledge_category="all",
+    )
+    await orchestrator_main._llm_chat_completion(
+        [{"role": "system", "content": "You are market-analyst."},
+         {"role": "user", "content": route.get("leader_reply", "")}],
+        temperature=0.7,
+    )
+
+
+async def scenario_trading_meeting() -> None:
+    from app.core.trading.trading_agents import create_trading_agents
+    from app.core.trading.trading_config import TradingMeetingConfig
+    from app.core.trading.trading_meeting import TradingMeeting
+
+    meeting = TradingMeeting(
+        agents=create_trading_agents(toolkit=None),
+        config=TradingMeetingConfig(symbol="BTC-USDT-SWAP"),
+    )
+    await meeting.run(context="benchmark")
+
+
+SCENARIOS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "rewoo_analysis": scenario_rewoo_analysis,
+    "roundtable": scenario_roundtable,
+    "expert_chat": scenario_expert_chat,
+    "trading_meeting": scenario_trading_meeting,
+}
+
+
+async def run_scenario(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    cassette_path = Path(args.cassette_dir) / f"{name}.jsonl"
+    cassette = Cassette.load(str(cassette_path)) if args.mode == "replay" else Cassette()
+    runs: List[Dict[str, Any]] = []
+    # 预热轮 (不计入结果) 吸收首次 import 与连接池初始化的开销
+    for i in range(-args.warmup if args.mode != "record" else 0, args.repeat):
+        cassette.rewind()
+        harness = ReplayHarness(
+            mode=args.mode,
+            cassette=cassette if args.mode != "record" else Cassette(),
+            llm_latency=args.llm_latency,
+            tool_latency=args.tool_latency,
+            responder=responder if args.mode != "record" else None,
+            seed=args.seed + max(i, 0),
+        )
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        error = None
+        async with harness:
+            try:
+                await asyncio.wait_for(SCENARIOS[name](), timeout=args.timeout)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        stats = harness.get_stats()
+        if i < 0:
+            continue
+        runs.append({
+            "wall_s": time.perf_counter() - wall0,
+            "cpu_s": time.process_time() - cpu0,
+            "llm_calls": stats["llm_calls"],
+            "tool_calls": stats["tool_calls"],
+            "http_calls": stats["http_calls"],
+            "misses": stats["misses"],
+            "simulated_wait_s": stats["simulated_wait_s"],
+            "error": error,
+        })
+        if args.mode == "record":
+            harness.cassette.save(str(cassette_path))
+            break
+
+    # 多次运行取中位数
+    def median(key: str) -> float:
+        values = sorted(r[key] for r in runs)
+        return round(values[len(values) // 2], 4)
+
+    return {
+        "scenario": name,
+        "runs": len(runs),
+        "wall_s": median("wall_s"),
+        "cpu_s": median("cpu_s"),
+        "llm_calls": max(r["llm_calls"] for r in runs),
+        "tool_calls": max(r["tool_calls"] for r in runs),
+        "http_calls": max(r["http_calls"] for r in runs),
+        "misses": max(r["misses"] for r in runs),
+        "simulated_wait_s": median("simulated_wait_s"),
+        "errors": [r["error"] for r in runs if r["error"]],
+    }
+
+
+def check_thresholds(results: List[Dict[str, Any]], thresholds: Dict[str, Dict[str, float]]) -> List[str]:
+    violations = []
+    for result in results:
+        if result["errors"]:
+            violations.append(f"{result['scenario']}: {result['errors'][0]}")
+        for metric, limit in thresholds.get(result["scenario"], {}).items():
+            if result.get(metric, 0) > limit:
+                violations.append(f"{result['scenario']}.{metric} = {result[metric]} > {limit}")
+    return violations
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="default: all")
+    parser.add_argument("--mode", choices=["synthetic", "replay", "record"], default="synthetic")
+    parser.add_argument("--cassette-dir", default="benchmarks/cassettes")
+    parser.add_argument("--llm-latency", default="lognormal:800,0.4", help="LatencyModel spec for LLM calls")
+    parser.add_argument("--tool-latency", default="lognormal:300,0.5", help="LatencyModel spec for tool calls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per scenario")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--thresholds", help="JSON file with per-scenario upper limits")
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    results = [await run_scenario(name, args) for name in (args.scenario or SCENARIOS)]
+    thresholds = json.loads(Path(args.thresholds).read_text()) if args.thresholds else {}
+    violations = check_thresholds(results, thresholds)
+
+    if args.json:
+        print(json.dumps({"results": results, "violations": violations}, ensure_ascii=False, indent=2))
+    else:
+        print(f"{'scenario':<16}{'wall_s':>9}{'cpu_s':>8}{'llm':>6}{'tools':>7}{'misses':>8}")
+        for r in results:
+            print(f"{r['scenario']:<16}{r['wall_s']:>9.3f}{r['cpu_s']:>8.3f}{r['llm_calls']:>6}"
+                  f"{r['tool_calls']:>7}{r['misses']:>8}")
+        for violation in violations:
+            print(f"REGRESSION {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Kafka producer/consumer pipeline benchmark (in-memory broker).
+
+Uses the in-memory Kafka stand-in from tests/mocks (one simulated round trip
+per producer request) and compares:
+1) legacy producer: model_dump + json.dumps, send_and_wait per message
+2) KafkaClient.send_batch: pydantic_core/orjson codec, linger batching, bulk acks
+3) legacy consumer: handlers awaited one message at a time
+4) ConcurrentConsumer: per-partition bounded concurrency, ordered offset commits
+
+Run from the repo root:
+    PYTHONPATH=backend/services/report_orchestrator python scripts/run_kafka_pipeline_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import timeit
+from typing import Any, Dict
+
+from app.messaging.codec import decode_value, encode_key, encode_value
+from app.messaging.consumer import ConcurrentConsumer
+from app.messaging.kafka_client import KafkaClient
+from app.messaging.messages import AgentResponse
+from app.messaging.topics import MagellanTopics
+from tests.mocks.memory_kafka import InMemoryBroker, InMemoryConsumer, InMemoryProducer
+
+TOPIC = MagellanTopics.AGENT_RESPONSE
+
+
+def _message(i: int) -> AgentResponse:
+    return AgentResponse(
+        source="bench",
+        destination="orchestrator",
+        agent_id=f"agent{i % 5}",
+        session_id=f"session{i % 20}",
+        outputs={"text": "估值分析 " * 40, "scores": list(range(20))},
+    )
+
+
+def _legacy_serializer(value: Any) -> bytes:
+    return json.dumps(value, default=str).encode("utf-8")
+
+
+def benchmark_codec(iterations: int = 5000) -> Dict[str, float]:
+    message = _message(1)
+    legacy = timeit.timeit(lambda: _legacy_serializer(message.model_dump()), number=iterations)
+    current = timeit.timeit(lambda: encode_value(message), number=iterations)
+    return {
+        "legacy_us": round(legacy / iterations * 1e6, 2),
+        "codec_us": round(current / iterations * 1e6, 2),
+        "speedup": round(legacy / current, 2),
+    }
+
+
+async def benchmark_legacy_producer(messages: int, latency: float) -> Dict[str, Any]:
+    broker = InMemoryBroker(request_latency=latency)
+    producer = InMemoryProducer(broker, value_serializer=_legacy_serializer, key_serializer=encode_key)
+    t0 = time.perf_counter()
+    for i in range(messages):
+        msg = _message(i)
+        await producer.send_and_wait(TOPIC.value, value=msg.model_dump(), key=msg.session_id)
+    elapsed = time.perf_counter() - t0
+    return {"seconds": round(elapsed, 3), "msgs_per_sec": round(messages / elapsed), "requests": broker.requests}
+
+
+async def benchmark_batch_producer(messages: int, latency: float, linger_ms: int) -> Dict[str, Any]:
+    broker = InMemoryBroker(request_latency=latency)
+    client = KafkaClient()
+    client._producer = InMemoryProducer(
+        broker, value_serializer=encode_value, key_serializer=encode_key,
+        linger_ms=linger_ms, max_batch_size=64 * 1024,
+    )
+    batch = [_message(i) for i in range(messages)]
+    t0 = time.perf_counter()
+    sent = await client.send_batch(TOPIC, batch)
+    elapsed = time.perf_counter() - t0
+    client._producer = None
+    return {
+        "seconds": round(elapsed, 3),
+        "msgs_per_sec": round(messages / elapsed),
+        "requests": broker.requests,
+        "acked": sent,
+    }
+
+
+async def _seed(broker: InMemoryBroker, messages: int):
+    producer = InMemoryProducer(broker, value_serializer=encode_value, key_serializer=encode_key, max_batch_size=1 << 20)
+    for i in range(messages):
+        msg = _message(i)
+        await producer.send(TOPIC.value, value=msg, key=msg.session_id)
+    await producer.flush()
+
+
+def _handler_delay(rng: random.Random, slow_ratio: float, fast: float, slow: float) -> float:
+    return slow if rng.random() < slow_ratio else fast
+
+
+async def benchmark_legacy_consumer(messages: int, slow_ratio: float, fast: float, slow: float) -> Dict[str, Any]:
+    broker = InMemoryBroker(request_latency=0)
+    await _seed(broker, messages)
+    consumer = InMemoryConsumer(broker, TOPIC.value, value_deserializer=lambda v: json.loads(v.decode("utf-8")))
+    rng = random.Random(7)
+    handled = 0
+    t0 = time.perf_counter()
+    while handled < messages:
+        for records in (await consumer.getmany(timeout_ms=10)).values():
+            for _ in records:
+                await asyncio.sleep(_handler_delay(rng, slow_ratio, fast, slow))
+                handled += 1
+    elapsed = time.perf_counter() - t0
+    return {"seconds": round(elapsed, 3), "msgs_per_sec": round(messages / elapsed)}
+
+
+async def benchmark_concurrent_consumer(
+    messages: int, slow_ratio: float, fast: float, slow: float, concurrency: int
+) -> Dict[str, Any]:
+    broker = InMemoryBroker(request_latency=0)
+    await _seed(broker, messages)
+    consumer = InMemoryConsumer(broker, TOPIC.value, value_deserializer=decode_value)
+    rng = random.Random(7)
+    last_seen: Dict[str, int] = {}
+    order_violations = 0
+
+    async def handler(record):
+        nonlocal order_violations
+        if last_seen.get(record.key, -1) > record.offset:
+            order_violations += 1
+        last_seen[record.key] = record.offset
+        await asyncio.sleep(_handler_delay(rng, slow_ratio, fast, slow))
+
+    dispatcher = ConcurrentConsumer(consumer, handler, concurrency=concurrency, poll_timeout_ms=10)
+    t0 = time.perf_counter()
+    task = asyncio.create_task(dispatcher.run())
+    while dispatcher.stats["processed"] < messages:
+        await asyncio.sleep(0.002)
+    elapsed = time.perf_counter() - t0
+    await dispatcher.stop()
+    await task
+    return {
+        "seconds": round(elapsed, 3),
+        "msgs_per_sec": round(messages / elapsed),
+        "committed": sum(broker.committed.values()),
+        "per_key_order_violations": order_violations,
+        **{k: v for k, v in dispatcher.get_stats().items() if k in ("commits", "pauses")},
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Kafka producer/consumer paths on an in-memory broker")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated broker round trip per request")
+    parser.add_argument("--linger-ms", type=int, default=5)
+    parser.add_argument("--slow-ratio", type=float, default=0.05, help="Share of slow handler calls")
+    parser.add_argument("--concurrency", type=int, default=8, help="Per-partition handler concurrency")
+    parser.add_argument("--json", action="store_true", help="Print pure JSON output")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    consumer_args = (args.messages, args.slow_ratio, 0.001, 0.02)
+    result: Dict[str, Any] = {
+        "messages": args.messages,
+        "codec": benchmark_codec(),
+        "producer": {
+            "legacy_send_and_wait": await benchmark_legacy_producer(args.messages, latency),
+            "send_batch": await benchmark_batch_producer(args.messages, latency, args.linger_ms),
+        },
+        "consumer": {
+            "legacy_sequential": await benchmark_legacy_consumer(*consumer_args),
+            "concurrent": await benchmark_concurrent_consumer(*consumer_args, args.concurrency),
+        },
+    }
+
+    if not args.json:
+        print("=== Kafka Pipeline Benchmark (in-memory broker) ===")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    concurrent = result["consumer"]["concurrent"]
+    passed = (
+        result["producer"]["send_batch"]["acked"] == args.messages
+        and concurrent["committed"] == args.messages
+        and concurrent["per_key_order_violations"] == 0
+    )
+    return 0 if passed else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
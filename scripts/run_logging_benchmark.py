@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Logging hot-path benchmark: print(flush=True) vs sync logging vs the queued log pipeline.
+
+Simulates many concurrent coroutines publishing events (as AgentEventBus/MessageBus
+do during a roundtable) and logging one line per event into a stdout-like sink
+whose writes block for --write-latency-us (container stdout is a pipe to the log
+driver). Reports per-call latency and event-loop lag for:
+1) legacy: print(f"...", flush=True)
+2) sync logging: logger.info("%s", ...) with a StreamHandler on the event loop thread
+3) log pipeline: LazyQueueHandler + background QueueListener (observability.log_pipeline)
+
+Run from the repo root:
+    PYTHONPATH=backend/services/report_orchestrator python scripts/run_logging_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from app.core.observability.log_pipeline import LogPipeline
+
+
+class SlowSink:
+    """stdout 替身: 每次 write/flush 阻塞固定时间 (容器 stdout 是写往日志驱动的管道)"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.lines = 0
+
+    def _block(self):
+        # 真实的 write(2) 阻塞时释放 GIL，用 sleep 而不是忙等来模拟
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def write(self, data: str) -> int:
+        self._block()
+        self.lines += data.count("\n")
+        return len(data)
+
+    def flush(self):
+        self._block()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _run(emit: Callable[[int, Dict[str, Any]], None], publishers: int, events: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    lag: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag.append((time.perf_counter() - started - 0.001) * 1000)
+
+    async def publisher(pid: int):
+        for i in range(events):
+            event = {"agent_name": f"agent{pid}", "event_type": "thinking", "message": "x" * 120, "seq": i}
+            started = time.perf_counter()
+            emit(pid, event)
+            latencies.append((time.perf_counter() - started) * 1e6)
+            await asyncio.sleep(0)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(publisher(p) for p in range(publishers)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    return {
+        "events": len(latencies),
+        "seconds": round(elapsed, 3),
+        "call_p50_us": round(statistics.median(latencies), 2),
+        "call_p99_us": round(_percentile(latencies, 0.99), 2),
+        "loop_lag_p99_ms": round(_percentile(lag, 0.99), 3) if lag else 0.0,
+        "loop_lag_max_ms": round(max(lag), 3) if lag else 0.0,
+    }
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark print() vs queued logging on the event loop")
+    parser.add_argument("--publishers", type=int, default=20)
+    parser.add_argument("--events", type=int, default=500, help="Events per publisher")
+    parser.add_argument("--write-latency-us", type=float, default=30.0, help="Blocking time per sink write/flush")
+    parser.add_argument("--json", action="store_true", help="Print pure JSON output")
+    args = parser.parse_args()
+
+    latency_s = args.write_latency_us / 1e6
+    formatter = logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    legacy_sink = SlowSink(latency_s)
+
+    def legacy(pid: int, event: Dict[str, Any]):
+        print(
+            f"[AgentEventBus] Publishing event: {event['agent_name']} - {event['event_type']} - {event['message'][:80]}",
+            file=legacy_sink,
+            flush=True,
+        )
+
+    sync_sink = SlowSink(latency_s)
+    sync_handler = logging.StreamHandler(sync_sink)
+    sync_handler.setFormatter(formatter)
+    sync_logger = _logger("bench.sync", sync_handler)
+
+    def sync_logging(pid: int, event: Dict[str, Any]):
+        sync_logger.info(
+            "[AgentEventBus] Publishing event: %s - %s - %s",
+            event["agent_name"], event["event_type"], event["message"][:80],
+        )
+
+    queued_sink = SlowSink(latency_s)
+    queued_handler = logging.StreamHandler(queued_sink)
+    queued_handler.setFormatter(formatter)
+    pipeline = LogPipeline([queued_handler], max_size=args.publishers * args.events + 1)
+    queued_logger = _logger("bench.queued", pipeline.handler)
+
+    def queued_logging(pid: int, event: Dict[str, Any]):
+        queued_logger.info(
+            "[AgentEventBus] Publishing event: %s - %s - %s",
+            event["agent_name"], event["event_type"], event["message"][:80],
+        )
+
+    result: Dict[str, Any] = {
+        "config": {
+            "publishers": args.publishers,
+            "events_per_publisher": args.events,
+            "write_latency_us": args.write_latency_us,
+        },
+        "print_flush": await _run(legacy, args.publishers, args.events),
+        "sync_logging": await _run(sync_logging, args.publishers, args.events),
+    }
+    pipeline.start()
+    result["log_pipeline"] = await _run(queued_logging, args.publishers, args.events)
+    drain_started = time.perf_counter()
+    pipeline.stop()
+    result["log_pipeline"]["writer_drain_seconds"] = round(time.perf_counter() - drain_started, 3)
+    result["log_pipeline"]["dropped"] = pipeline.get_stats()["dropped"]
+    result["lines_written"] = {
+        "print_flush": legacy_sink.lines,
+        "sync_logging": sync_sink.lines,
+        "log_pipeline": queued_sink.lines,
+    }
+    result["call_p99_speedup_vs_print"] = round(
+        result["print_flush"]["call_p99_us"] / max(result["log_pipeline"]["call_p99_us"], 1e-6), 1
+    )
+
+    if not args.json:
+        print("=== Logging Hot Path Benchmark ===")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
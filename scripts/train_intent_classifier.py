@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Train the local intent classifier from logged LLM intent decisions.
+
+Reads INTENT_LOG_PATH (JSONL written by IntentRecognizer when it falls back to
+the LLM; the service only writes it when INTENT_LOG_PATH is set), holds out a share of the records for accuracy, then fits on all
+records and writes the model to INTENT_CLASSIFIER_MODEL_PATH.
+
+Run from the repo root:
+    PYTHONPATH=backend/services/report_orchestrator python scripts/train_intent_classifier.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+
+from app.core.intent_classifier import HashedNgramClassifier, IntentLog
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train the hashed n-gram intent classifier from the intent log")
+    parser.add_argument("--log", default=os.getenv("INTENT_LOG_PATH"), help="intent log (default: INTENT_LOG_PATH)")
+    parser.add_argument(
+        "--output",
+        default=os.getenv("INTENT_CLASSIFIER_MODEL_PATH", "/tmp/magellan_intent/intent_classifier.json"),
+    )
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of records used for evaluation")
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--dim-bits", type=int, default=18)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print pure JSON output")
+    args = parser.parse_args()
+
+    if not args.log:
+        print(json.dumps({"error": "no intent log: pass --log or set INTENT_LOG_PATH"}, ensure_ascii=False))
+        return 1
+    records = IntentLog(args.log).read(min_confidence=args.min_confidence)
+    if not records:
+        print(json.dumps({"error": f"no usable records in {args.log}"}, ensure_ascii=False))
+        return 1
+
+    examples = [(r["text"], r["intent"]) for r in records]
+    random.Random(args.seed).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+    train, test = examples[:split], examples[split:]
+
+    accuracy = None
+    if train and test:
+        model = HashedNgramClassifier(dim=1 << args.dim_bits).fit(train, epochs=args.epochs, seed=args.seed)
+        accuracy = sum(1 for text, label in test if model.predict(text)[0] == label) / len(test)
+
+    started = time.perf_counter()
+    model = HashedNgramClassifier(dim=1 << args.dim_bits).fit(examples, epochs=args.epochs, seed=args.seed)
+    train_seconds = time.perf_counter() - started
+    model.save(args.output)
+
+    labels = {}
+    for _, label in examples:
+        labels[label] = labels.get(label, 0) + 1
+    result = {
+        "records": len(examples),
+        "labels": labels,
+        "holdout_records": len(test),
+        "holdout_accuracy": round(accuracy, 4) if accuracy is not None else None,
+        "train_seconds": round(train_seconds, 3),
+        "model_path": args.output,
+    }
+    if not args.json:
+        print("=== Intent Classifier Training ===")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())